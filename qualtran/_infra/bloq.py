@@ -299,6 +299,7 @@ class Bloq(metaclass=abc.ABCMeta):
         generalizer: Optional[Union['GeneralizerT', Sequence['GeneralizerT']]] = None,
         keep: Optional[Sequence['Bloq']] = None,
         max_depth: Optional[int] = None,
+        sparse_polynomials: bool = False,
     ) -> Tuple['nx.DiGraph', Dict['Bloq', Union[int, 'sympy.Expr']]]:
         """Get the bloq call graph and call totals.
 
@@ -314,6 +315,9 @@ class Bloq(metaclass=abc.ABCMeta):
             keep: If this function evaluates to True for the current bloq, keep the bloq as a leaf
                 node in the call graph instead of recursing into it.
             max_depth: If provided, build a call graph with at most this many layers.
+            sparse_polynomials: If True, accumulate symbolic call totals as sparse polynomials
+                and only convert them to sympy expressions at the end. This is much faster for
+                large call graphs with many generalized symbols.
 
         Returns:
             g: A directed graph where nodes are (generalized) bloqs and edge attribute 'n' reports
@@ -324,7 +328,13 @@ class Bloq(metaclass=abc.ABCMeta):
         """
         from qualtran.resource_counting.bloq_counts import get_bloq_call_graph
 
-        return get_bloq_call_graph(self, generalizer=generalizer, keep=keep, max_depth=max_depth)
+        return get_bloq_call_graph(
+            self,
+            generalizer=generalizer,
+            keep=keep,
+            max_depth=max_depth,
+            sparse_polynomials=sparse_polynomials,
+        )
 
     def bloq_counts(
         self, generalizer: Optional[Union['GeneralizerT', Sequence['GeneralizerT']]] = None
@@ -438,12 +438,12 @@ def _binst_to_cxns(
 ) -> Tuple[List[Connection], List[Connection]]:
     """Helper method to extract all predecessor and successor Connections for a binst."""
     pred_cxns: List[Connection] = []
-    for pred in binst_graph.pred[binst]:
-        pred_cxns.extend(binst_graph.edges[pred, binst]['cxns'])
+    for edge_data in binst_graph.pred[binst].values():
+        pred_cxns.extend(edge_data['cxns'])
 
     succ_cxns: List[Connection] = []
-    for succ in binst_graph.succ[binst]:
-        succ_cxns.extend(binst_graph.edges[binst, succ]['cxns'])
+    for edge_data in binst_graph.succ[binst].values():
+        succ_cxns.extend(edge_data['cxns'])
 
     return pred_cxns, succ_cxns
 
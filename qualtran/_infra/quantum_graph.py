@@ -22,7 +22,7 @@ if TYPE_CHECKING:
     from qualtran import Bloq, Register
 
 
-@frozen
+@frozen(cache_hash=True)
 class BloqInstance:
     """A unique instance of a Bloq within a `CompositeBloq`.
 
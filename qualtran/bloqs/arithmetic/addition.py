@@ -44,8 +44,9 @@ from qualtran.bloqs.mcmt.and_bloq import And
 from qualtran.bloqs.mcmt.multi_control_multi_target_pauli import MultiControlX
 from qualtran.bloqs.util_bloqs import ArbitraryClifford
 from qualtran.cirq_interop import decompose_from_cirq_style_method
-from qualtran.cirq_interop.bit_tools import iter_bits, iter_bits_twos_complement
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
+from qualtran.simulation.bit_packing import ints_to_bits
+from qualtran.simulation.classical_sim import classical_where, classical_widen
 
 if TYPE_CHECKING:
     import quimb.tensor as qtn
@@ -116,9 +117,15 @@ class Add(Bloq):
     def on_classical_vals(
         self, a: 'ClassicalValT', b: 'ClassicalValT'
     ) -> Dict[str, 'ClassicalValT']:
-        unsigned = isinstance(self.dtype, (QUInt, QMontgomeryUInt))
-        N = 2**self.dtype.bitsize if unsigned else 2 ** (self.dtype.bitsize - 1)
-        return {'a': a, 'b': int(math.fmod(a + b, N))}
+        N = 2**self.dtype.bitsize
+        # Avoid e.g. `np.uint64 + int` being promoted to a float, or `a + b` overflowing.
+        a_plus_b = classical_widen(a, self.dtype.bitsize + 1) + classical_widen(
+            b, self.dtype.bitsize + 1
+        )
+        if isinstance(self.dtype, (QUInt, QMontgomeryUInt)):
+            return {'a': a, 'b': a_plus_b % N}
+        # Two's complement wraparound.
+        return {'a': a, 'b': (a_plus_b + N // 2) % N - N // 2}
 
     def short_name(self) -> str:
         return "a+b"
@@ -260,7 +267,8 @@ class OutOfPlaceAdder(GateWithRegisters, cirq.ArithmeticGate):
     def on_classical_vals(
         self, *, a: 'ClassicalValT', b: 'ClassicalValT'
     ) -> Dict[str, 'ClassicalValT']:
-        return {'a': a, 'b': b, 'c': a + b}
+        c_bitsize = self.bitsize + 1
+        return {'a': a, 'b': b, 'c': classical_widen(a, c_bitsize) + classical_widen(b, c_bitsize)}
 
     def with_registers(self, *new_registers: Union[int, Sequence[int]]):
         raise NotImplementedError("no need to implement with_registers.")
@@ -397,10 +405,7 @@ class SimpleAddConstant(Bloq):
 
         # Get binary representation of k and split k into separate wires.
         k_split = bb.split(k)
-        if self.signed:
-            binary_rep = list(iter_bits_twos_complement(self.k, self.bitsize))
-        else:
-            binary_rep = list(iter_bits(self.k, self.bitsize))
+        binary_rep = ints_to_bits(self.k, self.bitsize, signed=self.signed)[0]
 
         # Apply XGates to qubits in k where the bitstring has value 1. Apply CNOTs when the gate is
         # controlled.
@@ -489,10 +494,11 @@ class AddConstantMod(GateWithRegisters, cirq.ArithmeticGate):
     def with_registers(self, *new_registers: Union[int, Sequence[int]]) -> "AddConstantMod":
         raise NotImplementedError()
 
-    def _classical_unctrled(self, target_val: int):
-        if target_val < self.mod:
-            return (target_val + self.add_val) % self.mod
-        return target_val
+    def _classical_unctrled(self, target_val: 'ClassicalValT') -> 'ClassicalValT':
+        target_val = classical_widen(target_val, self.bitsize + 1)
+        return classical_where(
+            target_val < self.mod, (target_val + self.add_val) % self.mod, target_val
+        )
 
     def apply(self, *args) -> Union[int, Iterable[int]]:
         target_val = args[-1]
@@ -503,15 +509,13 @@ class AddConstantMod(GateWithRegisters, cirq.ArithmeticGate):
         return ret
 
     def on_classical_vals(
-        self, *, x: int, ctrl: Optional[int] = None
+        self, *, x: 'ClassicalValT', ctrl: Optional['ClassicalValT'] = None
     ) -> Dict[str, 'ClassicalValT']:
         out = self._classical_unctrled(x)
         if self.cvs:
             assert ctrl is not None
-            if ctrl == int(''.join(str(x) for x in self.cvs), 2):
-                return {'ctrl': ctrl, 'x': out}
-            else:
-                return {'ctrl': ctrl, 'x': x}
+            is_active = ctrl == int(''.join(str(x) for x in self.cvs), 2)
+            return {'ctrl': ctrl, 'x': classical_where(is_active, out, x)}
 
         assert ctrl is None
         return {'x': out}
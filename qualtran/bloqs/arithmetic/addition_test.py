@@ -35,6 +35,7 @@ from qualtran.cirq_interop.testing import (
     GateHelper,
 )
 from qualtran.resource_counting.generalizers import ignore_split_join
+from qualtran.simulation.bit_parallel_classical_sim import call_bit_parallel
 from qualtran.simulation.classical_sim import (
     format_classical_truth_table,
     get_classical_truth_table,
@@ -210,6 +211,82 @@ def test_add_classical():
     assert ret1 == ret2
 
 
+def test_add_classical_vectorized():
+    a, b = np.meshgrid(np.arange(8), np.arange(8))
+    vals = Add(QUInt(3)).on_classical_vals(a=a, b=b)
+    np.testing.assert_array_equal(vals['b'], (a + b) % 8)
+    for x, y in zip(a.flat, b.flat):
+        assert Add(QUInt(3)).on_classical_vals(a=int(x), b=int(y))['b'] == (x + y) % 8
+
+    # Signed addition wraps around in two's complement.
+    a, b = np.meshgrid(np.arange(-4, 4), np.arange(-4, 4))
+    vals = Add(QInt(3)).on_classical_vals(a=a, b=b)
+    np.testing.assert_array_equal(vals['b'], (a + b + 4) % 8 - 4)
+    assert Add(QInt(3)).on_classical_vals(a=3, b=2)['b'] == -3
+    assert Add(QInt(3)).on_classical_vals(a=-4, b=-1)['b'] == 3
+
+    # Values that don't fit in 64 bits use object arrays.
+    a = np.array([2**99, 2**100 - 1], dtype=object)
+    assert list(Add(QUInt(100)).on_classical_vals(a=a, b=a)['b']) == [0, 2**100 - 2]
+    assert list(OutOfPlaceAdder(100).on_classical_vals(a=a, b=a)['c']) == [2**100, 2**101 - 2]
+
+    # Sums of numpy integers must not wrap around in the input dtype or turn into floats.
+    a = np.array([2**63 - 1, -5])
+    np.testing.assert_array_equal(Add(QInt(64)).on_classical_vals(a=a, b=a)['b'], [-2, -10])
+    a = np.array([200, 100], dtype=np.uint8)
+    np.testing.assert_array_equal(OutOfPlaceAdder(8).on_classical_vals(a=a, b=a)['c'], [400, 200])
+    c = OutOfPlaceAdder(64).call_classically(a=np.uint64(2**63), b=np.uint64(2**63))[2]
+    assert c == 2**64
+
+
+def test_add_constant_mod_classical_64_bit():
+    mod = 2**64 - 59
+    bloq = AddConstantMod(bitsize=64, mod=mod, add_val=2**63)
+    assert bloq.on_classical_vals(x=5)['x'] == 2**63 + 5
+    assert bloq.call_classically(x=mod + 1) == (mod + 1,)
+    x = np.array([5, 2**63, mod - 1, mod + 1], dtype=np.uint64)
+    vals = bloq.on_classical_vals(x=x)
+    assert list(vals['x']) == [2**63 + 5, 59, 2**63 - 1, mod + 1]
+
+
+@pytest.mark.parametrize('dtype', [QUInt(5), QInt(5), QUInt(24)])
+def test_add_bit_parallel(dtype):
+    rs = np.random.RandomState(52)
+    lo = -(2 ** (dtype.bitsize - 1)) if isinstance(dtype, QInt) else 0
+    a, b = rs.randint(lo, lo + 2**dtype.bitsize, size=(2, 2048))
+    bloq = Add(dtype)
+    out = call_bit_parallel(bloq, a=a, b=b)
+    np.testing.assert_array_equal(out['b'], bloq.on_classical_vals(a=a, b=b)['b'])
+
+    bloq = OutOfPlaceAdder(5)
+    a, b = np.meshgrid(np.arange(32), np.arange(32))
+    np.testing.assert_array_equal(call_bit_parallel(bloq, a=a, b=b)['c'], a + b)
+
+    bloq = SimpleAddConstant(bitsize=5, k=7, cvs=(1, 0), signed=False)
+    x = np.arange(32)
+    for ctrls in itertools.product([0, 1], repeat=2):
+        out = call_bit_parallel(bloq, ctrls=ctrls, x=x)
+        np.testing.assert_array_equal(out['x'], (x + 7 * (ctrls == (1, 0))) % 32)
+
+
+def test_add_constant_mod_classical_vectorized():
+    bloq = AddConstantMod(bitsize=4, mod=13, add_val=5, cvs=(1, 0))
+    x = np.arange(16)
+    for ctrl in range(4):
+        vals = bloq.on_classical_vals(x=x, ctrl=np.full(16, ctrl))
+        expected = [bloq.on_classical_vals(x=int(i), ctrl=ctrl)['x'] for i in x]
+        np.testing.assert_array_equal(vals['x'], expected)
+    assert bloq.on_classical_vals(x=12, ctrl=2)['x'] == 4
+    assert bloq.on_classical_vals(x=13, ctrl=2)['x'] == 13
+    assert bloq.on_classical_vals(x=12, ctrl=3)['x'] == 12
+
+    # Sums that don't fit in the input dtype don't wrap around.
+    bloq = AddConstantMod(bitsize=8, mod=251, add_val=200)
+    x = np.arange(256, dtype=np.uint8)
+    expected = [(i + 200) % 251 if i < 251 else i for i in range(256)]
+    np.testing.assert_array_equal(bloq.on_classical_vals(x=x)['x'], expected)
+
+
 @pytest.mark.parametrize('bitsize', [3])
 @pytest.mark.parametrize('mod', [5, 8])
 @pytest.mark.parametrize('add_val', [1, 2])
@@ -38,10 +38,10 @@ from qualtran._infra.quantum_graph import Soquet
 from qualtran.bloqs.basic_gates import CNOT, TGate, XGate
 from qualtran.bloqs.mcmt.and_bloq import And, MultiAnd
 from qualtran.bloqs.mcmt.multi_control_multi_target_pauli import MultiControlX
-from qualtran.cirq_interop.bit_tools import iter_bits
 from qualtran.cirq_interop.t_complexity_protocol import t_complexity, TComplexity
 from qualtran.drawing import WireSymbol
 from qualtran.drawing.musical_score import TextBox
+from qualtran.simulation.bit_packing import ints_to_bits
 
 if TYPE_CHECKING:
     from qualtran.resource_counting import BloqCountT, SympySymbolAllocator
@@ -72,7 +72,9 @@ class LessThanConstant(GateWithRegisters, cirq.ArithmeticGate):
         input_val, less_than_val, target_register_val = register_vals
         return input_val, less_than_val, target_register_val ^ (input_val < less_than_val)
 
-    def on_classical_vals(self, *, x: int, target: int) -> Dict[str, 'ClassicalValT']:
+    def on_classical_vals(
+        self, *, x: 'ClassicalValT', target: 'ClassicalValT'
+    ) -> Dict[str, 'ClassicalValT']:
         return {'x': x, 'target': target ^ (x < self.less_than_val)}
 
     def _circuit_diagram_info_(self, _) -> cirq.CircuitDiagramInfo:
@@ -119,7 +121,7 @@ class LessThanConstant(GateWithRegisters, cirq.ArithmeticGate):
         # Scan from left to right.
         # `are_equal` contains whether the numbers are equal so far.
         ancilla = context.qubit_manager.qalloc(self.bitsize)
-        for b, q, a in zip(iter_bits(self.less_than_val, self.bitsize), qubits, ancilla):
+        for b, q, a in zip(ints_to_bits(self.less_than_val, self.bitsize)[0], qubits, ancilla):
             if b:
                 yield cirq.X(q)
                 adjoint.append(cirq.X(q))
@@ -502,6 +504,7 @@ class GreaterThan(Bloq):
         b: n-bit-sized input registers.
         target: A single bit output register to store the result of A > B.
     """
+
     a_bitsize: int
     b_bitsize: int
 
@@ -511,6 +514,11 @@ class GreaterThan(Bloq):
             a=QUInt(self.a_bitsize), b=QUInt(self.b_bitsize), target=QBit()
         )
 
+    def on_classical_vals(
+        self, a: 'ClassicalValT', b: 'ClassicalValT', target: 'ClassicalValT'
+    ) -> Dict[str, 'ClassicalValT']:
+        return {'a': a, 'b': b, 'target': target ^ (a > b)}
+
     def short_name(self) -> str:
         return "a>b"
 
@@ -573,6 +581,7 @@ class LinearDepthGreaterThan(Bloq):
         [Halving the cost of quantum addition](https://arxiv.org/abs/1709.06648)
         [Improved quantum circuits for elliptic curve discrete logarithms](https://arxiv.org/abs/2306.08585)
     """
+
     bitsize: int
     signed: bool
 
@@ -586,12 +595,9 @@ class LinearDepthGreaterThan(Bloq):
         self, a: 'ClassicalValT', b: 'ClassicalValT', target: 'ClassicalValT'
     ) -> Dict[str, 'ClassicalValT']:
         # target is a 1-bit register so we assert that it's classical value is binary.
-        assert target == (target % 2)
+        assert np.all(target == (target % 2))
 
-        if a > b:
-            target = (target + 1) % 2
-
-        return {'a': a, 'b': b, 'target': target}
+        return {'a': a, 'b': b, 'target': target ^ (a > b)}
 
     def build_composite_bloq(
         self, bb: 'BloqBuilder', a: SoquetT, b: SoquetT, target: SoquetT
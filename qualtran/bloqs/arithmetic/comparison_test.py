@@ -36,6 +36,7 @@ from qualtran.cirq_interop.testing import (
     assert_circuit_inp_out_cirqsim,
     assert_decompose_is_consistent_with_t_complexity,
 )
+from qualtran.simulation.bit_parallel_classical_sim import call_bit_parallel
 
 
 def test_greater_than(bloq_autotester):
@@ -220,6 +221,40 @@ def test_classical_linear_depth_greater_than(bitsize, signed, a, b, target, resu
     assert bloq_classical[-1] == result
 
 
+def test_comparison_classical_vectorized():
+    x = np.arange(16)
+    target = np.arange(16) % 2
+    vals = LessThanConstant(4, 7).on_classical_vals(x=x, target=target)
+    np.testing.assert_array_equal(vals['target'], target ^ (x < 7))
+
+    a, b = np.meshgrid(np.arange(8), np.arange(8))
+    for bloq in [GreaterThan(3, 3), LinearDepthGreaterThan(3, signed=False)]:
+        for t in [0, 1]:
+            vals = bloq.on_classical_vals(a=a, b=b, target=np.full_like(a, t))
+            expected = [
+                bloq.call_classically(a=int(i), b=int(j), target=t)[-1]
+                for i, j in zip(a.flat, b.flat)
+            ]
+            np.testing.assert_array_equal(vals['target'].flat, expected)
+    assert GreaterThan(3, 3).call_classically(a=5, b=3, target=0) == (5, 3, 1)
+
+
+def test_comparison_bit_parallel():
+    x = np.arange(16)
+    for bloq in [LessThanConstant(4, 7), LessThanConstant(4, 16)]:
+        for target in [0, 1]:
+            out = call_bit_parallel(bloq, x=x, target=target)
+            np.testing.assert_array_equal(
+                out['target'], bloq.on_classical_vals(x=x, target=target)['target']
+            )
+
+    a, b = np.meshgrid(np.arange(16), np.arange(16))
+    bloq = LinearDepthGreaterThan(4, signed=False)
+    for target in [0, 1]:
+        out = call_bit_parallel(bloq, a=a, b=b, target=target)
+        np.testing.assert_array_equal(out['target'], target ^ (a > b))
+
+
 def test_greater_than_constant():
     bb = BloqBuilder()
     bitsize = 5
@@ -13,7 +13,7 @@
 #  limitations under the License.
 
 from functools import cached_property
-from typing import List, Set, TYPE_CHECKING
+from typing import Any, Dict, Iterator, List, Set, Tuple, TYPE_CHECKING
 
 import cirq
 from attrs import frozen
@@ -23,9 +23,11 @@ from qualtran import GateWithRegisters, QAny, QUInt, Register, Side, Signature
 from qualtran.bloqs.mcmt.and_bloq import And
 from qualtran.bloqs.util_bloqs import ArbitraryClifford
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
+from qualtran.simulation.classical_sim import classical_widen
 
 if TYPE_CHECKING:
     from qualtran.resource_counting import BloqCountT, SympySymbolAllocator
+    from qualtran.simulation.classical_sim import ClassicalValT
 
 
 @frozen
@@ -74,24 +76,34 @@ class HammingWeightCompute(GateWithRegisters):
             [cirq.CX(a, b), cirq.CX(a, out), cirq.CX(b, c)],
         ]
 
-    def _decompose_using_three_to_two_adders(
-        self, x: List[cirq.Qid], junk: List[cirq.Qid], out: List[cirq.Qid]
-    ) -> cirq.OP_TREE:
+    def _three_to_two_adder_network(
+        self, x: List[Any], junk: List[Any], out: List[Any]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yields `(a, b, c, anc)` for each three-to-two adder and `(ctrl, target)` for each CNOT."""
         for out_idx in range(len(out)):
             y = []
             for in_idx in range(0, len(x) - 2, 2):
                 a, b, c = x[in_idx], x[in_idx + 1], x[in_idx + 2]
                 anc = junk.pop()
                 y.append(anc)
-                yield self._three_to_two_adder(a, b, c, anc)
+                yield a, b, c, anc
             if len(x) % 2 == 1:
-                yield cirq.CNOT(x[-1], out[out_idx])
+                yield x[-1], out[out_idx]
             else:
                 anc = junk.pop()
-                yield self._three_to_two_adder(x[-2], x[-1], out[out_idx], anc)
+                yield x[-2], x[-1], out[out_idx], anc
                 y.append(anc)
             x = [*y]
 
+    def _decompose_using_three_to_two_adders(
+        self, x: List[cirq.Qid], junk: List[cirq.Qid], out: List[cirq.Qid]
+    ) -> cirq.OP_TREE:
+        for qubits in self._three_to_two_adder_network(x, junk, out):
+            if len(qubits) == 4:
+                yield self._three_to_two_adder(*qubits)
+            else:
+                yield cirq.CNOT(*qubits)
+
     def decompose_from_registers(
         self, *, context: cirq.DecompositionContext, **quregs: NDArray[cirq.Qid]
     ) -> cirq.OP_TREE:
@@ -102,6 +114,31 @@ class HammingWeightCompute(GateWithRegisters):
         out: List[cirq.Qid] = [*quregs['out'][::-1]]
         yield self._decompose_using_three_to_two_adders(x, junk, out)
 
+    def on_classical_vals(self, x: 'ClassicalValT') -> Dict[str, 'ClassicalValT']:
+        # Run the adders of the decomposition on (arrays of) bits. Like the decomposition, this
+        # leaves the carries in `junk` and partial sums in `x`.
+        regs = {reg.name: reg.bitsize for reg in self.signature}
+        # Inputs may be numpy unsigned scalars (e.g. from a `Join`), which don't support shifts.
+        x = classical_widen(x, self.bitsize)
+        bits = {('x', i): (x >> i) & 1 for i in range(regs['x'])}
+        bits.update({('junk', i): 0 for i in range(regs['junk'])})
+        bits.update({('out', i): 0 for i in range(regs['out'])})
+        for qubits in self._three_to_two_adder_network(
+            [('x', i) for i in range(regs['x'])],
+            [('junk', i) for i in range(regs['junk'])],
+            [('out', i) for i in range(regs['out'])],
+        ):
+            if len(qubits) == 4:
+                a, b, c, anc = (bits[q] for q in qubits)
+                bits[qubits[3]] = anc ^ (a & b) ^ (a & c) ^ (b & c)
+                bits[qubits[2]] = a ^ b ^ c
+            else:
+                bits[qubits[1]] ^= bits[qubits[0]]
+        return {
+            name: sum(bits[(name, i)] << i for i in range(bitsize))
+            for name, bitsize in regs.items()
+        }
+
     def _t_complexity_(self, adjoint: bool = False) -> TComplexity:
         and_t = And(uncompute=adjoint).t_complexity()
         junk_bitsize = self.bitsize - self.bitsize.bit_count()
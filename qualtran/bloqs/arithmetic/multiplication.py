@@ -31,6 +31,7 @@ from qualtran import (
 )
 from qualtran.bloqs.basic_gates import Toffoli
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
+from qualtran.simulation.classical_sim import classical_widen
 
 if TYPE_CHECKING:
     from qualtran import SoquetT
@@ -150,13 +151,13 @@ class Square(Bloq):
             ]
         )
 
-    def on_classical_vals(self, **vals: int) -> Dict[str, 'ClassicalValT']:
+    def on_classical_vals(self, **vals: 'ClassicalValT') -> Dict[str, 'ClassicalValT']:
+        a = vals["a"]
+        square = classical_widen(a, 2 * self.bitsize) ** 2
         if self.uncompute:
-            a, result = vals["a"], vals["result"]
-            assert result == a**2
+            assert np.all(vals["result"] == square)
             return {'a': a}
-        a = vals["a"]
-        return {'a': a, 'result': a**2}
+        return {'a': a, 'result': square}
 
     def short_name(self) -> str:
         return "a^2"
@@ -249,6 +250,17 @@ class SumOfSquares(Bloq):
             ]
         )
 
+    def on_classical_vals(
+        self, input: 'ClassicalValT'  # pylint: disable=redefined-builtin
+    ) -> Dict[str, 'ClassicalValT']:
+        # `input` has shape `(k,)`, or `(..., k)` for a batch of inputs.
+        result_bitsize = 2 * self.bitsize + (self.k - 1).bit_length()
+        vals = classical_widen(np.asarray(input), result_bitsize)
+        result = np.sum(vals**2, axis=-1)
+        if isinstance(result, np.generic):
+            result = result.item()
+        return {'input': input, 'result': result}
+
     def short_name(self) -> str:
         return "SOS"
 
@@ -316,6 +328,16 @@ class Product(Bloq):
             ]
         )
 
+    def on_classical_vals(
+        self, a: 'ClassicalValT', b: 'ClassicalValT'
+    ) -> Dict[str, 'ClassicalValT']:
+        result_bitsize = self.a_bitsize + self.b_bitsize
+        return {
+            'a': a,
+            'b': b,
+            'result': classical_widen(a, result_bitsize) * classical_widen(b, result_bitsize),
+        }
+
     def short_name(self) -> str:
         return "a*b"
 
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import cirq
+import numpy as np
 import pytest
 
 from qualtran import BloqBuilder, QUInt, Register
@@ -104,6 +105,40 @@ def test_product():
     cbloq.t_complexity()
 
 
+def test_multiplication_classical_vectorized():
+    a, b = np.meshgrid(np.arange(32), np.arange(8))
+    np.testing.assert_array_equal(Product(5, 3).on_classical_vals(a=a, b=b)['result'], a * b)
+    assert Product(5, 3).call_classically(a=31, b=7) == (31, 7, 217)
+
+    np.testing.assert_array_equal(Square(4).on_classical_vals(a=a)['result'], a**2)
+    assert Square(4, uncompute=True).on_classical_vals(a=a, result=a**2)['a'] is a
+
+    inputs = np.random.RandomState(52).randint(0, 256, size=(10, 4)).astype(np.uint8)
+    vals = SumOfSquares(8, 4).on_classical_vals(input=inputs)
+    np.testing.assert_array_equal(vals['result'], np.sum(inputs.astype(int) ** 2, axis=1))
+    assert SumOfSquares(8, 4).call_classically(input=inputs[0])[1] == vals['result'][0]
+    big = np.array([2**40, 2**40 - 1], dtype=object)
+    assert (
+        SumOfSquares(41, 2).on_classical_vals(input=big)['result'] == 2**80 + (2**40 - 1) ** 2
+    )
+
+
+def test_multiplication_classical_no_overflow():
+    a = np.array([255], dtype=np.uint8)
+    np.testing.assert_array_equal(Square(8).on_classical_vals(a=a)['result'], [255**2])
+    Square(8, uncompute=True).on_classical_vals(a=a, result=np.array([255**2]))
+    assert Square(8).call_classically(a=np.uint8(255)) == (255, 255**2)
+
+    big = np.array([2**40 - 1], dtype=np.uint64)
+    np.testing.assert_array_equal(
+        Square(40).on_classical_vals(a=big)['result'], [(2**40 - 1) ** 2]
+    )
+    vals = Product(40, 30).on_classical_vals(a=big, b=np.array([2**30 - 1], dtype=np.uint64))
+    assert vals['result'][0] == (2**40 - 1) * (2**30 - 1)
+    vals = Product(8, 8).on_classical_vals(a=a, b=a)
+    np.testing.assert_array_equal(vals['result'], [255 * 255])
+
+
 def test_scale_int_by_real():
     bb = BloqBuilder()
     q0 = bb.add_register('a', 15)
@@ -38,7 +38,7 @@ from qualtran import (
 )
 from qualtran.bloqs.util_bloqs import ArbitraryClifford
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
-from qualtran.simulation.classical_sim import ints_to_bits
+from qualtran.simulation.bit_packing import ints_to_bits
 
 if TYPE_CHECKING:
     import cirq
@@ -318,7 +318,7 @@ class _IntVector(Bloq):
         return {}
 
     def build_composite_bloq(self, bb: 'BloqBuilder', **val: 'SoquetT') -> Dict[str, 'SoquetT']:
-        bits = ints_to_bits(np.array([self.val]), w=self.bitsize)[0]
+        bits = ints_to_bits(self.val, w=self.bitsize)[0]
         if self.state:
             assert not val
             return self._build_composite_state(bb, bits)
@@ -335,7 +335,7 @@ class _IntVector(Bloq):
         outgoing: Dict[str, SoquetT],
     ):
         data = np.zeros(2**self.bitsize).reshape((2,) * self.bitsize)
-        bitstring = ints_to_bits(np.array([self.val]), w=self.bitsize)[0]
+        bitstring = ints_to_bits(self.val, w=self.bitsize)[0]
         data[tuple(bitstring)] = 1
         data = data.reshape(-1)
 
@@ -14,5 +14,7 @@
 
 """Bloqs to load classical data in a quantum register"""
 
+from qualtran.bloqs.data_loading.hashable_array import HashableArray
 from qualtran.bloqs.data_loading.qrom import QROM
 from qualtran.bloqs.data_loading.select_swap_qrom import SelectSwapQROM
+from qualtran.bloqs.data_loading.symbolic_qrom import SymbolicQROM, SymbolicSelectSwapQROM
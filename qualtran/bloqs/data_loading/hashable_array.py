@@ -0,0 +1,114 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Read-only numpy arrays that can be hashed and compared in constant time."""
+
+import hashlib
+import os
+from functools import cached_property
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+_CHUNK_SIZE = 1 << 20
+
+
+def as_readonly_array(data: Union[ArrayLike, 'HashableArray']) -> NDArray:
+    """Convert `data` to a read-only numpy array.
+
+    Arrays (including memory-mapped ones) that are already read-only are used as is, without
+    making a copy. Writeable arrays are copied so that later changes to them cannot go unnoticed.
+    """
+    if isinstance(data, HashableArray):
+        return data.array
+    arr = np.asarray(data)
+    if arr.flags.writeable:
+        arr = arr.copy()
+        arr.setflags(write=False)
+    return arr
+
+
+class HashableArray:
+    """A read-only numpy array which is hashed and compared by a digest of its contents.
+
+    The blake2 digest of the array is computed once, the first time it is needed, so that
+    bloqs holding large data tables can be hashed, compared and used as cache keys without
+    converting their data to tuples of python integers.
+
+    Integer arrays with the same values compare equal regardless of their integer dtype. Arrays
+    of any other dtype (including booleans) only compare equal to arrays of the same dtype.
+
+    Args:
+        data: The array to wrap. See `as_readonly_array` for when this makes a copy.
+    """
+
+    def __init__(self, data: Union[ArrayLike, 'HashableArray']):
+        self._array = as_readonly_array(data)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True) -> 'HashableArray':
+        """Load an array from a `.npy` file, memory-mapping it (read-only) by default."""
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    @property
+    def array(self) -> NDArray:
+        return self._array
+
+    @property
+    def shape(self):
+        return self._array.shape
+
+    @cached_property
+    def digest(self) -> bytes:
+        arr = self._array
+        h = hashlib.blake2b(digest_size=16)
+        if arr.dtype.kind in 'iu':
+            # Normalize the dtype so that e.g. int32 and int64 arrays hash the same. Unsigned
+            # values that do not fit in an int64 are tagged separately, so that they do not
+            # collide with the negative values that share their bit pattern.
+            if arr.dtype == np.uint64 and arr.size and arr.max() >= 2**63:
+                h.update(b'uint')
+                dtype: np.dtype = np.dtype(np.uint64)
+            else:
+                h.update(b'int')
+                dtype = np.dtype(np.int64)
+        else:
+            h.update(arr.dtype.str.encode())
+            dtype = arr.dtype
+        h.update(repr(arr.shape).encode())
+        flat = arr.reshape(-1)
+        for i in range(0, flat.size, _CHUNK_SIZE):
+            chunk = flat[i : i + _CHUNK_SIZE]
+            if dtype == np.object_:
+                h.update(repr(chunk.tolist()).encode())
+            else:
+                h.update(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+        return h.digest()
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __eq__(self, other):
+        if not isinstance(other, HashableArray):
+            return NotImplemented
+        return self.shape == other.shape and self.digest == other.digest
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is None:
+            return np.asarray(self._array, dtype=dtype)
+        return np.array(self._array, dtype=dtype, copy=copy)
+
+    def __repr__(self):
+        return f'HashableArray({self._array!r})'
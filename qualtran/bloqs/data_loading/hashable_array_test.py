@@ -0,0 +1,77 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+
+from qualtran.bloqs.data_loading.hashable_array import as_readonly_array, HashableArray
+
+
+def test_as_readonly_array_copies_writeable_arrays():
+    arr = np.arange(10)
+    ro = as_readonly_array(arr)
+    assert not ro.flags.writeable
+    assert arr.flags.writeable
+    arr[0] = 5
+    assert ro[0] == 0
+    with pytest.raises(ValueError):
+        ro[0] = 1
+
+    # Read-only arrays are not copied.
+    assert as_readonly_array(ro) is ro
+    assert as_readonly_array(HashableArray(ro)) is ro
+
+
+def test_hashable_array_eq():
+    a = HashableArray(np.arange(12))
+    assert a == HashableArray(list(range(12)))
+    assert a == HashableArray(np.arange(12, dtype=np.int32))
+    assert hash(a) == hash(HashableArray(np.arange(12, dtype=np.int32)))
+    assert a != HashableArray(np.arange(12).reshape(3, 4))
+    assert a != HashableArray(np.arange(1, 13))
+    assert a != HashableArray(np.arange(12, dtype=float))
+    assert len({a, HashableArray(np.arange(12)), HashableArray(np.arange(11))}) == 2
+    np.testing.assert_array_equal(np.asarray(a), np.arange(12))
+    big = np.array([2**70, 1], dtype=object)
+    assert HashableArray(big) == HashableArray(big.copy())
+    assert HashableArray(big) != HashableArray(np.array([2**70, 2], dtype=object))
+
+
+def test_hashable_array_eq_signedness_and_kind():
+    assert HashableArray(np.array([-1])) != HashableArray(np.array([2**64 - 1], dtype=np.uint64))
+    assert HashableArray(np.array([2**64 - 1], dtype=np.uint64)) == HashableArray(
+        np.array([2**64 - 1], dtype=np.uint64)
+    )
+    assert HashableArray(np.array([3], dtype=np.uint64)) == HashableArray(np.array([3]))
+    assert HashableArray(np.array([True])) != HashableArray(np.array([1]))
+    assert HashableArray(np.array([True])) == HashableArray(np.array([True]))
+
+
+def test_hashable_array_array_protocol():
+    a = HashableArray(np.arange(4))
+    assert np.asarray(a) is a.array
+    assert np.shares_memory(np.array(a, copy=False), a.array)
+    copied = np.array(a, copy=True)
+    assert not np.shares_memory(copied, a.array)
+    np.testing.assert_array_equal(np.asarray(a, dtype=float), np.arange(4.0))
+
+
+def test_hashable_array_load(tmp_path):
+    path = tmp_path / 'data.npy'
+    np.save(path, np.arange(100).reshape(10, 10))
+    a = HashableArray.load(path)
+    assert not a.array.flags.owndata
+    assert not a.array.flags.writeable
+    assert a == HashableArray(np.arange(100).reshape(10, 10))
+    assert HashableArray.load(path, mmap=False) == a
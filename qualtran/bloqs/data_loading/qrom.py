@@ -25,13 +25,30 @@ from numpy.typing import ArrayLike, NDArray
 from qualtran import bloq_example, BloqDocSpec, BoundedQUInt, QAny, Register, Soquet
 from qualtran._infra.gate_with_registers import merge_qubits, total_bits
 from qualtran.bloqs.basic_gates import CNOT
+from qualtran.bloqs.data_loading.hashable_array import as_readonly_array, HashableArray
 from qualtran.bloqs.mcmt.and_bloq import And, MultiAnd
 from qualtran.bloqs.multiplexers.unary_iteration_bloq import UnaryIterationGate
 from qualtran.drawing import Circle, TextBox, WireSymbol
 from qualtran.resource_counting import BloqCountT
+from qualtran.simulation.bit_packing import ints_to_bits
 from qualtran.simulation.classical_sim import ClassicalValT
 
 
+def _data_converter(data: Sequence[ArrayLike]) -> Tuple[NDArray, ...]:
+    return tuple(as_readonly_array(d) for d in data)
+
+
+def _popcount(data: NDArray) -> NDArray[np.int64]:
+    """Element-wise number of set bits in the absolute value of integer `data`."""
+    if data.dtype.kind not in 'iu':
+        return np.vectorize(lambda x: int(x).bit_count(), otypes=[np.int64])(data)
+    as_bytes = np.abs(data).astype(np.uint64).view(np.uint8).reshape(data.shape + (8,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
 @cirq.value_equality()
 @attrs.frozen
 class QROM(UnaryIterationGate):
@@ -48,7 +65,9 @@ class QROM(UnaryIterationGate):
             of this list is greater than one then we use the same selection indices
             to load each dataset (for example, to load alt and keep data for
             state preparation). Each data set is required to have the same
-            shape and to be of integer type.
+            shape and to be of integer type. The data is stored as read-only arrays;
+            read-only inputs, like tables memory-mapped with `HashableArray.load`, are not
+            copied.
         selection_bitsizes: The number of bits used to represent each selection register
             corresponding to the size of each dimension of the array. Should be
             the same length as the shape of each of the datasets.
@@ -65,14 +84,14 @@ class QROM(UnaryIterationGate):
             Babbush et. al. (2020). Figure 3.
     """
 
-    data: Sequence[NDArray]
+    data: Tuple[NDArray, ...] = attrs.field(converter=_data_converter)
     selection_bitsizes: Tuple[int, ...]
     target_bitsizes: Tuple[int, ...]
     num_controls: int = 0
 
     @classmethod
     def build(cls, *data: ArrayLike, num_controls: int = 0) -> 'QROM':
-        _data = [np.array(d, dtype=int) for d in data]
+        _data = [np.asarray(d, dtype=int) for d in data]
         selection_bitsizes = tuple((s - 1).bit_length() for s in _data[0].shape)
         target_bitsizes = tuple(max(int(np.max(d)).bit_length(), 1) for d in data)
         return QROM(
@@ -126,9 +145,9 @@ class QROM(UnaryIterationGate):
     ) -> cirq.OP_TREE:
         for i, d in enumerate(self.data):
             target = target_regs.get(f'target{i}_', ())
-            for q, bit in zip(target, f'{int(d[selection_idx]):0{len(target)}b}'):
-                if int(bit):
-                    yield gate(q)
+            bits = ints_to_bits(d[selection_idx], len(target))[0]
+            for q in np.asarray(target)[bits.astype(bool)]:
+                yield gate(q)
 
     def decompose_zero_selection(
         self, context: cirq.DecompositionContext, **quregs: NDArray[cirq.Qid]
@@ -155,14 +174,52 @@ class QROM(UnaryIterationGate):
             yield cirq.inverse(multi_controlled_and)
             context.qubit_manager.qfree(list(junk.flatten()) + [and_target])
 
+    @cached_property
+    def _run_ends(self) -> Tuple[NDArray[np.intp], ...]:
+        """For each nested selection loop, the end of the run of identical data at each index.
+
+        `self._run_ends[i][prefix + (l,)]` is the largest `r` such that all of
+        `data[prefix][l:r]` are equal, for every dataset, where `prefix` has `i` elements.
+        It is `l` if the data `data[prefix + (l,)]` is itself not a constant block.
+        """
+        shape = self.data[0].shape
+        run_ends = []
+        for i, n in enumerate(shape):
+            # Blocks of data for each `prefix + (j,)`, flattened across datasets.
+            blocks = np.stack(
+                [d.reshape(shape[: i + 1] + (-1,)) for d in self.data], axis=-2
+            ).reshape(shape[: i + 1] + (len(self.data), -1))
+            first = blocks[..., :1]
+            is_const = np.all(blocks == first, axis=(-2, -1))
+            same_as_next = (
+                is_const[..., :-1]
+                & is_const[..., 1:]
+                & np.all(first[..., :-1, :, :] == first[..., 1:, :, :], axis=(-2, -1))
+            )
+            # The index of the last block in the run of identical blocks starting at each index.
+            idx = np.broadcast_to(np.arange(n), is_const.shape)
+            last = np.where(
+                np.concatenate([~same_as_next, np.ones_like(is_const[..., :1])], -1), idx, n
+            )
+            last = np.flip(np.minimum.accumulate(np.flip(last, axis=-1), axis=-1), axis=-1)
+            run_ends.append(np.where(is_const, last + 1, idx))
+        return tuple(run_ends)
+
+    @cached_property
+    def _num_cnots(self) -> NDArray[np.int64]:
+        """The number of CNOTs needed to load the data at each selection index."""
+        return sum(_popcount(d) for d in self.data)
+
     def _break_early(self, selection_index_prefix: Tuple[int, ...], l: int, r: int):
-        for data in self.data:
-            data_l_r_flat = data[selection_index_prefix][l:r].flat
-            unique_element = data_l_r_flat[0]
-            for x in data_l_r_flat:
-                if x != unique_element:
-                    return False
-        return True
+        run_ends = self._run_ends[len(selection_index_prefix)]
+        return bool(run_ends[selection_index_prefix + (l,)] >= min(r, run_ends.shape[-1]))
+
+    def _break_early_batch(
+        self, selection_index_prefixes: NDArray[np.intp], l: NDArray[np.intp], r: NDArray[np.intp]
+    ) -> NDArray[np.bool_]:
+        run_ends = self._run_ends[selection_index_prefixes.shape[1]]
+        run_ends = run_ends[tuple(selection_index_prefixes.T)].reshape(-1, run_ends.shape[-1])
+        return run_ends[:, l] >= np.minimum(r, run_ends.shape[-1])
 
     def nth_operation(
         self, context: cirq.DecompositionContext, control: cirq.Qid, **kwargs
@@ -223,13 +280,25 @@ class QROM(UnaryIterationGate):
             return self
         return NotImplemented  # pragma: no cover
 
+    @cached_property
+    def _hashable_data(self) -> Tuple[HashableArray, ...]:
+        return tuple(HashableArray(d) for d in self.data)
+
     def _value_equality_values_(self):
-        data_tuple = tuple(tuple(d.flatten()) for d in self.data)
-        return (self.selection_registers, self.target_registers, self.control_registers, data_tuple)
+        return (
+            self.selection_registers,
+            self.target_registers,
+            self.control_registers,
+            self._hashable_data,
+        )
 
     def nth_operation_callgraph(self, **kwargs: int) -> Set['BloqCountT']:
         selection_idx = tuple(kwargs[reg.name] for reg in self.selection_registers)
-        return {(CNOT(), sum(int(d[selection_idx]).bit_count() for d in self.data))}
+        return {(CNOT(), int(self._num_cnots[selection_idx]))}
+
+    def nth_operation_callgraph_batch(self, **kwargs: NDArray[np.intp]) -> Set['BloqCountT']:
+        selection_idxs = tuple(kwargs[reg.name] for reg in self.selection_registers)
+        return {(CNOT(), int(self._num_cnots[selection_idxs].sum()))}
 
 
 @bloq_example
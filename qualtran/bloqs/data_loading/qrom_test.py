@@ -20,6 +20,7 @@ import pytest
 
 from qualtran._infra.gate_with_registers import split_qubits, total_bits
 from qualtran.bloqs.basic_gates import CNOT, TGate
+from qualtran.bloqs.data_loading.hashable_array import HashableArray
 from qualtran.bloqs.data_loading.qrom import _qrom_multi_data, _qrom_multi_dim, _qrom_small, QROM
 from qualtran.cirq_interop.bit_tools import iter_bits
 from qualtran.cirq_interop.t_complexity_protocol import t_complexity
@@ -412,3 +413,55 @@ def test_qrom_call_graph_matches_decomposition(num_controls):
     _, sigma_dcmp = qrom.decompose_bloq().call_graph(generalizer=cirq_to_bloqs)
     assert sigma_call[TGate()] == sigma_dcmp[TGate()]
     assert sigma_call[CNOT()] == sigma_dcmp[CNOT()]
+
+
+def _brute_force_break_early(data, selection_index_prefix, l, r):
+    for d in data:
+        flat = d[selection_index_prefix][l:r].flatten()
+        if np.any(flat != flat[0]):
+            return False
+    return True
+
+
+@pytest.mark.parametrize(
+    "shape,n_data", [((16,), 1), ((13,), 2), ((4, 8), 1), ((3, 5), 2), ((4, 2, 4), 2)]
+)
+def test_qrom_break_early_matches_brute_force(shape, n_data):
+    rs = np.random.RandomState(1234)
+    # Few distinct values, so that there are long runs of identical entries.
+    data = [np.sort(rs.randint(0, 3, size=shape), axis=None).reshape(shape)] * n_data
+    data[-1] = 2 * data[-1]
+    data.append(rs.randint(0, 2, size=shape) * (rs.rand(*shape) < 0.2))
+    qrom = QROM.build(*data)
+    for idx in itertools.product(*[range(s) for s in shape]):
+        for i, n in enumerate(shape):
+            prefix, l = idx[:i], idx[i]
+            for r in range(l + 1, n + 1):
+                assert qrom._break_early(prefix, l, r) == _brute_force_break_early(
+                    data, prefix, l, r
+                )
+
+
+def test_qrom_num_cnots():
+    data = [np.array([0, 1, 3, 2**40 - 1, 7]), np.array([5, 0, 0, 1, 2])]
+    qrom = QROM.build(*data)
+    np.testing.assert_array_equal(qrom._num_cnots, [2, 1, 2, 41, 4])
+    assert qrom.nth_operation_callgraph(selection=3) == {(CNOT(), 41)}
+
+
+def test_qrom_equality_uses_data_digest():
+    data = np.arange(1000) % 7
+    qrom = QROM.build(data)
+    assert qrom == QROM.build(list(data))
+    assert hash(qrom) == hash(QROM.build(data.astype(np.int32)))
+    assert qrom != QROM.build(np.roll(data, 1))
+    assert not qrom.data[0].flags.writeable
+
+
+def test_qrom_from_memory_mapped_data(tmp_path):
+    path = tmp_path / 'data.npy'
+    np.save(path, np.arange(16))
+    data = HashableArray.load(path)
+    qrom = QROM.build(data)
+    assert qrom.data[0] is data.array
+    assert qrom == QROM.build(np.arange(16))
@@ -17,10 +17,11 @@ from typing import List, Optional, Sequence, Tuple
 
 import cirq
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
 
 from qualtran import BoundedQUInt, GateWithRegisters, QAny, Register, Signature, Soquet
 from qualtran._infra.gate_with_registers import merge_qubits, split_qubits, total_bits
+from qualtran.bloqs.data_loading.hashable_array import as_readonly_array, HashableArray
 from qualtran.bloqs.data_loading.qrom import QROM
 from qualtran.bloqs.swap_network import SwapWithZero
 from qualtran.drawing import Circle, TextBox, WireSymbol
@@ -90,7 +91,7 @@ class SelectSwapQROM(GateWithRegisters):
 
     def __init__(
         self,
-        *data: Sequence[int],
+        *data: ArrayLike,
         target_bitsizes: Optional[Sequence[int]] = None,
         block_size: Optional[int] = None,
     ):
@@ -109,7 +110,8 @@ class SelectSwapQROM(GateWithRegisters):
 
         Args:
             data: Sequence of integers to load in the target register. If more than one sequence
-                is provided, each sequence must be of the same length.
+                is provided, each sequence must be of the same length. The data is stored as
+                read-only arrays; read-only inputs are not copied.
             target_bitsizes: Sequence of integers describing the size of target register for each
                 data sequence to load. Defaults to `max(data[i]).bit_length()` for each i.
             block_size(B): Load batches of `B` data elements in each iteration of traditional QROM
@@ -121,12 +123,13 @@ class SelectSwapQROM(GateWithRegisters):
             ValueError: If all target data sequences to load do not have the same length.
         """
         # Validate input.
+        data = tuple(as_readonly_array(d) for d in data)
         if len(set(len(d) for d in data)) != 1:
             raise ValueError("All data sequences to load must be of equal length.")
         if target_bitsizes is None:
-            target_bitsizes = [max(d).bit_length() for d in data]
+            target_bitsizes = [int(np.max(d)).bit_length() for d in data]
         assert len(target_bitsizes) == len(data)
-        assert all(t >= max(d).bit_length() for t, d in zip(target_bitsizes, data))
+        assert all(t >= int(np.max(d)).bit_length() for t, d in zip(target_bitsizes, data))
         self._num_sequences = len(data)
         self._target_bitsizes = tuple(target_bitsizes)
         self._iteration_length = len(data[0])
@@ -139,7 +142,7 @@ class SelectSwapQROM(GateWithRegisters):
         self.selection_q, self.selection_r = tuple(
             (L - 1).bit_length() for L in [self.num_blocks, self.block_size]
         )
-        self._data = tuple(tuple(d) for d in data)
+        self._data = data
 
     @cached_property
     def selection_registers(self) -> Tuple[Register, ...]:
@@ -163,9 +166,17 @@ class SelectSwapQROM(GateWithRegisters):
         return Signature([*self.selection_registers, *self.target_registers])
 
     @property
-    def data(self) -> Tuple[Tuple[int, ...], ...]:
+    def data(self) -> Tuple[NDArray, ...]:
         return self._data
 
+    @cached_property
+    def _hashable_data(self) -> Tuple[HashableArray, ...]:
+        return tuple(HashableArray(d) for d in self.data)
+
+    @property
+    def target_bitsizes(self) -> Tuple[int, ...]:
+        return self._target_bitsizes
+
     @property
     def block_size(self) -> int:
         return self._block_size
@@ -193,9 +204,11 @@ class SelectSwapQROM(GateWithRegisters):
                 ordered_target_qubits.extend(context.qubit_manager.qborrow(target_bitsize))
                 data_for_current_block = data[block_id :: self.block_size]
                 if len(data_for_current_block) < self.num_blocks:
-                    zero_pad = (0,) * (self.num_blocks - len(data_for_current_block))
-                    data_for_current_block = data_for_current_block + zero_pad
-                qrom_data.append(np.array(data_for_current_block))
+                    zero_pad = np.zeros(
+                        self.num_blocks - len(data_for_current_block), dtype=data.dtype
+                    )
+                    data_for_current_block = np.concatenate([data_for_current_block, zero_pad])
+                qrom_data.append(data_for_current_block)
                 qrom_target_bitsizes.append(target_bitsize)
         # Construct QROM, SwapWithZero and CX operations using the batched data and qubits.
         k = (self.block_size - 1).bit_length()
@@ -254,4 +267,4 @@ class SelectSwapQROM(GateWithRegisters):
         return 'QROAM'
 
     def _value_equality_values_(self):
-        return self.block_size, self._target_bitsizes, self.data
+        return self.block_size, self._target_bitsizes, self._hashable_data
@@ -120,6 +120,9 @@ def test_qroam_hashable():
     qrom = SelectSwapQROM([1, 2, 5, 6, 7, 8])
     assert hash(qrom) is not None
     assert t_complexity(qrom) == TComplexity(32, 160, 0)
+    assert qrom == SelectSwapQROM(np.array([1, 2, 5, 6, 7, 8]))
+    assert hash(qrom) == hash(SelectSwapQROM(np.array([1, 2, 5, 6, 7, 8])))
+    assert qrom != SelectSwapQROM([1, 2, 5, 6, 7, 9])
 
 
 def test_qroam_many_registers():
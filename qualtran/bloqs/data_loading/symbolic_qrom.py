@@ -0,0 +1,299 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Data-free QROM bloqs for resource estimation at scale."""
+
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import attrs
+import numpy as np
+import sympy
+from attrs import frozen
+
+from qualtran import Bloq, bloq_example, BloqDocSpec, BoundedQUInt, QAny, Register, Signature
+from qualtran.bloqs.basic_gates import CNOT, XGate
+from qualtran.bloqs.mcmt.and_bloq import And, MultiAnd
+from qualtran.bloqs.swap_network.cswap_approx import CSwapApprox
+from qualtran.resource_counting.symbolic_counting_utils import ceil, log2, SymbolicInt
+
+if TYPE_CHECKING:
+    from qualtran.bloqs.data_loading.qrom import QROM
+    from qualtran.bloqs.data_loading.select_swap_qrom import SelectSwapQROM
+    from qualtran.resource_counting import BloqCountT, SympySymbolAllocator
+
+
+def _is_symbolic(*args) -> bool:
+    return any(isinstance(arg, sympy.Basic) for arg in args)
+
+
+def _prod(args: Tuple[SymbolicInt, ...]) -> SymbolicInt:
+    ret: SymbolicInt = 1
+    for arg in args:
+        ret = ret * arg
+    return ret
+
+
+def _index_bitsize(n: SymbolicInt) -> SymbolicInt:
+    """The number of bits needed to store the integers in `range(n)`."""
+    if _is_symbolic(n):
+        return ceil(log2(n))
+    return (int(n) - 1).bit_length()
+
+
+def _to_tuple(v) -> tuple:
+    return tuple(v) if isinstance(v, (tuple, list, np.ndarray)) else (v,)
+
+
+@frozen
+class SymbolicQROM(Bloq):
+    """A `QROM` described only by the shape of its data and the size of its entries.
+
+    The call graph matches the unary iteration circuit of `QROM` without constructing it, so
+    the data sizes can be symbolic or too large to materialize.
+
+    The And gates are counted assuming that consecutive data entries differ, i.e. without the
+    "variable-spaced" QROM optimization. This is exact for generic data and an upper bound
+    otherwise. The CNOTs loading the data into the target registers are given by `num_ones`,
+    the total number of set bits across all data entries; if it isn't known, every bit of every
+    entry is assumed to be set.
+
+    Args:
+        data_shape: The shape of each of the datasets.
+        target_bitsizes: The number of bits of the target register of each dataset.
+        num_controls: The number of control qubits.
+        num_ones: The total number of set bits in all the entries of all the datasets. Defaults
+            to the upper bound `prod(data_shape) * sum(target_bitsizes)`.
+
+    Registers:
+        control: The control register, if `num_controls > 0`.
+        selection{i}: One selection register for each dimension of the data.
+        target{i}_: One target register for each dataset.
+    """
+
+    data_shape: Tuple[SymbolicInt, ...] = attrs.field(converter=_to_tuple)
+    target_bitsizes: Tuple[SymbolicInt, ...] = attrs.field(converter=_to_tuple)
+    num_controls: int = 0
+    num_ones: Optional[SymbolicInt] = None
+
+    @classmethod
+    def from_qrom(cls, qrom: 'QROM') -> 'SymbolicQROM':
+        """The data-free version of `qrom`, with the exact number of set bits of its data."""
+        return cls(
+            data_shape=qrom.data[0].shape,
+            target_bitsizes=qrom.target_bitsizes,
+            num_controls=qrom.num_controls,
+            num_ones=int(qrom._num_cnots.sum()),
+        )
+
+    @cached_property
+    def selection_bitsizes(self) -> Tuple[SymbolicInt, ...]:
+        return tuple(_index_bitsize(n) for n in self.data_shape)
+
+    @cached_property
+    def signature(self) -> Signature:
+        regs = []
+        if self.num_controls:
+            regs.append(Register('control', QAny(self.num_controls)))
+        types = [
+            BoundedQUInt(sb, n)
+            for n, sb in zip(self.data_shape, self.selection_bitsizes)
+            if _is_symbolic(sb) or sb > 0
+        ]
+        if len(types) == 1:
+            regs.append(Register('selection', types[0]))
+        else:
+            regs.extend(Register(f'selection{i}', dtype) for i, dtype in enumerate(types))
+        regs.extend(
+            Register(f'target{i}_', QAny(b))
+            for i, b in enumerate(self.target_bitsizes)
+            if _is_symbolic(b) or b
+        )
+        return Signature(regs)
+
+    @cached_property
+    def n_entries(self) -> SymbolicInt:
+        """The number of entries in each dataset."""
+        return _prod(self.data_shape)
+
+    def build_call_graph(self, ssa: 'SympySymbolAllocator') -> Set['BloqCountT']:
+        # Each nested unary iteration over `n_i` indices, for each of the `prod(n_j for j < i)`
+        # iterations of its parent loops, has `n_i - 1` internal nodes that need an And gate.
+        # The telescoping sum is `prod(n_i) - 1`. Without controls, the root of the outermost
+        # loop is controlled by the selection qubit itself, using X gates instead of an And.
+        num_ands = self.n_entries - 1
+        num_ones = self.num_ones
+        if num_ones is None:
+            num_ones = self.n_entries * sum(self.target_bitsizes)
+        counts: Dict[Bloq, SymbolicInt] = defaultdict(lambda: 0)
+        single_entry = not _is_symbolic(self.n_entries) and self.n_entries == 1
+        if self.num_controls == 0:
+            if single_entry:
+                # A single entry is loaded unconditionally, with X gates instead of CNOTs.
+                counts[XGate()] += num_ones
+                return set(counts.items())
+            num_ands = num_ands - 1
+            counts[XGate()] += 2
+        elif self.num_controls == 2:
+            counts[And(1, 1)] += 1
+            counts[And(1, 1).adjoint()] += 1
+        elif self.num_controls > 2:
+            multi_and = MultiAnd(cvs=(1,) * self.num_controls)
+            counts[multi_and] += 1
+            counts[multi_and.adjoint()] += 1
+        if not single_entry:
+            counts[And(1, 0)] += num_ands
+            counts[And().adjoint()] += num_ands
+        counts[CNOT()] += num_ands + num_ones
+        return set(counts.items())
+
+    def adjoint(self) -> 'Bloq':
+        return self
+
+    def short_name(self) -> str:
+        return 'QROM'
+
+
+@frozen
+class SymbolicSelectSwapQROM(Bloq):
+    """A `SelectSwapQROM` described only by the size of its data and its entries.
+
+    The call graph matches the decomposition of `SelectSwapQROM` into two `SymbolicQROM`s,
+    four layers of controlled swaps and the CNOTs into the target registers. See `SymbolicQROM`
+    for when the counts are exact or an upper bound.
+
+    Args:
+        data_size: The number of entries in each of the datasets.
+        target_bitsizes: The number of bits of the target register of each dataset.
+        block_size: The number of entries loaded at once by the QROM. Defaults to the optimal
+            block size for concrete sizes and to the smallest power of two that is at least
+            `sqrt(data_size / sum(target_bitsizes))` for symbolic ones.
+        num_ones: The total number of set bits in all the entries of all the datasets. Defaults
+            to the upper bound `data_size * sum(target_bitsizes)`.
+
+    Registers:
+        selection: The selection register.
+        target{i}_: One target register for each dataset.
+    """
+
+    data_size: SymbolicInt
+    target_bitsizes: Tuple[SymbolicInt, ...] = attrs.field(converter=_to_tuple)
+    block_size: SymbolicInt = attrs.field()
+    num_ones: Optional[SymbolicInt] = None
+
+    @block_size.default
+    def _default_block_size(self) -> SymbolicInt:
+        from qualtran.bloqs.data_loading.select_swap_qrom import find_optimal_log_block_size
+
+        target_bitsize = sum(self.target_bitsizes)
+        if _is_symbolic(self.data_size, target_bitsize):
+            return 2 ** sympy.Max(0, sympy.ceiling(log2(self.data_size / target_bitsize) / 2))
+        return 2 ** find_optimal_log_block_size(self.data_size, target_bitsize)
+
+    @classmethod
+    def from_select_swap_qrom(cls, qrom: 'SelectSwapQROM') -> 'SymbolicSelectSwapQROM':
+        """The data-free version of `qrom`, with the exact number of set bits of its data."""
+        from qualtran.bloqs.data_loading.qrom import _popcount
+
+        return cls(
+            data_size=len(qrom.data[0]),
+            target_bitsizes=tuple(reg.bitsize for reg in qrom.target_registers),
+            block_size=qrom.block_size,
+            num_ones=int(sum(_popcount(d).sum() for d in qrom.data)),
+        )
+
+    @cached_property
+    def num_blocks(self) -> SymbolicInt:
+        if _is_symbolic(self.data_size, self.block_size):
+            return sympy.ceiling(self.data_size / self.block_size)
+        return -(-self.data_size // self.block_size)
+
+    @cached_property
+    def signature(self) -> Signature:
+        selection_bitsize = _index_bitsize(self.num_blocks) + _index_bitsize(self.block_size)
+        return Signature(
+            [
+                Register('selection', BoundedQUInt(selection_bitsize, self.data_size)),
+                *(
+                    Register(f'target{i}_', QAny(b))
+                    for i, b in enumerate(self.target_bitsizes)
+                    if _is_symbolic(b) or b
+                ),
+            ]
+        )
+
+    def build_call_graph(self, ssa: 'SympySymbolAllocator') -> Set['BloqCountT']:
+        target_bitsize = sum(self.target_bitsizes)
+        # The QROM loads `block_size` entries of each dataset at once, padded with zeros.
+        if _is_symbolic(self.block_size):
+            qrom_target_bitsizes = (self.block_size * target_bitsize,)
+        else:
+            qrom_target_bitsizes = self.target_bitsizes * int(self.block_size)
+        num_ones = self.num_ones
+        if num_ones is None:
+            num_ones = self.data_size * target_bitsize
+        qrom = SymbolicQROM(
+            data_shape=(self.num_blocks,), target_bitsizes=qrom_target_bitsizes, num_ones=num_ones
+        )
+        counts = {qrom: 2, CNOT(): 2 * target_bitsize}
+        # `SwapWithZero` on `block_size` registers uses `block_size - 1` controlled swaps.
+        num_swaps = 4 * (self.block_size - 1)
+        if _is_symbolic(num_swaps) or num_swaps > 0:
+            counts[CSwapApprox(target_bitsize)] = num_swaps
+        return set(counts.items())
+
+    def adjoint(self) -> 'Bloq':
+        return self
+
+    def short_name(self) -> str:
+        return 'QROAM'
+
+
+@bloq_example
+def _symbolic_qrom() -> SymbolicQROM:
+    N, b = sympy.symbols('N b', positive=True, integer=True)
+    symbolic_qrom = SymbolicQROM(data_shape=(N,), target_bitsizes=(b,))
+    return symbolic_qrom
+
+
+@bloq_example
+def _symbolic_qrom_multi_dim() -> SymbolicQROM:
+    N, M, b = sympy.symbols('N M b', positive=True, integer=True)
+    symbolic_qrom_multi_dim = SymbolicQROM(
+        data_shape=(N, M), target_bitsizes=(b, b), num_controls=1
+    )
+    return symbolic_qrom_multi_dim
+
+
+@bloq_example
+def _symbolic_select_swap_qrom() -> SymbolicSelectSwapQROM:
+    N, b, k = sympy.symbols('N b k', positive=True, integer=True)
+    symbolic_select_swap_qrom = SymbolicSelectSwapQROM(
+        data_size=N, target_bitsizes=(b,), block_size=2**k
+    )
+    return symbolic_select_swap_qrom
+
+
+_SYMBOLIC_QROM_DOC = BloqDocSpec(
+    bloq_cls=SymbolicQROM,
+    import_line='from qualtran.bloqs.data_loading.symbolic_qrom import SymbolicQROM',
+    examples=[_symbolic_qrom, _symbolic_qrom_multi_dim],
+)
+
+_SYMBOLIC_SELECT_SWAP_QROM_DOC = BloqDocSpec(
+    bloq_cls=SymbolicSelectSwapQROM,
+    import_line='from qualtran.bloqs.data_loading.symbolic_qrom import SymbolicSelectSwapQROM',
+    examples=[_symbolic_select_swap_qrom],
+)
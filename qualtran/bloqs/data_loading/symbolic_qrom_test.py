@@ -0,0 +1,99 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+import sympy
+
+from qualtran.bloqs.basic_gates import CNOT, TGate
+from qualtran.bloqs.data_loading.qrom import QROM
+from qualtran.bloqs.data_loading.select_swap_qrom import SelectSwapQROM
+from qualtran.bloqs.data_loading.symbolic_qrom import (
+    _symbolic_qrom,
+    _symbolic_qrom_multi_dim,
+    _symbolic_select_swap_qrom,
+    SymbolicQROM,
+    SymbolicSelectSwapQROM,
+)
+from qualtran.resource_counting.generalizers import cirq_to_bloqs, ignore_split_join
+
+
+def test_symbolic_qrom(bloq_autotester):
+    bloq_autotester(_symbolic_qrom)
+
+
+def test_symbolic_qrom_multi_dim(bloq_autotester):
+    bloq_autotester(_symbolic_qrom_multi_dim)
+
+
+def test_symbolic_select_swap_qrom(bloq_autotester):
+    bloq_autotester(_symbolic_select_swap_qrom)
+
+
+@pytest.mark.parametrize("shape", [(2,), (30,), (5, 7), (3, 4, 5)])
+@pytest.mark.parametrize("num_controls", [0, 1, 2, 3])
+def test_symbolic_qrom_matches_qrom(shape, num_controls):
+    # Distinct consecutive entries, so that the QROM can't break early.
+    rs = np.random.RandomState(1234)
+    data = rs.permutation(int(np.prod(shape))).reshape(shape) + 1
+    qrom = QROM.build(data, 3 * data, num_controls=num_controls)
+    bloq = SymbolicQROM.from_qrom(qrom)
+    assert bloq.signature == qrom.signature
+    assert bloq.call_graph()[1] == qrom.call_graph(generalizer=cirq_to_bloqs)[1]
+
+
+def test_symbolic_qrom_upper_bound():
+    data = np.array([1, 2, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 5, 5, 5, 5])
+    qrom = QROM.build(data)
+    _, sigma = qrom.call_graph(generalizer=cirq_to_bloqs)
+    _, sigma_symb = SymbolicQROM.from_qrom(qrom).call_graph()
+    _, sigma_no_data = SymbolicQROM(data.shape, qrom.target_bitsizes).call_graph()
+    assert sigma[TGate()] < sigma_symb[TGate()] == sigma_no_data[TGate()]
+    assert sigma[CNOT()] < sigma_symb[CNOT()] < sigma_no_data[CNOT()]
+
+
+@pytest.mark.parametrize("num_controls", [0, 1, 2, 3])
+def test_symbolic_qrom_single_entry(num_controls):
+    qrom = QROM.build(np.array([5]), np.array([10]), num_controls=num_controls)
+    _, sigma = qrom.call_graph(generalizer=[cirq_to_bloqs, ignore_split_join])
+    _, sigma_symb = SymbolicQROM.from_qrom(qrom).call_graph()
+    assert sigma_symb == sigma
+    assert all(count > 0 for count in sigma_symb.values())
+
+
+@pytest.mark.parametrize(
+    "n, block_size",
+    [(30, 4), (17, 1), (64, 8), (10, 3)]
+    + [(n, b) for n in range(1, 13) for b in (1, 2, 3, 4, 8) if b <= n]
+    + [(n, n) for n in (5, 13, 16)],
+)
+def test_symbolic_select_swap_qrom_matches_select_swap_qrom(n, block_size):
+    rs = np.random.RandomState(1234)
+    data = rs.permutation(n) + 1
+    qrom = SelectSwapQROM(data, 2 * data, block_size=block_size)
+    bloq = SymbolicSelectSwapQROM.from_select_swap_qrom(qrom)
+    assert bloq.signature == qrom.signature
+    assert bloq.t_complexity() == qrom.t_complexity()
+
+
+def test_symbolic_qrom_t_complexity():
+    N, M, b = sympy.symbols('N M b', positive=True, integer=True)
+    assert SymbolicQROM((N,), (b,)).t_complexity().t == 4 * N - 8
+    assert SymbolicQROM((N, M), (b,), num_controls=1).t_complexity().t == 4 * N * M - 4
+    assert SymbolicQROM((N,), (b,), num_controls=2).t_complexity().t == 4 * N
+
+    qroam = SymbolicSelectSwapQROM(N, (b,), block_size=4)
+    assert qroam.t_complexity().t == 8 * (sympy.ceiling(N / 4) - 2) + 4 * 12 * b
+    assert SymbolicSelectSwapQROM(1024, (4,)).block_size == 16
+    assert SymbolicSelectSwapQROM(N, (b,)).block_size.free_symbols == {N, b}
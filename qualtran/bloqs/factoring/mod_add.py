@@ -26,7 +26,7 @@ from qualtran.bloqs.basic_gates import TGate, XGate
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
 from qualtran.drawing import Circle, TextBox, WireSymbol
 from qualtran.resource_counting import BloqCountT, SympySymbolAllocator
-from qualtran.simulation.classical_sim import ClassicalValT
+from qualtran.simulation.classical_sim import classical_where, classical_widen, ClassicalValT
 
 
 @frozen
@@ -69,11 +69,11 @@ class CtrlScaleModAdd(Bloq):
     def on_classical_vals(
         self, ctrl: 'ClassicalValT', x: 'ClassicalValT', y: 'ClassicalValT'
     ) -> Dict[str, 'ClassicalValT']:
-        if ctrl == 0:
-            return {'ctrl': 0, 'x': x, 'y': y}
-
-        assert ctrl == 1, 'Bad ctrl value.'
-        y_out = (y + x * self.k) % self.mod
+        assert np.all((ctrl == 0) | (ctrl == 1)), 'Bad ctrl value.'
+        # `y + x * k` has up to `2 * bitsize + 1` bits; widen to avoid overflowing int64.
+        wide_x = classical_widen(x, 2 * self.bitsize + 1)
+        wide_y = classical_widen(y, 2 * self.bitsize + 1)
+        y_out = classical_where(ctrl == 1, (wide_y + wide_x * self.k) % self.mod, wide_y)
         return {'ctrl': ctrl, 'x': x, 'y': y_out}
 
     def short_name(self) -> str:
@@ -119,6 +119,13 @@ class CtrlModAddK(Bloq):
         ((bloq, n),) = self.bloq_counts().items()
         return n * bloq.t_complexity()
 
+    def on_classical_vals(
+        self, ctrl: 'ClassicalValT', x: 'ClassicalValT'
+    ) -> Dict[str, 'ClassicalValT']:
+        assert np.all((ctrl == 0) | (ctrl == 1)), 'Bad ctrl value.'
+        x = classical_widen(x, self.bitsize + 1)
+        return {'ctrl': ctrl, 'x': classical_where(ctrl == 1, (x + self.k) % self.mod, x)}
+
     def short_name(self) -> str:
         return f'x += {self.k} % {self.mod}'
 
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import numpy as np
 import pytest
 
 from qualtran.bloqs.factoring.mod_add import CtrlModAddK, CtrlScaleModAdd, MontgomeryModAdd
@@ -36,6 +37,41 @@ def test_ctrl_mod_add_k():
     assert n == 5
 
 
+def test_ctrl_mod_add_classical_vectorized():
+    x, y = np.meshgrid(np.arange(221), np.arange(0, 221, 7))
+    for ctrl in [0, 1]:
+        ctrls = np.full_like(x, ctrl)
+        bloq = CtrlScaleModAdd(k=123, mod=13 * 17, bitsize=8)
+        vals = bloq.on_classical_vals(ctrl=ctrls, x=x, y=y)
+        np.testing.assert_array_equal(vals['y'], (y + ctrl * x * 123) % 221)
+        assert bloq.on_classical_vals(ctrl=ctrl, x=5, y=3)['y'] == (3 + ctrl * 5 * 123) % 221
+
+        bloq = CtrlModAddK(k=123, mod=13 * 17, bitsize=8)
+        vals = bloq.on_classical_vals(ctrl=ctrls, x=x)
+        np.testing.assert_array_equal(vals['x'], (x + ctrl * 123) % 221)
+        assert bloq.on_classical_vals(ctrl=ctrl, x=200)['x'] == (200 + ctrl * 123) % 221
+
+
+def test_ctrl_mod_add_classical_64_bit():
+    mod = 2**64 - 59
+    bloq = CtrlScaleModAdd(k=3, mod=mod, bitsize=64)
+    assert bloq.call_classically(ctrl=1, x=2**62, y=1) == (1, 2**62, 3 * 2**62 + 1)
+    bloq = CtrlModAddK(k=2**63, mod=mod, bitsize=64)
+    assert bloq.call_classically(ctrl=1, x=5) == (1, 2**63 + 5)
+    assert bloq.call_classically(ctrl=0, x=5) == (0, 5)
+
+
+@pytest.mark.parametrize('mod', [2**32 - 5, 2**61 - 1])
+def test_ctrl_scale_mod_add_classical_vectorized_no_overflow(mod: int):
+    bloq = CtrlScaleModAdd(k=mod - 5, mod=mod, bitsize=mod.bit_length())
+    x = np.array([1, 2**31 + 7, mod - 3], dtype=np.uint64)
+    y = np.array([mod - 1, 0, 2], dtype=np.uint64)
+    vals = bloq.on_classical_vals(ctrl=np.ones_like(x), x=x, y=y)
+    expected = [bloq.call_classically(ctrl=1, x=int(xi), y=int(yi))[2] for xi, yi in zip(x, y)]
+    assert list(vals['y']) == expected
+    assert list(vals['y']) == [(int(yi) + int(xi) * (mod - 5)) % mod for xi, yi in zip(x, y)]
+
+
 @pytest.mark.parametrize('bitsize,p', [(1, 1), (2, 3), (5, 8)])
 def test_montgomery_mod_add_decomp(bitsize, p):
     bloq = MontgomeryModAdd(bitsize=bitsize, p=p)
@@ -37,7 +37,7 @@ from qualtran.bloqs.factoring.mod_add import CtrlScaleModAdd
 from qualtran.drawing import Circle, directional_text_box, WireSymbol
 from qualtran.resource_counting import BloqCountT, SympySymbolAllocator
 from qualtran.resource_counting.generalizers import ignore_alloc_free, ignore_split_join
-from qualtran.simulation.classical_sim import ClassicalValT
+from qualtran.simulation.classical_sim import classical_where, classical_widen, ClassicalValT
 
 
 @frozen
@@ -102,11 +102,9 @@ class CtrlModMul(Bloq):
         return {(self._Add(k=k), 2), (CSwap(self.bitsize), 1)}
 
     def on_classical_vals(self, ctrl, x) -> Dict[str, ClassicalValT]:
-        if ctrl == 0:
-            return {'ctrl': ctrl, 'x': x}
-
-        assert ctrl == 1, ctrl
-        return {'ctrl': ctrl, 'x': (x * self.k) % self.mod}
+        assert np.all((ctrl == 0) | (ctrl == 1)), ctrl
+        x = classical_widen(x, 2 * self.bitsize)
+        return {'ctrl': ctrl, 'x': classical_where(ctrl == 1, (x * self.k) % self.mod, x)}
 
     def short_name(self) -> str:
         return f'x *= {self.k} % {self.mod}'
@@ -90,6 +90,38 @@ def test_consistent_classical():
         assert ret1 == ret2
 
 
+def test_ctrl_mod_mul_classical_vectorized():
+    bloq = CtrlModMul(k=123, mod=13 * 17, bitsize=8)
+    x = np.arange(221)
+    for ctrl in [0, 1]:
+        vals = bloq.on_classical_vals(ctrl=np.full_like(x, ctrl), x=x)
+        expected = [bloq.call_classically(ctrl=ctrl, x=int(i))[1] for i in x]
+        np.testing.assert_array_equal(vals['x'], expected)
+
+    # Values that don't fit in 64 bits use object arrays.
+    mod = 2**127 - 1
+    bloq = CtrlModMul(k=2**100, mod=mod, bitsize=127)
+    x = np.array([3, 2**120], dtype=object)
+    vals = bloq.on_classical_vals(ctrl=np.array([1, 1]), x=x)
+    assert list(vals['x']) == [3 * 2**100 % mod, 2**220 % mod]
+
+
+def test_ctrl_mod_mul_classical_64_bit():
+    mod = 2**64 - 59
+    bloq = CtrlModMul(k=3, mod=mod, bitsize=64)
+    assert bloq.call_classically(ctrl=1, x=2**62 + 1) == (1, 3 * (2**62 + 1))
+    assert bloq.call_classically(ctrl=0, x=2**62 + 1) == (0, 2**62 + 1)
+
+
+@pytest.mark.parametrize('mod', [2**32 - 5, 2**61 - 1])
+def test_ctrl_mod_mul_classical_vectorized_no_overflow(mod: int):
+    bloq = CtrlModMul(k=mod - 5, mod=mod, bitsize=mod.bit_length())
+    x = np.array([1, 2**31 + 7, mod - 3], dtype=np.uint64)
+    vals = bloq.on_classical_vals(ctrl=np.ones_like(x), x=x)
+    assert list(vals['x']) == [bloq.call_classically(ctrl=1, x=int(i))[1] for i in x]
+    assert list(vals['x']) == [int(i) * (mod - 5) % mod for i in x]
+
+
 def test_modmul_symb_manual():
     k, N, n_x = sympy.symbols('k N n_x')
     bloq = CtrlModMul(k=k, mod=N, bitsize=n_x)
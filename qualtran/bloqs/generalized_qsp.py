@@ -11,7 +11,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import Sequence, Tuple
 
 import cirq
@@ -74,31 +74,7 @@ class SU2RotationGate(GateWithRegisters):
         yield cirq.GlobalPhaseGate(np.exp(1j * (np.pi + self.lambd + self.phi) / 2)).on()
 
 
-def qsp_complementary_polynomial(
-    P: Sequence[complex], *, verify: bool = False
-) -> Sequence[complex]:
-    r"""Computes the Q polynomial given P
-
-    Computes polynomial $Q$ of degree at-most that of $P$, satisfying
-
-        $$ \abs{P(e^{i\theta})}^2 + \abs{Q(e^{i\theta})}^2 = 1 $$
-
-    for every $\theta \in \mathbb{R}$.
-
-    The exact method for computing $Q$ is described in the proof of Theorem 4.
-    The method computes an auxillary polynomial R, whose roots are computed
-    and re-interpolated to obtain the required polynomial Q.
-
-    TODO: Also implement the more efficient optimization-based method described in Eq. 52
-
-    Args:
-        P: Co-efficients of a complex polynomial.
-        verify: sanity check the computed polynomial roots (defaults to False).
-
-    References:
-        [Generalized Quantum Signal Processing](https://arxiv.org/abs/2308.01501)
-            Motlagh and Wiebe. (2023). Theorem 4.
-    """
+def _qsp_complementary_polynomial_roots(P: NDArray, verify: bool) -> NDArray:
     d = len(P) - 1  # degree
 
     # R(z) = z^d (1 - P^*(z) P(z))
@@ -118,53 +94,31 @@ def qsp_complementary_polynomial(
     roots = R.roots()
 
     # R is self-inversive, so larger_roots and smaller_roots occur in conjugate pairs.
-    units: list[complex] = []  # roots r s.t. \abs{r} = 1
-    larger_roots: list[complex] = []  # roots r s.t. \abs{r} > 1
-    smaller_roots: list[complex] = []  # roots r s.t. \abs{r} < 1
-
-    for r in roots:
-        if np.allclose(np.abs(r), 1):
-            units.append(r)
-        elif np.abs(r) > 1:
-            larger_roots.append(r)
-        else:
-            smaller_roots.append(r)
+    abs_roots = np.abs(roots)
+    is_unit = np.isclose(abs_roots, 1)
+    units = roots[is_unit]  # roots r s.t. \abs{r} = 1
+    larger_roots = roots[~is_unit & (abs_roots > 1)]  # roots r s.t. \abs{r} > 1
+    smaller_roots = roots[~is_unit & (abs_roots < 1)]  # roots r s.t. \abs{r} < 1
 
     if verify:
         # verify that the non-unit roots indeed occur in conjugate pairs.
-        def is_permutation(A, B):
-            assert len(A) == len(B)
-            A = list(A)
-            for z in B:
-                for w in A:
-                    if np.allclose(z, w):
-                        A.remove(w)
-                        break
-                else:
-                    return False
-            return True
-
-        assert is_permutation(smaller_roots, 1 / np.array(larger_roots).conj())
+        assert len(smaller_roots) == len(larger_roots)
+        matches = np.isclose(smaller_roots[:, None], 1 / larger_roots.conj()[None, :])
+        assert matches.any(axis=0).all() and matches.any(axis=1).all()
 
     # pair up roots in `units`, claimed in Eq. 40 and the explanation preceding it.
-    # all unit roots must have even multiplicity.
-    paired_units: list[complex] = []
-    unpaired_units: list[complex] = []
-    for z in units:
-        matched_z = None
-        for w in unpaired_units:
-            if np.allclose(z, w):
-                matched_z = w
-                break
-
-        if matched_z:
-            paired_units.append(z)
-            unpaired_units.remove(matched_z)
-        else:
-            unpaired_units.append(z)
+    # all unit roots must have even multiplicity, so after sorting them by their angle (starting
+    # from the largest gap between two of them) the two roots of each pair are next to each other.
+    units = units[np.argsort(np.angle(units))]
+    if len(units):
+        gaps = np.diff(np.angle(units), append=np.angle(units[0]) + 2 * np.pi)
+        units = np.roll(units, -(np.argmax(gaps) + 1))
+    n_pairs = len(units) // 2
+    paired_units = units[0 : 2 * n_pairs : 2]
 
     if verify:
-        assert len(unpaired_units) == 0
+        assert len(units) == 2 * n_pairs
+        assert np.allclose(paired_units, units[1::2])
 
     # Q = G \hat{G}, where
     # - \hat{G}^2 is the monomials which are unit roots of R, which occur in pairs.
@@ -177,11 +131,95 @@ def qsp_complementary_polynomial(
     c = R.coef[-1]
     scaling_factor = np.sqrt(np.abs(c * np.prod(larger_roots)))
 
-    Q = scaling_factor * Polynomial.fromroots(paired_units + smaller_roots)
+    Q = scaling_factor * Polynomial.fromroots(np.concatenate([paired_units, smaller_roots]))
 
     return Q.coef
 
 
+_FFT_TOLERANCE = 1e-11
+_FFT_MAX_SIZE = 2**24
+
+
+def _qsp_complementary_polynomial_fft(P: NDArray) -> NDArray:
+    d = len(P) - 1  # degree
+
+    # $1 - \abs{P}^2 = \abs{Q}^2$ on the unit circle, sampled at `n` points. Taking the
+    # logarithm, $\log\abs{Q}$ is the real part of $\log Q$, which is analytic in the unit disk
+    # if Q has no roots in it. The coefficients of $\log Q$ are hence given by folding the
+    # Fourier coefficients (the cepstrum) of $\log\abs{Q}$ onto the non-negative frequencies.
+    # The truncation to `n` samples aliases the cepstrum, so `n` is increased until the
+    # resulting polynomial is accurate on a grid twice as fine.
+    n = 2 ** max(4, int(np.ceil(np.log2(8 * (d + 1)))))
+    while n <= _FFT_MAX_SIZE:
+        H = 1 - np.abs(np.fft.fft(P, n)) ** 2
+        if np.min(H) <= 0:
+            raise ValueError("1 - |P|^2 must be positive on the unit circle to use the FFT method.")
+        cepstrum = np.fft.ifft(np.log(H) / 2)
+        cepstrum[1 : n // 2] *= 2
+        cepstrum[n // 2 + 1 :] = 0
+        Q = np.fft.ifft(np.exp(np.fft.fft(cepstrum)))[: d + 1]
+
+        error = 1 - np.abs(np.fft.fft(P, 2 * n)) ** 2 - np.abs(np.fft.fft(Q, 2 * n)) ** 2
+        if np.max(np.abs(error)) <= _FFT_TOLERANCE:
+            # Reflect the roots of Q into the unit disk, like the roots method does, which gives
+            # Q a large leading coefficient and keeps `qsp_phase_factors` well conditioned.
+            return np.conj(Q[::-1])
+        n *= 2
+    raise ValueError(f"The FFT method did not converge for a polynomial of degree {d}.")
+
+
+def qsp_complementary_polynomial(
+    P: Sequence[complex], *, verify: bool = False, method: str = 'auto'
+) -> Sequence[complex]:
+    r"""Computes the Q polynomial given P
+
+    Computes polynomial $Q$ of degree at-most that of $P$, satisfying
+
+        $$ \abs{P(e^{i\theta})}^2 + \abs{Q(e^{i\theta})}^2 = 1 $$
+
+    for every $\theta \in \mathbb{R}$.
+
+    Two methods are supported:
+
+    - `'roots'`: The exact method described in the proof of Theorem 4.
+      The method computes an auxillary polynomial R, whose roots are computed
+      and re-interpolated to obtain the required polynomial Q. Finding the roots
+      takes $O(d^3)$ time and is numerically unstable for large degrees $d$.
+    - `'fft'`: Computes the Q with all roots in the unit disk from the FFT of
+      $\log(1 - \abs{P}^2)$ (the Kolmogorov, or cepstral, method for spectral
+      factorization). This takes $O(d \log d)$ time and works for degrees of
+      $10^4$ and more, but requires $\abs{P} < 1$ on the unit circle.
+
+    The default `'auto'` uses the FFT method, falling back to the roots method if $\abs{P}$
+    reaches 1 on the unit circle.
+
+    Args:
+        P: Co-efficients of a complex polynomial.
+        verify: sanity check the computed polynomial roots (defaults to False).
+            The FFT method always checks that the result is accurate.
+        method: One of `'auto'`, `'roots'` or `'fft'`.
+
+    Raises:
+        ValueError: if the FFT method is used and $\abs{P}$ reaches 1 on the unit circle,
+            or for an unknown `method`.
+
+    References:
+        [Generalized Quantum Signal Processing](https://arxiv.org/abs/2308.01501)
+            Motlagh and Wiebe. (2023). Theorem 4.
+    """
+    P = np.asarray(P, dtype=complex)
+    if method == 'roots':
+        return _qsp_complementary_polynomial_roots(P, verify)
+    if method == 'fft':
+        return _qsp_complementary_polynomial_fft(P)
+    if method == 'auto':
+        try:
+            return _qsp_complementary_polynomial_fft(P)
+        except ValueError:
+            return _qsp_complementary_polynomial_roots(P, verify)
+    raise ValueError(f"Unknown method {method!r}, expected 'auto', 'roots' or 'fft'.")
+
+
 def qsp_phase_factors(
     P: Sequence[complex], Q: Sequence[complex]
 ) -> Tuple[Sequence[float], Sequence[float], float]:
@@ -208,33 +246,56 @@ def qsp_phase_factors(
     if len(P) != len(Q):
         raise ValueError("Polynomials P and Q must have the same degree.")
 
-    S = np.array([P, Q])
-    n = S.shape[1]
+    S0 = np.array(P, dtype=complex)
+    S1 = np.array(Q, dtype=complex)
+    n = len(S0)
 
     theta = np.zeros(n)
     phi = np.zeros(n)
     lambd = 0
 
+    def is_zero(x):
+        # same as `np.isclose(x, 0)`, which is slow on scalars.
+        return abs(x) <= 1e-8
+
     def safe_angle(x):
-        return 0 if np.isclose(x, 0) else np.angle(x)
+        return 0 if is_zero(x) else np.angle(x)
 
     for d in reversed(range(n)):
-        assert S.shape == (2, d + 1)
+        assert len(S0) == len(S1) == d + 1
 
-        a, b = S[:, d]
+        a, b = S0[d], S1[d]
         theta[d] = np.arctan2(np.abs(b), np.abs(a))
         # \phi_d = arg(a / b)
-        phi[d] = 0 if np.isclose(np.abs(b), 0) else safe_angle(a * np.conj(b))
+        phi[d] = 0 if is_zero(np.abs(b)) else safe_angle(a * np.conj(b))
 
         if d == 0:
             lambd = safe_angle(b)
         else:
-            S = SU2RotationGate(theta[d], phi[d], 0).rotation_matrix.conj().T @ S
-            S = np.array([S[0][1 : d + 1], S[1][0:d]])
+            # S = SU2RotationGate(theta[d], phi[d], 0).rotation_matrix.conj().T @ S, keeping
+            # only the coefficients of degree 1 to d of P and 0 to d - 1 of Q.
+            c, s = np.cos(theta[d]), np.sin(theta[d])
+            e = np.exp(-1j * phi[d])
+            S0, S1 = e * c * S0[1:] + s * S1[1:], e * s * S0[:-1] - c * S1[:-1]
 
     return theta, phi, lambd
 
 
+@lru_cache(maxsize=128)
+def _qsp_complementary_polynomial_cached(P: Tuple[complex, ...]) -> NDArray:
+    Q = np.asarray(qsp_complementary_polynomial(P))
+    Q.setflags(write=False)
+    return Q
+
+
+@lru_cache(maxsize=128)
+def _qsp_phase_factors_cached(P: Tuple[complex, ...]) -> Tuple[NDArray, NDArray, float]:
+    theta, phi, lambd = qsp_phase_factors(P, _qsp_complementary_polynomial_cached(P))
+    theta.setflags(write=False)
+    phi.setflags(write=False)
+    return theta, phi, lambd
+
+
 @frozen
 class GeneralizedQSP(GateWithRegisters):
     r"""Applies a QSP polynomial $P$ to a unitary $U$ to obtain a block-encoding of $P(U)$.
@@ -264,13 +325,19 @@ class GeneralizedQSP(GateWithRegisters):
     def signature(self) -> Signature:
         return Signature([Register('signal', QBit()), *self.U.signature])
 
+    @cached_property
+    def _P_key(self) -> Tuple[complex, ...]:
+        return tuple(np.asarray(self.P, dtype=complex).tolist())
+
     @cached_property
     def Q(self):
-        return qsp_complementary_polynomial(self.P)
+        # Q and the phases are cached across instances, e.g. for the adjoint and controlled
+        # versions of the same GQSP, as they are expensive to compute for large degrees.
+        return _qsp_complementary_polynomial_cached(self._P_key)
 
     @cached_property
     def _qsp_phases(self) -> Tuple[Sequence[float], Sequence[float], float]:
-        return qsp_phase_factors(self.P, self.Q)
+        return _qsp_phase_factors_cached(self._P_key)
 
     @cached_property
     def _theta(self) -> Sequence[float]:
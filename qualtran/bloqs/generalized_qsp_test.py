@@ -110,6 +110,48 @@ def test_real_polynomial_has_real_complementary_polynomial(degree: int):
         assert np.isreal(Q).all()
 
 
+@pytest.mark.parametrize("degree", [4, 20, 100])
+def test_complementary_polynomial_methods_agree(degree: int):
+    random_state = np.random.RandomState(42)
+
+    for _ in range(5):
+        P = random_qsp_polynomial(degree, random_state=random_state)
+        Q_roots = qsp_complementary_polynomial(P, method='roots', verify=True)
+        Q_fft = qsp_complementary_polynomial(P, method='fft')
+        np.testing.assert_allclose(Q_roots, Q_fft, atol=1e-7)
+
+
+def test_complementary_polynomial_fft_large_degree():
+    random_state = np.random.RandomState(42)
+    P = random_qsp_polynomial(10**4, random_state=random_state)
+    Q = qsp_complementary_polynomial(P)
+    check_polynomial_pair_on_random_points_on_unit_circle(
+        P, Q, random_state=random_state, n_points=10
+    )
+
+    theta, phi, lambd = qsp_phase_factors(P[:1000], qsp_complementary_polynomial(P[:1000]))
+    assert len(theta) == len(phi) == 1000
+
+
+def test_complementary_polynomial_auto_falls_back_to_roots():
+    P = [0.5, 0.5]  # |P(1)| = 1
+    with pytest.raises(ValueError):
+        qsp_complementary_polynomial(P, method='fft')
+    np.testing.assert_allclose(qsp_complementary_polynomial(P), [-0.5, 0.5], atol=1e-7)
+    with pytest.raises(ValueError):
+        qsp_complementary_polynomial(P, method='newton')
+
+
+def test_generalized_qsp_phases_are_cached():
+    random_state = np.random.RandomState(42)
+    P = random_qsp_polynomial(10, random_state=random_state)
+    U = RandomGate.create(1, random_state=random_state)
+    gqsp = GeneralizedQSP(U, P)
+    other = GeneralizedQSP(RandomGate.create(1, random_state=random_state), tuple(P))
+    assert other.Q is gqsp.Q
+    assert other._theta is gqsp._theta
+
+
 @frozen
 class RandomGate(GateWithRegisters):
     bitsize: int
@@ -14,7 +14,7 @@
 
 import abc
 from collections import defaultdict
-from functools import cached_property
+from functools import cached_property, partial
 from typing import Callable, Dict, Iterator, List, Sequence, Set, Tuple, TYPE_CHECKING, Union
 
 import cirq
@@ -272,17 +272,19 @@ def _unary_iteration_callgraph_segtree(
     r_iter: int,
     l_range: int,
     r_range: int,
-    break_early: Callable[[int, int], bool],
+    break_early: Callable[[NDArray[np.intp], NDArray[np.intp]], NDArray[np.bool_]],
+    n_prefixes: int,
     bloq_counts: Dict['Bloq', Union[int, 'sympy.Expr']],
-) -> Sequence[int]:
-    """Iterative segment tree used to construct call graph for Unary iteration.
-
-    See https://codeforces.com/blog/entry/18051 for an explanation of how iterative
-    segment trees work.
+) -> Tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """Level-by-level segment tree used to construct call graph for Unary iteration.
 
     The method constructs a unary iteration segment tree for the case when `num_controls=1`,
     similar to `_unary_iteration_segtree`, and adds the bloq counts to `bloq_counts` dict.
 
+    The trees of `n_prefixes` independent unary iterations over the same range, which differ only
+    in their early breaking condition, are traversed at once. Each level of the trees is processed
+    with array operations, so the number of python calls is logarithmic in the size of the range.
+
     Args:
         l_iter: Left index of iteration range over which the segment tree should be constructed.
         r_iter: Right index of iteration range over which the segment tree should be constructed.
@@ -290,57 +292,61 @@ def _unary_iteration_callgraph_segtree(
             Should be a power of 2.
         r_range: Right index of range represented by the root node of the segment tree.
             Should be a power of 2 and greater than l_range.
-        break_early: For each internal node of the segment tree, `break_early(l, r)` is called to
-            evaluate whether the unary iteration should terminate early and not recurse in the
-            subtree of the node representing range `[l, r)`. If True, the internal node is
-            considered equivalent to a leaf node and the method yields only one tuple
-            `(OP_TREE, control_qubit, l)` for all integers in the range `[l, r)`.
+        break_early: For internal nodes of the segment tree, `break_early(l, r)` is called with
+            arrays of ranges `[l[j], r[j])` and should return a boolean array of shape
+            `(n_prefixes, len(l))` which specifies whether the unary iteration of each tree should
+            terminate early and not recurse in the subtree of the node representing `[l[j], r[j])`.
+            If True, the internal node is considered equivalent to a leaf node.
+        n_prefixes: The number of segment trees to traverse.
         bloq_counts: Mutable Dictionary to which the counts of bloqs used by the unary iteration
-            segment tree are appended.
+            segment trees are appended.
 
     Returns:
-        Returns a sequence of integers, each representing the first element `l` in the range
-        `[l, r)` corresponding to the leaf nodes of the constructed segment tree.
+        A tuple `(prefix_idxs, ls)` of integer arrays with one entry per leaf node of the
+        constructed segment trees. `prefix_idxs` is the index of the tree that the leaf belongs
+        to and `ls` is the first element `l` in the range `[l, r)` corresponding to the leaf node.
         The derived operations should specify the cost of attaching operations on each of the
         leaf nodes, identified by the `l` entries, to fully specify the cost of the corresponding
         unary iteration bloq.
     """
     n = r_range - l_range
     n_levels = n.bit_length()
-    marked = np.zeros(2 * n, dtype=bool)
+    # Nodes whose subtree doesn't need to be traversed, for each tree in the current level.
+    marked = np.zeros((n_prefixes, 1), dtype=bool)
     num_ands = 0
-    ret: List[int] = []
+    prefix_idxs: List[NDArray[np.intp]] = []
+    ls: List[NDArray[np.intp]] = []
     step_size = n
     for lvl in range(1, n_levels + 1):
-        r = l_range
-        for i in range((1 << (lvl - 1)), (1 << lvl)):
-            l = r
-            r = l + step_size
-            marked[i] = marked[i >> 1]
-            if marked[i]:
-                # We don't need to traverse this subtree since it's parent was already "marked".
-                continue
-            if l >= r_iter or l_iter >= r:
-                # Range corresponding to this node is completely outside of iteration range.
-                marked[i] = 1
-                continue
-            if l_iter <= l < r <= r_iter and (i >= n or break_early(l, r)):
-                # Reached a leaf node or a "special" internal node; append its left element.
-                marked[i] = 1
-                ret.append(l)
-                continue
-            m = (l + r) >> 1
-            if r_iter <= m or l_iter >= m:
-                # Yield only left sub-tree or right sub-tree. No need of any ops here. We'll visit
-                # the left / right subtrees later.
-                continue
-            # Need to yield both left & right subtrees. Add the `ands` to bloq counts.
-            num_ands += 1
+        if lvl > 1:
+            marked = np.repeat(marked, 2, axis=1)
+        l = l_range + step_size * np.arange(1 << (lvl - 1))
+        r = l + step_size
+        m = (l + r) >> 1
+        # Range corresponding to this node is completely outside of iteration range.
+        outside = (l >= r_iter) | (l_iter >= r)
+        inside = (l_iter <= l) & (r <= r_iter)
+        # Reached a leaf node or a "special" internal node; append its left element.
+        is_leaf = np.broadcast_to(inside, marked.shape)
+        if lvl < n_levels:
+            is_leaf = np.zeros(marked.shape, dtype=bool)
+            # Skip nodes whose subtree isn't traversed in any of the trees.
+            query = inside & ~marked.all(axis=0)
+            if np.any(query):
+                is_leaf[:, query] = break_early(l[query], r[query])
+        is_leaf = is_leaf & ~marked
+        leaf_prefix_idxs, leaf_nodes = np.nonzero(is_leaf)
+        prefix_idxs.append(leaf_prefix_idxs)
+        ls.append(l[leaf_nodes])
+        # Need to yield both left & right subtrees. Add the `ands` to bloq counts.
+        both_subtrees = ~outside & (r_iter > m) & (l_iter < m)
+        num_ands += int(np.count_nonzero(both_subtrees & ~marked & ~is_leaf))
+        marked = marked | outside | is_leaf
         step_size //= 2
     bloq_counts[and_bloq.And(1, 0)] += num_ands
     bloq_counts[CNOT()] += num_ands
     bloq_counts[and_bloq.And().adjoint()] += num_ands
-    return ret
+    return np.concatenate(prefix_idxs), np.concatenate(ls)
 
 
 def _unary_iteration_callgraph(
@@ -348,9 +354,10 @@ def _unary_iteration_callgraph(
     r_iter: int,
     selection_bitsize: int,
     control_bitsize: int,
-    break_early: Callable[[int, int], bool],
+    break_early: Callable[[NDArray[np.intp], NDArray[np.intp]], NDArray[np.bool_]],
+    n_prefixes: int,
     bloq_counts: Dict['Bloq', Union[int, 'sympy.Expr']],
-) -> Sequence[int]:
+) -> Tuple[NDArray[np.intp], NDArray[np.intp]]:
     """Helper to compute the call graph for unary iteration.
 
     See docstring of `_unary_iteration_callgraph_segtree`, to which this method delegates, for
@@ -361,28 +368,28 @@ def _unary_iteration_callgraph(
     if control_bitsize == 0:
         while r_iter <= 2 ** (selection_bitsize - 1):
             selection_bitsize -= 1
-        bloq_counts[XGate()] += 2
+        bloq_counts[XGate()] += 2 * n_prefixes
         l, r = 0, 2**selection_bitsize
-        ret = _unary_iteration_callgraph_segtree(
-            l_iter, r_iter, l, (l + r) >> 1, break_early, bloq_counts
+        left = _unary_iteration_callgraph_segtree(
+            l_iter, r_iter, l, (l + r) >> 1, break_early, n_prefixes, bloq_counts
         )
-        ret += _unary_iteration_callgraph_segtree(
-            l_iter, r_iter, (l + r) >> 1, r, break_early, bloq_counts
+        right = _unary_iteration_callgraph_segtree(
+            l_iter, r_iter, (l + r) >> 1, r, break_early, n_prefixes, bloq_counts
         )
-        return ret
+        return np.concatenate([left[0], right[0]]), np.concatenate([left[1], right[1]])
 
     if control_bitsize == 2:
-        bloq_counts[and_bloq.And(1, 1)] += 1
-        bloq_counts[and_bloq.And(1, 1).adjoint()] += 1
+        bloq_counts[and_bloq.And(1, 1)] += n_prefixes
+        bloq_counts[and_bloq.And(1, 1).adjoint()] += n_prefixes
 
     if control_bitsize > 2:
         multi_and = and_bloq.MultiAnd(cvs=(1,) * control_bitsize)
-        bloq_counts[multi_and] += 1
-        bloq_counts[multi_and.adjoint()] += 1
+        bloq_counts[multi_and] += n_prefixes
+        bloq_counts[multi_and.adjoint()] += n_prefixes
 
     assert 2**selection_bitsize >= r_iter - l_iter
     return _unary_iteration_callgraph_segtree(
-        l_iter, r_iter, 0, 1 << selection_bitsize, break_early, bloq_counts
+        l_iter, r_iter, 0, 1 << selection_bitsize, break_early, n_prefixes, bloq_counts
     )
 
 
@@ -584,43 +591,88 @@ class UnaryIterationGate(GateWithRegisters):
         wire_symbols += [self.__class__.__name__] * total_bits(self.target_registers)
         return cirq.CircuitDiagramInfo(wire_symbols=wire_symbols)
 
+    def _break_early_batch(
+        self, selection_index_prefixes: NDArray[np.intp], l: NDArray[np.intp], r: NDArray[np.intp]
+    ) -> NDArray[np.bool_]:
+        """Vectorized version of `self._break_early`, used to compute the call graph.
+
+        Derived classes that override `_break_early` can override this method to evaluate the
+        early termination condition for many nodes of many segment trees at once. By default,
+        `self._break_early` is called once per prefix and node.
+
+        Args:
+            selection_index_prefixes: An integer array of shape `(n_prefixes, i)` where each row is
+                a `selection_index_prefix` of the i'th nested for-loop.
+            l: Beginnings of ranges `[l, r)` for internal nodes of the unary iteration segment tree.
+            r: Ends (exclusive) of ranges `[l, r)` for internal nodes of the unary iteration
+                segment tree.
+
+        Returns:
+            A boolean array of shape `(n_prefixes, len(l))`.
+        """
+        ret = np.zeros((len(selection_index_prefixes), len(l)), dtype=bool)
+        if type(self)._break_early is UnaryIterationGate._break_early:
+            return ret
+        for i, prefix in enumerate(selection_index_prefixes):
+            prefix_tuple = tuple(int(x) for x in prefix)
+            for j, (l_j, r_j) in enumerate(zip(l, r)):
+                ret[i, j] = self._break_early(prefix_tuple, int(l_j), int(r_j))
+        return ret
+
     def nth_operation_callgraph(self, **selection_regs_name_to_val) -> Set['BloqCountT']:
         raise NotImplementedError(
             f"Derived class {type(self)} does not implement `nth_operation_callgraph`."
         )
 
+    def nth_operation_callgraph_batch(
+        self, **selection_regs_name_to_vals: NDArray[np.intp]
+    ) -> Set['BloqCountT']:
+        """Total call graph of `self.nth_operation` over many values of the selection registers.
+
+        Each keyword argument is an integer array, of the same length for all selection registers,
+        and the i'th entries of the arrays specify one set of values of the selection registers.
+        By default, `self.nth_operation_callgraph` is called for each of them and the counts are
+        summed. Derived classes can override this method with a vectorized implementation.
+        """
+        bloq_counts: Dict['Bloq', Union[int, 'sympy.Expr']] = defaultdict(lambda: 0)
+        names = list(selection_regs_name_to_vals.keys())
+        for vals in zip(*selection_regs_name_to_vals.values()):
+            kwargs = {name: int(val) for name, val in zip(names, vals)}
+            for bloq, count in self.nth_operation_callgraph(**kwargs):
+                bloq_counts[bloq] += count
+        return {(bloq, count) for bloq, count in bloq_counts.items()}
+
     def build_call_graph(self, ssa: 'SympySymbolAllocator') -> Set['BloqCountT']:
         if total_bits(self.selection_registers) == 0 or self._break_early(
             (), 0, self.selection_registers[0].dtype.iteration_length
         ):
             return self.decompose_bloq().build_call_graph(ssa)
-        num_loops = len(self.selection_registers)
         bloq_counts: Dict['Bloq', Union[int, 'sympy.Expr']] = defaultdict(lambda: 0)
 
-        def unary_iteration_loops(
-            nested_depth: int, selection_reg_name_to_val: Dict[str, int], num_controls: int
-        ) -> None:
-            if nested_depth == num_loops:
-                for bloq, count in self.nth_operation_callgraph(**selection_reg_name_to_val):
-                    bloq_counts[bloq] += count
-                return
-            # Use recursion to cost out `num_loops` nested loops using _unary_iteration_callgraph()
-            selection_index_prefix = tuple(selection_reg_name_to_val.values())
-            ith_for_loop = _unary_iteration_callgraph(
+        # Cost out the nested loops one at a time. The values of the loop variables of the parent
+        # for-loops, for every leaf of their unary iteration segment trees, are the rows of
+        # `prefixes`.
+        prefixes = np.zeros((1, 0), dtype=np.intp)
+        num_controls = total_bits(self.control_registers)
+        for reg in self.selection_registers:
+            prefix_idxs, ls = _unary_iteration_callgraph(
                 l_iter=0,
-                r_iter=self.selection_registers[nested_depth].dtype.iteration_length,
-                selection_bitsize=self.selection_registers[nested_depth].bitsize,
+                r_iter=reg.dtype.iteration_length,
+                selection_bitsize=reg.bitsize,
                 control_bitsize=num_controls,
-                break_early=lambda l, r: self._break_early(selection_index_prefix, l, r),
+                break_early=partial(self._break_early_batch, prefixes),
+                n_prefixes=len(prefixes),
                 bloq_counts=bloq_counts,
             )
-            for n in ith_for_loop:
-                selection_reg_name_to_val[self.selection_registers[nested_depth].name] = n
-                unary_iteration_loops(nested_depth + 1, selection_reg_name_to_val, num_controls=1)
-                selection_reg_name_to_val.pop(self.selection_registers[nested_depth].name)
+            prefixes = np.concatenate([prefixes[prefix_idxs], ls[:, np.newaxis]], axis=1)
+            num_controls = 1
 
         try:
-            unary_iteration_loops(0, {}, total_bits(self.control_registers))
+            selection_regs_name_to_vals = {
+                reg.name: prefixes[:, i] for i, reg in enumerate(self.selection_registers)
+            }
+            for bloq, count in self.nth_operation_callgraph_batch(**selection_regs_name_to_vals):
+                bloq_counts[bloq] += count
             return {(bloq, count) for bloq, count in bloq_counts.items()}
         except NotImplementedError:
             return super().build_call_graph(ssa)
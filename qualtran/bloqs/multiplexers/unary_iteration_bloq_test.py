@@ -13,16 +13,23 @@
 #  limitations under the License.
 
 import itertools
+from collections import defaultdict
 from functools import cached_property
 from typing import Sequence, Set, Tuple, TYPE_CHECKING
 
 import cirq
+import numpy as np
 import pytest
 
 from qualtran import BoundedQUInt, QAny, Register, Signature
 from qualtran._infra.gate_with_registers import get_named_qubits, total_bits
 from qualtran.bloqs.basic_gates import CNOT
-from qualtran.bloqs.multiplexers.unary_iteration_bloq import unary_iteration, UnaryIterationGate
+from qualtran.bloqs.mcmt import And
+from qualtran.bloqs.multiplexers.unary_iteration_bloq import (
+    _unary_iteration_callgraph_segtree,
+    unary_iteration,
+    UnaryIterationGate,
+)
 from qualtran.bloqs.util_bloqs import Join, Split
 from qualtran.cirq_interop.bit_tools import iter_bits
 from qualtran.cirq_interop.testing import assert_circuit_inp_out_cirqsim, GateHelper
@@ -130,6 +137,19 @@ class ApplyXToIJKthQubit(UnaryIterationGate):
     def nth_operation_callgraph(self, **selection_regs_name_to_val) -> Set['BloqCountT']:
         return {(CNOT(), 3)}
 
+    def nth_operation_callgraph_batch(self, **selection_regs_name_to_vals) -> Set['BloqCountT']:
+        return {(CNOT(), 3 * len(selection_regs_name_to_vals['i']))}
+
+
+class ApplyXToIJKthQubitBreakEarly(ApplyXToIJKthQubit):
+    """Only distinguishes the `k` index when `i == j`."""
+
+    def nth_operation_callgraph_batch(self, **selection_regs_name_to_vals) -> Set['BloqCountT']:
+        return UnaryIterationGate.nth_operation_callgraph_batch(self, **selection_regs_name_to_vals)
+
+    def _break_early(self, selection_index_prefix: Tuple[int, ...], l: int, r: int) -> bool:
+        return len(selection_index_prefix) == 2 and len(set(selection_index_prefix)) == 2
+
 
 @pytest.mark.slow
 @pytest.mark.parametrize("target_shape", [(2, 3, 2), (2, 2, 2)])
@@ -230,6 +250,46 @@ def test_multi_dimensional_bloq_has_consistent_decomposition(target_shape: Tuple
     verify_bloq_has_consistent_build_callgraph(bloq)
 
 
+@pytest.mark.parametrize("target_shape", [(2, 3, 2), (3, 3, 4)])
+def test_break_early_bloq_has_consistent_decomposition(target_shape: Tuple[int, int, int]):
+    bloq = ApplyXToIJKthQubitBreakEarly(target_shape)
+    assert_valid_bloq_decomposition(bloq)
+    verify_bloq_has_consistent_build_callgraph(bloq)
+    n_leaves = target_shape[0] * target_shape[1] + min(target_shape[:2]) * (target_shape[2] - 1)
+    assert bloq.call_graph()[1][CNOT()] == 3 * n_leaves + bloq.t_complexity().t // 4
+
+
+def test_large_multi_dimensional_call_graph():
+    target_shape = (50, 60, 70)
+    bloq = ApplyXToIJKthQubit(target_shape)
+    sigma = bloq.bloq_counts()
+    n = target_shape[0] * target_shape[1] * target_shape[2]
+    assert sigma[And(1, 0)] == n - 2
+    assert sigma[CNOT()] == 3 * n + sigma[And(1, 0)]
+
+
+def test_callgraph_segtree_skips_nodes_marked_in_all_trees():
+    queried = []
+
+    def break_early(l, r):
+        queried.extend(zip(l.tolist(), r.tolist()))
+        # Break early at [0, 8) in the first tree only, and at [8, 16) in both trees.
+        return np.array([(l == 0) & (r == 8) | (l == 8) & (r == 16), (l == 8) & (r == 16)])
+
+    bloq_counts: dict = defaultdict(lambda: 0)
+    prefix_idxs, ls = _unary_iteration_callgraph_segtree(0, 16, 0, 16, break_early, 2, bloq_counts)
+    assert sorted(zip(prefix_idxs.tolist(), ls.tolist())) == [
+        (0, 0),
+        (0, 8),
+        *[(1, l) for l in range(8)],
+        (1, 8),
+    ]
+    # Nodes below [8, 16) are never queried; nodes below [0, 8) still are for the second tree.
+    assert all(l < 8 or (l, r) == (8, 16) for l, r in queried)
+    assert (8, 16) in queried
+    assert (0, 4) in queried
+
+
 @pytest.mark.notebook
 def test_notebook():
     execute_notebook('unary_iteration')
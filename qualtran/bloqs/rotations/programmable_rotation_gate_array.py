@@ -24,7 +24,7 @@ from numpy.typing import NDArray
 from qualtran import BoundedQUInt, GateWithRegisters, QAny, Register, Signature
 from qualtran._infra.gate_with_registers import total_bits
 from qualtran.bloqs.data_loading.qrom import QROM
-from qualtran.cirq_interop.bit_tools import iter_bits
+from qualtran.simulation.bit_packing import ints_to_bits
 
 
 class ProgrammableRotationGateArrayBase(GateWithRegisters):
@@ -150,7 +150,7 @@ class ProgrammableRotationGateArrayBase(GateWithRegisters):
         for i, thetas in enumerate(self.angles):
             bit_width = max(thetas).bit_length()
             st, en = en, en + bit_width
-            angles_bits[:, st:en] = [[*iter_bits(t, bit_width)] for t in thetas]
+            angles_bits[:, st:en] = ints_to_bits(np.asarray(thetas), bit_width)
             angles_bit_pow[st:en] = [*range(bit_width)][::-1]
             angles_idx[st:en] = i
         assert en == num_bits
@@ -32,6 +32,7 @@ from qualtran import BoundedQUInt, Register, Signature
 from qualtran._infra.gate_with_registers import total_bits
 from qualtran.bloqs.arithmetic import LessThanEqual
 from qualtran.bloqs.basic_gates.swap import CSwap
+from qualtran.bloqs.data_loading.hashable_array import as_readonly_array, HashableArray
 from qualtran.bloqs.data_loading.qrom import QROM
 from qualtran.bloqs.select_and_prepare import PrepareOracle
 from qualtran.bloqs.state_preparation.prepare_uniform_superposition import (
@@ -89,8 +90,8 @@ class StatePreparationAliasSampling(PrepareOracle):
     selection_registers: Tuple[Register, ...] = attrs.field(
         converter=lambda v: (v,) if isinstance(v, Register) else tuple(v)
     )
-    alt: NDArray[np.int_]
-    keep: NDArray[np.int_]
+    alt: NDArray[np.int_] = attrs.field(converter=as_readonly_array)
+    keep: NDArray[np.int_] = attrs.field(converter=as_readonly_array)
     mu: int
 
     @classmethod
@@ -144,13 +145,12 @@ class StatePreparationAliasSampling(PrepareOracle):
             )
         )
 
+    @cached_property
+    def _hashable_data(self) -> Tuple[HashableArray, HashableArray]:
+        return HashableArray(self.alt), HashableArray(self.keep)
+
     def _value_equality_values_(self):
-        return (
-            self.selection_registers,
-            tuple(self.alt.ravel()),
-            tuple(self.keep.ravel()),
-            self.mu,
-        )
+        return (self.selection_registers, *self._hashable_data, self.mu)
 
     def decompose_from_registers(
         self,
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import attrs
 import cirq
 import numpy as np
 import pytest
@@ -62,6 +63,16 @@ def test_state_preparation_via_coherent_alias_for_0_mu():
     assert_state_preparation_valid_for_coefficient(lcu_coefficients, 2e-1)
 
 
+def test_state_preparation_via_coherent_alias_sampling_eq():
+    lcu_coefficients = get_1d_Ising_lcu_coeffs(4)
+    bloq = StatePreparationAliasSampling.from_lcu_probs(lcu_coefficients.tolist())
+    other = StatePreparationAliasSampling.from_lcu_probs(lcu_coefficients.tolist())
+    assert bloq == other
+    assert hash(bloq) == hash(other)
+    assert not bloq.alt.flags.writeable
+    assert bloq != attrs.evolve(bloq, keep=bloq.keep ^ 1)
+
+
 def test_state_preparation_via_coherent_alias_sampling_diagram():
     data = np.asarray(range(1, 5)) / np.sum(range(1, 5))
     gate = StatePreparationAliasSampling.from_lcu_probs(
@@ -73,11 +73,11 @@ References:
 
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 import attrs
 import numpy as np
-from numpy.typing import ArrayLike
+from numpy.typing import ArrayLike, DTypeLike, NDArray
 
 from qualtran import (
     Bloq,
@@ -352,82 +352,133 @@ class RotationTree:
     The rotation angles are used to encode the amplitude of a state using the method described in
     [1], section on arbitrary quantum state preparation, page 3.
 
+    All the angles are computed with array operations, one level of the tree at a time. The state
+    is read in aligned chunks of `chunk_size` coefficients, so it can be e.g. a memory-mapped
+    array that does not fit in memory. Only the sums of the probabilities over each chunk and the
+    ROM values themselves are kept in memory for the whole state.
+
+    Args:
+        state: The coefficients of the state, of length a power of two.
+        phase_bitsize: The number of bits of the ROM values.
+        uncompute: Whether to compute the ROM values for the adjoint of the state preparation.
+        dtype: The floating point type used to compute the angles. `np.float32` halves the memory
+            used, at the cost of precision; it is only suitable for small `phase_bitsize`.
+        chunk_size: The (maximum) number of coefficients of the state processed at once.
+
     References:
         [Trading T-gates for dirty qubits in state preparation and unitary synthesis]
         (https://arxiv.org/abs/1812.00954).
             Low, Kliuchnikov, Schaeffer. 2018.
     """
 
-    def __init__(self, state: ArrayLike, phase_bitsize: int, uncompute: bool = False):
+    def __init__(
+        self,
+        state: ArrayLike,
+        phase_bitsize: int,
+        uncompute: bool = False,
+        dtype: DTypeLike = np.float64,
+        chunk_size: int = 2**20,
+    ):
+        # This does not copy (or read) memory-mapped arrays.
+        state = np.asarray(state)
         self.state_bitsize = (len(state) - 1).bit_length()
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != 'f':
+            raise ValueError(f"dtype must be a floating point type, not {self.dtype}.")
+        # The largest power of two that is at most `chunk_size` and `len(state)`.
+        self.chunk_size = 1 << min(int(chunk_size).bit_length() - 1, self.state_bitsize)
         self._calc_amplitude_angles_and_rv(state, phase_bitsize, uncompute)
         self._calc_phase_rom_values(state, phase_bitsize, uncompute)
 
     def get_rom_vals(self) -> Tuple[List[List[int]], List[int]]:
-        return self.amplitude_rom_values, self.phase_rom_values
+        return (
+            [layer.tolist() for layer in self.amplitude_rom_values],
+            self.phase_rom_values.tolist(),
+        )
+
+    def _chunks(self, state: NDArray) -> Iterator[Tuple[int, NDArray]]:
+        for start in range(0, 2**self.state_bitsize, self.chunk_size):
+            yield start, np.asarray(state[start : start + self.chunk_size])
 
     def _calc_amplitude_angles_and_rv(
-        self, state: ArrayLike, phase_bitsize: int, uncompute: bool
+        self, state: NDArray, phase_bitsize: int, uncompute: bool
     ) -> None:
         r"""Gives a list of the ROM values to be loaded for preparing the amplitudes of a state.
 
-        The ith element of the returned list is another list with the rom values to be loaded when
+        The ith element of the returned list is an array with the rom values to be loaded when
         preparing the amplitudes of the ith qubit for the given state.
         """
-        slen = len(state)
-        self.sum_total = np.zeros(2 * slen)
-        for i in range(slen):
-            self.sum_total[i + slen] = abs(state[i]) ** 2
-        for i in range(slen - 1, 0, -1):
-            self.sum_total[i] = self.sum_total[i << 1] + self.sum_total[(i << 1) | 1]
-        self.amplitude_rom_values: List[List[int]] = []
-        for i in range(self.state_bitsize):
-            rom_vals_this_layer: List[int] = []
-            for node in range(1 << i, 1 << (i + 1)):
-                angle = self._angle_0(node)
+        n = self.state_bitsize
+        n_chunk = self.chunk_size.bit_length() - 1
+        self.amplitude_rom_values: List[NDArray] = [
+            np.zeros(2**i, dtype=np.int64) for i in range(n)
+        ]
+
+        def add_layers(sums: NDArray, depth: int, start: int) -> NDArray:
+            # `sums` holds the probabilities of the nodes `start, start + 1, ...` at `depth`.
+            n_levels = len(sums).bit_length() - 1
+            for i in reversed(range(depth - n_levels, depth)):
+                left = sums[0::2]
+                sums = left + sums[1::2]
+                angles = self._angle_0(left, sums)
                 if uncompute:
-                    angle = 2 * np.pi - angle
-                rom_val = RotationTree._angle_to_rom_value(angle, phase_bitsize)
-                rom_vals_this_layer.append(rom_val)
-            self.amplitude_rom_values.append(rom_vals_this_layer)
+                    angles = 2 * np.pi - angles
+                start >>= 1
+                self.amplitude_rom_values[i][start : start + len(sums)] = self._angle_to_rom_value(
+                    angles, phase_bitsize
+                )
+            return sums
 
-    def _calc_phase_rom_values(self, state: ArrayLike, phase_bitsize: int, uncompute: bool) -> None:
+        # Build the bottom `n_chunk` levels of the tree one chunk at a time.
+        chunk_sums = np.zeros(2 ** (n - n_chunk), dtype=self.dtype)
+        for start, chunk in self._chunks(state):
+            probs = np.square(np.abs(chunk)).astype(self.dtype, copy=False)
+            chunk_sums[start >> n_chunk] = add_layers(probs, n, start)[0]
+        # and the top levels from the total probability of each chunk.
+        add_layers(chunk_sums, n - n_chunk, 0)
+
+    def _calc_phase_rom_values(self, state: NDArray, phase_bitsize: int, uncompute: bool) -> None:
         """Computes the rom value to be loaded to get the phase for each coefficient of the state.
 
         As we are using the equivalent to controlled Z to do the rotations instead of Rz, there
         is a phase offset for each coefficient that has to be corrected. This offset is half of the
         turn angle applied, and is added to the phase for each coefficient.
         """
-        offsets = np.zeros(2**self.state_bitsize)
-        for i in range(self.state_bitsize):
-            rang = 2 ** (self.state_bitsize - i)
-            for j in range(2**i):
-                arv = self.amplitude_rom_values[i][j]
-                if uncompute:
-                    arv = -arv % 2**phase_bitsize
-                offsets[j * rang : (j + 1) * rang] += (np.pi * arv / (2**phase_bitsize)) % np.pi
-        angles = np.array([np.angle(c) for c in state])
-        # flip angle if uncompute
-        angles = [(1 - 2 * uncompute) * (a - o) for a, o in zip(angles, offsets)]
-        self.phase_rom_values: List[int] = [
-            RotationTree._angle_to_rom_value(a, phase_bitsize) for a in angles
-        ]
-
-    def _angle_0(self, idx: int) -> float:
-        r"""Angle that corresponds to p_0."""
-        return 2 * np.arccos(np.sqrt(self._p0(idx)))
+        n = self.state_bitsize
+        layer_offsets = []
+        for i in range(n):
+            arv = self.amplitude_rom_values[i]
+            if uncompute:
+                arv = -arv % 2**phase_bitsize
+            layer_offsets.append(
+                ((np.pi * arv / (2**phase_bitsize)) % np.pi).astype(self.dtype, copy=False)
+            )
+        self.phase_rom_values = np.zeros(2**n, dtype=np.int64)
+        for start, chunk in self._chunks(state):
+            offsets = np.zeros(len(chunk), dtype=self.dtype)
+            idx = np.arange(start, start + len(chunk))
+            for i in range(n):
+                # Each node of the ith layer is the parent of `2**(n - i)` coefficients.
+                offsets += layer_offsets[i][idx >> (n - i)]
+            angles = np.angle(chunk).astype(self.dtype, copy=False)
+            # flip angle if uncompute
+            angles = (1 - 2 * uncompute) * (angles - offsets)
+            self.phase_rom_values[start : start + len(chunk)] = self._angle_to_rom_value(
+                angles, phase_bitsize
+            )
 
-    def _p0(self, idx: int) -> float:
-        if self.sum_total[idx] == 0:
-            return 0
-        return self.sum_total[idx << 1] / self.sum_total[idx]
+    @staticmethod
+    def _angle_0(left: NDArray, total: NDArray) -> NDArray:
+        r"""Angles that correspond to p_0, the probability of the left child of each node."""
+        p0 = np.divide(left, total, out=np.zeros_like(total), where=total != 0)
+        return 2 * np.arccos(np.sqrt(p0))
 
     @staticmethod
-    def _angle_to_rom_value(angle: float, phase_bitsize: int) -> int:
-        r"""Given an angle, returns the value to be loaded in ROM.
+    def _angle_to_rom_value(angle: NDArray, phase_bitsize: int) -> NDArray:
+        r"""Given angles, returns the values to be loaded in ROM.
 
-        Returns the value to be loaded to a QROM to encode the given angle with a certain value of
-        phase_bitsize.
+        Returns the values to be loaded to a QROM to encode the given angles with a certain value
+        of phase_bitsize.
         """
         rom_value_decimal = 2**phase_bitsize * angle / (2 * np.pi)
-        return round(rom_value_decimal) % (2**phase_bitsize)
+        return np.rint(rom_value_decimal).astype(np.int64) % (2**phase_bitsize)
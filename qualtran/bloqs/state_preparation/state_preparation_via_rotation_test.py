@@ -22,6 +22,7 @@ from qualtran.bloqs.basic_gates import CNOT, PlusState, ZeroState
 from qualtran.bloqs.rotations.phase_gradient import PhaseGradientState
 from qualtran.bloqs.state_preparation.state_preparation_via_rotation import (
     _state_prep_via_rotation,
+    RotationTree,
     StatePreparationViaRotations,
 )
 from qualtran.testing import assert_valid_bloq_decomposition, execute_notebook
@@ -248,6 +249,35 @@ def test_state_preparation_via_rotation_multi_qubit_ctrl(
     assert np.allclose(result, correct)
 
 
+@pytest.mark.parametrize("uncompute", [False, True])
+def test_rotation_tree_chunks(uncompute: bool):
+    rng = np.random.default_rng(1234)
+    state = rng.normal(size=2**8) + 1j * rng.normal(size=2**8)
+    state[:64] = 0
+    state /= np.linalg.norm(state)
+    expected = RotationTree(state, 7, uncompute).get_rom_vals()
+    for chunk_size in [1, 2, 5, 64, 2**8]:
+        tree = RotationTree(state, 7, uncompute, chunk_size=chunk_size)
+        assert tree.get_rom_vals() == expected
+
+
+def test_rotation_tree_float32(tmp_path):
+    rng = np.random.default_rng(1234)
+    state = rng.normal(size=2**10) + 1j * rng.normal(size=2**10)
+    state /= np.linalg.norm(state)
+    path = tmp_path / 'state.npy'
+    np.save(path, state)
+    ampl_rv, phase_rv = RotationTree(state, 8).get_rom_vals()
+    tree = RotationTree(np.load(path, mmap_mode='r'), 8, dtype=np.float32, chunk_size=2**6)
+    ampl_rv_32, phase_rv_32 = tree.get_rom_vals()
+    for layer, layer_32 in zip(ampl_rv, ampl_rv_32):
+        np.testing.assert_allclose(layer, layer_32, atol=1)
+    # The phases are only compared up to rounding and wrapping around.
+    assert np.all(np.abs((np.array(phase_rv) - phase_rv_32 + 1) % 2**8) <= 2)
+    with pytest.raises(ValueError):
+        RotationTree(state, 8, dtype=np.int64)
+
+
 def test_notebook():
     execute_notebook("state_preparation_via_rotation")
 
@@ -37,7 +37,7 @@ from qualtran import (
 )
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
 from qualtran.drawing import directional_text_box, WireSymbol
-from qualtran.simulation.classical_sim import bits_to_ints, ints_to_bits
+from qualtran.simulation.bit_packing import bits_to_ints, ints_to_bits
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -76,7 +76,7 @@ class Split(Bloq):
         return TComplexity()
 
     def on_classical_vals(self, reg: int) -> Dict[str, 'ClassicalValT']:
-        return {'reg': ints_to_bits(np.array([reg]), self.dtype.num_qubits)[0]}
+        return {'reg': ints_to_bits(reg, self.dtype.num_qubits)[0]}
 
     def add_my_tensors(
         self,
@@ -265,28 +265,14 @@ class Partition(Bloq):
         xbits = ints_to_bits(x, self.n)[0]
         start = 0
         for reg in self.regs:
-            size = np.prod(reg.shape + (reg.bitsize,))
-            bits_reg = xbits[start : start + size]
-            if reg.shape == ():
-                out_vals[reg.name] = bits_to_ints(bits_reg)[0]
-            else:
-                ints_reg = bits_to_ints(
-                    [
-                        bits_reg[i * reg.bitsize : (i + 1) * reg.bitsize]
-                        for i in range(np.prod(reg.shape))
-                    ]
-                )
-                out_vals[reg.name] = np.array(ints_reg).reshape(reg.shape)
+            size = int(np.prod(reg.shape + (reg.bitsize,)))
+            ints_reg = bits_to_ints(xbits[start : start + size].reshape(-1, reg.bitsize))
+            out_vals[reg.name] = ints_reg[0] if reg.shape == () else ints_reg.reshape(reg.shape)
             start += size
         return out_vals
 
     def _classical_unpartition(self, **vals: 'ClassicalValT'):
-        out_vals = []
-        for reg in self.regs:
-            if isinstance(vals[reg.name], np.ndarray):
-                out_vals.append(ints_to_bits(vals[reg.name].ravel(), reg.bitsize).ravel())
-            else:
-                out_vals.append(ints_to_bits(vals[reg.name], reg.bitsize)[0])
+        out_vals = [ints_to_bits(vals[reg.name], reg.bitsize).reshape(-1) for reg in self.regs]
         big_int = np.concatenate(out_vals)
         return {'x': bits_to_ints(big_int)[0]}
 
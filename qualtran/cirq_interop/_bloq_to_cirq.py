@@ -17,6 +17,7 @@
 from functools import cached_property
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+import attrs
 import cirq
 import networkx as nx
 import numpy as np
@@ -25,6 +26,7 @@ from numpy.typing import NDArray
 from qualtran import (
     Bloq,
     Connection,
+    DanglingT,
     DecomposeNotImplementedError,
     DecomposeTypeError,
     LeftDangle,
@@ -41,7 +43,7 @@ from qualtran._infra.gate_with_registers import (
     split_qubits,
     total_bits,
 )
-from qualtran.cirq_interop._cirq_to_bloq import _QReg, CirqQuregInT, CirqQuregT
+from qualtran.cirq_interop._cirq_to_bloq import CirqQuregInT, CirqQuregT
 from qualtran.cirq_interop._interop_qubit_manager import InteropQubitManager
 from qualtran.drawing import Circle, LarrowTextBox, ModPlus, RarrowTextBox, TextBox, WireSymbol
 
@@ -188,43 +190,131 @@ class BloqAsCirqGate(cirq.Gate):
         return f'BloqAsCirqGate({self.bloq})'
 
 
-def _track_soq_name_changes(cxns: Iterable[Connection], qvar_to_qreg: Dict[Soquet, _QReg]):
+_SoqKey = Tuple[Union[int, DanglingT], str, Side, Tuple[int, ...]]
+
+
+def _soq_key(soq: Soquet) -> _SoqKey:
+    """A cheap-to-hash key identifying `soq` within a single composite bloq.
+
+    Hashing a `Soquet` recursively hashes its bloq instance, bloq and register, which dominates
+    the export time of large composite bloqs. Bloq instance indices are unique within a
+    composite bloq, so they can stand in for the bloq instance.
+    """
+    binst = soq.binst
+    binst_key = binst if isinstance(binst, DanglingT) else binst.i
+    return binst_key, soq.reg.name, soq.reg.side, soq.idx
+
+
+@attrs.frozen(eq=False)
+class _CirqOpTemplate:
+    """A bloq's cirq operation, expressed in terms of positions of its flattened input qubits.
+
+    Templates are built from the operation of the first instance of each distinct bloq and are
+    then re-targeted to the actual qubits of every later instance of the bloq.
+
+    Attributes:
+        in_reg_names: Names of the bloq's left registers, in the order their qubits are flattened.
+        op: The cirq operation acting on the qubits of the first instance, or None.
+        op_qubit_idxs: For each qubit of `op`, its position among the flattened input qubits.
+        out_qubit_idxs: For each right register, the positions of its output qubits among the
+            flattened input qubits.
+    """
+
+    in_reg_names: Tuple[str, ...]
+    op: Optional[cirq.Operation]
+    op_qubit_idxs: Tuple[int, ...]
+    out_qubit_idxs: Dict[str, NDArray[np.int_]]
+
+    def on(
+        self, in_quregs: Dict[str, CirqQuregT]
+    ) -> Tuple[Optional[cirq.Operation], Dict[str, CirqQuregT]]:
+        qubits = np.concatenate([in_quregs[name].reshape(-1) for name in self.in_reg_names])
+        op = None if self.op is None else self.op.with_qubits(*qubits[list(self.op_qubit_idxs)])
+        return op, {name: qubits[idxs] for name, idxs in self.out_qubit_idxs.items()}
+
+
+def _get_cirq_op_template(
+    bloq: Bloq,
+    in_quregs: Dict[str, CirqQuregT],
+    op: Optional[cirq.Operation],
+    out_quregs: Dict[str, CirqQuregT],
+) -> Optional[_CirqOpTemplate]:
+    """Builds a `_CirqOpTemplate` for `bloq`, or returns None if `bloq` can't be templated.
+
+    The template is derived from the result `(op, out_quregs)` of a call to
+    `bloq.as_cirq_op(**in_quregs)`, so building it does not need another call to `as_cirq_op`.
+    Only bloqs with exclusively THRU registers whose `as_cirq_op` neither allocates nor
+    references qubits other than its inputs can be templated; all other bloqs must interact
+    with the qubit manager and are converted on a per-instance basis.
+    """
+    if any(reg.side != Side.THRU for reg in bloq.signature):
+        return None
+    in_reg_names = tuple(reg.name for reg in bloq.signature)
+    in_qubits = [q for name in in_reg_names for q in np.asarray(in_quregs[name]).flat]
+    qubit_to_idx = {q: i for i, q in enumerate(in_qubits)}
+    op_qubits = () if op is None else op.qubits
+    out_qubits = [q for qs in out_quregs.values() for q in np.asarray(qs).flat]
+    if any(q not in qubit_to_idx for q in (*op_qubits, *out_qubits)):
+        return None
+    return _CirqOpTemplate(
+        in_reg_names=in_reg_names,
+        op=op,
+        op_qubit_idxs=tuple(qubit_to_idx[q] for q in op_qubits),
+        out_qubit_idxs={
+            name: np.vectorize(qubit_to_idx.__getitem__, otypes=[int])(np.asarray(qs))
+            for name, qs in out_quregs.items()
+        },
+    )
+
+
+def _track_soq_name_changes(
+    cxns: Iterable[Connection], soq_to_qubits: Dict[_SoqKey, Sequence[cirq.Qid]]
+):
     """Track inter-Bloq name changes across the two ends of a connection."""
     for cxn in cxns:
-        qvar_to_qreg[cxn.right] = qvar_to_qreg[cxn.left]
-        del qvar_to_qreg[cxn.left]
+        soq_to_qubits[_soq_key(cxn.right)] = soq_to_qubits.pop(_soq_key(cxn.left))
 
 
 def _bloq_to_cirq_op(
     bloq: Bloq,
     pred_cxns: Iterable[Connection],
     succ_cxns: Iterable[Connection],
-    qvar_to_qreg: Dict[Soquet, _QReg],
+    soq_to_qubits: Dict[_SoqKey, Sequence[cirq.Qid]],
     qubit_manager: cirq.QubitManager,
-) -> cirq.Operation:
-    _track_soq_name_changes(pred_cxns, qvar_to_qreg)
+    op_templates: Optional[Dict[Bloq, Optional[_CirqOpTemplate]]] = None,
+) -> Optional[cirq.Operation]:
+    _track_soq_name_changes(pred_cxns, soq_to_qubits)
     in_quregs: Dict[str, CirqQuregT] = {
         reg.name: np.empty((*reg.shape, reg.bitsize), dtype=object)
         for reg in bloq.signature.lefts()
     }
     # Construct the cirq qubit registers using input / output connections.
-    # 1. All input Soquets should already have the correct mapping in `qvar_to_qreg`.
+    # 1. All input Soquets should already have the correct mapping in `soq_to_qubits`.
     for cxn in pred_cxns:
         soq = cxn.right
-        assert soq in qvar_to_qreg, f"{soq=} should exist in {qvar_to_qreg=}."
-        in_quregs[soq.reg.name][soq.idx] = qvar_to_qreg[soq].qubits
+        soq_key = _soq_key(soq)
+        assert soq_key in soq_to_qubits, f"{soq=} should exist in {soq_to_qubits=}."
+        in_quregs[soq.reg.name][soq.idx] = soq_to_qubits[soq_key]
         if soq.reg.side == Side.LEFT:
-            # Remove soquets for LEFT registers from qvar_to_qreg mapping.
-            del qvar_to_qreg[soq]
-
-    op, out_quregs = bloq.as_cirq_op(qubit_manager=qubit_manager, **in_quregs)
+            # Remove soquets for LEFT registers from soq_to_qubits mapping.
+            del soq_to_qubits[soq_key]
+
+    template = None if op_templates is None else op_templates.get(bloq)
+    if template is None:
+        op, out_quregs = bloq.as_cirq_op(qubit_manager=qubit_manager, **in_quregs)
+        if op_templates is not None and bloq not in op_templates:
+            # Bloqs that can't be templated are cached as None, so that `as_cirq_op` is
+            # only ever called once per instance.
+            op_templates[bloq] = _get_cirq_op_template(bloq, in_quregs, op, out_quregs)
+    else:
+        op, out_quregs = template.on(in_quregs)
 
     # 2. Update the mappings based on output soquets and `out_quregs`.
     for cxn in succ_cxns:
         soq = cxn.left
         assert soq.reg.name in out_quregs, f"{soq=} should exist in {out_quregs=}."
         if soq.reg.side == Side.RIGHT:
-            qvar_to_qreg[soq] = _QReg(out_quregs[soq.reg.name][soq.idx])
+            soq_to_qubits[_soq_key(soq)] = tuple(np.asarray(out_quregs[soq.reg.name][soq.idx]).flat)
     return op
 
 
@@ -236,6 +326,9 @@ def _cbloq_to_cirq_circuit(
 ) -> Tuple[cirq.FrozenCircuit, Dict[str, 'CirqQuregT']]:
     """Propagate `as_cirq_op` calls through a composite bloq's contents to export a `cirq.Circuit`.
 
+    Operations for bloqs that occur repeatedly are only constructed once; subsequent
+    instances re-target a cached operation template to their qubits. See `_CirqOpTemplate`.
+
     Args:
         signature: The cbloq's signature for validating inputs and outputs.
         cirq_quregs: Mapping from left register name to Cirq qubit arrays.
@@ -246,12 +339,13 @@ def _cbloq_to_cirq_circuit(
         circuit: The cirq.FrozenCircuit version of this composite bloq.
         cirq_quregs: The output mapping from right register names to Cirq qubit arrays.
     """
-    cirq_quregs = {k: np.apply_along_axis(_QReg, -1, v) for k, v in cirq_quregs.items()}
-    qvar_to_qreg: Dict[Soquet, _QReg] = {
-        Soquet(LeftDangle, idx=idx, reg=reg): cirq_quregs[reg.name][idx]
-        for reg in signature.lefts()
-        for idx in reg.all_idxs()
-    }
+    soq_to_qubits: Dict[_SoqKey, Sequence[cirq.Qid]] = {}
+    for reg in signature.lefts():
+        quregs = np.asarray(cirq_quregs[reg.name])
+        for idx in reg.all_idxs():
+            soq_to_qubits[LeftDangle, reg.name, reg.side, idx] = tuple(quregs[idx].flat)
+
+    op_templates: Dict[Bloq, Optional[_CirqOpTemplate]] = {}
     moments: List[cirq.Moment] = []
     for binsts in nx.topological_generations(binst_graph):
         moment: List[cirq.Operation] = []
@@ -261,26 +355,27 @@ def _cbloq_to_cirq_circuit(
                 continue
             pred_cxns, succ_cxns = _binst_to_cxns(binst, binst_graph=binst_graph)
             if binst is RightDangle:
-                _track_soq_name_changes(pred_cxns, qvar_to_qreg)
+                _track_soq_name_changes(pred_cxns, soq_to_qubits)
                 continue
 
-            op = _bloq_to_cirq_op(binst.bloq, pred_cxns, succ_cxns, qvar_to_qreg, qubit_manager)
+            op = _bloq_to_cirq_op(
+                binst.bloq, pred_cxns, succ_cxns, soq_to_qubits, qubit_manager, op_templates
+            )
             if op is not None:
                 moment.append(op)
         if moment:
-            moments.append(cirq.Moment(moment))
+            moments.append(cirq.Moment.from_ops(*moment))
 
-    # Find output Cirq quregs using `qvar_to_qreg` mapping for registers in `signature.rights()`.
+    # Find output Cirq quregs using `soq_to_qubits` mapping for registers in `signature.rights()`.
     def _f_quregs(reg: Register) -> CirqQuregT:
         ret = np.empty(reg.shape + (reg.bitsize,), dtype=object)
         for idx in reg.all_idxs():
-            soq = Soquet(RightDangle, idx=idx, reg=reg)
-            ret[idx] = qvar_to_qreg[soq].qubits
+            ret[idx] = soq_to_qubits[RightDangle, reg.name, reg.side, idx]
         return ret
 
     out_quregs = {reg.name: _f_quregs(reg) for reg in signature.rights()}
 
-    return cirq.FrozenCircuit(moments), out_quregs
+    return cirq.FrozenCircuit.from_moments(*moments), out_quregs
 
 
 def _wire_symbol_to_cirq_diagram_info(
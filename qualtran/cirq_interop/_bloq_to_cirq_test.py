@@ -12,7 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import cirq
 import numpy as np
@@ -21,11 +21,11 @@ from attrs import frozen
 
 from qualtran import Bloq, BloqBuilder, Signature, Soquet, SoquetT
 from qualtran._infra.gate_with_registers import get_named_qubits
-from qualtran.bloqs.basic_gates import Toffoli, XGate
+from qualtran.bloqs.basic_gates import CNOT, Toffoli, XGate
 from qualtran.bloqs.factoring import ModExp
 from qualtran.bloqs.mcmt.and_bloq import And, MultiAnd
 from qualtran.bloqs.swap_network import SwapWithZero
-from qualtran.cirq_interop._bloq_to_cirq import BloqAsCirqGate, CirqQuregT
+from qualtran.cirq_interop._bloq_to_cirq import _get_cirq_op_template, BloqAsCirqGate, CirqQuregT
 from qualtran.cirq_interop.t_complexity_protocol import t_complexity
 from qualtran.testing import execute_notebook
 
@@ -118,6 +118,97 @@ def test_multi_and_allocates():
     assert sorted(out_quregs.keys()) == ['ctrl', 'junk', 'target']
 
 
+@frozen
+class RelabelSwapTest(Bloq):
+    @property
+    def signature(self):
+        return Signature.build(x=1, y=1)
+
+    def as_cirq_op(
+        self, qubit_manager: cirq.QubitManager, x: CirqQuregT, y: CirqQuregT
+    ) -> Tuple[None, Dict[str, CirqQuregT]]:
+        return None, {'x': y, 'y': x}
+
+
+def _cirq_op_template(bloq: Bloq):
+    in_quregs = get_named_qubits(bloq.signature.lefts())
+    op, out_quregs = bloq.as_cirq_op(cirq.ops.SimpleQubitManager(), **in_quregs)
+    return _get_cirq_op_template(bloq, in_quregs, op, out_quregs)
+
+
+def test_cirq_op_template():
+    template = _cirq_op_template(Toffoli())
+    assert template is not None
+    ctrl, target = np.array(cirq.LineQubit.range(2)).reshape((2, 1)), cirq.LineQubit(5)
+    op, out_quregs = template.on({'ctrl': ctrl, 'target': np.array([target])})
+    assert op == cirq.CCNOT(*ctrl.flat, target)
+    np.testing.assert_array_equal(out_quregs['ctrl'], ctrl)
+    np.testing.assert_array_equal(out_quregs['target'], [target])
+
+    template = _cirq_op_template(RelabelSwapTest())
+    assert template is not None
+    x, y = cirq.LineQubit.range(2)
+    op, out_quregs = template.on({'x': np.array([x]), 'y': np.array([y])})
+    assert op is None
+    assert out_quregs['x'] == [y] and out_quregs['y'] == [x]
+
+    # Bloqs that allocate or free qubits can't be templated.
+    assert _cirq_op_template(And()) is None
+    qm = cirq.ops.SimpleQubitManager()
+    ctrl = np.array(cirq.LineQubit.range(2)).reshape((2, 1))
+    _, in_quregs = And().as_cirq_op(qm, ctrl=ctrl)
+    op, out_quregs = And().adjoint().as_cirq_op(qm, **in_quregs)
+    assert _get_cirq_op_template(And().adjoint(), in_quregs, op, out_quregs) is None
+
+
+@frozen(eq=False)
+class CountingAllocTest(Bloq):
+    calls: List[int]
+
+    @property
+    def signature(self):
+        return Signature.build(x=1)
+
+    def as_cirq_op(
+        self, qubit_manager: cirq.QubitManager, x: CirqQuregT
+    ) -> Tuple[cirq.Operation, Dict[str, CirqQuregT]]:
+        self.calls.append(1)
+        (anc,) = qubit_manager.qalloc(1)
+        op = cirq.CNOT(*x, anc)
+        qubit_manager.qfree([anc])
+        return op, {'x': x}
+
+
+def test_untemplatable_bloq_as_cirq_op_called_once_per_instance():
+    calls: List[int] = []
+    bloq = CountingAllocTest(calls)
+    bb = BloqBuilder()
+    x = bb.add_register('x', 1)
+    for _ in range(3):
+        x = bb.add(bloq, x=x)
+    cbloq = bb.finalize(x=x)
+    circuit, _ = cbloq.to_cirq_circuit(x=cirq.LineQubit.range(1))
+    assert len(calls) == 3
+    assert len(list(circuit.all_operations())) == 3
+
+
+def test_repeated_bloqs_to_cirq():
+    bb = BloqBuilder()
+    q0, q1, q2 = bb.add_register('q0', 1), bb.add_register('q1', 1), bb.add_register('q2', 1)
+    for _ in range(2):
+        (q0, q1), q2 = bb.add(Toffoli(), ctrl=[q0, q1], target=q2)
+        q2, q0 = bb.add(CNOT(), ctrl=q2, target=q0)
+        q1 = bb.add(XGate(), q=q1)
+    cbloq = bb.finalize(q0=q0, q1=q1, q2=q2)
+    qs = cirq.LineQubit.range(3)
+    circuit, out_quregs = cbloq.to_cirq_circuit(q0=[qs[0]], q1=[qs[1]], q2=[qs[2]])
+    assert circuit == cirq.FrozenCircuit(
+        [cirq.CCNOT(*qs), cirq.Moment(cirq.CNOT(qs[2], qs[0]), cirq.X(qs[1]))] * 2
+    )
+    for i, q in enumerate(qs):
+        np.testing.assert_array_equal(out_quregs[f'q{i}'], [q])
+
+
 def test_contruct_op_from_gate():
     and_gate = And()
     in_quregs = {'ctrl': np.array([*cirq.LineQubit.range(2)]).reshape(2, 1)}
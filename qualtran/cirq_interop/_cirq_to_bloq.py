@@ -15,10 +15,12 @@
 """Cirq gates/circuits to Qualtran Bloqs conversion."""
 import abc
 import itertools
+import threading
 from collections import defaultdict
 from functools import cached_property
-from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING, Union
 
+import cachetools
 import cirq
 import numpy as np
 import quimb.tensor as qtn
@@ -42,7 +44,6 @@ from qualtran import (
 from qualtran._infra.gate_with_registers import (
     _get_all_and_output_quregs_from_input,
     get_named_qubits,
-    split_qubits,
 )
 from qualtran.cirq_interop._interop_qubit_manager import InteropQubitManager
 from qualtran.cirq_interop.t_complexity_protocol import t_complexity, TComplexity
@@ -251,50 +252,69 @@ class _QReg:
     )
 
 
-def _ensure_in_reg_exists(
-    bb: BloqBuilder, in_reg: _QReg, qreg_to_qvar: Dict[_QReg, Soquet]
-) -> None:
-    """Takes care of qubit allocations, split and joins to ensure `qreg_to_qvar[in_reg]` exists."""
-    all_mapped_qubits = {q for qreg in qreg_to_qvar for q in qreg.qubits}
-    qubits_to_allocate: List[cirq.Qid] = [q for q in in_reg.qubits if q not in all_mapped_qubits]
-    if qubits_to_allocate:
-        qreg_to_qvar[_QReg(qubits_to_allocate)] = bb.allocate(len(qubits_to_allocate))
-
-    if in_reg in qreg_to_qvar:
-        # This is the easy case when no split / joins are needed.
-        return
-
-    # a. Split all registers containing at-least one qubit corresponding to `in_reg`.
-    in_reg_qubits = set(in_reg.qubits)
-
-    new_qreg_to_qvar: Dict[_QReg, Soquet] = {}
-    for qreg, soq in qreg_to_qvar.items():
-        if len(qreg.qubits) > 1 and any(q in qreg.qubits for q in in_reg_qubits):
-            new_qreg_to_qvar |= {_QReg(q): s for q, s in zip(qreg.qubits, bb.split(soq=soq))}
-        else:
-            new_qreg_to_qvar[qreg] = soq
-    qreg_to_qvar.clear()
-
-    # b. Join all 1-bit registers, corresponding to individual qubits, that make up `in_reg`.
-    soqs_to_join: Dict[cirq.Qid, Soquet] = {}
-    for qreg, soq in new_qreg_to_qvar.items():
-        if len(in_reg_qubits) > 1 and qreg.qubits and qreg.qubits[0] in in_reg_qubits:
-            assert len(qreg.qubits) == 1, "Individual qubits should have been split by now."
-            soqs_to_join[qreg.qubits[0]] = soq
-        else:
-            qreg_to_qvar[qreg] = soq
-    if soqs_to_join:
-        qreg_to_qvar[in_reg] = bb.join(np.array([soqs_to_join[q] for q in in_reg.qubits]))
+class _QRegToQVar:
+    """Tracks the Soquet (i.e. quantum variable) holding each live register of cirq qubits.
+
+    Alongside the `_QReg` to `Soquet` mapping, an index from every individual live qubit to the
+    `_QReg` containing it is maintained, so that looking up, splitting and joining the registers
+    touched by an operation costs time proportional to the size of the operation rather than to
+    the number of live qubits.
+    """
+
+    def __init__(self):
+        self._qreg_to_qvar: Dict[_QReg, Soquet] = {}
+        self._qubit_to_qreg: Dict[cirq.Qid, _QReg] = {}
+
+    def __contains__(self, qreg: _QReg) -> bool:
+        return qreg in self._qreg_to_qvar
+
+    def __getitem__(self, qreg: _QReg) -> Soquet:
+        return self._qreg_to_qvar[qreg]
+
+    def __setitem__(self, qreg: _QReg, qvar: Soquet):
+        self._qreg_to_qvar[qreg] = qvar
+        for q in qreg.qubits:
+            self._qubit_to_qreg[q] = qreg
+
+    def pop(self, qreg: _QReg) -> Soquet:
+        for q in qreg.qubits:
+            del self._qubit_to_qreg[q]
+        return self._qreg_to_qvar.pop(qreg)
+
+    def qvars(self) -> Iterable[Soquet]:
+        return self._qreg_to_qvar.values()
+
+    def ensure_in_reg_exists(self, bb: BloqBuilder, in_reg: _QReg) -> None:
+        """Takes care of qubit allocations, split and joins to ensure `self[in_reg]` exists."""
+        qubits_to_allocate = [q for q in in_reg.qubits if q not in self._qubit_to_qreg]
+        if qubits_to_allocate:
+            self[_QReg(qubits_to_allocate)] = bb.allocate(len(qubits_to_allocate))
+
+        if in_reg in self._qreg_to_qvar:
+            # This is the easy case when no split / joins are needed.
+            return
+
+        # a. Split all registers containing at-least one qubit corresponding to `in_reg`.
+        for qreg in dict.fromkeys(self._qubit_to_qreg[q] for q in in_reg.qubits):
+            if len(qreg.qubits) > 1:
+                soqs = bb.split(soq=self.pop(qreg))
+                for q, soq in zip(qreg.qubits, soqs):
+                    self[_QReg(q)] = soq
+
+        # b. Join all 1-bit registers, corresponding to individual qubits, that make up `in_reg`.
+        if len(in_reg.qubits) > 1:
+            soqs_to_join = [self.pop(_QReg(q)) for q in in_reg.qubits]
+            self[in_reg] = bb.join(np.array(soqs_to_join))
 
 
 def _gather_input_soqs(
-    bb: BloqBuilder, op_quregs: Dict[str, NDArray[_QReg]], qreg_to_qvar: Dict[_QReg, Soquet]
+    bb: BloqBuilder, op_quregs: Dict[str, NDArray[_QReg]], qreg_to_qvar: _QRegToQVar
 ) -> Dict[str, NDArray[Soquet]]:
     qvars_in: Dict[str, NDArray[Soquet]] = {}
     for reg_name, quregs in op_quregs.items():
         flat_soqs: List[Soquet] = []
         for qureg in quregs.flatten():
-            _ensure_in_reg_exists(bb, qureg, qreg_to_qvar)
+            qreg_to_qvar.ensure_in_reg_exists(bb, qureg)
             flat_soqs.append(qreg_to_qvar[qureg])
         qvars_in[reg_name] = np.array(flat_soqs).reshape(quregs.shape)
     return qvars_in
@@ -383,6 +403,45 @@ def _extract_bloq_from_op(op: 'cirq.Operation') -> Bloq:
     return _cirq_gate_to_bloq(op.gate)
 
 
+def _extract_bloq_from_op_cached(op: 'cirq.Operation', gate_to_bloq: Dict[cirq.Gate, Bloq]) -> Bloq:
+    """Memoized version of `_extract_bloq_from_op`, keyed by the operation's gate."""
+    gate = op.gate
+    if gate is None:
+        return _extract_bloq_from_op(op)
+    try:
+        if gate in gate_to_bloq:
+            return gate_to_bloq[gate]
+    except TypeError:
+        # Unhashable gate.
+        return _extract_bloq_from_op(op)
+    bloq = gate_to_bloq[gate] = _extract_bloq_from_op(op)
+    return bloq
+
+
+def _qubit_slices_by_register(signature: Signature) -> List[Tuple[Register, List[slice]]]:
+    """For each register, the slices of a flat list of qubits that make up each of its soquets.
+
+    The flat list of qubits is ordered as in `split_qubits`. Registers are returned in signature
+    order; each register's slices are ordered as its soquets in `Register.all_idxs()`.
+    """
+    layout: List[Tuple[Register, List[slice]]] = []
+    base = 0
+    for reg in signature:
+        n_soqs = int(np.prod(reg.shape))
+        slices = [
+            slice(base + i * reg.bitsize, base + (i + 1) * reg.bitsize) for i in range(n_soqs)
+        ]
+        layout.append((reg, slices))
+        base += reg.total_bits()
+    return layout
+
+
+def _unflatten_soqs(flat_soqs: List[Soquet], reg: Register) -> Union[Soquet, NDArray[Soquet]]:
+    if not reg.shape:
+        return flat_soqs[0]
+    return np.array(flat_soqs).reshape(reg.shape)
+
+
 def cirq_optree_to_cbloq(
     optree: cirq.OP_TREE,
     *,
@@ -420,15 +479,18 @@ def cirq_optree_to_cbloq(
     Any qubit in `optree` which is not part of `in_quregs` and `out_quregs` is considered to be
     allocated & deallocated inside the CompositeBloq and does not show up in it's signature.
     """
-    circuit = cirq.Circuit(optree)
     if signature is None:
         if in_quregs is not None or out_quregs is not None:
             raise ValueError("`in_quregs` / `out_quregs` requires specifying `signature`.")
-        all_qubits = sorted(circuit.all_qubits())
+        # The set of qubits is only known once the entire OP-TREE has been consumed.
+        ops: Iterable[cirq.Operation] = list(cirq.flatten_to_ops(optree))
+        all_qubits = sorted(set(q for op in ops for q in op.qubits))
         signature = Signature([Register('qubits', QBit(), shape=(len(all_qubits),))])
         in_quregs = out_quregs = {'qubits': np.array(all_qubits).reshape(len(all_qubits), 1)}
     elif in_quregs is None or out_quregs is None:
         raise ValueError("`signature` requires specifying both `in_quregs` and `out_quregs`.")
+    else:
+        ops = cirq.flatten_to_ops(optree)
 
     in_quregs = {k: np.apply_along_axis(_QReg, -1, v) for k, v in in_quregs.items()}
     out_quregs = {k: np.apply_along_axis(_QReg, -1, v) for k, v in out_quregs.items()}
@@ -436,7 +498,7 @@ def cirq_optree_to_cbloq(
     bb, initial_soqs = BloqBuilder.from_signature(signature, add_registers_allowed=False)
 
     # 1. Compute qreg_to_qvar for input qubits in the LEFT signature.
-    qreg_to_qvar: Dict[_QReg, Soquet] = {}
+    qreg_to_qvar = _QRegToQVar()
     for reg in signature.lefts():
         if reg.name not in in_quregs:
             raise ValueError(f"Register {reg.name} from signature must be present in in_quregs.")
@@ -448,42 +510,50 @@ def cirq_optree_to_cbloq(
                 f"Shape {in_quregs[reg.name].shape} of cirq register "
                 f"{reg.name} should be {soqs.shape}."
             )
-        qreg_to_qvar |= zip(in_quregs[reg.name].flatten(), soqs.flatten())
+        for qreg, soq in zip(in_quregs[reg.name].flatten(), soqs.flatten()):
+            qreg_to_qvar[qreg] = soq
 
-    # 2. Add each operation to the composite Bloq.
-    for op in circuit.all_operations():
-        bloq = _extract_bloq_from_op(op)
-        if bloq.signature == Signature([]):
+    # 2. Add each operation to the composite Bloq. Gates typically repeat many times in large
+    # circuits, so the bloq and the register layout corresponding to each gate are cached.
+    gate_to_bloq: Dict[cirq.Gate, Bloq] = {}
+    bloq_to_layout: Dict[Bloq, List[Tuple[Register, List[slice]]]] = {}
+    for op in ops:
+        bloq = _extract_bloq_from_op_cached(op, gate_to_bloq)
+        if bloq not in bloq_to_layout:
+            bloq_to_layout[bloq] = _qubit_slices_by_register(bloq.signature)
+        layout = bloq_to_layout[bloq]
+        if not layout:
             bb.add(bloq)
             continue
 
-        # 3.1 Find input / output registers.
-        all_op_quregs: Dict[str, NDArray[_QReg]] = {
-            k: np.apply_along_axis(_QReg, -1, v)
-            for k, v in split_qubits(bloq.signature, op.qubits).items()
-        }
-        in_op_quregs: Dict[str, NDArray[_QReg]] = {
-            reg.name: all_op_quregs[reg.name] for reg in bloq.signature.lefts()
-        }
-        # 3.2 Find input Soquets, by potentially allocating new Bloq registers corresponding to
+        # 3.1 Find input Soquets, by potentially allocating new Bloq registers corresponding to
         # input Cirq `in_quregs` and updating the `qreg_to_qvar` mapping.
-        qvars_in = _gather_input_soqs(bb, in_op_quregs, qreg_to_qvar)
-
-        # 3.3 Add Bloq to the `CompositeBloq` compute graph and get corresponding output Soquets.
+        qvars_in: Dict[str, Union[Soquet, NDArray[Soquet]]] = {}
+        for reg, qubit_slices in layout:
+            if reg.side == Side.RIGHT:
+                continue
+            flat_soqs: List[Soquet] = []
+            for qubit_slice in qubit_slices:
+                qureg = _QReg(op.qubits[qubit_slice])
+                qreg_to_qvar.ensure_in_reg_exists(bb, qureg)
+                flat_soqs.append(qreg_to_qvar[qureg])
+            qvars_in[reg.name] = _unflatten_soqs(flat_soqs, reg)
+
+        # 3.2 Add Bloq to the `CompositeBloq` compute graph and get corresponding output Soquets.
         qvars_out = bb.add_d(bloq, **qvars_in)
 
-        # 3.4 Update `qreg_to_qvar` mapping using output soquets `qvars_out`.
-        for reg in bloq.signature:
-            # all_op_quregs should exist for both LEFT & RIGHT registers.
-            assert reg.name in all_op_quregs
-            quregs = all_op_quregs[reg.name]
+        # 3.3 Update `qreg_to_qvar` mapping using output soquets `qvars_out`.
+        for reg, qubit_slices in layout:
             if reg.side == Side.LEFT:
                 # This register got de-allocated, update the `qreg_to_qvar` mapping.
-                for q in quregs.flatten():
-                    _ = qreg_to_qvar.pop(q)
+                for qubit_slice in qubit_slices:
+                    _ = qreg_to_qvar.pop(_QReg(op.qubits[qubit_slice]))
             else:
-                assert quregs.shape == np.array(qvars_out[reg.name]).shape
-                qreg_to_qvar |= zip(quregs.flatten(), np.array(qvars_out[reg.name]).flatten())
+                soqs = qvars_out[reg.name]
+                out_soqs: List[Soquet] = [soqs] if isinstance(soqs, Soquet) else list(soqs.flat)
+                assert len(out_soqs) == len(qubit_slices)
+                for qubit_slice, soq in zip(qubit_slices, out_soqs):
+                    qreg_to_qvar[_QReg(op.qubits[qubit_slice])] = soq
 
     # 4. Combine Soquets to match the right signature.
     final_soqs_dict = _gather_input_soqs(
@@ -491,7 +561,7 @@ def cirq_optree_to_cbloq(
     )
     final_soqs_set = set(soq for soqs in final_soqs_dict.values() for soq in soqs.flatten())
     # 5. Free all dangling Soquets which are not part of the final soquets set.
-    for qvar in qreg_to_qvar.values():
+    for qvar in list(qreg_to_qvar.qvars()):
         if qvar not in final_soqs_set:
             bb.free(qvar)
     return bb.finalize(**final_soqs_dict)
@@ -515,11 +585,25 @@ def decompose_from_cirq_style_method(
     If `Bloq.on()` is used, the bloqs will be retained in their native form in the returned
     composite bloq. If `cirq.Gate.on()` is used, the gates will be wrapped in `CirqGateAsBloq`.
 
+    Decompositions are cached per `(bloq, method_name)`, so repeatedly decomposing equal bloqs
+    (directly or via `BloqAsCirqGate`) only runs the cirq-style method and the conversion to a
+    `CompositeBloq` once. Unhashable bloqs are decomposed without caching. Use
+    `clear_decomposition_cache()` to release cached decompositions.
+
     Args:
         bloq: The bloq to decompose.
         method_name: The string name of the method that can be found on the bloq that
             yields the cirq-style decomposition.
     """
+    try:
+        hash(bloq)
+    except TypeError:
+        return _decompose_from_cirq_style_method.__wrapped__(bloq, method_name)  # type: ignore
+    return _decompose_from_cirq_style_method(bloq, method_name)
+
+
+@cachetools.cached(cachetools.LRUCache(1024), lock=threading.RLock(), info=True)
+def _decompose_from_cirq_style_method(bloq: Bloq, method_name: str) -> CompositeBloq:
     if any(
         cirq.is_parameterized(reg.bitsize) or cirq.is_parameterized(reg.side)
         for reg in bloq.signature
@@ -533,7 +617,16 @@ def decompose_from_cirq_style_method(
     all_quregs, out_quregs = _get_all_and_output_quregs_from_input(bloq.signature, qm, in_quregs)
     context = cirq.DecompositionContext(qubit_manager=qm)
     dfr_method = getattr(bloq, method_name)
-    decomposed_optree = dfr_method(context=context, **all_quregs)
+    decomposed_ops = list(cirq.flatten_to_ops(dfr_method(context=context, **all_quregs)))
+    for op in decomposed_ops:
+        if op.gate is None:
+            # E.g. classically controlled operations from measurement-based uncomputation.
+            raise DecomposeTypeError(f"Cannot decompose {bloq} with non-gate operation {op}.")
     return cirq_optree_to_cbloq(
-        decomposed_optree, signature=bloq.signature, in_quregs=in_quregs, out_quregs=out_quregs
+        decomposed_ops, signature=bloq.signature, in_quregs=in_quregs, out_quregs=out_quregs
     )
+
+
+def clear_decomposition_cache() -> None:
+    """Release the decompositions cached by `decompose_from_cirq_style_method`."""
+    _decompose_from_cirq_style_method.cache_clear()  # type: ignore[attr-defined]
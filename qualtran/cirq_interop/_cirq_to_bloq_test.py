@@ -24,6 +24,7 @@ from qualtran import (
     Bloq,
     BloqBuilder,
     DecomposeNotImplementedError,
+    DecomposeTypeError,
     GateWithRegisters,
     QAny,
     QBit,
@@ -32,10 +33,16 @@ from qualtran import (
     Signature,
 )
 from qualtran._infra.gate_with_registers import get_named_qubits
-from qualtran.bloqs.basic_gates import CNOT, OneState
+from qualtran.bloqs.basic_gates import CNOT, Hadamard, OneState, TGate
 from qualtran.bloqs.mcmt.and_bloq import And
 from qualtran.bloqs.util_bloqs import Allocate, Free, Join, Split
-from qualtran.cirq_interop import cirq_optree_to_cbloq, CirqGateAsBloq, CirqQuregT
+from qualtran.cirq_interop import (
+    cirq_optree_to_cbloq,
+    CirqGateAsBloq,
+    CirqQuregT,
+    clear_decomposition_cache,
+)
+from qualtran.cirq_interop._bloq_to_cirq import BloqAsCirqGate
 from qualtran.cirq_interop.t_complexity_protocol import TComplexity
 
 
@@ -201,6 +208,26 @@ def test_cirq_optree_to_cbloq():
     assert bloqs_list.count(Free(QAny(2))) == 2
 
 
+def test_cirq_optree_to_cbloq_from_generator():
+    qubits = cirq.LineQubit.range(3)
+
+    def optree():
+        for i in range(3):
+            yield [cirq.H(qubits[i]), (cirq.CNOT(qubits[i], qubits[(i + 1) % 3]),)]
+            yield cirq.T(qubits[i])
+
+    signature = Signature([Register('q', QBit(), shape=(3,))])
+    quregs = {'q': np.array(qubits).reshape((3, 1))}
+    cbloq = cirq_optree_to_cbloq(optree(), signature=signature, in_quregs=quregs, out_quregs=quregs)
+    bloqs_list = [binst.bloq for binst in cbloq.bloq_instances]
+    assert bloqs_list.count(Hadamard()) == 3
+    assert bloqs_list.count(CNOT()) == 3
+    assert bloqs_list.count(TGate()) == 3
+    np.testing.assert_allclose(
+        cbloq.tensor_contract(), cirq.Circuit(optree()).unitary(qubits), atol=1e-8
+    )
+
+
 def test_cirq_gate_as_bloq_for_left_only_gates():
     class LeftOnlyGate(GateWithRegisters):
         @property
@@ -224,3 +251,34 @@ def test_cirq_gate_as_bloq_decompose_raises():
     bloq = CirqGateAsBloq(cirq.X)
     with pytest.raises(DecomposeNotImplementedError, match="does not declare a decomposition"):
         _ = bloq.decompose_bloq()
+
+
+def test_decompose_non_gate_operations_raises():
+    bloq = And(uncompute=True)
+    with pytest.raises(DecomposeTypeError, match="non-gate operation"):
+        _ = bloq.decompose_bloq()
+
+
+def test_decompose_from_cirq_style_method_is_cached():
+    @attr.frozen
+    class CountingGate(GateWithRegisters):
+        num_calls: list = attr.field(eq=False, factory=list)
+
+        @property
+        def signature(self) -> Signature:
+            return Signature.build(x=1, y=1)
+
+        def decompose_from_registers(self, *, context, x, y) -> cirq.OP_TREE:
+            self.num_calls.append(1)
+            yield cirq.CNOT(*x, *y)
+
+    clear_decomposition_cache()
+    gate = CountingGate()
+    cbloq = gate.decompose_bloq()
+    assert CountingGate().decompose_bloq() is cbloq
+    cirq.decompose_once(BloqAsCirqGate(gate).on(*cirq.LineQubit.range(2)))
+    assert len(gate.num_calls) == 1
+    clear_decomposition_cache()
+    assert gate.decompose_bloq() is not cbloq
+    assert len(gate.num_calls) == 2
+    clear_decomposition_cache()
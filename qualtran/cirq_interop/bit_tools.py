@@ -16,6 +16,8 @@ from typing import Iterator, Tuple
 
 import numpy as np
 
+from qualtran.simulation.bit_packing import bits_to_ints, fixed_point_to_bits
+
 
 def iter_bits(val: int, width: int, *, signed: bool = False) -> Iterator[int]:
     """Iterate over the bits in a binary representation of `val`.
@@ -93,6 +95,6 @@ def iter_bits_fixed_point(val: float, width: int, *, signed: bool = False) -> It
 
 
 def float_as_fixed_width_int(val: float, width: int) -> Tuple[int, int]:
-    """Returns a `width` length fixed point binary representation of `val` where -1 <= val <= 1."""
-    bits = [*iter_bits_fixed_point(val, width, signed=True)]
-    return bits[0], int(''.join(str(b) for b in bits[1:]), 2)
+    """Returns a `width` length fixed point binary representation of `val` where -1 < val < 1."""
+    bits = fixed_point_to_bits(val, width, signed=True)[0]
+    return int(bits[0]), int(bits_to_ints(bits[1:])[0])
@@ -14,28 +14,11 @@
 
 """Utility methods for LCU circuits as implemented in https://github.com/quantumlib/OpenFermion"""
 
+import collections
 import math
-from typing import Sequence
+from typing import Deque, List, Sequence
 
-
-def _partial_sums(vals):
-    """Adds up the items in the input, yielding partial sums along the way."""
-    total = 0
-    for v in vals:
-        yield total
-        total += v
-    yield total
-
-
-def _differences(weights):
-    """Iterates over the input yielding differences between adjacent items."""
-    previous_weight = None
-    have_previous_weight = False
-    for w in weights:
-        if have_previous_weight:
-            yield w - previous_weight
-        previous_weight = w
-        have_previous_weight = True
+import numpy as np
 
 
 def _discretize_probability_distribution(unnormalized_probabilities, epsilon):
@@ -62,10 +45,11 @@ def _discretize_probability_distribution(unnormalized_probabilities, epsilon):
     sub_bit_precision = max(0, int(math.ceil(-math.log(epsilon * n, 2))))
     bin_count = 2**sub_bit_precision * n
 
-    cumulative = list(_partial_sums(unnormalized_probabilities))
+    # `np.cumsum` adds up the values sequentially, so this matches summing them one at a time.
+    cumulative = np.cumsum(np.concatenate([[0.0], np.asarray(unnormalized_probabilities, float)]))
     total = cumulative[-1]
-    discretized_cumulative = [int(math.floor(c / total * bin_count + 0.5)) for c in cumulative]
-    discretized = list(_differences(discretized_cumulative))
+    discretized_cumulative = np.floor(cumulative / total * bin_count + 0.5).astype(np.int64)
+    discretized = np.diff(discretized_cumulative).tolist()
     return discretized, bin_count, sub_bit_precision
 
 
@@ -106,42 +90,52 @@ def _preprocess_for_efficient_roulette_selection(discretized_probabilities):
         ValueError: if `discretized_probabilities` input is empty or if the sum of elements
             in the list is not a multiple of the number of items in the list.
     """
-    weights = list(discretized_probabilities)  # Need a copy we can mutate.
-    if not weights:
+    weights = np.array(discretized_probabilities, dtype=np.int64)
+    if not weights.size:
         raise ValueError('Empty input.')
 
     n = len(weights)
-    target_weight = sum(weights) // n
-    if sum(weights) != n * target_weight:
+    target_weight = int(weights.sum()) // n
+    if int(weights.sum()) != n * target_weight:
         raise ValueError('sum(weights) must be a multiple of len(weights).')
 
     # Initially, every item's alternative is itself.
     alternates = list(range(n))
     keep_weights = [0] * n
 
-    # Scan for needy items and donors. First pass will handle all
-    # initially-needy items. Second pass will handle any remaining items that
-    # started as donors but become needy due to over-donation (though some may
-    # also be handled during the first pass).
-    donor_position = 0
+    # Scan for needy items and pair each one with the first donor that still has a surplus.
+    # Donors are used up in index order, so they are kept in a queue and only the needy items
+    # are visited. A donor that over-donates becomes needy: if it comes after the item it
+    # donated to, it is visited later in the same scan, otherwise in a second scan. Every item
+    # enters each worklist at most once, so this takes O(n) time.
+    donors = collections.deque(np.flatnonzero(weights > target_weight).tolist())
+    needy = np.flatnonzero(weights < target_weight).tolist()
+    remaining = weights.tolist()
     for _ in range(2):
-        for i in range(n):
-            # Is this a needy item?
-            if weights[i] >= target_weight:
-                continue  # Nope.
+        later: Deque[int] = collections.deque()
+        missed: List[int] = []
+        k = 0
+        while k < len(needy) or later:
+            # Visit the needy items in index order.
+            if later and (k == len(needy) or later[0] < needy[k]):
+                i = later.popleft()
+            else:
+                i = needy[k]
+                k += 1
 
             # Find a donor.
-            while weights[donor_position] <= target_weight:
-                donor_position += 1
+            while remaining[donors[0]] <= target_weight:
+                donors.popleft()
+            donor = donors[0]
 
             # Donate.
-            donated = target_weight - weights[i]
-            weights[donor_position] -= donated
-            alternates[i] = donor_position
-            keep_weights[i] = weights[i]
-
-            # Needy item has been paired. Remove it from consideration.
-            weights[i] = target_weight
+            remaining[donor] -= target_weight - remaining[i]
+            alternates[i] = donor
+            keep_weights[i] = remaining[i]
+            remaining[i] = target_weight
+            if remaining[donor] < target_weight:
+                (later if donor > i else missed).append(donor)
+        needy = missed
 
     return alternates, keep_weights
 
@@ -123,6 +123,44 @@ class PreprocessForEfficientRouletteSelectionTest(unittest.TestCase):
         # v0 donates 2 to v1, leaving v0 needy, then v2 donates 1 to v0.
         self.assertEqual(self.assertPreprocess(weights=[3, 0, 3]), ([2, 0, 2], [1, 0, 0]))
 
+    def test_over_donation_chain(self):
+        # Every donor over-donates to the previous item and is paired with the next donor.
+        n = 20_000
+        alternates, keep_chances = self.assertPreprocess(weights=[0] + [n] * (n - 1))
+        self.assertEqual(alternates, list(range(1, n)) + [n - 1])
+        self.assertEqual(keep_chances, list(range(n - 1)) + [0])
+
+    def test_matches_sequential_scan(self):
+        random.seed(8)
+        for _ in range(100):
+            n = random.randint(1, 50)
+            weights = [random.choice([0, 1, n, random.randint(0, 100)]) for _ in range(n)]
+            weights[-1] += n - sum(weights) % n  # Ensure multiple of length.
+            self.assertEqual(
+                _preprocess_for_efficient_roulette_selection(weights), _sequential_scan(weights)
+            )
+
+
+def _sequential_scan(weights):
+    """Reference for `_preprocess_for_efficient_roulette_selection` scanning every item."""
+    weights = list(weights)
+    n = len(weights)
+    target_weight = sum(weights) // n
+    alternates = list(range(n))
+    keep_weights = [0] * n
+    donor_position = 0
+    for _ in range(2):
+        for i in range(n):
+            if weights[i] >= target_weight:
+                continue
+            while weights[donor_position] <= target_weight:
+                donor_position += 1
+            weights[donor_position] -= target_weight - weights[i]
+            alternates[i] = donor_position
+            keep_weights[i] = weights[i]
+            weights[i] = target_weight
+    return alternates, keep_weights
+
 
 class PreprocessLCUCoefficientsForReversibleSamplingTest(unittest.TestCase):
     def assertPreprocess(self, lcu_coefs, epsilon):
@@ -17,7 +17,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import builtins
+import collections.abc
 import google.protobuf.descriptor
+import google.protobuf.internal.containers
 import google.protobuf.message
 import sys
 
@@ -53,13 +55,28 @@ class NDArray(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     NDARRAY_FIELD_NUMBER: builtins.int
+    DTYPE_FIELD_NUMBER: builtins.int
+    SHAPE_FIELD_NUMBER: builtins.int
+    BUFFER_FIELD_NUMBER: builtins.int
     ndarray: builtins.bytes
-    """A Numpy array serialized as bytes using np.save() / np.load()."""
+    """A Numpy array serialized as bytes using np.save() / np.load().
+    Only populated by older versions of the serializer; superseded by the fields below.
+    """
+    dtype: builtins.str
+    """Numpy dtype string of the array, e.g. '<i8'."""
+    @property
+    def shape(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]:
+        """Shape of the array."""
+    buffer: builtins.bytes
+    """Raw C-ordered contents of the array; decoded using np.frombuffer()."""
     def __init__(
         self,
         *,
         ndarray: builtins.bytes = ...,
+        dtype: builtins.str = ...,
+        shape: collections.abc.Iterable[builtins.int] | None = ...,
+        buffer: builtins.bytes = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["ndarray", b"ndarray"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["buffer", b"buffer", "dtype", b"dtype", "ndarray", b"ndarray", "shape", b"shape"]) -> None: ...
 
 global___NDArray = NDArray
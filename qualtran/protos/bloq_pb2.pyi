@@ -47,6 +47,8 @@ class BloqArg(google.protobuf.message.Message):
     SUBBLOQ_FIELD_NUMBER: builtins.int
     CIRQ_JSON_GZIP_FIELD_NUMBER: builtins.int
     QDATA_TYPE_FIELD_NUMBER: builtins.int
+    TUPLE_VAL_FIELD_NUMBER: builtins.int
+    HASHABLE_ARRAY_FIELD_NUMBER: builtins.int
     name: builtins.str
     int_val: builtins.int
     float_val: builtins.float
@@ -63,6 +65,12 @@ class BloqArg(google.protobuf.message.Message):
     @property
     def qdata_type(self) -> qualtran.protos.data_types_pb2.QDataType:
         """data type"""
+    @property
+    def tuple_val(self) -> global___BloqArgTuple:
+        """A tuple of values, e.g. the datasets loaded by a QROM or a tuple of bitsizes."""
+    @property
+    def hashable_array(self) -> qualtran.protos.args_pb2.NDArray:
+        """A `HashableArray`, stored as its numpy array."""
     def __init__(
         self,
         *,
@@ -75,13 +83,32 @@ class BloqArg(google.protobuf.message.Message):
         subbloq: builtins.int = ...,
         cirq_json_gzip: builtins.bytes = ...,
         qdata_type: qualtran.protos.data_types_pb2.QDataType | None = ...,
+        tuple_val: global___BloqArgTuple | None = ...,
+        hashable_array: qualtran.protos.args_pb2.NDArray | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["cirq_json_gzip", b"cirq_json_gzip", "float_val", b"float_val", "int_val", b"int_val", "ndarray", b"ndarray", "qdata_type", b"qdata_type", "string_val", b"string_val", "subbloq", b"subbloq", "sympy_expr", b"sympy_expr", "val", b"val"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["cirq_json_gzip", b"cirq_json_gzip", "float_val", b"float_val", "int_val", b"int_val", "name", b"name", "ndarray", b"ndarray", "qdata_type", b"qdata_type", "string_val", b"string_val", "subbloq", b"subbloq", "sympy_expr", b"sympy_expr", "val", b"val"]) -> None: ...
-    def WhichOneof(self, oneof_group: typing_extensions.Literal["val", b"val"]) -> typing_extensions.Literal["int_val", "float_val", "string_val", "sympy_expr", "ndarray", "subbloq", "cirq_json_gzip", "qdata_type"] | None: ...
+    def HasField(self, field_name: typing_extensions.Literal["cirq_json_gzip", b"cirq_json_gzip", "float_val", b"float_val", "hashable_array", b"hashable_array", "int_val", b"int_val", "ndarray", b"ndarray", "qdata_type", b"qdata_type", "string_val", b"string_val", "subbloq", b"subbloq", "sympy_expr", b"sympy_expr", "tuple_val", b"tuple_val", "val", b"val"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["cirq_json_gzip", b"cirq_json_gzip", "float_val", b"float_val", "hashable_array", b"hashable_array", "int_val", b"int_val", "name", b"name", "ndarray", b"ndarray", "qdata_type", b"qdata_type", "string_val", b"string_val", "subbloq", b"subbloq", "sympy_expr", b"sympy_expr", "tuple_val", b"tuple_val", "val", b"val"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["val", b"val"]) -> typing_extensions.Literal["int_val", "float_val", "string_val", "sympy_expr", "ndarray", "subbloq", "cirq_json_gzip", "qdata_type", "tuple_val", "hashable_array"] | None: ...
 
 global___BloqArg = BloqArg
 
+@typing_extensions.final
+class BloqArgTuple(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ITEMS_FIELD_NUMBER: builtins.int
+    @property
+    def items(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___BloqArg]:
+        """The items of the tuple. Their names are unused."""
+    def __init__(
+        self,
+        *,
+        items: collections.abc.Iterable[global___BloqArg] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["items", b"items"]) -> None: ...
+
+global___BloqArgTuple = BloqArgTuple
+
 @typing_extensions.final
 class BloqLibrary(google.protobuf.message.Message):
     """A library of Bloqs. BloqLibrary should be used to represent both primitive Bloqs and
@@ -0,0 +1,135 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Sparse polynomial arithmetic for accumulating symbolic call counts.
+
+Multiplying and adding sympy expressions edge-by-edge in a large call graph builds deeply
+nested expression trees that sympy has to re-canonicalize at every step. Instead, we represent
+each count as a polynomial: a dictionary mapping monomials to numeric coefficients. A monomial
+is a tuple of exponents, one per generator (with trailing zeros stripped), where the generators
+are the sympy symbols and opaque sub-expressions (like `log2(n)`, `ceiling(...)` or `Max(...)`
+from `symbolic_counting_utils`) encountered in the edge counts. Conversion back to sympy only
+happens once at the end.
+"""
+
+import operator
+from collections import defaultdict
+from typing import Dict, List, Tuple, Union
+
+import sympy
+
+Monomial = Tuple[int, ...]
+Coefficient = Union[int, sympy.Number]
+SparsePolynomial = Dict[Monomial, Coefficient]
+
+_EXPAND_HINTS = dict(deep=False, log=False, power_base=False, power_exp=False, multinomial=True)
+
+
+class GeneratorTable:
+    """Assigns a stable integer index to each polynomial generator."""
+
+    def __init__(self):
+        self._idxs: Dict[sympy.Expr, int] = {}
+        self.gens: List[sympy.Expr] = []
+
+    def index(self, gen: sympy.Expr) -> int:
+        idx = self._idxs.get(gen)
+        if idx is None:
+            idx = len(self.gens)
+            self._idxs[gen] = idx
+            self.gens.append(gen)
+        return idx
+
+
+def _to_coefficient(c: sympy.Expr) -> Coefficient:
+    if c.is_Integer:
+        return int(c)
+    assert isinstance(c, sympy.Number)
+    return c
+
+
+def poly_from_expr(expr: Union[int, sympy.Expr], gens: GeneratorTable) -> SparsePolynomial:
+    """Convert a count into a sparse polynomial over the generators in `gens`.
+
+    Sums and products are expanded; positive integer powers of a generator are tracked as
+    exponents. Anything else (functions, negative or symbolic powers, ...) becomes a generator
+    of its own.
+    """
+    if not isinstance(expr, sympy.Basic):
+        return {(): expr} if expr != 0 else {}
+    if expr.is_Number:
+        return {(): _to_coefficient(expr)} if expr != 0 else {}
+
+    poly: Dict[Monomial, Coefficient] = defaultdict(int)
+    for term in sympy.Add.make_args(sympy.expand(expr, **_EXPAND_HINTS)):
+        coeff, rest = term.as_coeff_Mul()
+        exps: Dict[int, int] = defaultdict(int)
+        for factor in sympy.Mul.make_args(rest):
+            if factor is sympy.S.One:
+                continue
+            base, exp = factor.as_base_exp()
+            if exp.is_Integer and exp > 0:
+                exps[gens.index(base)] += int(exp)
+            else:
+                exps[gens.index(factor)] += 1
+        monomial = [0] * (max(exps) + 1 if exps else 0)
+        for i, e in exps.items():
+            monomial[i] = e
+        poly[tuple(monomial)] += _to_coefficient(coeff)
+    return {m: c for m, c in poly.items() if c != 0}
+
+
+def _mul_monomials(a: Monomial, b: Monomial) -> Monomial:
+    if len(a) < len(b):
+        a, b = b, a
+    return tuple(map(operator.add, a[: len(b)], b)) + a[len(b) :]
+
+
+def add_product_into(acc: SparsePolynomial, a: SparsePolynomial, b: SparsePolynomial) -> None:
+    """In-place `acc += a * b`."""
+    if len(b) == 1:
+        ((mb, cb),) = b.items()
+        if not mb:
+            # Fast path: scaling by a constant.
+            for ma, ca in a.items():
+                c = acc.get(ma, 0) + ca * cb
+                if c == 0:
+                    acc.pop(ma, None)
+                else:
+                    acc[ma] = c
+            return
+
+    for ma, ca in a.items():
+        for mb, cb in b.items():
+            m = _mul_monomials(ma, mb)
+            c = acc.get(m, 0) + ca * cb
+            if c == 0:
+                acc.pop(m, None)
+            else:
+                acc[m] = c
+
+
+def poly_to_expr(poly: SparsePolynomial, gens: GeneratorTable) -> Union[int, sympy.Expr]:
+    """Convert a sparse polynomial back into a sympy expression.
+
+    Constant polynomials with integer coefficients are returned as python `int`s.
+    """
+    if not poly:
+        return 0
+    if len(poly) == 1 and () in poly:
+        return poly[()]
+    terms = []
+    for m, c in poly.items():
+        terms.append(sympy.Mul(c, *(gens.gens[i] ** e for i, e in enumerate(m) if e)))
+    return sympy.Add(*terms)
@@ -0,0 +1,61 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+import sympy
+
+from qualtran.resource_counting._sparse_polynomial import (
+    add_product_into,
+    GeneratorTable,
+    poly_from_expr,
+    poly_to_expr,
+)
+from qualtran.resource_counting.symbolic_counting_utils import ceil, log2, smax
+
+n, m = sympy.symbols('n m')
+
+
+@pytest.mark.parametrize(
+    'expr',
+    [
+        0,
+        7,
+        0.5,
+        n,
+        3 * n**2 * m - 1,
+        (n + 1) ** 3,
+        ceil(log2(n)) * n,
+        smax(n, m) + 2,
+        1 / n + n / 4,
+    ],
+)
+def test_round_trip(expr):
+    gens = GeneratorTable()
+    poly = poly_from_expr(expr, gens)
+    assert sympy.expand(poly_to_expr(poly, gens) - expr) == 0
+
+
+def test_add_product_into():
+    gens = GeneratorTable()
+    a = poly_from_expr(n + ceil(log2(n)), gens)
+    b = poly_from_expr(n - ceil(log2(n)), gens)
+    acc = poly_from_expr(ceil(log2(n)) ** 2, gens)
+    add_product_into(acc, a, b)
+    assert acc == poly_from_expr(n**2, gens)
+    assert poly_to_expr(acc, gens) == n**2
+
+    acc = {}
+    add_product_into(acc, poly_from_expr(3, gens), poly_from_expr(4, gens))
+    assert poly_to_expr(acc, gens) == 12
+    assert isinstance(poly_to_expr(acc, gens), int)
@@ -21,6 +21,13 @@ import networkx as nx
 import sympy
 
 from qualtran import Bloq, CompositeBloq, DecomposeNotImplementedError, DecomposeTypeError
+from qualtran.resource_counting._sparse_polynomial import (
+    add_product_into,
+    GeneratorTable,
+    poly_from_expr,
+    poly_to_expr,
+    SparsePolynomial,
+)
 
 BloqCountT = Tuple[Bloq, Union[int, sympy.Expr]]
 GeneralizerT = Callable[[Bloq], Optional[Bloq]]
@@ -165,6 +172,31 @@ def _compute_sigma(root_bloq: Bloq, g: nx.DiGraph) -> Dict[Bloq, Union[int, symp
     return dict(bloq_sigmas[root_bloq])
 
 
+def _compute_sigma_sparse(root_bloq: Bloq, g: nx.DiGraph) -> Dict[Bloq, Union[int, sympy.Expr]]:
+    """Like `_compute_sigma`, but accumulate counts as sparse polynomials.
+
+    Each edge count is converted once into a sparse polynomial (see `_sparse_polynomial`) and
+    the products and sums over the graph are done on those. The totals are converted back into
+    sympy expressions at the end.
+    """
+    gens = GeneratorTable()
+    bloq_sigmas: Dict[Bloq, Dict[Bloq, SparsePolynomial]] = {}
+    for bloq in reversed(list(nx.topological_sort(g))):
+        callees = list(g.successors(bloq))
+        sigma: Dict[Bloq, SparsePolynomial] = {}
+        bloq_sigmas[bloq] = sigma
+        if not callees:
+            sigma[bloq] = {(): 1}
+            continue
+
+        for callee in callees:
+            n = poly_from_expr(g.edges[bloq, callee]['n'], gens)
+            for k, callee_poly in bloq_sigmas[callee].items():
+                add_product_into(sigma.setdefault(k, {}), callee_poly, n)
+
+    return {k: poly_to_expr(poly, gens) for k, poly in bloq_sigmas[root_bloq].items()}
+
+
 def _make_composite_generalizer(*funcs: GeneralizerT) -> GeneralizerT:
     """Return a generalizer that calls each `*funcs` generalizers in order."""
 
@@ -184,6 +216,7 @@ def get_bloq_call_graph(
     ssa: Optional[SympySymbolAllocator] = None,
     keep: Optional[Callable[[Bloq], bool]] = None,
     max_depth: Optional[int] = None,
+    sparse_polynomials: bool = False,
 ) -> Tuple[nx.DiGraph, Dict[Bloq, Union[int, sympy.Expr]]]:
     """Recursively build the bloq call graph and call totals.
 
@@ -201,6 +234,12 @@ def get_bloq_call_graph(
         keep: If this function evaluates to True for the current bloq, keep the bloq as a leaf
             node in the call graph instead of recursing into it.
         max_depth: If provided, build a call graph with at most this many layers.
+        sparse_polynomials: If True, accumulate the call totals as sparse polynomials in the
+            symbols (and opaque functions like `log2`, `ceil` or `smax` of them) appearing in
+            the edge counts, and only convert to sympy at the end. This avoids the super-linear
+            growth of sympy expression trees on large, generalized call graphs. The
+            resulting expressions are equal to, but not necessarily written the same as, the
+            default ones.
 
     Returns:
         g: A directed graph where nodes are (generalized) bloqs and edge attribute 'n' reports
@@ -223,7 +262,10 @@ def get_bloq_call_graph(
     if bloq is None:
         raise ValueError("You can't generalize away the root bloq.")
     _build_call_graph(bloq, generalizer, ssa, keep, max_depth, g=g, depth=0)
-    sigma = _compute_sigma(bloq, g)
+    if sparse_polynomials:
+        sigma = _compute_sigma_sparse(bloq, g)
+    else:
+        sigma = _compute_sigma(bloq, g)
     return g, sigma
 
 
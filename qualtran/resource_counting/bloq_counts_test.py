@@ -26,6 +26,7 @@ from qualtran import Bloq, BloqBuilder, Signature, SoquetT
 from qualtran.bloqs.basic_gates import TGate
 from qualtran.bloqs.util_bloqs import ArbitraryClifford, Join, Split
 from qualtran.resource_counting import BloqCountT, get_bloq_call_graph, SympySymbolAllocator
+from qualtran.resource_counting.symbolic_counting_utils import ceil, log2, smax
 
 
 @frozen
@@ -199,3 +200,36 @@ def test_funnel_graph_generalize():
 
     assert edgeset == {('x', 'a', 2), ('a', 'b', 1), ('b', 'c', 1)}
     assert sigma == {'c': 2}
+
+
+def make_symbolic_layered_graph(n_layers: int = 6, width: int = 3):
+    n, m = sympy.symbols('n m', positive=True, integer=True)
+    counts = [n, 2 * m + 1, smax(n, m), ceil(log2(n)), sympy.Rational(1, 2) * n**2, 3]
+    layer = [OnlyCallGraphBloqShim(f'leaf{i}') for i in range(width)]
+    for depth in range(n_layers):
+        layer = [
+            OnlyCallGraphBloqShim(
+                f'l{depth}_{i}',
+                callees=[
+                    (callee, counts[(i + j + depth) % len(counts)])
+                    for j, callee in enumerate(layer)
+                ],
+            )
+            for i in range(width)
+        ]
+    root = OnlyCallGraphBloqShim('root', callees=[(b, 1) for b in layer])
+    return root, (n, m)
+
+
+def test_sparse_polynomial_sigma():
+    bloq, (n, m) = make_symbolic_layered_graph()
+    _, sigma = bloq.call_graph()
+    _, sparse_sigma = bloq.call_graph(sparse_polynomials=True)
+    assert sigma.keys() == sparse_sigma.keys()
+    for k, expr in sigma.items():
+        for vals in [{n: 5, m: 3}, {n: 17, m: 40}]:
+            assert expr.subs(vals) == sparse_sigma[k].subs(vals)
+
+    _, sigma = get_bloq_call_graph(DecompBloq(10), sparse_polynomials=True)
+    assert sigma[TGate()] == 30
+    assert isinstance(sigma[TGate()], int)
@@ -11,6 +11,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+from functools import lru_cache
 from io import BytesIO
 from typing import Union
 
@@ -21,6 +22,17 @@ from sympy.parsing import parse_expr
 from qualtran.protos import args_pb2
 
 
+@lru_cache(maxsize=4096)
+def sympy_expr_from_str(expr: str) -> sympy.Expr:
+    """Parses a sympy expression serialized using `str(expr)`.
+
+    Serialized libraries typically repeat the same handful of symbolic bitsizes and counts
+    across thousands of registers and arguments, so parsed expressions are memoized. Sympy
+    expressions are immutable, which makes sharing them between deserialized objects safe.
+    """
+    return parse_expr(expr)
+
+
 def int_or_sympy_to_proto(val: Union[int, sympy.Expr]) -> args_pb2.IntOrSympy:
     return (
         args_pb2.IntOrSympy(sympy_expr=str(val))
@@ -30,15 +42,25 @@ def int_or_sympy_to_proto(val: Union[int, sympy.Expr]) -> args_pb2.IntOrSympy:
 
 
 def int_or_sympy_from_proto(val: args_pb2.IntOrSympy) -> Union[int, sympy.Expr]:
-    return val.int_val if val.HasField('int_val') else parse_expr(val.sympy_expr)
+    return val.int_val if val.HasField('int_val') else sympy_expr_from_str(val.sympy_expr)
 
 
 def ndarray_to_proto(arr: np.ndarray) -> args_pb2.NDArray:
-    arr_bytes = BytesIO()
-    np.save(arr_bytes, arr, allow_pickle=False)
-    return args_pb2.NDArray(ndarray=arr_bytes.getvalue())
+    """Serializes `arr` as its dtype, shape and raw C-ordered buffer."""
+    if arr.dtype.hasobject:
+        raise ValueError(f"Cannot serialize numpy arrays with {arr.dtype=}")
+    return args_pb2.NDArray(
+        dtype=arr.dtype.str, shape=arr.shape, buffer=np.ascontiguousarray(arr).tobytes()
+    )
 
 
 def ndarray_from_proto(arr: args_pb2.NDArray) -> np.ndarray:
+    """Deserializes an `NDArray` proto.
+
+    The returned array is a read-only view over the bytes held by the proto; no copy is made.
+    """
+    if arr.dtype:
+        return np.frombuffer(arr.buffer, dtype=np.dtype(arr.dtype)).reshape(tuple(arr.shape))
+    # Older libraries stored arrays in the `np.save` format.
     arr_bytes = BytesIO(arr.ndarray)
     return np.load(arr_bytes, allow_pickle=False)
@@ -12,10 +12,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from io import BytesIO
+
 import numpy as np
 import pytest
 import sympy
 
+from qualtran.protos import args_pb2
 from qualtran.serialization import args
 
 
@@ -31,3 +34,36 @@ def test_ndarray_to_proto():
     proto = args.ndarray_to_proto(x)
     x_from_proto = args.ndarray_from_proto(proto)
     assert np.allclose(x, x_from_proto)
+
+
+@pytest.mark.parametrize(
+    'x',
+    [
+        np.arange(24, dtype=np.int64).reshape((2, 3, 4)),
+        np.arange(10, dtype='>u2')[::2],
+        np.array([1 + 2j, 3 - 4j], dtype=np.complex64),
+        np.zeros((0, 3), dtype=np.uint8),
+        np.array(5),
+    ],
+)
+def test_ndarray_to_proto_raw_buffer(x):
+    proto = args.ndarray_to_proto(x)
+    assert not proto.ndarray
+    x_from_proto = args.ndarray_from_proto(proto)
+    assert x_from_proto.dtype == x.dtype
+    assert x_from_proto.shape == x.shape
+    np.testing.assert_array_equal(x_from_proto, x)
+    assert not x_from_proto.flags.writeable
+
+
+def test_ndarray_from_legacy_proto():
+    x = np.arange(12).reshape((3, 4))
+    arr_bytes = BytesIO()
+    np.save(arr_bytes, x, allow_pickle=False)
+    proto = args_pb2.NDArray(ndarray=arr_bytes.getvalue())
+    np.testing.assert_array_equal(args.ndarray_from_proto(proto), x)
+
+
+def test_int_or_sympy_from_proto_is_memoized():
+    proto = args.int_or_sympy_to_proto(sympy.Symbol('n') * sympy.log(sympy.Symbol('L')))
+    assert args.int_or_sympy_from_proto(proto) is args.int_or_sympy_from_proto(proto)
@@ -13,21 +13,20 @@
 #  limitations under the License.
 
 import dataclasses
+import importlib
 import inspect
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Type
 
 import attrs
 import cirq
 import numpy as np
 import sympy
-from sympy.parsing.sympy_parser import parse_expr
 
 from qualtran import (
     Bloq,
     BloqInstance,
     CompositeBloq,
     Connection,
-    Controlled,
     DanglingT,
     DecomposeNotImplementedError,
     DecomposeTypeError,
@@ -37,62 +36,122 @@ from qualtran import (
     Signature,
     Soquet,
 )
-from qualtran.bloqs import arithmetic, basic_gates, factoring, swap_network
-from qualtran.bloqs.arithmetic import sorting
-from qualtran.bloqs.mcmt import and_bloq
-from qualtran.bloqs.util_bloqs import Allocate, ArbitraryClifford, Free, Join, Split
-from qualtran.cirq_interop import CirqGateAsBloq
 from qualtran.protos import bloq_pb2
 from qualtran.serialization import annotations, args, data_types, registers
 
-RESOLVER_DICT = {
-    'CNOT': basic_gates.CNOT,
-    'Rx': basic_gates.Rx,
-    'Ry': basic_gates.Ry,
-    'Rz': basic_gates.Rz,
-    'CSwap': basic_gates.CSwap,
-    'TwoBitCSwap': basic_gates.TwoBitCSwap,
-    'TwoBitSwap': basic_gates.TwoBitSwap,
-    'TGate': basic_gates.TGate,
-    'MinusEffect': basic_gates.MinusEffect,
-    'MinusState': basic_gates.MinusState,
-    'PlusState': basic_gates.PlusState,
-    'PlusEffect': basic_gates.PlusEffect,
-    'XGate': basic_gates.XGate,
-    'IntEffect': basic_gates.IntEffect,
-    'IntState': basic_gates.IntState,
-    'OneEffect': basic_gates.OneEffect,
-    'OneState': basic_gates.OneState,
-    'ZeroEffect': basic_gates.ZeroEffect,
-    'ZeroState': basic_gates.ZeroState,
-    'ZGate': basic_gates.ZGate,
-    'CtrlAddK': factoring.CtrlAddK,
-    'CtrlModAddK': factoring.CtrlModAddK,
-    'CtrlScaleModAdd': factoring.CtrlScaleModAdd,
-    'ModExp': factoring.ModExp,
-    'CtrlModMul': factoring.CtrlModMul,
-    'And': and_bloq.And,
-    'MultiAnd': and_bloq.MultiAnd,
-    'Add': arithmetic.Add,
-    'Square': arithmetic.Square,
-    'SumOfSquares': arithmetic.SumOfSquares,
-    'Product': arithmetic.Product,
-    'GreaterThan': arithmetic.GreaterThan,
-    'Comparator': sorting.Comparator,
-    'BitonicSort': sorting.BitonicSort,
-    'CSwapApprox': swap_network.CSwapApprox,
-    'SwapWithZero': swap_network.SwapWithZero,
-    'Split': Split,
-    'Join': Join,
-    'Allocate': Allocate,
-    'Free': Free,
-    'ArbitraryClifford': ArbitraryClifford,
-    'Controlled': Controlled,
-    'CirqGateAsBloq': CirqGateAsBloq,
+# Lazily populated registry mapping fully-qualified class paths to Bloq classes.
+# Entries are added on first lookup by `resolve_bloq_class`; users may also add entries
+# explicitly (e.g. for classes that cannot be imported by path).
+RESOLVER_DICT: Dict[str, Type[Bloq]] = {}
+
+# Top-level packages whose modules `resolve_bloq_class` may import. Class paths come from
+# (possibly untrusted) serialized data, so other modules are never imported. Packages that
+# define their own bloqs can add their name here to make them deserializable.
+BLOQ_PACKAGE_ALLOWLIST: Set[str] = {'qualtran'}
+
+# Short class names used by older serialized libraries, mapped to their fully-qualified
+# class paths. These are plain strings so that no bloq module is imported eagerly.
+_LEGACY_NAME_TO_PATH: Dict[str, str] = {
+    'CompositeBloq': 'qualtran.CompositeBloq',
+    'Controlled': 'qualtran.Controlled',
+    'CNOT': 'qualtran.bloqs.basic_gates.CNOT',
+    'Rx': 'qualtran.bloqs.basic_gates.Rx',
+    'Ry': 'qualtran.bloqs.basic_gates.Ry',
+    'Rz': 'qualtran.bloqs.basic_gates.Rz',
+    'CSwap': 'qualtran.bloqs.basic_gates.CSwap',
+    'TwoBitCSwap': 'qualtran.bloqs.basic_gates.TwoBitCSwap',
+    'TwoBitSwap': 'qualtran.bloqs.basic_gates.TwoBitSwap',
+    'TGate': 'qualtran.bloqs.basic_gates.TGate',
+    'MinusEffect': 'qualtran.bloqs.basic_gates.MinusEffect',
+    'MinusState': 'qualtran.bloqs.basic_gates.MinusState',
+    'PlusState': 'qualtran.bloqs.basic_gates.PlusState',
+    'PlusEffect': 'qualtran.bloqs.basic_gates.PlusEffect',
+    'XGate': 'qualtran.bloqs.basic_gates.XGate',
+    'IntEffect': 'qualtran.bloqs.basic_gates.IntEffect',
+    'IntState': 'qualtran.bloqs.basic_gates.IntState',
+    'OneEffect': 'qualtran.bloqs.basic_gates.OneEffect',
+    'OneState': 'qualtran.bloqs.basic_gates.OneState',
+    'ZeroEffect': 'qualtran.bloqs.basic_gates.ZeroEffect',
+    'ZeroState': 'qualtran.bloqs.basic_gates.ZeroState',
+    'ZGate': 'qualtran.bloqs.basic_gates.ZGate',
+    'CtrlAddK': 'qualtran.bloqs.factoring.CtrlAddK',
+    'CtrlModAddK': 'qualtran.bloqs.factoring.CtrlModAddK',
+    'CtrlScaleModAdd': 'qualtran.bloqs.factoring.CtrlScaleModAdd',
+    'ModExp': 'qualtran.bloqs.factoring.ModExp',
+    'CtrlModMul': 'qualtran.bloqs.factoring.CtrlModMul',
+    'And': 'qualtran.bloqs.mcmt.and_bloq.And',
+    'MultiAnd': 'qualtran.bloqs.mcmt.and_bloq.MultiAnd',
+    'Add': 'qualtran.bloqs.arithmetic.Add',
+    'Square': 'qualtran.bloqs.arithmetic.Square',
+    'SumOfSquares': 'qualtran.bloqs.arithmetic.SumOfSquares',
+    'Product': 'qualtran.bloqs.arithmetic.Product',
+    'GreaterThan': 'qualtran.bloqs.arithmetic.GreaterThan',
+    'Comparator': 'qualtran.bloqs.arithmetic.sorting.Comparator',
+    'BitonicSort': 'qualtran.bloqs.arithmetic.sorting.BitonicSort',
+    'CSwapApprox': 'qualtran.bloqs.swap_network.CSwapApprox',
+    'SwapWithZero': 'qualtran.bloqs.swap_network.SwapWithZero',
+    'Split': 'qualtran.bloqs.util_bloqs.Split',
+    'Join': 'qualtran.bloqs.util_bloqs.Join',
+    'Allocate': 'qualtran.bloqs.util_bloqs.Allocate',
+    'Free': 'qualtran.bloqs.util_bloqs.Free',
+    'ArbitraryClifford': 'qualtran.bloqs.util_bloqs.ArbitraryClifford',
+    'CirqGateAsBloq': 'qualtran.cirq_interop.CirqGateAsBloq',
 }
 
 
+def bloq_class_to_name(bloq_cls: Type[Bloq]) -> str:
+    """The fully-qualified class path used to identify `bloq_cls` in a `BloqLibrary`."""
+    return f'{bloq_cls.__module__}.{bloq_cls.__qualname__}'
+
+
+def resolve_bloq_class(name: str) -> Type[Bloq]:
+    """Returns the Bloq class identified by `name`, importing its module on first use.
+
+    Args:
+        name: The fully-qualified class path of the bloq, e.g.
+            `qualtran.bloqs.basic_gates.cnot.CNOT`. Short class names written by older
+            versions of the serializer are also accepted for the bloqs they supported.
+
+    Raises:
+        ValueError: If `name` cannot be resolved to a `Bloq` subclass, or if it is not in
+            `RESOLVER_DICT` and lies outside the packages in `BLOQ_PACKAGE_ALLOWLIST`.
+    """
+    if name in RESOLVER_DICT:
+        return RESOLVER_DICT[name]
+    path = _LEGACY_NAME_TO_PATH.get(name, name)
+    parts = path.split('.')
+    if parts[0] not in BLOQ_PACKAGE_ALLOWLIST:
+        raise ValueError(
+            f"Refusing to import {name=}: its package is not in `BLOQ_PACKAGE_ALLOWLIST`."
+        )
+    # The module path is the longest importable prefix; the remainder is the (possibly nested)
+    # qualified name of the class within that module.
+    for i in range(len(parts) - 1, 0, -1):
+        module_name = '.'.join(parts[:i])
+        try:
+            obj = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            # Only a missing prefix of `path` means there is no such module; a missing
+            # dependency of an existing module is a genuine error.
+            if e.name is None or not (module_name + '.').startswith(e.name + '.'):
+                raise
+            continue
+        try:
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            break
+        if isinstance(obj, type) and issubclass(obj, Bloq):
+            RESOLVER_DICT[name] = obj
+            return obj
+        break
+    raise ValueError(f"Unable to find a Bloq corresponding to {name=}")
+
+
 def arg_to_proto(*, name: str, val: Any) -> bloq_pb2.BloqArg:
+    # Imported here so that importing this module doesn't import `qualtran.bloqs.data_loading`.
+    from qualtran.bloqs.data_loading.hashable_array import HashableArray
+
     if isinstance(val, int):
         return bloq_pb2.BloqArg(name=name, int_val=val)
     if isinstance(val, float):
@@ -103,6 +162,11 @@ def arg_to_proto(*, name: str, val: Any) -> bloq_pb2.BloqArg:
         return bloq_pb2.BloqArg(name=name, sympy_expr=str(val))
     if isinstance(val, np.ndarray):
         return bloq_pb2.BloqArg(name=name, ndarray=args.ndarray_to_proto(val))
+    if isinstance(val, HashableArray):
+        return bloq_pb2.BloqArg(name=name, hashable_array=args.ndarray_to_proto(val.array))
+    if isinstance(val, tuple):
+        items = [arg_to_proto(name='', val=v) for v in val]
+        return bloq_pb2.BloqArg(name=name, tuple_val=bloq_pb2.BloqArgTuple(items=items))
     if isinstance(val, cirq.Gate):
         return bloq_pb2.BloqArg(name=name, cirq_json_gzip=cirq.to_json_gzip(val))
     if isinstance(val, QDType):
@@ -118,9 +182,15 @@ def arg_from_proto(arg: bloq_pb2.BloqArg) -> Dict[str, Any]:
     if arg.HasField("string_val"):
         return {arg.name: arg.string_val}
     if arg.HasField("sympy_expr"):
-        return {arg.name: parse_expr(arg.sympy_expr)}
+        return {arg.name: args.sympy_expr_from_str(arg.sympy_expr)}
     if arg.HasField("ndarray"):
         return {arg.name: args.ndarray_from_proto(arg.ndarray)}
+    if arg.HasField("hashable_array"):
+        from qualtran.bloqs.data_loading.hashable_array import HashableArray
+
+        return {arg.name: HashableArray(args.ndarray_from_proto(arg.hashable_array))}
+    if arg.HasField("tuple_val"):
+        return {arg.name: tuple(arg_from_proto(item)[''] for item in arg.tuple_val.items)}
     if arg.HasField("cirq_json_gzip"):
         return {arg.name: cirq.read_json_gzip(gzip_raw=arg.cirq_json_gzip)}
     if arg.HasField("qdata_type"):
@@ -145,29 +215,24 @@ class _BloqLibDeserializer:
         if bloq_id in self.idx_to_bloq:
             return self.idx_to_bloq[bloq_id]
         bloq_proto: bloq_pb2.BloqLibrary.BloqWithDecomposition = self.idx_to_proto[bloq_id]
-        if bloq_proto.bloq.name == 'CompositeBloq':
+        bloq_cls = resolve_bloq_class(bloq_proto.bloq.name)
+        if bloq_cls is CompositeBloq:
             self.idx_to_bloq[bloq_id] = CompositeBloq(
                 connections=tuple(
                     self._connection_from_proto(cxn) for cxn in bloq_proto.decomposition
                 ),
                 signature=Signature(registers.registers_from_proto(bloq_proto.bloq.registers)),
             )
-        elif bloq_proto.bloq.name in RESOLVER_DICT:
+        else:
             kwargs = {}
             for arg in bloq_proto.bloq.args:
                 if arg.HasField('subbloq'):
                     kwargs[arg.name] = self.bloq_id_to_bloq(arg.subbloq)
                 else:
                     kwargs.update(arg_from_proto(arg))
-            self.idx_to_bloq[bloq_id] = self._construct_bloq(bloq_proto.bloq.name, **kwargs)
-        else:
-            raise ValueError(f"Unable to find a Bloq corresponding to {bloq_proto.bloq.name=}")
+            self.idx_to_bloq[bloq_id] = _call_init(bloq_cls, kwargs)
         return self.idx_to_bloq[bloq_id]
 
-    def _construct_bloq(self, name: str, **kwargs):
-        """Construct a Bloq using serialized name and BloqArgs."""
-        return RESOLVER_DICT[name](**kwargs)
-
     def _connection_from_proto(self, cxn: bloq_pb2.Connection) -> Connection:
         return Connection(
             left=self._soquet_from_proto(cxn.left), right=self._soquet_from_proto(cxn.right)
@@ -237,25 +302,39 @@ def bloqs_to_proto(
     return library
 
 
-def _iter_fields(bloq: Bloq):
-    """Yields fields of `bloq` iff `type(bloq)` is implemented using `dataclasses` or `attr`.
+def _iter_fields(bloq: Bloq) -> Iterator[str]:
+    """Yields the names of the fields of `bloq` that are arguments of its __init__ method.
 
-    The method only yields Fields corresponding to attributes that are part of the __init__ method
-    of the bloq. This ensures that for attrs / dataclasses based Bloqs that have a custom init
-    method, we yield only the fields that are accepted by the constructor (eg: `IntState` Bloq).
+    For `type(bloq)` implemented using `dataclasses` or `attrs`, the method only yields fields
+    that are part of the __init__ method of the bloq. This ensures that for attrs / dataclasses
+    based Bloqs that have a custom init method, we yield only the fields that are accepted by
+    the constructor (eg: `IntState` Bloq). For other classes (eg: `SelectSwapQROM`), the
+    arguments of the __init__ method that are also (non-method) attributes of the bloq are
+    yielded.
     Note that this is a hacky solution and a more generalized long-term approach would be to have
     a protocol to query init params for each class and use them as Bloq args during
     serialization / deserialization.
     """
-
+    params = inspect.signature(type(bloq).__init__).parameters
     if dataclasses.is_dataclass(type(bloq)):
-        for field in dataclasses.fields(bloq):
-            if field.name in inspect.signature(type(bloq).__init__).parameters:
-                yield field
+        names = [field.name for field in dataclasses.fields(bloq)]
     elif attrs.has(type(bloq)):
-        for field in attrs.fields(type(bloq)):
-            if field.name in inspect.signature(type(bloq).__init__).parameters:
-                yield field
+        names = [field.name for field in attrs.fields(type(bloq))]
+    else:
+        names = [
+            name
+            for name in list(params)[1:]
+            if hasattr(bloq, name) and not callable(getattr(bloq, name))
+        ]
+    yield from (name for name in names if name in params)
+
+
+def _call_init(bloq_cls: Type[Bloq], kwargs: Dict[str, Any]) -> Bloq:
+    """Calls `bloq_cls(**kwargs)`, passing the value of a `*args` parameter positionally."""
+    for name, param in inspect.signature(bloq_cls.__init__).parameters.items():
+        if param.kind == inspect.Parameter.VAR_POSITIONAL and name in kwargs:
+            return bloq_cls(*kwargs.pop(name), **kwargs)
+    return bloq_cls(**kwargs)
 
 
 def _connection_to_proto(cxn: Connection, bloq_to_idx: Dict[Bloq, int]):
@@ -316,8 +395,8 @@ def _populate_bloq_to_idx(
                     _populate_bloq_to_idx(binst.bloq, bloq_to_idx, pred, max_depth - 1)
                 else:
                     _populate_bloq_to_idx(binst.bloq, bloq_to_idx, pred, 0)
-        except NotImplementedError:
-            # NotImplementedError is raised if `bloq` does not have a decomposition.
+        except (NotImplementedError, DecomposeTypeError):
+            # Raised if `bloq` does not have a decomposition or is atomic.
             ...
 
         # Approximately decompose the current Bloq and its decomposed Bloqs.
@@ -326,14 +405,14 @@ def _populate_bloq_to_idx(
                 _add_bloq_to_dict(subbloq, bloq_to_idx)
                 _populate_bloq_to_idx(subbloq, bloq_to_idx, pred, 0)
 
-        except NotImplementedError:
-            # NotImplementedError is raised if `bloq` does not implement bloq_counts.
+        except (NotImplementedError, DecomposeTypeError):
+            # Raised if `bloq` does not implement bloq_counts or is atomic.
             ...
 
     # If the current Bloq contains other Bloqs as sub-bloqs, add them to the `bloq_to_idx` dict.
-    # This is only supported for Bloqs implemented as dataclasses / attrs.
-    for field in _iter_fields(bloq):
-        subbloq = getattr(bloq, field.name)
+    # See `_iter_fields` for which attributes of the bloq are considered.
+    for name in _iter_fields(bloq):
+        subbloq = getattr(bloq, name)
         if isinstance(subbloq, Bloq):
             _add_bloq_to_dict(subbloq, bloq_to_idx)
             _populate_bloq_to_idx(subbloq, bloq_to_idx, pred, 0)
@@ -346,7 +425,7 @@ def _bloq_to_proto(bloq: Bloq, *, bloq_to_idx: Dict[Bloq, int]) -> bloq_pb2.Bloq
         t_complexity = None
 
     return bloq_pb2.Bloq(
-        name=bloq.__class__.__name__,
+        name=bloq_class_to_name(type(bloq)),
         registers=registers.registers_to_proto(bloq.signature),
         t_complexity=t_complexity,
         args=_bloq_args_to_proto(bloq, bloq_to_idx=bloq_to_idx),
@@ -360,8 +439,8 @@ def _bloq_args_to_proto(
         return None
 
     ret = [
-        _bloq_arg_to_proto(name=field.name, val=getattr(bloq, field.name), bloq_to_idx=bloq_to_idx)
-        for field in _iter_fields(bloq)
+        _bloq_arg_to_proto(name=name, val=getattr(bloq, name), bloq_to_idx=bloq_to_idx)
+        for name in _iter_fields(bloq)
     ]
     return ret if ret else None
 
@@ -13,6 +13,8 @@
 #  limitations under the License.
 
 import dataclasses
+import subprocess
+import sys
 from typing import Union
 
 import attrs
@@ -21,8 +23,9 @@ import numpy as np
 import pytest
 import sympy
 
-from qualtran import Bloq, Signature
+from qualtran import Bloq, CompositeBloq, Signature
 from qualtran._infra.composite_bloq_test import TestTwoCNOT
+from qualtran.bloqs.basic_gates import CNOT, Hadamard
 from qualtran.bloqs.factoring.mod_exp import ModExp
 from qualtran.cirq_interop import CirqGateAsBloq
 from qualtran.cirq_interop._cirq_to_bloq_test import TestCNOT as TestCNOTCirq
@@ -53,9 +56,89 @@ def test_arg_to_proto_round_trip(arg):
         assert arg_dict['custom_name'] == arg
 
 
-def test_bloq_to_proto_cnot():
-    bloq_serialization.RESOLVER_DICT.update({'TestCNOT': TestCNOTCirq})
+def test_arg_to_proto_round_trip_tuples_and_hashable_arrays():
+    from qualtran.bloqs.data_loading.hashable_array import HashableArray
+
+    for arg in [(1, 2, 3), ((1, 2), 'x'), ()]:
+        proto = bloq_serialization.arg_to_proto(name='custom_name', val=arg)
+        assert bloq_serialization.arg_from_proto(proto) == {'custom_name': arg}
+
+    arg = (np.arange(4), np.arange(6, dtype=np.uint8).reshape(2, 3))
+    proto = bloq_serialization.arg_to_proto(name='custom_name', val=arg)
+    got = bloq_serialization.arg_from_proto(proto)['custom_name']
+    assert isinstance(got, tuple) and len(got) == 2
+    for got_arr, arr in zip(got, arg):
+        assert got_arr.dtype == arr.dtype
+        np.testing.assert_array_equal(got_arr, arr)
+
+    arg = HashableArray(np.arange(10, dtype=np.uint16))
+    proto = bloq_serialization.arg_to_proto(name='custom_name', val=arg)
+    assert bloq_serialization.arg_from_proto(proto) == {'custom_name': arg}
+
+
+def test_qrom_round_trip():
+    from qualtran.bloqs.data_loading.qrom import QROM
+    from qualtran.bloqs.data_loading.select_swap_qrom import SelectSwapQROM
+
+    data = np.arange(6).reshape(2, 3)
+    for bloq in [
+        QROM.build(np.arange(4)),
+        QROM.build(data, 2 * data, num_controls=1),
+        SelectSwapQROM(np.arange(8), 3 * np.arange(8), block_size=2),
+    ]:
+        deserialized = bloq_serialization.bloqs_from_proto(bloq_serialization.bloqs_to_proto(bloq))
+        assert deserialized[0] == bloq
+        assert deserialized[0].t_complexity() == bloq.t_complexity()
+
+
+def test_resolve_bloq_class():
+    from qualtran.bloqs.data_loading.qrom import QROM
+
+    assert bloq_serialization.bloq_class_to_name(QROM) == 'qualtran.bloqs.data_loading.qrom.QROM'
+    assert bloq_serialization.resolve_bloq_class('qualtran.bloqs.data_loading.qrom.QROM') is QROM
+    assert bloq_serialization.resolve_bloq_class('CNOT') is CNOT
+    assert bloq_serialization.resolve_bloq_class('qualtran.CompositeBloq') is CompositeBloq
+    with pytest.raises(ValueError):
+        bloq_serialization.resolve_bloq_class('qualtran.bloqs.basic_gates.NotABloq')
+    with pytest.raises(ValueError):
+        bloq_serialization.resolve_bloq_class('qualtran.Signature')
+    with pytest.raises(ValueError):
+        bloq_serialization.resolve_bloq_class('not_a_package.bloqs.NotABloq')
+    with pytest.raises(ValueError):
+        bloq_serialization.resolve_bloq_class('qualtran.not_a_module.NotABloq')
+
+
+def test_resolve_bloq_class_refuses_other_packages(monkeypatch):
+    imported = []
+    monkeypatch.setattr(bloq_serialization.importlib, 'import_module', imported.append)
+    with pytest.raises(ValueError, match='ALLOWLIST'):
+        bloq_serialization.resolve_bloq_class('os.system')
+    with pytest.raises(ValueError, match='ALLOWLIST'):
+        bloq_serialization.resolve_bloq_class('qualtranx.bloqs.NotABloq')
+    assert not imported
+
+    monkeypatch.setattr(bloq_serialization, 'BLOQ_PACKAGE_ALLOWLIST', {'qualtran', 'os'})
+    with pytest.raises(ValueError, match='Unable to find'):
+        bloq_serialization.resolve_bloq_class('os.system')
+    assert imported == ['os']
+
+
+def test_serialization_import_is_lazy():
+    code = (
+        'import sys; import qualtran.serialization.bloq; '
+        'assert "qualtran.bloqs.factoring" not in sys.modules'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_bloq_round_trip_without_registration():
+    bloq = Hadamard()
+    proto_lib = bloq_serialization.bloqs_to_proto(bloq)
+    assert proto_lib.table[0].bloq.name == 'qualtran.bloqs.basic_gates.hadamard.Hadamard'
+    assert bloq in bloq_serialization.bloqs_from_proto(proto_lib)
+
 
+def test_bloq_to_proto_cnot():
     cnot = TestCNOTCirq()
     proto_lib = bloq_serialization.bloqs_to_proto(cnot)
     assert len(proto_lib.table) == 2
@@ -63,7 +146,7 @@ def test_bloq_to_proto_cnot():
     assert len(proto_lib.table[1].decomposition) == 0
 
     proto = proto_lib.table[0].bloq
-    assert proto.name == "TestCNOT"
+    assert proto.name == "qualtran.cirq_interop._cirq_to_bloq_test.TestCNOT"
     assert len(proto.registers.registers) == 2
     assert proto.registers.registers[0].name == 'control'
     assert proto.registers.registers[0].side == registers_pb2.Register.Side.THRU
@@ -74,8 +157,6 @@ def test_bloq_to_proto_cnot():
 
 
 def test_cbloq_to_proto_two_cnot():
-    bloq_serialization.RESOLVER_DICT.update({'TestTwoCNOT': TestTwoCNOT})
-
     cbloq = TestTwoCNOT().decompose_bloq()
     proto_lib = bloq_serialization.bloqs_to_proto(cbloq)
     assert len(proto_lib.table) == 2  # TestTwoCNOT and TestCNOT
@@ -112,15 +193,12 @@ class TestTwoCSwap(Bloq):
 
 
 def test_cbloq_to_proto_test_two_cswap():
-    bloq_serialization.RESOLVER_DICT.update({'TestCSwap': TestCSwap})
-    bloq_serialization.RESOLVER_DICT.update({'TestTwoCSwap': TestTwoCSwap})
-
     bitsize = sympy.Symbol("a") * sympy.Symbol("b")
     cswap_proto_lib = bloq_serialization.bloqs_to_proto(TestCSwap(bitsize))
     assert len(cswap_proto_lib.table) == 1
     assert len(cswap_proto_lib.table[0].decomposition) == 0
     cswap_proto = cswap_proto_lib.table[0].bloq
-    assert cswap_proto.name == "TestCSwap"
+    assert cswap_proto.name == "qualtran.serialization.bloq_test.TestCSwap"
     assert len(cswap_proto.args) == 1
     assert cswap_proto.args[0].name == "bitsize"
     assert sympy.parse_expr(cswap_proto.args[0].sympy_expr) == bitsize
@@ -170,10 +248,6 @@ class TestMetaBloq(Bloq):
 
 
 def test_meta_bloq_to_proto():
-    bloq_serialization.RESOLVER_DICT.update({'TestCSwap': TestCSwap})
-    bloq_serialization.RESOLVER_DICT.update({'TestTwoCSwap': TestTwoCSwap})
-    bloq_serialization.RESOLVER_DICT.update({'TestMetaBloq': TestMetaBloq})
-
     sub_bloq_one = TestTwoCSwap(20)
     sub_bloq_two = TestTwoCSwap(20).decompose_bloq()
     bloq = TestMetaBloq(sub_bloq_one, sub_bloq_two)
@@ -184,10 +258,10 @@ def test_meta_bloq_to_proto():
     proto_lib = bloq_serialization.bloqs_to_proto(bloq, max_depth=2)
     assert len(proto_lib.table) == 4  # TestMetaBloq, TestTwoCSwap, CompositeBloq, TestCSwap
 
-    assert proto_lib.table[0].bloq.name == 'TestMetaBloq'
+    assert proto_lib.table[0].bloq.name == 'qualtran.serialization.bloq_test.TestMetaBloq'
     assert len(proto_lib.table[0].decomposition) == 9
 
-    assert proto_lib.table[1].bloq.name == 'TestTwoCSwap'
+    assert proto_lib.table[1].bloq.name == 'qualtran.serialization.bloq_test.TestTwoCSwap'
     assert len(proto_lib.table[1].decomposition) == 9
 
     assert proto_lib == bloq_serialization.bloqs_to_proto(bloq, bloq, TestTwoCSwap(20), max_depth=2)
@@ -0,0 +1,139 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Vectorized conversions between integers and their big-endian bits.
+
+Integers are split into 64-bit words which are viewed as big-endian bytes, so that the bits
+can be (un)packed with `np.unpackbits` and `np.packbits`. Values that don't fit in 64 bits
+are supported using numpy arrays with `dtype=object`, holding python integers.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def _n_words(w: int) -> int:
+    return max(1, -(-w // _WORD_BITS))
+
+
+def ints_to_bits(
+    x: Union[int, Sequence[int], NDArray], w: int, *, signed: bool = False
+) -> NDArray[np.uint8]:
+    """Returns the big-endian bitstrings specified by the given integers.
+
+    Args:
+        x: An integer or array of integers. Use `dtype=object` for values that don't fit in
+            64 bits.
+        w: The bit width of the returned bitstrings.
+        signed: If True, negative values are represented using two's complement. Otherwise,
+            all the values must be non-negative.
+
+    Returns:
+        An array of bits with shape `np.atleast_1d(x).shape + (w,)`. The values are truncated
+        to their `w` least significant bits.
+    """
+    x = np.atleast_1d(x)
+    if x.dtype.kind == 'b':
+        x = x.astype(np.uint8)
+    if not signed:
+        assert np.all(x >= 0)
+    n_words = _n_words(w)
+    if x.dtype == object or n_words > 1:
+        x = x.astype(object)
+        # The most significant word comes first.
+        shifts = [_WORD_BITS * i for i in reversed(range(n_words))]
+        words = np.stack([((x >> s) & _WORD_MASK).astype(np.uint64) for s in shifts], axis=-1)
+    else:
+        # Casting to `uint64` wraps negative values around in two's complement.
+        words = x.astype(np.uint64)[..., np.newaxis]
+    as_bytes = np.ascontiguousarray(words, dtype='>u8').view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=-1)
+    return bits[..., n_words * _WORD_BITS - w :]
+
+
+def bits_to_ints(
+    bitstrings: Union[Sequence[int], Sequence[Sequence[int]], NDArray], *, signed: bool = False
+) -> NDArray:
+    """Returns the integers specified by the given big-endian bitstrings.
+
+    Args:
+        bitstrings: A bitstring or array of bitstrings, each of which has the 1s bit (LSB) at
+            the end.
+        signed: If True, the bitstrings are read as two's complement integers.
+
+    Returns:
+        An array of integers; one for each bitstring. The dtype is `uint64` (or `int64` if
+        `signed`) for bitstrings of up to 64 bits, and `object` for longer ones.
+    """
+    bitstrings = np.atleast_2d(bitstrings).astype(np.uint8)
+    w = bitstrings.shape[-1]
+    n_words = _n_words(w)
+    padded = np.zeros(bitstrings.shape[:-1] + (n_words * _WORD_BITS,), dtype=np.uint8)
+    padded[..., n_words * _WORD_BITS - w :] = bitstrings
+    words = np.packbits(padded, axis=-1).view('>u8').astype(np.uint64)
+    if n_words == 1:
+        vals = words[..., 0]
+        if signed and w == _WORD_BITS:
+            return vals.view(np.int64)
+        if signed and w:
+            return vals.astype(np.int64) - (bitstrings[..., 0].astype(np.int64) << w)
+        return vals
+
+    vals = np.zeros(words.shape[:-1], dtype=object)
+    for i in range(n_words):
+        vals = (vals << _WORD_BITS) | words[..., i].astype(object)
+    if signed:
+        vals = vals - (bitstrings[..., 0].astype(object) << w)
+    return vals
+
+
+def fixed_point_to_bits(x: ArrayLike, w: int, *, signed: bool = False) -> NDArray[np.uint8]:
+    r"""Returns the `w`-bit fixed point binary representations of the numbers in `x`.
+
+    Each number $x$ is truncated to $\sum_{b} \mathrm{bits}[b] / 2^{1+b}$.
+
+    Args:
+        x: A floating point number or array of numbers in [0, 1), or in (-1, 1) if `signed`.
+        w: The number of bits in the fixed point representation.
+        signed: If True, the first bit is the sign of the number, which is 1 if x < 0 else 0,
+            and the remaining `w - 1` bits represent its absolute value.
+
+    Returns:
+        An array of bits with shape `np.atleast_1d(x).shape + (w,)`.
+
+    Raises:
+        ValueError: If a value is out of range.
+    """
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    in_range = ((-1 < x) if signed else (0 <= x)) & (x < 1)
+    if not np.all(in_range):
+        raise ValueError(
+            f"{x[~in_range]} out of range for {'signed' if signed else 'unsigned'} fixed point."
+        )
+    n_frac = w - 1 if signed else w
+    # Multiplying by a power of two is exact, so this is the truncated binary expansion.
+    scaled = np.floor(np.ldexp(np.abs(x), n_frac))
+    if n_frac <= _WORD_BITS:
+        ints = scaled.astype(np.uint64)
+    else:
+        ints = np.vectorize(int, otypes=[object])(scaled)
+    bits = ints_to_bits(ints, n_frac)
+    if signed:
+        bits = np.concatenate([(x < 0).astype(np.uint8)[..., np.newaxis], bits], axis=-1)
+    return bits
@@ -0,0 +1,77 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import random
+
+import numpy as np
+import pytest
+
+from qualtran.cirq_interop.bit_tools import (
+    iter_bits,
+    iter_bits_fixed_point,
+    iter_bits_twos_complement,
+)
+from qualtran.simulation.bit_packing import bits_to_ints, fixed_point_to_bits, ints_to_bits
+
+
+@pytest.mark.parametrize('w', [1, 5, 8, 31, 63, 64, 65, 128, 200])
+def test_ints_to_bits_roundtrip(w):
+    rs = random.Random(52)
+    vals = [0, 1, 2**w - 1] + [rs.randrange(2**w) for _ in range(10)]
+    arr = np.array(vals, dtype=object if w > 63 else np.uint64)
+    bits = ints_to_bits(arr, w)
+    assert bits.shape == (len(vals), w)
+    for val, bs in zip(vals, bits):
+        assert bs.tolist() == list(iter_bits(val, w))
+    assert bits_to_ints(bits).tolist() == vals
+    assert bits_to_ints(bits).dtype == (object if w > 64 else np.uint64)
+
+    vals = [-1, -(2 ** (w - 1)), 2 ** (w - 1) - 1] + [
+        rs.randrange(-(2 ** (w - 1)), 2 ** (w - 1)) for _ in range(10)
+    ]
+    arr = np.array(vals, dtype=object if w > 64 else np.int64)
+    bits = ints_to_bits(arr, w, signed=True)
+    for val, bs in zip(vals, bits):
+        assert bs.tolist() == list(iter_bits_twos_complement(val, w))
+    assert bits_to_ints(bits, signed=True).tolist() == vals
+
+
+def test_ints_to_bits_shapes():
+    x = np.arange(24).reshape(2, 3, 4)
+    bits = ints_to_bits(x, 5)
+    assert bits.shape == (2, 3, 4, 5)
+    np.testing.assert_array_equal(bits_to_ints(bits), x)
+
+    # Values are truncated to `w` bits.
+    assert ints_to_bits(13, 2).tolist() == [[0, 1]]
+    assert ints_to_bits(2**70 + 5, 4).tolist() == [[0, 1, 0, 1]]
+    assert bits_to_ints([]).tolist() == [0]
+    with pytest.raises(AssertionError):
+        ints_to_bits(-1, 4)
+
+
+@pytest.mark.parametrize('w', [*range(2, 20, 3), 64, 65, 100])
+@pytest.mark.parametrize('signed', [True, False])
+def test_fixed_point_to_bits(w, signed):
+    rs = np.random.RandomState(52)
+    vals = rs.uniform(-1 if signed else 0, 1, size=10)
+    bits = fixed_point_to_bits(vals, w, signed=signed)
+    assert bits.shape == (10, w)
+    for val, bs in zip(vals, bits):
+        assert bs.tolist() == list(iter_bits_fixed_point(val, w, signed=signed))
+
+    with pytest.raises(ValueError):
+        fixed_point_to_bits(1.0, w, signed=signed)
+    with pytest.raises(ValueError):
+        fixed_point_to_bits(-0.5 if not signed else -1.0, w, signed=signed)
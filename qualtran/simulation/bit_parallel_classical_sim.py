@@ -0,0 +1,512 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Bit-parallel classical simulation of bloqs built from reversible classical gates.
+
+A bloq that decomposes into X, CNOT, Toffoli, And and (controlled) swap gates is compiled into
+a straight-line program acting on "bit planes". Each bit plane is an array of `uint64` words
+holding the value of one bit for 64 different inputs per word, so each instruction is a single
+numpy bitwise operation simulating the gate on a whole batch of inputs at once.
+
+Leaf bloqs that are not among these gates but have an `on_classical_vals` method are simulated
+by unpacking their input bit planes, calling the bloq one input at a time and packing the
+results back into bit planes.
+"""
+
+from typing import Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+from attrs import frozen
+from numpy.typing import ArrayLike, NDArray
+
+from qualtran import (
+    Bloq,
+    BoundedQUInt,
+    CompositeBloq,
+    DanglingT,
+    LeftDangle,
+    QAny,
+    QBit,
+    QDType,
+    QInt,
+    QMontgomeryUInt,
+    QUInt,
+    RightDangle,
+    Side,
+    Signature,
+    Soquet,
+)
+from qualtran._infra.bloq import DecomposeTypeError
+from qualtran._infra.composite_bloq import _binst_to_cxns
+from qualtran.bloqs.basic_gates import (
+    CNOT,
+    CSwap,
+    OneEffect,
+    OneState,
+    Toffoli,
+    TwoBitCSwap,
+    TwoBitSwap,
+    XGate,
+    ZeroEffect,
+    ZeroState,
+)
+from qualtran.bloqs.basic_gates.swap import Swap
+from qualtran.bloqs.mcmt.and_bloq import And
+from qualtran.bloqs.util_bloqs import Allocate, Cast, Free, Join, Partition, Split
+from qualtran.simulation.bit_packing import bits_to_ints, ints_to_bits
+
+# Opcodes of the straight-line program.
+_X = 0
+_CX = 1
+_CCX = 2
+_CSWAP = 3
+_FREE = 4
+_CLASSICAL = 5
+
+_UNSIGNED_DTYPES = (QBit, QAny, QUInt, BoundedQUInt, QMontgomeryUInt)
+
+_WORD_BITS = 64
+
+
+class BitParallelNotSupportedError(NotImplementedError):
+    """Raised if a bloq can't be compiled into a bit-parallel program.
+
+    This is the case if the bloq does not decompose into the gates supported by
+    `compile_bit_parallel`, or if its registers have a data type without an integer encoding.
+    """
+
+
+@frozen(eq=False)
+class BitParallelProgram:
+    """A bloq compiled into a straight-line program over bit planes.
+
+    Use `compile_bit_parallel` to construct a program.
+
+    Args:
+        signature: The signature of the compiled bloq.
+        in_planes: A mapping from the name of each left register to the indices of the bit
+            planes it is loaded into, with shape `reg.shape + (reg.bitsize,)`. The bits are
+            big-endian.
+        out_planes: The same for each right register.
+        n_planes: The number of bit planes used by the program.
+        instructions: The program. Each instruction is an opcode followed by the indices of the
+            bit planes it acts on, or by an index into `classical_leaves`.
+        classical_leaves: The leaf bloqs that are simulated with `on_classical_vals`.
+    """
+
+    signature: Signature
+    in_planes: Dict[str, NDArray[np.intp]]
+    out_planes: Dict[str, NDArray[np.intp]]
+    n_planes: int
+    instructions: Tuple[Tuple[int, ...], ...]
+    classical_leaves: Tuple['_ClassicalLeaf', ...] = ()
+
+    def __call__(self, chunk_size: int = 2**16, **vals: ArrayLike) -> Dict[str, NDArray]:
+        """Simulate the bloq on a batch of classical inputs.
+
+        Args:
+            chunk_size: The maximum number of inputs to simulate at once. This bounds the memory
+                used by the bit planes to `n_planes * chunk_size / 8` bytes.
+            **vals: An array of values for each left register. The leading (batch) dimensions
+                of the arrays are broadcast against each other; the trailing dimensions must
+                match the shape of the register. Use `dtype=object` for values that don't fit in
+                64 bits.
+
+        Returns:
+            An array of output values for each right register, with the broadcast batch shape
+            followed by the shape of the register.
+
+        Raises:
+            ValueError: If a non-zero bit is freed, i.e. if the circuit does not uncompute its
+                ancilla bits for one of the inputs.
+            NotImplementedError: If one of the `classical_leaves` has no classical action.
+        """
+        lefts = list(self.signature.lefts())
+        arrays = {}
+        batch_shapes = []
+        for reg in lefts:
+            arr = np.asarray(vals[reg.name])
+            if arr.dtype.kind == 'b':
+                arr = arr.astype(np.uint8)
+            n_batch_dims = arr.ndim - len(reg.shape)
+            if n_batch_dims < 0 or arr.shape[n_batch_dims:] != reg.shape:
+                raise ValueError(
+                    f"Incorrect shape {arr.shape} received for {reg.name}. Want {reg.shape} "
+                    "for each input."
+                )
+            reg.dtype.assert_valid_classical_val_array(arr, reg.name)
+            arrays[reg.name] = arr
+            batch_shapes.append(arr.shape[:n_batch_dims])
+        batch_shape = np.broadcast_shapes(*batch_shapes)
+        n = int(np.prod(batch_shape))
+        flat = {
+            reg.name: np.broadcast_to(arrays[reg.name], batch_shape + reg.shape).reshape(
+                (n,) + reg.shape
+            )
+            for reg in lefts
+        }
+
+        chunks: List[Dict[str, NDArray]] = []
+        for start in range(0, n, chunk_size):
+            chunks.append(
+                self._run_chunk({k: v[start : start + chunk_size] for k, v in flat.items()})
+            )
+
+        out_vals: Dict[str, NDArray] = {}
+        for reg in self.signature.rights():
+            if chunks:
+                out = np.concatenate([chunk[reg.name] for chunk in chunks])
+            else:
+                out = np.zeros((0,) + reg.shape, dtype=np.int64)
+            out_vals[reg.name] = out.reshape(batch_shape + reg.shape)
+        return out_vals
+
+    def _run_chunk(self, vals: Dict[str, NDArray]) -> Dict[str, NDArray]:
+        n = len(next(iter(vals.values()))) if vals else 1
+        n_words = -(-n // _WORD_BITS)
+        # Pad the batch by repeating its first input, so that the padding can't cause
+        # spurious errors when freeing bits.
+        n_pad = n_words * _WORD_BITS - n
+        planes = np.zeros((self.n_planes, n_words), dtype=np.uint64)
+        for reg in self.signature.lefts():
+            val = vals[reg.name]
+            val = np.concatenate([val, np.repeat(val[:1], n_pad, axis=0)])
+            for idx in reg.all_idxs():
+                planes[self.in_planes[reg.name][idx]] = _ints_to_planes(
+                    val[(slice(None),) + idx], reg.dtype
+                )
+
+        tmp = np.empty(n_words, dtype=np.uint64)
+        for op, *args in self.instructions:
+            if op == _X:
+                (t,) = args
+                np.invert(planes[t], out=planes[t])
+            elif op == _CX:
+                c, t = args
+                np.bitwise_xor(planes[t], planes[c], out=planes[t])
+            elif op == _CCX:
+                c1, c2, t = args
+                np.bitwise_and(planes[c1], planes[c2], out=tmp)
+                np.bitwise_xor(planes[t], tmp, out=planes[t])
+            elif op == _CSWAP:
+                c, x, y = args
+                np.bitwise_xor(planes[x], planes[y], out=tmp)
+                np.bitwise_and(tmp, planes[c], out=tmp)
+                np.bitwise_xor(planes[x], tmp, out=planes[x])
+                np.bitwise_xor(planes[y], tmp, out=planes[y])
+            elif op == _FREE:
+                (t,) = args
+                if planes[t].any():
+                    raise ValueError("Tried to free a non-zero bit.")
+            else:
+                assert op == _CLASSICAL
+                (i,) = args
+                self.classical_leaves[i].apply(planes)
+
+        out_vals = {}
+        for reg in self.signature.rights():
+            out = np.empty((n,) + reg.shape, dtype=_int_dtype(reg.dtype))
+            for idx in reg.all_idxs():
+                out[(slice(None),) + idx] = _planes_to_ints(
+                    planes[self.out_planes[reg.name][idx]], n, reg.dtype
+                )
+            out_vals[reg.name] = out
+        return out_vals
+
+
+def _int_dtype(dtype: QDType) -> np.dtype:
+    if dtype.num_qubits < 64:
+        return np.dtype(np.int64)
+    if dtype.num_qubits == 64:
+        return np.dtype(np.int64 if isinstance(dtype, QInt) else np.uint64)
+    return np.dtype(object)
+
+
+def _ints_to_planes(vals: NDArray, dtype: QDType) -> NDArray[np.uint64]:
+    """Transpose `vals` into big-endian bit planes of `len(vals) // 64` words each."""
+    bits = ints_to_bits(vals, dtype.num_qubits, signed=isinstance(dtype, QInt))
+    bits = np.ascontiguousarray(bits.T)
+    return np.packbits(bits, axis=1, bitorder='little').view(np.uint64)
+
+
+def _planes_to_ints(planes: NDArray[np.uint64], n: int, dtype: QDType) -> NDArray:
+    """Transpose big-endian bit planes back into the first `n` values they hold."""
+    bits = np.unpackbits(planes.view(np.uint8), axis=1, count=n, bitorder='little')
+    return bits_to_ints(bits.T, signed=isinstance(dtype, QInt)).astype(_int_dtype(dtype))
+
+
+@frozen(eq=False)
+class _ClassicalLeaf:
+    """A leaf bloq of a `BitParallelProgram` that is simulated with `call_classically`.
+
+    Args:
+        bloq: The leaf bloq.
+        in_planes: The bit planes of each left register of the bloq.
+        out_planes: The bit planes of each right register of the bloq. THRU registers keep
+            their input planes.
+    """
+
+    bloq: Bloq
+    in_planes: Dict[str, NDArray[np.intp]]
+    out_planes: Dict[str, NDArray[np.intp]]
+
+    def apply(self, planes: NDArray[np.uint64]):
+        n = planes.shape[1] * _WORD_BITS
+        lefts = list(self.bloq.signature.lefts())
+        in_vals = {}
+        for reg in lefts:
+            val = np.empty((n,) + reg.shape, dtype=_int_dtype(reg.dtype))
+            for idx in reg.all_idxs():
+                val[(slice(None),) + idx] = _planes_to_ints(
+                    planes[self.in_planes[reg.name][idx]], n, reg.dtype
+                )
+            in_vals[reg.name] = val
+            if reg.side == Side.LEFT:
+                # The planes of consumed registers are re-allocated, so they must be zero.
+                planes[self.in_planes[reg.name].reshape(-1)] = 0
+
+        rights = list(self.bloq.signature.rights())
+        out_vals = {
+            reg.name: np.empty((n,) + reg.shape, dtype=_int_dtype(reg.dtype)) for reg in rights
+        }
+        for i in range(n):
+            vals = {reg.name: in_vals[reg.name][i] for reg in lefts}
+            for reg in lefts:
+                if not reg.shape:
+                    vals[reg.name] = vals[reg.name].item()
+            for reg, val in zip(rights, self.bloq.call_classically(**vals)):
+                out_vals[reg.name][i] = val
+
+        for reg in rights:
+            for idx in reg.all_idxs():
+                planes[self.out_planes[reg.name][idx]] = _ints_to_planes(
+                    out_vals[reg.name][(slice(None),) + idx], reg.dtype
+                )
+
+
+class _Compiler:
+    """Helper to trace a bloq's decomposition into a `BitParallelProgram`."""
+
+    def __init__(self):
+        self.n_planes = 0
+        self.instructions: List[Tuple[int, ...]] = []
+        self.classical_leaves: List[_ClassicalLeaf] = []
+        self._free_planes: List[int] = []
+
+    def alloc(self, shape: Tuple[int, ...]) -> NDArray[np.intp]:
+        # Freed planes are reused: the program checks that they are zero when freed.
+        planes = np.empty(shape, dtype=np.intp)
+        for idx in np.ndindex(*shape):
+            if self._free_planes:
+                planes[idx] = self._free_planes.pop()
+            else:
+                planes[idx] = self.n_planes
+                self.n_planes += 1
+        return planes
+
+    def free(self, planes: NDArray[np.intp]):
+        for t in planes.reshape(-1):
+            self.instructions.append((_FREE, int(t)))
+            self._free_planes.append(int(t))
+
+    def x(self, t):
+        self.instructions.append((_X, int(t)))
+
+    def add(self, bloq: Bloq, in_planes: Dict[str, NDArray[np.intp]]) -> Dict[str, NDArray]:
+        """Emit the instructions for `bloq`, decomposing it if it isn't a supported gate."""
+        if isinstance(bloq, (Split, Join, Partition, Cast)):
+            # Bookkeeping bloqs don't move any bits around.
+            bits = np.concatenate(
+                [in_planes[reg.name].reshape(-1) for reg in bloq.signature.lefts()]
+            )
+            out_planes = {}
+            start = 0
+            for reg in bloq.signature.rights():
+                size = int(np.prod(reg.shape, dtype=int)) * reg.bitsize
+                out_planes[reg.name] = bits[start : start + size].reshape(
+                    reg.shape + (reg.bitsize,)
+                )
+                start += size
+            return out_planes
+        if isinstance(bloq, Allocate):
+            return {'reg': self.alloc((bloq.dtype.num_qubits,))}
+        if isinstance(bloq, Free):
+            self.free(in_planes['reg'])
+            return {}
+        if isinstance(bloq, (ZeroState, OneState, ZeroEffect, OneEffect)):
+            if bloq.state:
+                q = self.alloc((1,))
+                if bloq.bit:
+                    self.x(q[0])
+                return {'q': q}
+            if bloq.bit:
+                self.x(in_planes['q'][0])
+            self.free(in_planes['q'])
+            return {}
+        if isinstance(bloq, XGate):
+            self.x(in_planes['q'][0])
+            return in_planes
+        if isinstance(bloq, CNOT):
+            (c,), (t,) = in_planes['ctrl'], in_planes['target']
+            self.instructions.append((_CX, int(c), int(t)))
+            return in_planes
+        if isinstance(bloq, Toffoli):
+            (c1,), (c2,) = in_planes['ctrl']
+            (t,) = in_planes['target']
+            self.instructions.append((_CCX, int(c1), int(c2), int(t)))
+            return in_planes
+        if isinstance(bloq, And):
+            (c1,), (c2,) = in_planes['ctrl']
+            flips = [c for c, cv in [(c1, bloq.cv1), (c2, bloq.cv2)] if not cv]
+            for c in flips:
+                self.x(c)
+            target = in_planes['target'] if bloq.uncompute else self.alloc((1,))
+            self.instructions.append((_CCX, int(c1), int(c2), int(target[0])))
+            for c in flips:
+                self.x(c)
+            if bloq.uncompute:
+                self.free(target)
+                return {'ctrl': in_planes['ctrl']}
+            return {'ctrl': in_planes['ctrl'], 'target': target}
+        if isinstance(bloq, (TwoBitSwap, Swap)):
+            return {'x': in_planes['y'], 'y': in_planes['x']}
+        if isinstance(bloq, (TwoBitCSwap, CSwap)):
+            (c,) = in_planes['ctrl']
+            for x, y in zip(in_planes['x'], in_planes['y']):
+                self.instructions.append((_CSWAP, int(c), int(x), int(y)))
+            return in_planes
+
+        if isinstance(bloq, CompositeBloq):
+            return self.add_cbloq(bloq, in_planes)
+        try:
+            cbloq = bloq.decompose_bloq()
+        except (NotImplementedError, DecomposeTypeError) as e:
+            return self.add_classical_leaf(bloq, in_planes, e)
+        return self.add_cbloq(cbloq, in_planes)
+
+    def add_classical_leaf(
+        self, bloq: Bloq, in_planes: Dict[str, NDArray[np.intp]], cause: Exception
+    ) -> Dict[str, NDArray[np.intp]]:
+        """Emit an instruction simulating `bloq` with `call_classically`."""
+        if type(bloq).on_classical_vals is Bloq.on_classical_vals:
+            raise BitParallelNotSupportedError(
+                f"{bloq} is not supported by bit-parallel simulation, can't be decomposed and "
+                "has no classical action."
+            ) from cause
+        _assert_supported_dtypes(bloq)
+
+        out_planes = {}
+        for reg in bloq.signature.rights():
+            if reg.side == Side.THRU:
+                out_planes[reg.name] = in_planes[reg.name]
+            else:
+                out_planes[reg.name] = self.alloc(reg.shape + (reg.bitsize,))
+        for reg in bloq.signature.lefts():
+            if reg.side == Side.LEFT:
+                # `_ClassicalLeaf.apply` zeroes these planes, so no check is needed.
+                self._free_planes.extend(int(t) for t in in_planes[reg.name].reshape(-1))
+
+        self.instructions.append((_CLASSICAL, len(self.classical_leaves)))
+        self.classical_leaves.append(_ClassicalLeaf(bloq, in_planes, out_planes))
+        return out_planes
+
+    def add_cbloq(
+        self, cbloq: CompositeBloq, in_planes: Dict[str, NDArray[np.intp]]
+    ) -> Dict[str, NDArray[np.intp]]:
+        soq_planes: Dict[Soquet, NDArray[np.intp]] = {}
+        for reg in cbloq.signature.lefts():
+            for idx in reg.all_idxs():
+                soq_planes[Soquet(LeftDangle, reg, idx)] = in_planes[reg.name][idx]
+
+        binst_graph = cbloq._binst_graph  # pylint: disable=protected-access
+        for binst in nx.topological_sort(binst_graph):
+            if isinstance(binst, DanglingT):
+                continue
+            pred_cxns, _ = _binst_to_cxns(binst, binst_graph=binst_graph)
+            for cxn in pred_cxns:
+                soq_planes[cxn.right] = soq_planes[cxn.left]
+            bloq = binst.bloq
+            out_planes = self.add(
+                bloq, {reg.name: _gather(binst, reg, soq_planes) for reg in bloq.signature.lefts()}
+            )
+            for reg in bloq.signature.rights():
+                for idx in reg.all_idxs():
+                    soq_planes[Soquet(binst, reg, idx)] = out_planes[reg.name][idx]
+
+        final_preds, _ = _binst_to_cxns(RightDangle, binst_graph=binst_graph)
+        for cxn in final_preds:
+            soq_planes[cxn.right] = soq_planes[cxn.left]
+        return {reg.name: _gather(RightDangle, reg, soq_planes) for reg in cbloq.signature.rights()}
+
+
+def _gather(binst, reg, soq_planes: Dict[Soquet, NDArray[np.intp]]) -> NDArray[np.intp]:
+    planes = np.empty(reg.shape + (reg.bitsize,), dtype=np.intp)
+    for idx in reg.all_idxs():
+        planes[idx] = soq_planes[Soquet(binst, reg, idx)]
+    return planes
+
+
+def _assert_supported_dtypes(bloq: Bloq):
+    for reg in bloq.signature:
+        if not isinstance(reg.dtype, _UNSIGNED_DTYPES + (QInt,)):
+            raise BitParallelNotSupportedError(
+                f"Register {reg.name} of {bloq} has unsupported data type {reg.dtype}."
+            )
+
+
+def compile_bit_parallel(bloq: Bloq) -> BitParallelProgram:
+    """Compile `bloq` into a bit-parallel program for batched classical simulation.
+
+    `bloq` is recursively decomposed until it consists only of `XGate`, `CNOT`, `Toffoli`,
+    `And`, `TwoBitSwap`, `Swap`, `TwoBitCSwap`, `CSwap`, the computational basis states and
+    effects, and the bookkeeping bloqs (`Split`, `Join`, `Partition`, `Cast`, `Allocate` and
+    `Free`). Leaf bloqs that are not among these gates and can't be decomposed fall back to
+    their `on_classical_vals` method, which is called one input at a time. Note that the program
+    simulates the decomposition of `bloq`, not its own `on_classical_vals` method.
+
+    Returns:
+        A `BitParallelProgram` that can be called like `Bloq.on_classical_vals` with arrays of
+        input values.
+
+    Raises:
+        BitParallelNotSupportedError: If the bloq has registers with data types other than
+            `QBit`, `QAny`, `QInt`, `QUInt`, `BoundedQUInt` and `QMontgomeryUInt`, or if it
+            contains a bloq that isn't supported, can't be decomposed and does not override
+            `on_classical_vals`. Leaves simulated with `on_classical_vals` must also have
+            registers of these data types.
+    """
+    _assert_supported_dtypes(bloq)
+
+    compiler = _Compiler()
+    in_planes = {
+        reg.name: compiler.alloc(reg.shape + (reg.bitsize,)) for reg in bloq.signature.lefts()
+    }
+    out_planes = compiler.add(bloq, in_planes)
+    return BitParallelProgram(
+        signature=bloq.signature,
+        in_planes=in_planes,
+        out_planes=out_planes,
+        n_planes=compiler.n_planes,
+        instructions=tuple(compiler.instructions),
+        classical_leaves=tuple(compiler.classical_leaves),
+    )
+
+
+def call_bit_parallel(bloq: Bloq, **vals: ArrayLike) -> Dict[str, NDArray]:
+    """Simulate `bloq` on a batch of classical inputs with a bit-parallel program.
+
+    This is a shorthand for `compile_bit_parallel(bloq)(**vals)`.
+    """
+    return compile_bit_parallel(bloq)(**vals)
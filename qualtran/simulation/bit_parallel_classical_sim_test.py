@@ -0,0 +1,217 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import itertools
+from typing import Dict
+
+import numpy as np
+import pytest
+from attrs import frozen
+
+from qualtran import Bloq, BloqBuilder, QAny, QFxp, QInt, QUInt, Register, Side, Signature
+from qualtran.bloqs.arithmetic import Add
+from qualtran.bloqs.arithmetic.comparison import LinearDepthGreaterThan
+from qualtran.bloqs.basic_gates import (
+    CNOT,
+    CSwap,
+    Hadamard,
+    OneEffect,
+    OneState,
+    Toffoli,
+    TwoBitCSwap,
+    XGate,
+    ZeroState,
+)
+from qualtran.bloqs.basic_gates.swap import Swap
+from qualtran.bloqs.mcmt.and_bloq import And, MultiAnd
+from qualtran.bloqs.util_bloqs import Cast
+from qualtran.simulation.bit_parallel_classical_sim import (
+    BitParallelNotSupportedError,
+    call_bit_parallel,
+    compile_bit_parallel,
+)
+from qualtran.simulation.classical_sim import ClassicalValT, get_classical_truth_table
+
+
+def assert_bit_parallel_matches_call_classically(bloq):
+    lefts = list(bloq.signature.lefts())
+    domains = []
+    for reg in lefts:
+        if isinstance(reg.dtype, QAny):
+            domain = range(2**reg.bitsize)
+        else:
+            domain = reg.dtype.get_classical_domain()
+        domains.append(itertools.product(domain, repeat=int(np.prod(reg.shape))))
+    in_val_tuples = list(itertools.product(*domains))
+    in_vals = {
+        reg.name: np.array([t[i] for t in in_val_tuples]).reshape((-1,) + reg.shape)
+        for i, reg in enumerate(lefts)
+    }
+    out_vals = call_bit_parallel(bloq, **in_vals)
+    for j, in_val_tuple in enumerate(in_val_tuples):
+        vals = {
+            reg.name: np.reshape(val, reg.shape) if reg.shape else val[0]
+            for reg, val in zip(lefts, in_val_tuple)
+        }
+        expected = bloq.call_classically(**vals)
+        for reg, val in zip(bloq.signature.rights(), expected):
+            np.testing.assert_array_equal(out_vals[reg.name][j], val)
+
+
+@pytest.mark.parametrize(
+    'bloq',
+    [
+        XGate(),
+        CNOT(),
+        Toffoli(),
+        TwoBitCSwap(),
+        CSwap(3),
+        Swap(2),
+        *[And(cv1, cv2) for cv1, cv2 in itertools.product([0, 1], repeat=2)],
+        MultiAnd(cvs=(1, 0, 1, 1)),
+        Add(QUInt(3)),
+        Add(QInt(3)),
+    ],
+)
+def test_bit_parallel_matches_call_classically(bloq):
+    assert_bit_parallel_matches_call_classically(bloq)
+
+
+def test_bit_parallel_and_uncompute():
+    bloq = And(1, 0).adjoint()
+    ctrl = np.array([[0, 0], [1, 0], [1, 1]])
+    out = call_bit_parallel(bloq, ctrl=ctrl, target=[0, 1, 0])
+    assert list(out.keys()) == ['ctrl']
+    np.testing.assert_array_equal(out['ctrl'], ctrl)
+    with pytest.raises(ValueError):
+        call_bit_parallel(bloq, ctrl=ctrl, target=[0, 1, 1])
+
+
+def test_bit_parallel_states_and_effects():
+    assert call_bit_parallel(OneState())['q'] == 1
+    assert call_bit_parallel(ZeroState())['q'] == 0
+    assert call_bit_parallel(OneEffect(), q=[1, 1]) == {}
+    with pytest.raises(ValueError):
+        call_bit_parallel(OneEffect(), q=[1, 0])
+
+
+def test_bit_parallel_add_large_batch():
+    program = compile_bit_parallel(Add(QUInt(32)))
+    rs = np.random.RandomState(52)
+    a, b = rs.randint(0, 2**32, size=(2, 1000), dtype=np.uint64)
+    out = program(a=a, b=b, chunk_size=128)
+    np.testing.assert_array_equal(out['a'], a)
+    np.testing.assert_array_equal(out['b'], (a + b) % 2**32)
+
+    # Inputs are broadcast.
+    out = program(a=np.arange(5)[:, np.newaxis], b=np.arange(3))
+    assert out['b'].shape == (5, 3)
+    np.testing.assert_array_equal(out['b'], np.add.outer(np.arange(5), np.arange(3)))
+
+    out = Add(QInt(64)).on_classical_vals(a=-5, b=3)
+    assert call_bit_parallel(Add(QInt(64)), a=-5, b=3)['b'] == out['b'] == -2
+
+
+def test_bit_parallel_multi_word():
+    bloq = Add(QUInt(70))
+    a = np.array([2**69 + 1, 3, 2**70 - 1], dtype=object)
+    b = np.array([2**69, 2**65, 1], dtype=object)
+    out = call_bit_parallel(bloq, a=a, b=b)
+    assert out['b'].tolist() == [1, 2**65 + 3, 0]
+
+    bloq = Add(QInt(65))
+    out = call_bit_parallel(bloq, a=np.array([-(2**64), 7]), b=np.array([-1, -10]))
+    assert out['b'].tolist() == [2**64 - 1, -3]
+
+
+def test_bit_parallel_not_supported():
+    with pytest.raises(BitParallelNotSupportedError):
+        compile_bit_parallel(Hadamard())
+    with pytest.raises(BitParallelNotSupportedError):
+        compile_bit_parallel(Cast(QUInt(4), QFxp(4, 4)))
+
+
+@frozen
+class PlusOneTest(Bloq):
+    bitsize: int
+
+    @property
+    def signature(self) -> Signature:
+        return Signature.build(x=self.bitsize)
+
+    def on_classical_vals(self, x: int) -> Dict[str, ClassicalValT]:
+        return {'x': (x + 1) % 2**self.bitsize}
+
+
+@frozen
+class CopyTest(Bloq):
+    bitsize: int
+    uncompute: bool = False
+
+    @property
+    def signature(self) -> Signature:
+        side = Side.LEFT if self.uncompute else Side.RIGHT
+        return Signature(
+            [Register('x', QUInt(self.bitsize)), Register('y', QUInt(self.bitsize), side=side)]
+        )
+
+    def on_classical_vals(self, x: int, y=None) -> Dict[str, ClassicalValT]:
+        if self.uncompute:
+            assert x == y
+            return {'x': x}
+        return {'x': x, 'y': x}
+
+
+def test_bit_parallel_classical_leaves():
+    bb = BloqBuilder()
+    x = bb.add_register('x', 3)
+    x = bb.add(PlusOneTest(3), x=x)
+    x, y = bb.add(CopyTest(3), x=x)
+    x, y = bb.add(Add(QUInt(3)), a=x, b=y)
+    x, z = bb.add(CopyTest(3), x=x)
+    x = bb.add(CopyTest(3, uncompute=True), x=x, y=z)
+    x = bb.add(PlusOneTest(3), x=x)
+    cbloq = bb.finalize(x=x, y=y)
+
+    program = compile_bit_parallel(cbloq)
+    assert [leaf.bloq for leaf in program.classical_leaves] == [
+        PlusOneTest(3),
+        CopyTest(3),
+        CopyTest(3),
+        CopyTest(3, uncompute=True),
+        PlusOneTest(3),
+    ]
+    assert_bit_parallel_matches_call_classically(cbloq)
+    out = program(x=np.arange(8))
+    np.testing.assert_array_equal(out['x'], (np.arange(8) + 2) % 8)
+    np.testing.assert_array_equal(out['y'], 2 * ((np.arange(8) + 1) % 8) % 8)
+
+
+def test_truth_table_bit_parallel():
+    bloq = Add(QInt(3))
+    in_names, out_names, truth_table = get_classical_truth_table(bloq, bit_parallel=True)
+    assert in_names == out_names == ['a', 'b']
+    assert len(truth_table) == 64
+    for in_vals, out_vals in truth_table:
+        assert out_vals == bloq.call_classically(**dict(zip(in_names, in_vals)))
+        assert all(type(v) is int for v in out_vals)
+
+
+def test_truth_table_defaults_to_call_classically():
+    # The decomposition of the signed comparator disagrees with its `on_classical_vals`, so the
+    # default truth table must not silently tabulate the decomposition.
+    bloq = LinearDepthGreaterThan(3, signed=True)
+    in_names, _, truth_table = get_classical_truth_table(bloq)
+    for in_vals, out_vals in truth_table:
+        assert out_vals == bloq.call_classically(**dict(zip(in_names, in_vals)))
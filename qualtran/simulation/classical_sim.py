@@ -34,39 +34,43 @@ from qualtran import (
 )
 from qualtran._infra.composite_bloq import _binst_to_cxns
 
+# Kept importable from this module for existing importers.
+from qualtran.simulation.bit_packing import (  # pylint: disable=unused-import
+    bits_to_ints,
+    ints_to_bits,
+)
+
 ClassicalValT = Union[int, NDArray[int]]
 
 
-def bits_to_ints(bitstrings: Union[Sequence[int], NDArray[np.uint]]) -> NDArray[np.uint]:
-    """Returns the integer specified by the given big-endian bitstrings.
+def classical_where(
+    cond: Union[bool, NDArray[np.bool_]], x: ClassicalValT, y: ClassicalValT
+) -> ClassicalValT:
+    """Element-wise `x if cond else y` for scalar or array classical values.
 
-    Args:
-        bitstrings: A bitstring or array of bitstrings, each of which has the 1s bit (LSB) at the end.
-    Returns:
-        An array of integers; one for each bitstring.
+    Unlike `np.where`, this returns a python integer if all the arguments are scalars. This lets
+    `on_classical_vals` implementations support both single values and arrays of values (for
+    batches of inputs) with the same code. Use arrays with `dtype=object` for values that do not
+    fit in 64 bits.
     """
-    bitstrings = np.atleast_2d(bitstrings)
-    if bitstrings.shape[1] > 64:
-        raise NotImplementedError()
-    basis = 2 ** np.arange(bitstrings.shape[1] - 1, 0 - 1, -1, dtype=np.uint64)
-    return np.sum(basis * bitstrings, axis=1)
+    if not any(isinstance(v, np.ndarray) for v in (cond, x, y)):
+        # Don't let `np.where` promote a mix of large python integers to a float.
+        return x if cond else y
+    out = np.where(cond, x, y)
+    return out if out.ndim else out.item()
 
 
-def ints_to_bits(x: Union[int, Sequence[int], NDArray[np.uint]], w: int) -> NDArray[np.uint8]:
-    """Returns the big-endian bitstrings specified by the given integers.
+def classical_widen(vals: ClassicalValT, result_bitsize: int) -> ClassicalValT:
+    """Casts numpy inputs to a dtype that can hold a `result_bitsize`-bit result.
 
-    Args:
-        x: An integer or array of unsigned integers.
-        w: The bit width of the returned bitstrings.
+    Python ints are returned as-is; numpy scalars become python ints and integer arrays are
+    cast to `int64` if the result fits, and to `object` (arbitrary precision) otherwise.
     """
-    x = np.atleast_1d(x)
-    if not np.issubdtype(x.dtype, np.uint):
-        assert np.all(x >= 0)
-        assert np.iinfo(x.dtype).bits <= 64
-        x = x.astype(np.uint64)
-    assert w <= np.iinfo(x.dtype).bits
-    mask = 2 ** np.arange(w - 1, 0 - 1, -1, dtype=x.dtype).reshape((w, 1))
-    return (x & mask).astype(bool).astype(np.uint8).T
+    if isinstance(vals, np.generic):
+        return vals.item()
+    if isinstance(vals, np.ndarray) and vals.dtype != object:
+        return vals.astype(np.int64 if result_bitsize < 64 else object)
+    return vals
 
 
 def _get_in_vals(
@@ -216,12 +220,24 @@ def call_cbloq_classically(
 
 
 def get_classical_truth_table(
-    bloq: 'Bloq',
+    bloq: 'Bloq', bit_parallel: bool = False
 ) -> Tuple[List[str], List[str], List[Tuple[Sequence[Any], Sequence[Any]]]]:
     """Get a 'truth table' for a classical-reversible bloq.
 
+    By default, the bloq is simulated with `Bloq.call_classically` one input at a time.
+
+    With `bit_parallel=True`, the bloq's decomposition is compiled by
+    `qualtran.simulation.bit_parallel_classical_sim.compile_bit_parallel` and all of its inputs
+    are simulated at once by a bit-parallel program. Leaves of the decomposition that aren't
+    supported reversible gates fall back to their own `on_classical_vals`. If the bloq can't be
+    compiled, or one of those leaves has no classical action, the whole bloq falls back to
+    `call_classically`. The bit-parallel program simulates the bloq's *decomposition* rather
+    than its `on_classical_vals`, so the two tables only agree if the decomposition is correct.
+
     Args:
         bloq: The classical-reversible bloq to create a truth table for.
+        bit_parallel: Whether to tabulate the bloq's decomposition with a bit-parallel program,
+            if it is supported.
 
     Returns:
         in_names: The names of the left, input registers to serve as truth table headings for
@@ -243,6 +259,41 @@ def get_classical_truth_table(
         iters.append(reg.dtype.get_classical_domain())
     out_names: List[str] = [reg.name for reg in bloq.signature.rights()]
 
+    program = None
+    if bit_parallel:
+        # Imported here to avoid a circular import: the supported gates use this module.
+        from qualtran.simulation.bit_parallel_classical_sim import (
+            BitParallelNotSupportedError,
+            compile_bit_parallel,
+        )
+
+        try:
+            program = compile_bit_parallel(bloq)
+        except BitParallelNotSupportedError:
+            pass
+
+    out_vals = None
+    if program is not None:
+        in_val_tuples = list(itertools.product(*iters))
+        n = len(in_val_tuples)
+        in_vals: Dict[str, Any] = {
+            name: np.array([in_val_tuple[i] for in_val_tuple in in_val_tuples]).reshape(n)
+            for i, name in enumerate(in_names)
+        }
+        try:
+            out_vals = program(**in_vals)
+        except NotImplementedError:
+            pass
+
+    if out_vals is not None:
+        out_cols = []
+        for reg in bloq.signature.rights():
+            out_val = np.reshape(out_vals[reg.name], (n,) + reg.shape)
+            # Use python integers (rather than numpy scalars) like `call_classically`.
+            out_cols.append(list(out_val) if reg.shape else out_val.tolist())
+        out_val_tuples = [tuple(col[i] for col in out_cols) for i in range(n)]
+        return in_names, out_names, list(zip(in_val_tuples, out_val_tuples))
+
     truth_table: List[Tuple[Sequence[Any], Sequence[Any]]] = []
     for in_val_tuple in itertools.product(*iters):
         in_val_d = {name: val for name, val in zip(in_names, in_val_tuple)}
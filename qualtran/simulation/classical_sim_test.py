@@ -26,6 +26,7 @@ from qualtran.simulation.classical_sim import (
     _update_assign_from_vals,
     bits_to_ints,
     call_cbloq_classically,
+    classical_where,
     ints_to_bits,
 )
 from qualtran.testing import execute_notebook
@@ -66,6 +67,17 @@ def test_int_to_bits():
         ints_to_bits([4, -2], w=8)
 
 
+def test_classical_where():
+    assert classical_where(True, 1, 2) == 1
+    assert type(classical_where(np.int64(3) < 2, 1, 2)) is int
+    np.testing.assert_array_equal(classical_where(np.arange(4) < 2, 1, np.arange(4)), [1, 1, 2, 3])
+    big = np.array([2**70, 2**80], dtype=object)
+    assert list(classical_where(big > 2**75, big + 1, big)) == [2**70, 2**80 + 1]
+    # Scalars are selected exactly, without going through a (float) numpy array.
+    assert classical_where(True, 2**63 + 1, 5) == 2**63 + 1
+    assert type(classical_where(False, 2**63 + 1, 5)) is int
+
+
 def test_dtype_validation():
     # set up mocks for `_update_assign_from_vals`
     soq_assign = {}  # gets assigned to; we discard in this test.
@@ -12,11 +12,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from typing import Optional
+from typing import Iterable, Optional, Tuple, Union
 
+import attrs
+import numpy as np
 from attrs import field, frozen
+from numpy.typing import ArrayLike
 
-from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.magic_count import MagicCount, MagicCountBatch
 from qualtran.surface_code.rotation_cost_model import RotationCostModel
 
 _PRETTY_FLOAT = field(default=0.0, converter=float, repr=lambda x: f'{x:g}')
@@ -65,6 +68,8 @@ class AlgorithmSummary:
         return self.__mul__(other)
 
     def __add__(self, other: 'AlgorithmSummary') -> 'AlgorithmSummary':
+        if isinstance(other, AlgorithmSummaryBatch):
+            return NotImplemented
         if not isinstance(other, AlgorithmSummary):
             raise TypeError(
                 f"Addition isn't supported between AlgorithmSummary and type {type(other)}"
@@ -79,6 +84,8 @@ class AlgorithmSummary:
         )
 
     def __sub__(self, other: 'AlgorithmSummary') -> 'AlgorithmSummary':
+        if isinstance(other, AlgorithmSummaryBatch):
+            return NotImplemented
         if not isinstance(other, AlgorithmSummary):
             raise TypeError(
                 f"Subtraction isn't supported between AlgorithmSummary and type {type(other)}"
@@ -110,3 +117,138 @@ class AlgorithmSummary:
                 * rotation_model.rotation_cost(error_budget / self.rotation_gates)
             )
         return ret
+
+
+def _as_float_array(x: ArrayLike) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def _zero() -> np.ndarray:
+    return np.zeros(())
+
+
+@frozen(eq=False)
+class AlgorithmSummaryBatch:
+    """A batch of `AlgorithmSummary`s stored as NumPy arrays.
+
+    Each attribute of `AlgorithmSummary` is an array here. Arithmetic broadcasts the
+    arrays against each other, so e.g. a batch of summaries can be scaled by an array of
+    repetition counts without creating an `AlgorithmSummary` per element. Unlike
+    `AlgorithmSummary`, multiplication by non-integer factors is allowed.
+
+    Attributes:
+        algorithm_qubits: Number of qubits used by the algorithm $Q_{alg}$.
+        measurements: Number of Measurements $M_R$.
+        t_gates: Number of T gates $M_T$.
+        toffoli_gates: Number of Toffoli gates $M_{Tof}$.
+        rotation_gates: Number of Rotations $M_R$.
+        rotation_circuit_depth: Depth of rotation circuit $D_R$.
+    """
+
+    algorithm_qubits: np.ndarray = field(factory=_zero, converter=_as_float_array)
+    measurements: np.ndarray = field(factory=_zero, converter=_as_float_array)
+    t_gates: np.ndarray = field(factory=_zero, converter=_as_float_array)
+    toffoli_gates: np.ndarray = field(factory=_zero, converter=_as_float_array)
+    rotation_gates: np.ndarray = field(factory=_zero, converter=_as_float_array)
+    rotation_circuit_depth: np.ndarray = field(factory=_zero, converter=_as_float_array)
+
+    # Make NumPy defer to our reflected operators, e.g. in `np.arange(3) * batch`.
+    __array_ufunc__ = None
+
+    @classmethod
+    def from_summaries(cls, summaries: Iterable[AlgorithmSummary]) -> 'AlgorithmSummaryBatch':
+        summaries = list(summaries)
+        return cls(
+            **{
+                name: [getattr(summary, name) for summary in summaries]
+                for name in attrs.fields_dict(AlgorithmSummary)
+            }
+        )
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        return attrs.astuple(self, recurse=False)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return np.broadcast_shapes(*(col.shape for col in self._columns()))
+
+    def __getitem__(self, item) -> Union[AlgorithmSummary, 'AlgorithmSummaryBatch']:
+        shape = self.shape
+        columns = [np.broadcast_to(col, shape)[item] for col in self._columns()]
+        if np.ndim(columns[0]) == 0:
+            return AlgorithmSummary(*columns)
+        return AlgorithmSummaryBatch(*columns)
+
+    def sum(self) -> AlgorithmSummary:
+        """The sum of all the summaries in the batch."""
+        shape = self.shape
+        return AlgorithmSummary(*(np.broadcast_to(col, shape).sum() for col in self._columns()))
+
+    def __mul__(self, other: ArrayLike) -> 'AlgorithmSummaryBatch':
+        other = np.asarray(other)
+        if not (np.issubdtype(other.dtype, np.integer) or np.issubdtype(other.dtype, np.floating)):
+            raise TypeError(
+                f"Multiplication isn't supported between AlgorithmSummaryBatch and {other.dtype}"
+            )
+        return AlgorithmSummaryBatch(*(col * other for col in self._columns()))
+
+    def __rmul__(self, other: ArrayLike) -> 'AlgorithmSummaryBatch':
+        return self.__mul__(other)
+
+    def __add__(
+        self, other: Union[AlgorithmSummary, 'AlgorithmSummaryBatch']
+    ) -> 'AlgorithmSummaryBatch':
+        if not isinstance(other, (AlgorithmSummary, AlgorithmSummaryBatch)):
+            raise TypeError(
+                f"Addition isn't supported between AlgorithmSummaryBatch and type {type(other)}"
+            )
+        return AlgorithmSummaryBatch(
+            *(a + b for a, b in zip(self._columns(), attrs.astuple(other, recurse=False)))
+        )
+
+    def __radd__(self, other: AlgorithmSummary) -> 'AlgorithmSummaryBatch':
+        return self.__add__(other)
+
+    def __sub__(
+        self, other: Union[AlgorithmSummary, 'AlgorithmSummaryBatch']
+    ) -> 'AlgorithmSummaryBatch':
+        if not isinstance(other, (AlgorithmSummary, AlgorithmSummaryBatch)):
+            raise TypeError(
+                f"Subtraction isn't supported between AlgorithmSummaryBatch and type {type(other)}"
+            )
+        return AlgorithmSummaryBatch(
+            *(a - b for a, b in zip(self._columns(), attrs.astuple(other, recurse=False)))
+        )
+
+    def __rsub__(self, other: AlgorithmSummary) -> 'AlgorithmSummaryBatch':
+        return -1 * self + other
+
+    def to_magic_count(
+        self,
+        rotation_model: Optional[RotationCostModel] = None,
+        error_budget: Optional[ArrayLike] = None,
+    ) -> MagicCountBatch:
+        """Elementwise `AlgorithmSummary.to_magic_count`.
+
+        The rotation cost model is evaluated once per distinct per-rotation error budget.
+        """
+        ret = MagicCountBatch(n_t=self.t_gates, n_ccz=self.toffoli_gates)
+        has_rotations = self.rotation_gates > 0
+        if not np.any(has_rotations):
+            return ret
+        if rotation_model is None or error_budget is None:
+            raise ValueError(
+                'Rotation cost model and error budget must be provided to calculate rotation cost'
+            )
+        error_budget, rotation_gates = np.broadcast_arrays(error_budget, self.rotation_gates)
+        has_rotations = rotation_gates > 0
+        # Dummy budgets for elements without rotations, whose cost is dropped below.
+        error_budget = np.where(has_rotations, error_budget, 1.0)
+        rotation_budget = error_budget / np.where(has_rotations, rotation_gates, 1.0)
+        overhead = rotation_model.prepartion_overhead_batch(error_budget)
+        rotation_cost = rotation_model.rotation_cost_batch(rotation_budget)
+        rotations = ret + overhead + rotation_gates * rotation_cost
+        return MagicCountBatch(
+            n_t=np.where(has_rotations, rotations.n_t, ret.n_t),
+            n_ccz=np.where(has_rotations, rotations.n_ccz, ret.n_ccz),
+        )
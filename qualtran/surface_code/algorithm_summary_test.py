@@ -12,10 +12,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import numpy as np
 import pytest
 
-from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary, AlgorithmSummaryBatch
 from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.rotation_cost_model import (
+    BeverlandEtAlRotationCost,
+    SevenDigitsOfPrecisionConstantCost,
+)
 
 
 def test_mul():
@@ -90,3 +95,48 @@ def test_subtraction():
 
     with pytest.raises(ValueError):
         _ = AlgorithmSummary(rotation_gates=1).to_magic_count()
+
+
+def test_batch_arithmetic():
+    a = AlgorithmSummary(algorithm_qubits=7, measurements=8, t_gates=8, toffoli_gates=9)
+    b = AlgorithmSummary(algorithm_qubits=4, rotation_gates=2, rotation_circuit_depth=1)
+    batch = AlgorithmSummaryBatch.from_summaries([a, b])
+    assert batch.shape == (2,)
+    assert batch[0] == a and batch[1] == b
+    assert batch.sum() == a + b
+
+    repetitions = np.array([[1], [2], [3]])
+    scaled = repetitions * batch + a
+    assert scaled.shape == (3, 2)
+    assert scaled[2, 1] == 3 * b + a
+    assert (a - batch)[1] == a - b
+    assert (0.5 * batch)[0] == AlgorithmSummary(
+        algorithm_qubits=3.5, measurements=4, t_gates=4, toffoli_gates=4.5
+    )
+
+    with pytest.raises(TypeError):
+        _ = complex(1, 0) * batch
+    with pytest.raises(TypeError):
+        _ = batch + 5
+
+
+def test_batch_to_magic_count():
+    summaries = [
+        AlgorithmSummary(t_gates=1, toffoli_gates=4),
+        AlgorithmSummary(rotation_gates=10, t_gates=3),
+        AlgorithmSummary(rotation_gates=1000),
+    ]
+    batch = AlgorithmSummaryBatch.from_summaries(summaries)
+    error_budgets = np.array([[1e-2], [1e-4]])
+    for model in [BeverlandEtAlRotationCost, SevenDigitsOfPrecisionConstantCost]:
+        got = batch.to_magic_count(rotation_model=model, error_budget=error_budgets)
+        assert got.shape == (2, 3)
+        for i, budget in enumerate(error_budgets[:, 0]):
+            for j, summary in enumerate(summaries):
+                assert got[i, j] == summary.to_magic_count(model, budget)
+
+    assert AlgorithmSummaryBatch.from_summaries(summaries[:1]).to_magic_count()[0] == MagicCount(
+        n_t=1, n_ccz=4
+    )
+    with pytest.raises(ValueError):
+        _ = batch.to_magic_count()
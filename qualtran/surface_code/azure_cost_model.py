@@ -13,15 +13,20 @@
 #  limitations under the License.
 
 import math
+from typing import Union
 
-from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+import numpy as np
+
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary, AlgorithmSummaryBatch
 from qualtran.surface_code.quantum_error_correction_scheme_summary import (
     QuantumErrorCorrectionSchemeSummary,
 )
 from qualtran.surface_code.rotation_cost_model import RotationCostModel
 
 
-def logical_qubits(algorithm_specs: AlgorithmSummary) -> int:
+def logical_qubits(
+    algorithm_specs: Union[AlgorithmSummary, AlgorithmSummaryBatch]
+) -> Union[int, np.ndarray]:
     r"""Number of logical qubits needed for the algorithm.
 
     Equals:
@@ -32,15 +37,19 @@ def logical_qubits(algorithm_specs: AlgorithmSummary) -> int:
     Source: Equation D1 in https://arxiv.org/abs/2211.07629.
 
     Args:
-        algorithm_specs: A summary of an algorithm/circuit.
+        algorithm_specs: A summary of an algorithm/circuit, or a batch of them.
     """
     q_alg = algorithm_specs.algorithm_qubits
+    if isinstance(algorithm_specs, AlgorithmSummaryBatch):
+        return np.ceil(2 * q_alg + np.sqrt(8 * q_alg) + 1).astype(np.int64)
     return math.ceil(2 * q_alg + math.sqrt(8 * q_alg) + 1)
 
 
 def minimum_time_steps(
-    error_budget: float, alg: AlgorithmSummary, rotation_model: RotationCostModel
-) -> int:
+    error_budget: float,
+    alg: Union[AlgorithmSummary, AlgorithmSummaryBatch],
+    rotation_model: RotationCostModel,
+) -> Union[int, np.ndarray]:
     r"""Minimum number of time steps needed for the algorithm.
 
     Equals
@@ -58,10 +67,12 @@ def minimum_time_steps(
 
     Args:
         error_budget: Error Budget.
-        alg: A summary of an algorithm/circuit.
+        alg: A summary of an algorithm/circuit, or a batch of them.
         rotation_model: Cost model used to compute the number of T gates
             needed to approximate rotations.
     """
+    if isinstance(alg, AlgorithmSummaryBatch):
+        return _minimum_time_steps_batch(error_budget, alg, rotation_model)
     c_min = math.ceil(alg.measurements + alg.rotation_gates + alg.t_gates + 3 * alg.toffoli_gates)
     eps_syn = error_budget / 3
     if alg.rotation_gates > 0:
@@ -72,13 +83,29 @@ def minimum_time_steps(
     return c_min
 
 
+def _minimum_time_steps_batch(
+    error_budget: float, alg: AlgorithmSummaryBatch, rotation_model: RotationCostModel
+) -> np.ndarray:
+    """Elementwise `minimum_time_steps` over a batch of algorithm summaries."""
+    c_min = np.ceil(alg.measurements + alg.rotation_gates + alg.t_gates + 3 * alg.toffoli_gates)
+    eps_syn, rotation_gates = np.broadcast_arrays(error_budget / 3, alg.rotation_gates)
+    has_rotations = rotation_gates > 0
+    if np.any(has_rotations):
+        rotation_cost = rotation_model.rotation_cost_batch(
+            np.where(has_rotations, eps_syn / np.where(has_rotations, rotation_gates, 1), 1)
+        )
+        c_rot = np.ceil(alg.rotation_circuit_depth * (rotation_cost.n_t + 4 * rotation_cost.n_ccz))
+        c_min = c_min + np.where(has_rotations, c_rot, 0)
+    return c_min.astype(np.int64)
+
+
 def code_distance(
     error_budget: float,
-    time_steps: float,
-    alg: AlgorithmSummary,
+    time_steps: Union[float, np.ndarray],
+    alg: Union[AlgorithmSummary, AlgorithmSummaryBatch],
     qec: QuantumErrorCorrectionSchemeSummary,
     physical_error_rate: float,
-) -> int:
+) -> Union[int, np.ndarray]:
     r"""Minimum code distance needed to run the algorithm within the error budget.
 
     This is the code distance $d$ that satisfies $QCP = \epsilon/3$. Where:
@@ -89,18 +116,24 @@ def code_distance(
 
     Args:
         error_budget: Error Budget.
-        time_steps: Number of time steps used to run the algorithm.
-        alg: A summary of an algorithm/circuit.
+        time_steps: Number of time steps used to run the algorithm, or an array of them.
+        alg: A summary of an algorithm/circuit, or a batch of them.
         qec: Quantum Error Correction Scheme.
         physical_error_rate: The physical error rate of the device.
     """
     q = logical_qubits(alg)
+    if isinstance(q, np.ndarray) or isinstance(time_steps, np.ndarray):
+        return qec.code_distance_from_budget_vectorized(
+            physical_error_rate, error_budget / (3 * q * np.asarray(time_steps))
+        )
     return qec.code_distance_from_budget(physical_error_rate, error_budget / (3 * q * time_steps))
 
 
 def t_states(
-    error_budget: float, alg: AlgorithmSummary, rotation_model: RotationCostModel
-) -> float:
+    error_budget: float,
+    alg: Union[AlgorithmSummary, AlgorithmSummaryBatch],
+    rotation_model: RotationCostModel,
+) -> Union[float, np.ndarray]:
     r"""Total number of T states consumed by the algorithm.
 
     Equals
@@ -116,7 +149,7 @@ def t_states(
 
     Args:
         error_budget: Error Budget.
-        alg: A summary of an algorithm/circuit.
+        alg: A summary of an algorithm/circuit, or a batch of them.
         rotation_model: Cost model used to compute the number of T gates
             needed to approximate rotations.
     """
@@ -12,11 +12,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import numpy as np
 import pytest
 from attrs import frozen
 
 from qualtran.surface_code import azure_cost_model
-from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary, AlgorithmSummaryBatch
 from qualtran.surface_code.quantum_error_correction_scheme_summary import (
     BeverlandSuperconductingQubits,
 )
@@ -118,3 +119,32 @@ def test_t_states(test: Test):
         test.error_budget, test.alg, rotation_model=BeverlandEtAlRotationCost
     )
     assert got == pytest.approx(test.t_states, rel=0.1)
+
+
+def test_batch_matches_scalar():
+    algs = [test.alg for test in _TESTS] + [AlgorithmSummary(algorithm_qubits=10, t_gates=100)]
+    batch = AlgorithmSummaryBatch.from_summaries(algs)
+    error_budget = np.array([[1e-3], [1e-2]])
+    time_steps = 1e9
+
+    np.testing.assert_array_equal(
+        azure_cost_model.logical_qubits(batch),
+        [azure_cost_model.logical_qubits(alg) for alg in algs],
+    )
+    c_min = azure_cost_model.minimum_time_steps(error_budget, batch, BeverlandEtAlRotationCost)
+    t_states = azure_cost_model.t_states(error_budget, batch, BeverlandEtAlRotationCost)
+    d = azure_cost_model.code_distance(
+        error_budget, time_steps, batch, BeverlandSuperconductingQubits, physical_error_rate=1e-4
+    )
+    assert c_min.shape == t_states.shape == d.shape == (2, len(algs))
+    for i, budget in enumerate(error_budget[:, 0]):
+        for j, alg in enumerate(algs):
+            assert c_min[i, j] == azure_cost_model.minimum_time_steps(
+                budget, alg, BeverlandEtAlRotationCost
+            )
+            assert t_states[i, j] == azure_cost_model.t_states(
+                budget, alg, BeverlandEtAlRotationCost
+            )
+            assert d[i, j] == azure_cost_model.code_distance(
+                budget, time_steps, alg, BeverlandSuperconductingQubits, physical_error_rate=1e-4
+            )
@@ -13,13 +13,15 @@
 #  limitations under the License.
 
 import math
-from typing import Callable, Iterable, Iterator, Optional, Tuple
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from attrs import frozen
+from numpy.typing import ArrayLike
 
 import qualtran.surface_code.quantum_error_correction_scheme_summary as qec
 from qualtran.surface_code.data_block import DataBlock, SimpleDataBlock
-from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.magic_count import MagicCount, MagicCountBatch
 from qualtran.surface_code.magic_state_factory import MagicStateFactory
 from qualtran.surface_code.multi_factory import MultiFactory
 from qualtran.surface_code.physical_cost import PhysicalCost
@@ -163,7 +165,7 @@ class CCZ2TFactory(MagicStateFactory):
 
 def get_ccz2t_costs(
     *,
-    n_magic: MagicCount,
+    n_magic: Union[MagicCount, MagicCountBatch],
     n_algo_qubits: int,
     phys_err: float,
     cycle_time_us: float,
@@ -175,15 +177,27 @@ def get_ccz2t_costs(
     Note that this function can return failure probabilities larger than 1.
 
     Args:
-        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm
+        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm.
+            If a `MagicCountBatch` is given, the returned `PhysicalCost` holds arrays with its
+            shape.
         n_algo_qubits: Number of algorithm logical qubits.
         phys_err: The physical error rate of the device.
         cycle_time_us: The number of microseconds it takes to execute a surface code cycle.
         factory: magic state factory configuration. Used to evaluate distillation error and cost.
         data_block: data block configuration. Used to evaluate data error and footprint.
     """
+    if isinstance(n_magic, MagicCountBatch):
+        return _get_ccz2t_costs_batch(
+            n_magic=n_magic,
+            n_algo_qubits=n_algo_qubits,
+            phys_err=phys_err,
+            cycle_time_us=cycle_time_us,
+            factory=factory,
+            data_block=data_block,
+        )
+
     distillation_error = factory.distillation_error(n_magic=n_magic, phys_err=phys_err)
-    n_cycles = factory.n_cycles(n_magic=n_magic)
+    n_cycles = factory.n_cycles(n_magic=n_magic, phys_err=phys_err)
     data_error = data_block.data_error(
         n_algo_qubits=n_algo_qubits, n_cycles=n_cycles, phys_err=phys_err
     )
@@ -194,9 +208,160 @@ def get_ccz2t_costs(
     return PhysicalCost(failure_prob=failure_prob, footprint=footprint, duration_hr=duration_hr)
 
 
+def _get_ccz2t_costs_batch(
+    *,
+    n_magic: MagicCountBatch,
+    n_algo_qubits: int,
+    phys_err: float,
+    cycle_time_us: float,
+    factory: MagicStateFactory,
+    data_block: DataBlock,
+) -> PhysicalCost:
+    """`get_ccz2t_costs` for every element of a batch of magic counts."""
+    base_factory, n_factories = factory, 1
+    if isinstance(factory, MultiFactory):
+        base_factory, n_factories = factory.base_factory, factory.n_factories
+    if (
+        isinstance(base_factory, CCZ2TFactory)
+        and isinstance(data_block, SimpleDataBlock)
+        and base_factory.qec_scheme == data_block.qec_scheme
+    ):
+        return get_ccz2t_costs_vectorized(
+            n_magic=n_magic,
+            n_algo_qubits=n_algo_qubits,
+            phys_err=phys_err,
+            cycle_time_us=cycle_time_us,
+            distillation_l1_d=base_factory.distillation_l1_d,
+            distillation_l2_d=base_factory.distillation_l2_d,
+            data_d=data_block.data_d,
+            n_factories=n_factories,
+            routing_overhead=data_block.routing_overhead,
+            qec_scheme=data_block.qec_scheme,
+        )
+
+    # Otherwise, evaluate the scalar model once per distinct magic count.
+    shape = n_magic.shape
+    counts = np.stack([np.broadcast_to(n_magic.n_t, shape), np.broadcast_to(n_magic.n_ccz, shape)])
+    unique, inverse = np.unique(counts.reshape(2, -1), axis=1, return_inverse=True)
+    costs = [
+        get_ccz2t_costs(
+            n_magic=MagicCount(n_t=n_t, n_ccz=n_ccz),
+            n_algo_qubits=n_algo_qubits,
+            phys_err=phys_err,
+            cycle_time_us=cycle_time_us,
+            factory=factory,
+            data_block=data_block,
+        )
+        for n_t, n_ccz in unique.T
+    ]
+    inverse = inverse.reshape(shape)
+    return PhysicalCost(
+        failure_prob=np.array([c.failure_prob for c in costs])[inverse],
+        footprint=np.array([c.footprint for c in costs])[inverse],
+        duration_hr=np.array([c.duration_hr for c in costs])[inverse],
+    )
+
+
+def _n_ccz_states(n_t: ArrayLike, n_ccz: ArrayLike) -> np.ndarray:
+    return n_ccz + np.ceil(np.asarray(n_t) / 2)
+
+
+def _ccz2t_l2_error(
+    l1_d: ArrayLike,
+    l2_d: ArrayLike,
+    phys_err: ArrayLike,
+    qec_scheme: qec.QuantumErrorCorrectionSchemeSummary,
+) -> np.ndarray:
+    """Elementwise `CCZ2TFactory.l2_error` over arrays of distances and error rates."""
+    l1_d = np.asarray(l1_d)
+
+    def logical_error_rate(code_distance):
+        return qec_scheme.logical_error_rate_vectorized(code_distance, phys_err)
+
+    l0_error = phys_err + 100 * logical_error_rate(l1_d // 2)
+    l1_topo_error = logical_error_rate(l1_d)
+    l1_error = 1000 * l1_topo_error + 100 * l1_topo_error + 35 * l0_error**3
+    return 1000 * logical_error_rate(l2_d) + 28 * l1_error**2
+
+
+def _ccz2t_n_cycles(
+    l1_d: ArrayLike, l2_d: ArrayLike, n_t: ArrayLike, n_ccz: ArrayLike
+) -> np.ndarray:
+    """Elementwise `CCZ2TFactory.n_cycles` over arrays of distances and magic counts."""
+    distillation_d = np.maximum(2 * np.asarray(l1_d) + 1, l2_d)
+    catalyzations = np.ceil(np.asarray(n_t) / 2)
+    return np.ceil((_n_ccz_states(n_t, n_ccz) * 5.5 + catalyzations) * distillation_d)
+
+
+def get_ccz2t_costs_vectorized(
+    *,
+    n_magic: Union[MagicCount, MagicCountBatch],
+    n_algo_qubits: int,
+    phys_err: ArrayLike,
+    cycle_time_us: float,
+    distillation_l1_d: ArrayLike,
+    distillation_l2_d: ArrayLike,
+    data_d: ArrayLike,
+    n_factories: ArrayLike = 1,
+    routing_overhead: ArrayLike = 0.5,
+    qec_scheme: qec.QuantumErrorCorrectionSchemeSummary = qec.FowlerSuperconductingQubits,
+) -> PhysicalCost:
+    """Evaluate `get_ccz2t_costs` over whole arrays of parameters at once.
+
+    This is equivalent to calling `get_ccz2t_costs` with a
+    `MultiFactory(CCZ2TFactory(l1_d, l2_d, qec_scheme), n_factories)` and a
+    `SimpleDataBlock(data_d, routing_overhead, qec_scheme)` for every element of the
+    broadcast of the array-valued arguments, but evaluates the model with a handful of
+    NumPy operations instead of one Python call per configuration.
+
+    Args:
+        n_magic: The number(s) of magic states (T, Toffoli) required to execute the algorithm.
+        n_algo_qubits: Number of algorithm logical qubits.
+        phys_err: The physical error rate(s) of the device.
+        cycle_time_us: The number of microseconds it takes to execute a surface code cycle.
+        distillation_l1_d: Code distance(s) used for level 1 factories.
+        distillation_l2_d: Code distance(s) used for level 2 factories.
+        data_d: Code distance(s) used for the data block.
+        n_factories: Number(s) of factories used in parallel.
+        routing_overhead: Routing overhead(s) of the data block.
+        qec_scheme: The error correction scheme used by both the factories and the data block.
+
+    Returns:
+        A `PhysicalCost` whose attributes are arrays with the broadcast shape of the inputs.
+    """
+    phys_err = np.asarray(phys_err, dtype=float)
+    l1_d = np.asarray(distillation_l1_d, dtype=np.int64)
+    l2_d = np.asarray(distillation_l2_d, dtype=np.int64)
+    data_d = np.asarray(data_d, dtype=np.int64)
+    n_factories = np.asarray(n_factories, dtype=np.int64)
+    routing_overhead = np.asarray(routing_overhead, dtype=float)
+
+    distillation_error = _ccz2t_l2_error(l1_d, l2_d, phys_err, qec_scheme) * _n_ccz_states(
+        n_magic.n_t, n_magic.n_ccz
+    )
+    n_cycles = _ccz2t_n_cycles(l1_d, l2_d, n_magic.n_t, n_magic.n_ccz)
+    n_cycles = np.ceil(n_cycles / n_factories)
+
+    # Data block; see `SimpleDataBlock`.
+    n_logical_qubits = np.ceil((1 + routing_overhead) * n_algo_qubits).astype(np.int64)
+    data_error = (
+        n_logical_qubits * n_cycles * qec_scheme.logical_error_rate_vectorized(data_d, phys_err)
+    )
+
+    factory_footprint = (6 * (4 * 8 * 2 * l1_d**2) + 4 * 8 * 2 * l2_d**2) * n_factories
+    data_footprint = n_logical_qubits * qec_scheme.physical_qubits(data_d)
+
+    failure_prob, footprint, duration_hr = np.broadcast_arrays(
+        distillation_error + data_error,
+        factory_footprint + data_footprint,
+        (cycle_time_us * n_cycles) / (1_000_000 * 60 * 60),
+    )
+    return PhysicalCost(failure_prob=failure_prob, footprint=footprint, duration_hr=duration_hr)
+
+
 def get_ccz2t_costs_from_error_budget(
     *,
-    n_magic: MagicCount,
+    n_magic: Union[MagicCount, MagicCountBatch],
     n_algo_qubits: int,
     phys_err: float = 1e-3,
     error_budget: float = 1e-2,
@@ -208,7 +373,10 @@ def get_ccz2t_costs_from_error_budget(
     """Physical costs using the model from catalyzed CCZ to 2T paper.
 
     Args:
-        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm
+        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm.
+            If a `MagicCountBatch` is given, the returned `PhysicalCost` holds arrays with its
+            shape; see `get_ccz2t_costs_from_error_budget_vectorized` for how configurations
+            that exceed the error budget are reported.
         n_algo_qubits: Number of algorithm logical qubits.
         phys_err: The physical error rate of the device. This sets the suppression
             factor for increasing code distance.
@@ -235,10 +403,25 @@ def get_ccz2t_costs_from_error_budget(
     if factory is None:
         factory = CCZ2TFactory()
 
-    distillation_error = factory.distillation_error(n_magic=n_magic, phys_err=phys_err)
-    n_cycles = factory.n_cycles(n_magic=n_magic)
+    if isinstance(n_magic, MagicCountBatch) and data_block is None:
+        if not isinstance(factory, CCZ2TFactory):
+            raise ValueError(
+                f"A batch of magic counts needs a `data_block` when using {type(factory)}."
+            )
+        return get_ccz2t_costs_from_error_budget_vectorized(
+            n_t=n_magic.n_t,
+            n_ccz=n_magic.n_ccz,
+            n_algo_qubits=n_algo_qubits,
+            phys_err=phys_err,
+            error_budget=error_budget,
+            cycle_time_us=cycle_time_us,
+            routing_overhead=routing_overhead,
+            factory=factory,
+        )
 
     if data_block is None:
+        distillation_error = factory.distillation_error(n_magic=n_magic, phys_err=phys_err)
+        n_cycles = factory.n_cycles(n_magic=n_magic, phys_err=phys_err)
         # Use "left over" budget for data qubits.
         err_budget = error_budget - distillation_error
         if err_budget < 0:
@@ -267,6 +450,74 @@ def get_ccz2t_costs_from_error_budget(
     )
 
 
+def get_ccz2t_costs_from_error_budget_vectorized(
+    *,
+    n_t: ArrayLike,
+    n_ccz: ArrayLike,
+    n_algo_qubits: ArrayLike,
+    phys_err: ArrayLike = 1e-3,
+    error_budget: ArrayLike = 1e-2,
+    cycle_time_us: ArrayLike = 1.0,
+    routing_overhead: ArrayLike = 0.5,
+    factory: CCZ2TFactory = CCZ2TFactory(),
+) -> PhysicalCost:
+    """Evaluate `get_ccz2t_costs_from_error_budget` over whole arrays of parameters at once.
+
+    Magic state counts are given as (arrays of) `n_t` and `n_ccz` instead of a `MagicCount`,
+    and the data block code distance is chosen from the remaining error budget for every
+    element of the broadcast of the array-valued arguments.
+
+    Args:
+        n_t: The number(s) of T states required to execute the algorithm.
+        n_ccz: The number(s) of CCZ states required to execute the algorithm.
+        n_algo_qubits: Number(s) of algorithm logical qubits.
+        phys_err: The physical error rate(s) of the device.
+        error_budget: The acceptable chance(s) of an error occurring at any point.
+        cycle_time_us: The number(s) of microseconds it takes to execute a surface code cycle.
+        routing_overhead: Routing overhead(s) of the data block.
+        factory: The factory to use for every configuration.
+
+    Returns:
+        A `PhysicalCost` whose attributes are float arrays with the broadcast shape of the
+        inputs. Configurations whose distillation error alone exhausts the error budget, for
+        which `get_ccz2t_costs_from_error_budget` raises, are NaN.
+    """
+    phys_err = np.asarray(phys_err, dtype=float)
+    n_t = np.asarray(n_t, dtype=float)
+    n_ccz = np.asarray(n_ccz, dtype=float)
+    l1_d, l2_d = factory.distillation_l1_d, factory.distillation_l2_d
+
+    distillation_error = _ccz2t_l2_error(l1_d, l2_d, phys_err, factory.qec_scheme) * _n_ccz_states(
+        n_t, n_ccz
+    )
+    n_cycles = _ccz2t_n_cycles(l1_d, l2_d, n_t, n_ccz)
+
+    # Use "left over" budget for data qubits.
+    err_budget = error_budget - distillation_error
+    feasible = err_budget > 0
+    n_logical_qubits = np.ceil((1 + np.asarray(routing_overhead)) * n_algo_qubits)
+    data_unit_cells = n_logical_qubits * n_cycles
+    data_qec = qec.FowlerSuperconductingQubits
+    # Infeasible entries get a placeholder budget, so that every code distance is a valid
+    # integer, and are masked out below.
+    data_d = data_qec.code_distance_from_budget_vectorized(
+        phys_err, np.where(feasible, err_budget, 1.0) / data_unit_cells
+    )
+    data_error = data_unit_cells * data_qec.logical_error_rate_vectorized(data_d, phys_err)
+
+    failure_prob, footprint, duration_hr, feasible = np.broadcast_arrays(
+        distillation_error + data_error,
+        factory.footprint() + n_logical_qubits * data_qec.physical_qubits(data_d),
+        (cycle_time_us * n_cycles) / (1_000_000 * 60 * 60),
+        feasible,
+    )
+    return PhysicalCost(
+        failure_prob=np.where(feasible, failure_prob, np.nan),
+        footprint=np.where(feasible, footprint, np.nan),
+        duration_hr=np.where(feasible, duration_hr, np.nan),
+    )
+
+
 def iter_ccz2t_factories(
     l1_start: int = 5, l1_stop: int = 25, l2_stop: int = 41, *, n_factories=1
 ) -> Iterator[MagicStateFactory]:
@@ -302,6 +553,88 @@ def iter_simple_data_blocks(d_start: int = 7, d_stop: int = 35):
         yield SimpleDataBlock(data_d=logical_data_qubit_distance)
 
 
+def _ccz2t_factory_params(
+    factory: MagicStateFactory,
+) -> Optional[Tuple[int, int, int, qec.QuantumErrorCorrectionSchemeSummary]]:
+    """`(l1_d, l2_d, n_factories, qec_scheme)` of a (multi) CCZ2T factory, or None."""
+    n_factories = 1
+    if type(factory) is MultiFactory:
+        n_factories = factory.n_factories
+        factory = factory.base_factory
+    if type(factory) is not CCZ2TFactory:
+        return None
+    return (factory.distillation_l1_d, factory.distillation_l2_d, n_factories, factory.qec_scheme)
+
+
+def _get_ccz2t_grid_costs(
+    *,
+    n_magic: MagicCount,
+    n_algo_qubits: int,
+    phys_err: float,
+    cycle_time_us: float,
+    factories: Sequence[MagicStateFactory],
+    data_blocks: Sequence[DataBlock],
+) -> Optional[PhysicalCost]:
+    """Costs of every (factory, data block) pair as a `PhysicalCost` of 2D arrays.
+
+    Returns None if the configurations can't be evaluated by `get_ccz2t_costs_vectorized`.
+    """
+    factory_params = [_ccz2t_factory_params(factory) for factory in factories]
+    if any(params is None for params in factory_params):
+        return None
+    if any(type(data_block) is not SimpleDataBlock for data_block in data_blocks):
+        return None
+    qec_schemes = {params[3] for params in factory_params}
+    qec_schemes |= {data_block.qec_scheme for data_block in data_blocks}
+    if len(qec_schemes) != 1:
+        return None
+
+    l1_d, l2_d, n_factories, _ = (np.array(col)[:, np.newaxis] for col in zip(*factory_params))
+    return get_ccz2t_costs_vectorized(
+        n_magic=n_magic,
+        n_algo_qubits=n_algo_qubits,
+        phys_err=phys_err,
+        cycle_time_us=cycle_time_us,
+        distillation_l1_d=l1_d,
+        distillation_l2_d=l2_d,
+        data_d=np.array([data_block.data_d for data_block in data_blocks]),
+        n_factories=n_factories,
+        routing_overhead=np.array([data_block.routing_overhead for data_block in data_blocks]),
+        qec_scheme=qec_schemes.pop(),
+    )
+
+
+def _qubit_hours(pc: PhysicalCost) -> float:
+    return pc.qubit_hours
+
+
+def _apply_cost_function_to_grid(
+    cost_function: Callable[[PhysicalCost], float], grid_cost: PhysicalCost, vectorized: bool
+) -> np.ndarray:
+    """Evaluate `cost_function` on a `PhysicalCost` of arrays.
+
+    A `vectorized` cost function is applied to the whole grid in one call; otherwise, it is
+    applied element by element.
+    """
+    shape = grid_cost.failure_prob.shape
+    if vectorized:
+        values = np.asarray(cost_function(grid_cost), dtype=float)
+        if values.shape != shape:
+            raise ValueError(
+                f"The vectorized cost function returned shape {values.shape}, expected {shape}."
+            )
+        return values
+    return np.array(
+        [
+            cost_function(PhysicalCost(failure_prob=fp, footprint=fpt, duration_hr=dur))
+            for fp, fpt, dur in zip(
+                grid_cost.failure_prob.flat, grid_cost.footprint.flat, grid_cost.duration_hr.flat
+            )
+        ],
+        dtype=float,
+    ).reshape(shape)
+
+
 def get_ccz2t_costs_from_grid_search(
     *,
     n_magic: MagicCount,
@@ -311,12 +644,18 @@ def get_ccz2t_costs_from_grid_search(
     cycle_time_us: float = 1.0,
     factory_iter: Iterable[MagicStateFactory] = tuple(iter_ccz2t_factories()),
     data_block_iter: Iterable[DataBlock] = tuple(iter_simple_data_blocks()),
-    cost_function: Callable[[PhysicalCost], float] = (lambda pc: pc.qubit_hours),
+    cost_function: Callable[[PhysicalCost], float] = _qubit_hours,
+    vectorized_cost_function: bool = False,
 ) -> Tuple[PhysicalCost, CCZ2TFactory, SimpleDataBlock]:
     """Grid search over parameters to minimize space time volume.
 
+    When every factory is a `CCZ2TFactory` (optionally wrapped in a `MultiFactory`) and every
+    data block is a `SimpleDataBlock`, all sharing one QEC scheme, the whole grid is evaluated
+    at once with `get_ccz2t_costs_vectorized`. Otherwise, each pair is evaluated with
+    `get_ccz2t_costs`.
+
     Args:
-        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm
+        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm.
         n_algo_qubits: Number of algorithm logical qubits.
         phys_err: The physical error rate of the device. This sets the suppression
             factor for increasing code distance.
@@ -327,18 +666,81 @@ def get_ccz2t_costs_from_grid_search(
         data_block_iter: iterable containing the instances of SimpleDataBlock to search over.
         cost_function: function of PhysicalCost to be minimized. Defaults to spacetime volume.
             Set `cost_function = (lambda pc: pc.duration_hr)` to mimimize wall time.
+        vectorized_cost_function: Whether `cost_function` also accepts a `PhysicalCost` of
+            arrays and returns the array of its values, as arithmetic on the attributes of
+            `PhysicalCost` does. If so, it is applied to the whole grid in one call; otherwise,
+            it is applied element by element. The default cost function is always vectorized.
 
     Returns:
         best_cost, best_factory, best_data_block
 
+    Raises:
+        ValueError: If no configuration satisfies the error budget.
+
     References:
         A similar search was conducted manually in https://arxiv.org/abs/2011.03494, using a tweaked
         version of the spreadsheet from https://arxiv.org/abs/1812.01238
     """
+    factories = tuple(factory_iter)
+    data_blocks = tuple(data_block_iter)
+
+    grid_cost = _get_ccz2t_grid_costs(
+        n_magic=n_magic,
+        n_algo_qubits=n_algo_qubits,
+        phys_err=phys_err,
+        cycle_time_us=cycle_time_us,
+        factories=factories,
+        data_blocks=data_blocks,
+    )
+    if grid_cost is None:
+        return _get_ccz2t_costs_from_grid_search_loop(
+            n_magic=n_magic,
+            n_algo_qubits=n_algo_qubits,
+            phys_err=phys_err,
+            error_budget=error_budget,
+            cycle_time_us=cycle_time_us,
+            factories=factories,
+            data_blocks=data_blocks,
+            cost_function=cost_function,
+        )
+
+    feasible = np.flatnonzero(grid_cost.failure_prob <= error_budget)
+    if len(feasible) == 0:
+        raise ValueError(f"No configuration satisfies the error budget {error_budget}")
+    vectorized = vectorized_cost_function or cost_function is _qubit_hours
+    values = _apply_cost_function_to_grid(cost_function, grid_cost, vectorized).ravel()
+    best_index = int(feasible[np.argmin(values[feasible])])
+    i, j = divmod(best_index, len(data_blocks))
+
+    # Re-evaluate the winner with the scalar model so the result is identical to the loop.
+    best_factory, best_data_block = factories[i], data_blocks[j]
+    best_cost = get_ccz2t_costs(
+        n_magic=n_magic,
+        n_algo_qubits=n_algo_qubits,
+        phys_err=phys_err,
+        cycle_time_us=cycle_time_us,
+        factory=best_factory,
+        data_block=best_data_block,
+    )
+    return best_cost, best_factory, best_data_block
+
+
+def _get_ccz2t_costs_from_grid_search_loop(
+    *,
+    n_magic: MagicCount,
+    n_algo_qubits: int,
+    phys_err: float,
+    error_budget: float,
+    cycle_time_us: float,
+    factories: Sequence[MagicStateFactory],
+    data_blocks: Sequence[DataBlock],
+    cost_function: Callable[[PhysicalCost], float],
+) -> Tuple[PhysicalCost, MagicStateFactory, DataBlock]:
+    """Fallback for `get_ccz2t_costs_from_grid_search` evaluating one configuration at a time."""
     best_cost: Optional[PhysicalCost] = None
-    best_params: Optional[Tuple[CCZ2TFactory, SimpleDataBlock]] = None
-    for factory in factory_iter:
-        for data_block in data_block_iter:
+    best_params: Optional[Tuple[MagicStateFactory, DataBlock]] = None
+    for factory in factories:
+        for data_block in data_blocks:
             cost = get_ccz2t_costs(
                 n_magic=n_magic,
                 n_algo_qubits=n_algo_qubits,
@@ -354,6 +756,8 @@ def get_ccz2t_costs_from_grid_search(
                 best_cost = cost
                 best_params = (factory, data_block)
 
+    if best_cost is None or best_params is None:
+        raise ValueError(f"No configuration satisfies the error budget {error_budget}")
     best_factory, best_data_block = best_params
     return best_cost, best_factory, best_data_block
 
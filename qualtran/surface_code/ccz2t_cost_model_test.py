@@ -12,14 +12,30 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import math
+import warnings
+
 import numpy as np
+import pytest
 
 from qualtran.surface_code.ccz2t_cost_model import (
+    CCZ2TFactory,
+    get_ccz2t_costs,
     get_ccz2t_costs_from_error_budget,
+    get_ccz2t_costs_from_error_budget_vectorized,
     get_ccz2t_costs_from_grid_search,
+    get_ccz2t_costs_vectorized,
     iter_ccz2t_factories,
+    iter_simple_data_blocks,
+)
+from qualtran.surface_code.data_block import SimpleDataBlock
+from qualtran.surface_code.fifteen_to_one import FifteenToOne
+from qualtran.surface_code.magic_count import MagicCount, MagicCountBatch
+from qualtran.surface_code.multi_factory import MultiFactory
+from qualtran.surface_code.physical_cost import PhysicalCost
+from qualtran.surface_code.quantum_error_correction_scheme_summary import (
+    BeverlandSuperconductingQubits,
 )
-from qualtran.surface_code.magic_count import MagicCount
 
 
 def test_vs_spreadsheet():
@@ -65,3 +81,193 @@ def test_grid_search_against_thc():
     assert best_factory.base_factory.distillation_l1_d == 17
     assert best_factory.base_factory.distillation_l2_d == 29
     assert best_data_block.data_d == 33
+
+
+def test_vectorized_costs_match_scalar():
+    n_magic = MagicCount(n_t=10**8, n_ccz=10**8)
+    factories = list(iter_ccz2t_factories(n_factories=3))
+    data_blocks = [SimpleDataBlock(data_d=d, routing_overhead=0.3) for d in range(7, 35, 2)]
+    grid_cost = get_ccz2t_costs_vectorized(
+        n_magic=n_magic,
+        n_algo_qubits=100,
+        phys_err=np.array([1e-3, 1e-4])[:, np.newaxis, np.newaxis],
+        cycle_time_us=1,
+        distillation_l1_d=np.array([f.base_factory.distillation_l1_d for f in factories])[:, None],
+        distillation_l2_d=np.array([f.base_factory.distillation_l2_d for f in factories])[:, None],
+        data_d=np.array([db.data_d for db in data_blocks]),
+        n_factories=3,
+        routing_overhead=0.3,
+    )
+    assert grid_cost.failure_prob.shape == (2, len(factories), len(data_blocks))
+    for k, phys_err in enumerate([1e-3, 1e-4]):
+        for i, factory in enumerate(factories):
+            for j, data_block in enumerate(data_blocks):
+                cost = get_ccz2t_costs(
+                    n_magic=n_magic,
+                    n_algo_qubits=100,
+                    phys_err=phys_err,
+                    cycle_time_us=1,
+                    factory=factory,
+                    data_block=data_block,
+                )
+                np.testing.assert_allclose(grid_cost.failure_prob[k, i, j], cost.failure_prob)
+                assert grid_cost.footprint[k, i, j] == cost.footprint
+                assert grid_cost.duration_hr[k, i, j] == cost.duration_hr
+
+
+def test_grid_search_fallbacks():
+    n_magic = MagicCount(n_t=10**8, n_ccz=10**8)
+    kwargs = dict(n_magic=n_magic, n_algo_qubits=100, error_budget=0.1)
+    expected = get_ccz2t_costs_from_grid_search(**kwargs)
+
+    # Cost functions that can't operate on arrays must be applied element by element.
+    def cost_function(pc: PhysicalCost) -> float:
+        return max(pc.footprint, pc.duration_hr * 1e5)
+
+    factories = list(iter_ccz2t_factories())
+    data_blocks = list(iter_simple_data_blocks())
+    all_costs = [
+        get_ccz2t_costs(
+            n_magic=n_magic,
+            n_algo_qubits=100,
+            phys_err=1e-3,
+            cycle_time_us=1,
+            factory=f,
+            data_block=db,
+        )
+        for f in factories
+        for db in data_blocks
+    ]
+    brute_force = min((c for c in all_costs if c.failure_prob <= 0.1), key=cost_function)
+    cost, _, _ = get_ccz2t_costs_from_grid_search(**kwargs, cost_function=cost_function)
+    assert cost == brute_force
+    cost, _, _ = get_ccz2t_costs_from_grid_search(
+        **kwargs, cost_function=lambda pc: pc.qubit_hours if pc.failure_prob < 1 else math.inf
+    )
+    assert cost == expected[0]
+    # Vectorized cost functions see the whole grid, and their errors are not swallowed.
+    cost, _, _ = get_ccz2t_costs_from_grid_search(
+        **kwargs,
+        cost_function=lambda pc: pc.footprint * pc.duration_hr,
+        vectorized_cost_function=True,
+    )
+    assert cost == expected[0]
+    with pytest.raises(ValueError, match='truth value'):
+        get_ccz2t_costs_from_grid_search(
+            **kwargs, cost_function=cost_function, vectorized_cost_function=True
+        )
+    with pytest.raises(ValueError, match='shape'):
+        get_ccz2t_costs_from_grid_search(
+            **kwargs, cost_function=lambda pc: 1.0, vectorized_cost_function=True
+        )
+
+    # Factories without a vectorized model go through the scalar loop.
+    nested_factories = [MultiFactory(MultiFactory(f, 1), 1) for f in factories]
+    cost, factory, data_block = get_ccz2t_costs_from_grid_search(
+        **kwargs, factory_iter=nested_factories
+    )
+    assert cost == expected[0]
+    assert factory.base_factory.base_factory == expected[1]
+    assert data_block == expected[2]
+
+    with pytest.raises(ValueError, match='error budget'):
+        get_ccz2t_costs_from_grid_search(**{**kwargs, 'error_budget': 1e-30})
+    with pytest.raises(ValueError, match='error budget'):
+        get_ccz2t_costs_from_grid_search(
+            **{**kwargs, 'error_budget': 1e-30}, factory_iter=nested_factories
+        )
+
+
+def test_vectorized_costs_from_error_budget_match_scalar():
+    n_t = np.array([0, 10**6, 10**8, 10**10])[:, np.newaxis]
+    error_budgets = np.array([1e-1, 1e-2, 1e-3])
+    grid_cost = get_ccz2t_costs_from_error_budget_vectorized(
+        n_t=n_t, n_ccz=10**8, n_algo_qubits=100, error_budget=error_budgets
+    )
+    assert grid_cost.failure_prob.shape == (4, 3)
+    for i, t_count in enumerate(n_t[:, 0]):
+        for j, error_budget in enumerate(error_budgets):
+            try:
+                cost = get_ccz2t_costs_from_error_budget(
+                    n_magic=MagicCount(n_t=t_count, n_ccz=10**8),
+                    n_algo_qubits=100,
+                    error_budget=error_budget,
+                )
+            except ValueError:
+                assert np.isnan(grid_cost.footprint[i, j])
+                continue
+            np.testing.assert_allclose(grid_cost.failure_prob[i, j], cost.failure_prob)
+            assert grid_cost.footprint[i, j] == cost.footprint
+            assert grid_cost.duration_hr[i, j] == cost.duration_hr
+    assert np.isnan(grid_cost.footprint).any()
+
+
+def test_vectorized_costs_from_error_budget_infeasible():
+    distillation_error = CCZ2TFactory().distillation_error(
+        n_magic=MagicCount(n_ccz=10**8), phys_err=1e-3
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        cost = get_ccz2t_costs_from_error_budget_vectorized(
+            n_t=0,
+            n_ccz=10**8,
+            n_algo_qubits=100,
+            error_budget=np.array([1e-30, distillation_error, 1e-2]),
+        )
+    assert np.isnan(cost.failure_prob[:2]).all()
+    assert np.isnan(cost.footprint[:2]).all()
+    assert np.isnan(cost.duration_hr[:2]).all()
+    assert np.isfinite(cost.footprint[2])
+
+
+def test_costs_accept_magic_count_batch():
+    counts = [
+        MagicCount(n_t=10**8, n_ccz=10**8),
+        MagicCount(n_t=10**6),
+        MagicCount(n_ccz=10**4),
+    ]
+    batch = MagicCountBatch.from_magic_counts(counts)
+    factories = [CCZ2TFactory(), MultiFactory(CCZ2TFactory(), 4), FifteenToOne(7, 3, 3)]
+    data_blocks = [
+        SimpleDataBlock(data_d=25),
+        SimpleDataBlock(data_d=25, qec_scheme=BeverlandSuperconductingQubits),
+    ]
+    for factory in factories:
+        for data_block in data_blocks:
+            kwargs = dict(
+                n_algo_qubits=100,
+                phys_err=1e-3,
+                cycle_time_us=1,
+                factory=factory,
+                data_block=data_block,
+            )
+            got = get_ccz2t_costs(n_magic=batch, **kwargs)
+            for i, n_magic in enumerate(counts):
+                want = get_ccz2t_costs(n_magic=n_magic, **kwargs)
+                np.testing.assert_allclose(got.failure_prob[i], want.failure_prob)
+                assert got.footprint[i] == want.footprint
+                assert got.duration_hr[i] == want.duration_hr
+
+    got = get_ccz2t_costs_from_error_budget(n_magic=batch, n_algo_qubits=100)
+    for i, n_magic in enumerate(counts):
+        want = get_ccz2t_costs_from_error_budget(n_magic=n_magic, n_algo_qubits=100)
+        np.testing.assert_allclose(got.failure_prob[i], want.failure_prob)
+        assert got.footprint[i] == want.footprint
+    with pytest.raises(ValueError):
+        _ = get_ccz2t_costs_from_error_budget(
+            n_magic=batch, n_algo_qubits=100, factory=FifteenToOne(7, 3, 3)
+        )
+
+    # With an explicit data block, the error budget is ignored for batches too.
+    for factory in factories:
+        kwargs = dict(
+            n_algo_qubits=100,
+            phys_err=1e-3,
+            cycle_time_us=1,
+            factory=factory,
+            data_block=data_blocks[0],
+        )
+        got = get_ccz2t_costs_from_error_budget(n_magic=batch, **kwargs)
+        want = get_ccz2t_costs(n_magic=batch, **kwargs)
+        np.testing.assert_array_equal(got.footprint, want.footprint)
+        np.testing.assert_array_equal(got.duration_hr, want.duration_hr)
@@ -11,12 +11,15 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import threading
 from functools import lru_cache
-from typing import Optional
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
+import cachetools
 import cirq
 import numpy as np
 from attrs import frozen
+from numpy.typing import ArrayLike
 
 from qualtran.surface_code.magic_count import MagicCount
 from qualtran.surface_code.magic_state_factory import MagicStateFactory
@@ -26,6 +29,77 @@ from qualtran.surface_code.quantum_error_correction_scheme_summary import (
 )
 from qualtran.surface_code.t_factory_utils import NoisyPauliRotation, storage_error
 
+_N_QUBITS = 5
+
+
+class _ErrorRatesCache:
+    """A resizable LRU cache of simulated error rates that is safe to share across threads."""
+
+    def __init__(self, maxsize: int):
+        self._lock = threading.Lock()
+        self.cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=maxsize)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.cache = cachetools.LRUCache(maxsize=maxsize)
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[np.ndarray]:
+        with self._lock:
+            return self.cache.get(key)
+
+    def put(self, key: Tuple[Any, ...], value: np.ndarray) -> None:
+        with self._lock:
+            if self.cache.maxsize:
+                self.cache[key] = value
+
+
+_ERROR_RATES_CACHE = _ErrorRatesCache(maxsize=4096)
+
+
+def set_error_rates_cache_size(maxsize: int) -> None:
+    """Resize the module-level cache used by `fifteen_to_one_error_rates`.
+
+    The cache holds one entry per (d_X, d_Z, d_m, qec, phys_err) combination. Resizing drops
+    all cached entries; a size of zero disables caching.
+    """
+    _ERROR_RATES_CACHE.resize(maxsize)
+
+
+def fifteen_to_one_error_rates(
+    d_X: int, d_Z: int, d_m: int, qec: QuantumErrorCorrectionSchemeSummary, phys_err: ArrayLike
+) -> np.ndarray:
+    """Failure and output error probabilities of a 15-to-1 factory.
+
+    Error rates missing from the module-level cache are simulated together in a single batched
+    density matrix evaluation, see `set_error_rates_cache_size`.
+
+    Returns:
+        An array of shape `np.shape(phys_err) + (2,)` holding `(p_fail, p_out)` for each
+        physical error rate.
+    """
+    phys_errs = np.asarray(phys_err, dtype=float)
+
+    rates = {}
+    for p in phys_errs.flat:
+        cached = _ERROR_RATES_CACHE.get((d_X, d_Z, d_m, qec, float(p)))
+        if cached is not None:
+            rates[float(p)] = cached
+
+    missing = np.array(sorted({float(p) for p in phys_errs.flat} - rates.keys()))
+    if len(missing):
+        for p, p_fail_and_out in zip(
+            missing, _simulate_error_rates(missing, d_X, d_Z, d_m, qec), strict=True
+        ):
+            rates[float(p)] = p_fail_and_out
+            _ERROR_RATES_CACHE.put((d_X, d_Z, d_m, qec, float(p)), p_fail_and_out)
+
+    result = np.array([rates[float(p)] for p in phys_errs.flat], dtype=float)
+    return result.reshape(phys_errs.shape + (2,))
+
+
+def _maybe_scalar(values: np.ndarray, like: ArrayLike) -> Union[float, np.ndarray]:
+    return float(values) if np.ndim(like) == 0 else values
+
 
 @frozen
 class FifteenToOne(MagicStateFactory):
@@ -56,31 +130,22 @@ class FifteenToOne(MagicStateFactory):
         # source: page 11 of https://arxiv.org/abs/1905.06903
         return 2 * (self.d_X + 4 * self.d_Z) * 3 * self.d_X + 4 * self.d_m
 
-    @lru_cache(8)
-    def _final_state(self, phys_err: float):
-        factory = _build_factory(phys_err, self.d_X, self.d_Z, self.d_m, self.qec)
-        return (
-            cirq.DensityMatrixSimulator(dtype=np.complex128).simulate(factory).final_density_matrix
-        )
-
-    @lru_cache(8)
-    def p_fail(self, phys_err: float) -> float:
-        projector = np.kron(np.eye(2), np.ones((16, 16)) / 16)
-        return np.real_if_close(1 - np.trace(projector @ self._final_state(phys_err))).item()
-
-    @lru_cache(8)
-    def p_out(self, phys_err: float) -> float:
-        # I \otimes ones \otimes ones \otimes ones \otimes ones / 16
-        projector = np.kron(np.eye(2), np.ones((16, 16)) / 16)
-        project_state = (
-            1
-            / (1 - self.p_fail(phys_err))
-            * (projector @ self._final_state(phys_err) @ projector.T.conj())
-        )
-        # |T><T| \otimes ones \otimes ones \otimes ones \otimes ones / 16
-        T_state = np.array([1, np.exp(-1j * np.pi / 4)]).reshape((1, 2)) / np.sqrt(2)
-        target_density = np.kron(T_state.T.conj() @ T_state, np.ones((16, 16)) / 16)
-        return np.real_if_close(1 - np.trace(project_state @ target_density)).item()
+    def p_fail(self, phys_err: ArrayLike) -> Union[float, np.ndarray]:
+        """Probability that the factory detects an error and discards its output.
+
+        `phys_err` can be a single physical error rate or an array of them.
+        """
+        return _maybe_scalar(self._error_rates(phys_err)[..., 0], phys_err)
+
+    def p_out(self, phys_err: ArrayLike) -> Union[float, np.ndarray]:
+        """Probability that an accepted output state is faulty.
+
+        `phys_err` can be a single physical error rate or an array of them.
+        """
+        return _maybe_scalar(self._error_rates(phys_err)[..., 1], phys_err)
+
+    def _error_rates(self, phys_err: ArrayLike) -> np.ndarray:
+        return fifteen_to_one_error_rates(self.d_X, self.d_Z, self.d_m, self.qec, phys_err)
 
     def n_cycles(self, n_magic: MagicCount, phys_err: float) -> int:
         """The number of cycles (time) required to produce the requested number of magic states.
@@ -90,72 +155,143 @@ class FifteenToOne(MagicStateFactory):
 
         reference: page 11 of https://arxiv.org/abs/1905.06903
         """
+        return int(self.n_cycles_batch(n_magic, phys_err))
+
+    def n_cycles_batch(self, n_magic: MagicCount, phys_err: ArrayLike) -> np.ndarray:
+        """`n_cycles` evaluated for each of an array of physical error rates."""
         num_t = n_magic.n_t + 4 * n_magic.n_ccz
-        return np.ceil(num_t * 6 * self.d_m / (1 - self.p_fail(phys_err)))
+        return np.ceil(num_t * 6 * self.d_m / (1 - np.asarray(self.p_fail(phys_err))))
 
     def distillation_error(self, n_magic: MagicCount, phys_err: float) -> float:
         """The total error expected from distilling magic states with a given physical error rate."""
+        return float(self.distillation_error_batch(n_magic, phys_err))
+
+    def distillation_error_batch(self, n_magic: MagicCount, phys_err: ArrayLike) -> np.ndarray:
+        """`distillation_error` evaluated for each of an array of physical error rates."""
         num_t = n_magic.n_t + 4 * n_magic.n_ccz
-        return self.p_out(phys_err) * num_t
+        return np.asarray(self.p_out(phys_err)) * num_t
 
 
-def _build_factory(
-    phys_err: float, d_X: int, d_Z: int, d_m: int, qec: QuantumErrorCorrectionSchemeSummary
-) -> cirq.Circuit:
-    """Builds the 15-to-1 factory with its associated cost model.
+@lru_cache
+def _pauli_permutation(pauli_string: str) -> Tuple[np.ndarray, np.ndarray]:
+    """The Pauli string as a signed permutation: row `i` has entry `phases[i]` at `cols[i]`."""
+    pauli = cirq.unitary(cirq.DensePauliString(pauli_string))
+    cols = np.argmax(np.abs(pauli), axis=1)
+    return cols, pauli[np.arange(len(pauli)), cols]
 
-    The cost model turns the unitaries into channels (NoisyPauliRotation) and
-    adds X and Z errors (storage_errors).
-    The probabilities of those channels are the same as those in the supplementary
-    material of https://arxiv.org/abs/1905.06903.
 
-    Args:
-        phys_err: physical error rate.
-        d_X: Side length of the surface code along which X measurements happen.
-        d_Z: Side length of the surface code along which Z measurements happen.
-        d_m: Number of code cycles used in lattice surgery.
-        qec: Quantum error correction scheme being used.
+def _pauli_conjugate(pauli_string: str, rho: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """`(P rho, P rho P)` for a batch of Hermitian `rho`, using gathers instead of matmuls."""
+    cols, phases = _pauli_permutation(pauli_string)
+    p_rho = phases[:, np.newaxis] * rho[..., cols, :]
+    rho_p = np.swapaxes(p_rho, -1, -2).conj()
+    return p_rho, phases[:, np.newaxis] * rho_p[..., cols, :]
 
 
-    Returns:
-        The factory as a cirq circuit.
+def _as_batch(p: Any) -> np.ndarray:
+    """Reshape a scalar or per-error-rate probability to broadcast against density matrices."""
+    return np.reshape(p, (-1, 1, 1))
+
+
+@frozen(eq=False)
+class _PauliRotationChannel:
+    """A `NoisyPauliRotation` whose probabilities may be arrays, one entry per error rate."""
+
+    pauli_string: str
+    p1: Any
+    p2: Any
+    p3: Any
+
+    def to_cirq(self, qs: Sequence[cirq.Qid]) -> List[cirq.Operation]:
+        return [NoisyPauliRotation(self.pauli_string, self.p1, self.p2, self.p3)(*qs)]
+
+    def apply(self, rho: np.ndarray) -> np.ndarray:
+        # With U = cos(t) + i sin(t) P, the mixture sum_k p_k U_k rho U_k^dagger is
+        # a rho + b P rho P + i c (P rho - rho P) for the coefficients below.
+        probabilities = (1 - self.p1 - self.p2 - self.p3, self.p1, self.p2, self.p3)
+        angles = [t * np.pi / 8 for t in (1, 5, -1, 3)]
+        a = sum(p * np.cos(t) ** 2 for p, t in zip(probabilities, angles))
+        b = sum(p * np.sin(t) ** 2 for p, t in zip(probabilities, angles))
+        c = sum(p * np.sin(t) * np.cos(t) for p, t in zip(probabilities, angles))
+
+        p_rho, p_rho_p = _pauli_conjugate(self.pauli_string, rho)
+        rho_p = np.swapaxes(p_rho, -1, -2).conj()
+        return _as_batch(a) * rho + _as_batch(b) * p_rho_p + 1j * _as_batch(c) * (p_rho - rho_p)
+
+
+@frozen(eq=False)
+class _StorageErrorChannel:
+    """The `storage_error` channels whose probabilities may be arrays, one entry per error rate."""
+
+    kind: str
+    probabilities: Sequence[Any]
+
+    def to_cirq(self, qs: Sequence[cirq.Qid]) -> List[cirq.Operation]:
+        return list(storage_error(self.kind, self.probabilities, qs))
+
+    def apply(self, rho: np.ndarray) -> np.ndarray:
+        for qubit, p in enumerate(self.probabilities):
+            if np.all(np.equal(p, 0)):
+                continue
+            pauli_string = ''.join(self.kind if i == qubit else 'I' for i in range(_N_QUBITS))
+            _, p_rho_p = _pauli_conjugate(pauli_string, rho)
+            rho = (1 - _as_batch(p)) * rho + _as_batch(p) * p_rho_p
+        return rho
+
+
+def _factory_channels(
+    phys_err: Union[float, np.ndarray],
+    d_X: int,
+    d_Z: int,
+    d_m: int,
+    qec: QuantumErrorCorrectionSchemeSummary,
+) -> List[Union[_PauliRotationChannel, _StorageErrorChannel]]:
+    """The noisy channels of the 15-to-1 factory, applied after preparing the |+> state.
+
+    The probabilities of the channels are the same as those in the supplementary
+    material of https://arxiv.org/abs/1905.06903. `phys_err` can be a scalar or a
+    1D array, in which case every probability is an array with one entry per error rate.
     """
-    qs = cirq.LineQubit.range(5)
-    px = qec.logical_error_rate(d_X, phys_err)
-    pz = qec.logical_error_rate(d_Z, phys_err)
-    pm = qec.logical_error_rate(d_m, phys_err)
+    px: Union[float, np.ndarray]
+    pz: Union[float, np.ndarray]
+    pm: Union[float, np.ndarray]
+    if isinstance(phys_err, np.ndarray):
+        px, pz, pm = (qec.logical_error_rate_vectorized(d, phys_err) for d in (d_X, d_Z, d_m))
+    else:
+        px = qec.logical_error_rate(d_X, phys_err)
+        pz = qec.logical_error_rate(d_Z, phys_err)
+        pm = qec.logical_error_rate(d_m, phys_err)
 
-    factory = cirq.Circuit.from_moments(
-        cirq.H.on_each(qs),
+    return [
         # 1
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IZIII',
             phys_err / 3 + 0.5 * (d_m / d_Z) * pz * d_m,
             phys_err / 3 + 0.5 * d_Z * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 2
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IIZII',
             phys_err / 3 + 0.5 * (d_m / d_Z) * pz * d_m,
             phys_err / 3 + 0.5 * d_Z * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 3
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IIIZI',
             phys_err / 3 + 0.5 * (d_m / d_Z) * pz * d_m,
             phys_err / 3 + 0.5 * d_Z * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 5
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IZZZI',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (3 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error(
+        ),
+        _StorageErrorChannel(
             'X',
             [
                 0,
@@ -164,9 +300,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0,
@@ -175,26 +310,25 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0,
             ],
-            qs,
         ),
         # 6
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZZZII',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 2 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 7
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZZIZI',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 3 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error(
-            'Z', [0.5 * ((d_X + 2 * d_Z) + (d_X + 3 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0], qs
         ),
-        *storage_error(
+        _StorageErrorChannel(
+            'Z', [0.5 * ((d_X + 2 * d_Z) + (d_X + 3 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0]
+        ),
+        _StorageErrorChannel(
             'X',
             [
                 0.5 * px * d_m,
@@ -203,9 +337,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0.5 * px * d_m,
@@ -214,33 +347,32 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0,
             ],
-            qs,
         ),
         # 8
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZIZZI',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 3 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 9
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZIIZZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 4
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IIIIZ',
             phys_err / 3 + 0.5 * (d_m / d_Z) * pz * d_m,
             phys_err / 3 + 0.5 * d_Z * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error(
-            'Z', [0.5 * ((d_X + 3 * d_Z) + (d_X + 4 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0], qs
         ),
-        *storage_error(
+        _StorageErrorChannel(
+            'Z', [0.5 * ((d_X + 3 * d_Z) + (d_X + 4 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0]
+        ),
+        _StorageErrorChannel(
             'X',
             [
                 0.5 * px * d_m,
@@ -249,9 +381,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0.5 * (d_Z / d_X) * px * d_m,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0.5 * px * d_m,
@@ -260,26 +391,25 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0.5 * (d_X / d_Z) * pz * d_m,
             ],
-            qs,
         ),
         # 10
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZZIIZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 11
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZIZIZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error(
-            'Z', [0.5 * ((d_X + 4 * d_Z) + (d_X + 4 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0], qs
         ),
-        *storage_error(
+        _StorageErrorChannel(
+            'Z', [0.5 * ((d_X + 4 * d_Z) + (d_X + 4 * d_Z)) / d_X * px * d_m, 0, 0, 0, 0]
+        ),
+        _StorageErrorChannel(
             'X',
             [
                 0.5 * px * d_m,
@@ -288,9 +418,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0.5 * (d_Z / d_X) * px * d_m,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0.5 * px * d_m,
@@ -299,24 +428,23 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0.5 * (d_X / d_Z) * pz * d_m,
             ],
-            qs,
         ),
         # 12
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'ZZZZZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (d_X + 4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 13
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IIZZZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (3 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error('Z', [0.5 * (d_X + 4 * d_Z) / d_X * px * d_m, 0, 0, 0, 0], qs),
-        *storage_error(
+        ),
+        _StorageErrorChannel('Z', [0.5 * (d_X + 4 * d_Z) / d_X * px * d_m, 0, 0, 0, 0]),
+        _StorageErrorChannel(
             'X',
             [
                 0.5 * px * (d_m + 2 * d_X),
@@ -325,9 +453,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0.5 * (d_Z / d_X) * px * d_m,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0.5 * px * (d_m + 2 * d_X),
@@ -336,23 +463,22 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0.5 * (d_X / d_Z) * pz * d_m,
             ],
-            qs,
         ),
         # 14
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IZIZZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
+        ),
         # 15
-        NoisyPauliRotation(
+        _PauliRotationChannel(
             'IZZIZ',
             phys_err / 3 + 0.5 * pm * d_m,
             phys_err / 3 + 0.5 * pm * d_m + 0.5 * (4 * d_Z) * d_X / d_m * pm,
             phys_err / 3,
-        )(*qs),
-        *storage_error(
+        ),
+        _StorageErrorChannel(
             'X',
             [
                 0,
@@ -361,9 +487,8 @@ def _build_factory(
                 0.5 * (d_Z / d_X) * px * d_m,
                 0.5 * (d_Z / d_X) * px * d_m,
             ],
-            qs,
         ),
-        *storage_error(
+        _StorageErrorChannel(
             'Z',
             [
                 0,
@@ -372,10 +497,71 @@ def _build_factory(
                 0.5 * (d_X / d_Z) * pz * d_m,
                 0.5 * (d_X / d_Z) * pz * d_m,
             ],
-            qs,
         ),
-    )
-    return factory
+    ]
+
+
+def _build_factory(
+    phys_err: float, d_X: int, d_Z: int, d_m: int, qec: QuantumErrorCorrectionSchemeSummary
+) -> cirq.Circuit:
+    """Builds the 15-to-1 factory with its associated cost model.
+
+    The cost model turns the unitaries into channels (NoisyPauliRotation) and
+    adds X and Z errors (storage_errors).
+    The probabilities of those channels are the same as those in the supplementary
+    material of https://arxiv.org/abs/1905.06903.
+
+    Args:
+        phys_err: physical error rate.
+        d_X: Side length of the surface code along which X measurements happen.
+        d_Z: Side length of the surface code along which Z measurements happen.
+        d_m: Number of code cycles used in lattice surgery.
+        qec: Quantum error correction scheme being used.
+
+
+    Returns:
+        The factory as a cirq circuit.
+    """
+    qs = cirq.LineQubit.range(_N_QUBITS)
+    moments: List[cirq.OP_TREE] = [cirq.H.on_each(qs)]
+    for channel in _factory_channels(phys_err, d_X, d_Z, d_m, qec):
+        moments.extend(channel.to_cirq(qs))
+    return cirq.Circuit.from_moments(*moments)
+
+
+def _simulate_final_states(
+    phys_errs: np.ndarray, d_X: int, d_Z: int, d_m: int, qec: QuantumErrorCorrectionSchemeSummary
+) -> np.ndarray:
+    """Final density matrices of the factory circuit for each physical error rate.
+
+    This evolves a batch of density matrices, one per entry of `phys_errs`, through
+    the channels of `_build_factory`. Every channel is a mixture of Pauli conjugations,
+    which are applied as signed row and column permutations rather than matrix products.
+    """
+    dim = 1 << _N_QUBITS
+    rho = np.full((len(phys_errs), dim, dim), 1 / dim, dtype=np.complex128)
+    for channel in _factory_channels(np.asarray(phys_errs, dtype=float), d_X, d_Z, d_m, qec):
+        rho = channel.apply(rho)
+    return rho
+
+
+def _simulate_error_rates(
+    phys_errs: np.ndarray, d_X: int, d_Z: int, d_m: int, qec: QuantumErrorCorrectionSchemeSummary
+) -> np.ndarray:
+    """`(p_fail, p_out)` for each physical error rate, see `fifteen_to_one_error_rates`."""
+    rho = _simulate_final_states(phys_errs, d_X, d_Z, d_m, qec)
+
+    # I \otimes ones \otimes ones \otimes ones \otimes ones / 16
+    projector = np.kron(np.eye(2), np.ones((16, 16)) / 16)
+    p_fail = 1 - np.einsum('ij,bji->b', projector, rho).real
+
+    projected = (projector @ rho @ projector.T.conj()) / (1 - p_fail)[:, np.newaxis, np.newaxis]
+    # |T><T| \otimes ones \otimes ones \otimes ones \otimes ones / 16
+    T_state = np.array([1, np.exp(-1j * np.pi / 4)]).reshape((1, 2)) / np.sqrt(2)
+    target_density = np.kron(T_state.T.conj() @ T_state, np.ones((16, 16)) / 16)
+    p_out = 1 - np.einsum('bij,ji->b', projected, target_density).real
+
+    return np.stack([p_fail, p_out], axis=-1)
 
 
 FifteenToOne733 = FifteenToOne(7, 3, 3, reference='https://arxiv.org/abs/1905.06903')
@@ -14,11 +14,23 @@
 
 import math
 
+import cirq
+import numpy as np
 import pytest
 from attrs import frozen
 
-from qualtran.surface_code.fifteen_to_one import FifteenToOne
+import qualtran.surface_code.fifteen_to_one as fifteen_to_one
+from qualtran.surface_code.fifteen_to_one import (
+    _build_factory,
+    _simulate_final_states,
+    fifteen_to_one_error_rates,
+    FifteenToOne,
+    set_error_rates_cache_size,
+)
 from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.quantum_error_correction_scheme_summary import (
+    FowlerSuperconductingQubits,
+)
 
 
 @frozen
@@ -53,3 +65,62 @@ def test_validation():
     for bad_args in (1, 1, -1), (1, -1, 1), (-1, 1, 1), (5, 1, 1):
         with pytest.raises(AssertionError):
             _ = FifteenToOne(*bad_args)
+
+
+@pytest.mark.parametrize('d_X, d_Z, d_m', [(7, 3, 3), (17, 7, 7)])
+def test_final_states_match_density_matrix_simulation(d_X, d_Z, d_m):
+    phys_errs = np.array([1e-4, 1e-3])
+    final_states = _simulate_final_states(phys_errs, d_X, d_Z, d_m, FowlerSuperconductingQubits)
+    for phys_err, final_state in zip(phys_errs, final_states):
+        circuit = _build_factory(phys_err, d_X, d_Z, d_m, FowlerSuperconductingQubits)
+        expected = (
+            cirq.DensityMatrixSimulator(dtype=np.complex128).simulate(circuit).final_density_matrix
+        )
+        np.testing.assert_allclose(final_state, expected, atol=1e-12)
+
+
+def test_error_rates_are_batched():
+    factory = FifteenToOne(11, 5, 5)
+    phys_errs = np.geomspace(1e-4, 1e-3, 7)
+    p_fail = factory.p_fail(phys_errs)
+    p_out = factory.p_out(phys_errs)
+    assert p_fail.shape == p_out.shape == (7,)
+    for i, phys_err in enumerate(phys_errs):
+        assert isinstance(factory.p_out(phys_err), float)
+        assert factory.p_fail(phys_err) == p_fail[i]
+        assert factory.p_out(phys_err) == p_out[i]
+
+    n_magic = MagicCount(n_t=10)
+    np.testing.assert_array_equal(factory.distillation_error_batch(n_magic, phys_errs), p_out * 10)
+    np.testing.assert_array_equal(
+        factory.n_cycles_batch(n_magic, phys_errs), np.ceil(10 * 6 * 5 / (1 - p_fail))
+    )
+    assert isinstance(factory.n_cycles(n_magic, phys_errs[0]), int)
+    assert isinstance(factory.distillation_error(n_magic, phys_errs[0]), float)
+    assert factory.distillation_error(n_magic, phys_errs[0]) == p_out[0] * 10
+
+
+def test_error_rates_cache():
+    maxsize = fifteen_to_one._ERROR_RATES_CACHE.cache.maxsize
+    set_error_rates_cache_size(3)
+    try:
+        rates = fifteen_to_one_error_rates(7, 3, 3, FowlerSuperconductingQubits, [[1e-4, 2e-4]])
+        assert rates.shape == (1, 2, 2)
+        assert set(fifteen_to_one._ERROR_RATES_CACHE.cache.keys()) == {
+            (7, 3, 3, FowlerSuperconductingQubits, 1e-4),
+            (7, 3, 3, FowlerSuperconductingQubits, 2e-4),
+        }
+
+        # More misses than the cache can hold are still all returned.
+        phys_errs = [1e-4, 3e-4, 4e-4, 5e-4, 6e-4]
+        rates = fifteen_to_one_error_rates(7, 3, 3, FowlerSuperconductingQubits, phys_errs)
+        assert len(fifteen_to_one._ERROR_RATES_CACHE.cache) == 3
+        np.testing.assert_array_equal(
+            rates[-1], fifteen_to_one_error_rates(7, 3, 3, FowlerSuperconductingQubits, 6e-4)
+        )
+
+        set_error_rates_cache_size(0)
+        _ = fifteen_to_one_error_rates(7, 3, 3, FowlerSuperconductingQubits, [1e-4, 2e-4])
+        assert len(fifteen_to_one._ERROR_RATES_CACHE.cache) == 0
+    finally:
+        set_error_rates_cache_size(maxsize)
@@ -11,9 +11,11 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
-from typing import Union
+from typing import Iterable, Tuple, Union
 
+import numpy as np
 from attrs import field, frozen, validators
+from numpy.typing import ArrayLike
 
 
 @frozen
@@ -33,6 +35,8 @@ class MagicCount:
     )
 
     def __add__(self, other: 'MagicCount') -> 'MagicCount':
+        if not isinstance(other, MagicCount):
+            return NotImplemented
         return MagicCount(n_t=self.n_t + other.n_t, n_ccz=self.n_ccz + other.n_ccz)
 
     def __mul__(self, other: Union[float, int]) -> 'MagicCount':
@@ -40,3 +44,73 @@ class MagicCount:
 
     def __rmul__(self, other: Union[float, int]) -> 'MagicCount':
         return self.__mul__(other)
+
+
+def _as_float_array(x: ArrayLike) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def _zero() -> np.ndarray:
+    return np.zeros(())
+
+
+def _non_negative(instance, attribute, value: np.ndarray):
+    if np.any(value < 0):
+        raise ValueError(f"'{attribute.name}' must be >= 0: {value}")
+
+
+@frozen(eq=False)
+class MagicCountBatch:
+    """A batch of magic state counts stored as NumPy arrays.
+
+    This is the array-backed counterpart of `MagicCount`. Arithmetic broadcasts the count
+    arrays against each other (and against scalar or array factors) instead of creating one
+    `MagicCount` per element.
+
+    Attributes:
+        n_t: The number of T states.
+        n_ccz: The number of CCZ states.
+    """
+
+    n_t: np.ndarray = field(factory=_zero, converter=_as_float_array, validator=_non_negative)
+    n_ccz: np.ndarray = field(factory=_zero, converter=_as_float_array, validator=_non_negative)
+
+    # Make NumPy defer to our reflected operators, e.g. in `np.arange(3) * batch`.
+    __array_ufunc__ = None
+
+    @classmethod
+    def from_magic_counts(cls, counts: Iterable[MagicCount]) -> 'MagicCountBatch':
+        counts = list(counts)
+        return cls(n_t=[c.n_t for c in counts], n_ccz=[c.n_ccz for c in counts])
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return np.broadcast_shapes(self.n_t.shape, self.n_ccz.shape)
+
+    def __getitem__(self, item) -> Union[MagicCount, 'MagicCountBatch']:
+        n_t, n_ccz = (np.broadcast_to(x, self.shape)[item] for x in (self.n_t, self.n_ccz))
+        if np.ndim(n_t) == 0:
+            return MagicCount(n_t=n_t, n_ccz=n_ccz)
+        return MagicCountBatch(n_t=n_t, n_ccz=n_ccz)
+
+    def sum(self) -> MagicCount:
+        """The total over all elements of the batch."""
+        return MagicCount(
+            n_t=np.broadcast_to(self.n_t, self.shape).sum(),
+            n_ccz=np.broadcast_to(self.n_ccz, self.shape).sum(),
+        )
+
+    def __add__(self, other: Union[MagicCount, 'MagicCountBatch']) -> 'MagicCountBatch':
+        if not isinstance(other, (MagicCount, MagicCountBatch)):
+            return NotImplemented
+        return MagicCountBatch(n_t=self.n_t + other.n_t, n_ccz=self.n_ccz + other.n_ccz)
+
+    def __radd__(self, other: MagicCount) -> 'MagicCountBatch':
+        return self.__add__(other)
+
+    def __mul__(self, other: ArrayLike) -> 'MagicCountBatch':
+        other = np.asarray(other)
+        return MagicCountBatch(n_t=self.n_t * other, n_ccz=self.n_ccz * other)
+
+    def __rmul__(self, other: ArrayLike) -> 'MagicCountBatch':
+        return self.__mul__(other)
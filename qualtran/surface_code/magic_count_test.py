@@ -0,0 +1,36 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+
+from qualtran.surface_code.magic_count import MagicCount, MagicCountBatch
+
+
+def test_magic_count_batch():
+    counts = [MagicCount(n_t=1, n_ccz=2), MagicCount(n_t=5)]
+    batch = MagicCountBatch.from_magic_counts(counts)
+    assert batch.shape == (2,)
+    assert batch[0] == counts[0] and batch[1] == counts[1]
+    assert batch.sum() == counts[0] + counts[1]
+
+    scaled = np.array([[1], [0.5]]) * batch + MagicCount(n_t=1)
+    assert isinstance(scaled, MagicCountBatch)
+    assert scaled.shape == (2, 2)
+    assert scaled[1, 0] == 0.5 * counts[0] + MagicCount(n_t=1)
+    assert (MagicCount(n_ccz=1) + batch)[1] == MagicCount(n_t=5, n_ccz=1)
+
+    np.testing.assert_array_equal(MagicCountBatch(n_t=[1, 2]).n_ccz, 0)
+    with pytest.raises(ValueError):
+        _ = MagicCountBatch(n_t=[1, -1])
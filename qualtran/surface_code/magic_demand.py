@@ -0,0 +1,323 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Time-resolved magic state demand of a bloq."""
+
+import functools
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import networkx as nx
+import numpy as np
+from attrs import Factory, field, frozen
+
+from qualtran.surface_code.magic_count import MagicCount
+
+if TYPE_CHECKING:
+    from qualtran import Bloq, BloqInstance
+    from qualtran.surface_code.magic_state_factory import MagicStateFactory
+
+
+def _to_counts_array(x) -> np.ndarray:
+    arr = np.array(x, dtype=np.int64).reshape(-1)
+    arr.setflags(write=False)
+    return arr
+
+
+@frozen(eq=False)
+class MagicDemandProfile:
+    """The number of magic states consumed at each logical time step.
+
+    A time step is the time it takes to consume one layer of magic states, i.e. only magic
+    state consuming operations advance time; Clifford operations are free. Operations on
+    disjoint qubits that do not depend on each other are scheduled in the same time step.
+
+    The profile is stored as consecutive segments of time steps with a constant demand, so
+    that long stretches of serial magic states take constant memory.
+
+    Attributes:
+        n_t: The number of T states consumed at each time step of each segment.
+        n_ccz: The number of CCZ states consumed at each time step of each segment.
+        durations: The number of time steps in each segment. Defaults to one time step per
+            segment.
+    """
+
+    n_t: np.ndarray = field(converter=_to_counts_array)
+    n_ccz: np.ndarray = field(converter=_to_counts_array)
+    durations: np.ndarray = field(
+        converter=_to_counts_array,
+        default=Factory(lambda self: np.ones(len(self.n_t), dtype=np.int64), takes_self=True),
+    )
+
+    def __attrs_post_init__(self):
+        if not self.n_t.shape == self.n_ccz.shape == self.durations.shape:
+            raise ValueError(
+                f"Mismatched profile lengths: {len(self.n_t)} T segments, "
+                f"{len(self.n_ccz)} CCZ segments, {len(self.durations)} durations."
+            )
+        if np.any(self.durations < 0):
+            raise ValueError(f"Segment durations must be non-negative, got {self.durations}.")
+
+    @classmethod
+    def serial(cls, n_t: int = 0, n_ccz: int = 0) -> 'MagicDemandProfile':
+        """A profile that consumes `n_t` T states and then `n_ccz` CCZ states, one per step."""
+        durations = np.array([n_t, n_ccz], dtype=np.int64)
+        keep = durations > 0
+        return cls(n_t=[1, 0], n_ccz=[0, 1], durations=durations)._select(keep)
+
+    def _select(self, segments) -> 'MagicDemandProfile':
+        return MagicDemandProfile(
+            n_t=self.n_t[segments], n_ccz=self.n_ccz[segments], durations=self.durations[segments]
+        )
+
+    @property
+    def n_steps(self) -> int:
+        return int(self.durations.sum())
+
+    @cached_property
+    def _boundaries(self) -> np.ndarray:
+        """The first time step of every segment, followed by `n_steps`."""
+        return np.concatenate([[0], np.cumsum(self.durations)])
+
+    def per_step_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The number of T and CCZ states consumed at every time step.
+
+        This materializes `n_steps` entries; prefer the segments for long profiles.
+        """
+        return np.repeat(self.n_t, self.durations), np.repeat(self.n_ccz, self.durations)
+
+    def total(self) -> MagicCount:
+        """The total number of magic states consumed."""
+        return MagicCount(
+            n_t=int(self.n_t @ self.durations), n_ccz=int(self.n_ccz @ self.durations)
+        )
+
+    def _cumulative_counts(self, steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The number of T and CCZ states consumed before each of the time steps `steps`."""
+        bounds = self._boundaries
+        i = np.clip(np.searchsorted(bounds, steps, side='right') - 1, 0, len(self.durations) - 1)
+        offset = steps - bounds[i]
+        cum_t = np.concatenate([[0], np.cumsum(self.n_t * self.durations)])
+        cum_ccz = np.concatenate([[0], np.cumsum(self.n_ccz * self.durations)])
+        return cum_t[i] + self.n_t[i] * offset, cum_ccz[i] + self.n_ccz[i] * offset
+
+    def _window_counts(self, starts: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        start_t, start_ccz = self._cumulative_counts(starts)
+        end_t, end_ccz = self._cumulative_counts(starts + window)
+        return end_t - start_t, end_ccz - start_ccz
+
+    def _extremal_window_counts(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The counts of the windows that start or end at a segment boundary.
+
+        The counts of the other windows are interpolations of these, because the demand is
+        constant within each segment.
+        """
+        if window < 1:
+            raise ValueError(f"window must be positive, got {window}.")
+        if self.n_steps <= window:
+            total = self.total()
+            return np.array([total.n_t]), np.array([total.n_ccz])
+        bounds = self._boundaries
+        starts = np.unique(
+            np.clip(np.concatenate([bounds, bounds - window]), 0, self.n_steps - window)
+        )
+        return self._window_counts(starts, window)
+
+    def windowed_counts(self, window: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """The number of T and CCZ states consumed in every `window` consecutive time steps.
+
+        If the profile is shorter than `window`, its totals are returned as a single window.
+        This materializes one entry per window; `peak` and `min_factories` only consider the
+        windows starting or ending at a segment boundary.
+        """
+        if window < 1:
+            raise ValueError(f"window must be positive, got {window}.")
+        if self.n_steps <= window:
+            total = self.total()
+            return np.array([total.n_t]), np.array([total.n_ccz])
+        return self._window_counts(np.arange(self.n_steps - window + 1), window)
+
+    def peak(self, window: int = 1) -> MagicCount:
+        """The largest number of magic states consumed in `window` consecutive time steps.
+
+        Windows are ranked by the total number of magic states, counting a CCZ state as two
+        T states.
+        """
+        n_t, n_ccz = self._extremal_window_counts(window)
+        i = np.argmax(n_t + 2 * n_ccz)
+        return MagicCount(n_t=int(n_t[i]), n_ccz=int(n_ccz[i]))
+
+    def min_factories(
+        self,
+        factory: 'MagicStateFactory',
+        cycles_per_step: float,
+        window: int = 1,
+        phys_err: float = 1e-3,
+    ) -> int:
+        """The number of copies of `factory` needed to keep up with the peak demand.
+
+        Every `window` consecutive time steps must have their magic states distilled within
+        `window * cycles_per_step` error-correction cycles. Larger windows model buffering
+        of magic states between the factories and the data block. Only the windows starting
+        or ending at a segment boundary are checked, which is exact for factories whose
+        `n_cycles` is affine in the number of magic states, up to rounding.
+
+        Args:
+            factory: The factory to replicate.
+            cycles_per_step: The duration of a logical time step in error-correction cycles.
+                This is typically the data code distance.
+            window: The number of time steps the demand is averaged over.
+            phys_err: The physical error rate passed to `factory.n_cycles`.
+        """
+        n_t, n_ccz = self._extremal_window_counts(window)
+        demands = np.unique(np.stack([n_t, n_ccz], axis=-1), axis=0)
+        max_cycles = max(
+            factory.n_cycles(MagicCount(n_t=t, n_ccz=ccz), phys_err) for t, ccz in demands
+        )
+        return max(1, int(np.ceil(max_cycles / (window * cycles_per_step))))
+
+
+@functools.lru_cache(maxsize=None)
+def _rotation_types() -> Tuple[type, ...]:
+    from qualtran.resource_counting.t_counts_from_sigma import _get_all_rotation_types
+
+    return _get_all_rotation_types()
+
+
+def _leaf_magic_count(bloq: 'Bloq') -> Optional[Tuple[int, int]]:
+    """The (n_t, n_ccz) consumed by a magic leaf bloq, or None if `bloq` is not one."""
+    import cirq
+
+    from qualtran.bloqs.basic_gates import TGate, Toffoli
+    from qualtran.cirq_interop.t_complexity_protocol import TComplexity
+
+    if isinstance(bloq, TGate):
+        return 1, 0
+    if isinstance(bloq, Toffoli):
+        return 0, 1
+    if isinstance(bloq, _rotation_types()):
+        if cirq.has_stabilizer_effect(bloq):
+            return 0, 0
+        return TComplexity.rotation_cost(bloq.eps), 0
+    return None
+
+
+def _call_graph_magic_count(bloq: 'Bloq') -> Tuple[int, int]:
+    """The (n_t, n_ccz) of a bloq without a decomposition, from its call graph."""
+    n_t, n_ccz = 0, 0
+    _, sigma = bloq.call_graph(keep=lambda b: _leaf_magic_count(b) is not None)
+    for callee, n in sigma.items():
+        counts = _leaf_magic_count(callee)
+        if counts is None:
+            continue
+        n_t += counts[0] * n
+        n_ccz += counts[1] * n
+    try:
+        return int(n_t), int(n_ccz)
+    except TypeError as e:
+        raise ValueError(
+            f"Cannot build a magic demand profile for symbolic counts of {bloq}."
+        ) from e
+
+
+def _overlay_profiles(
+    placements: List[Tuple[int, MagicDemandProfile]], n_steps: int
+) -> MagicDemandProfile:
+    """The sum of the profiles, each one shifted to start at its time step."""
+    if n_steps == 0:
+        return MagicDemandProfile(n_t=[], n_ccz=[])
+    # Every segment boundary changes the demand by the difference of the adjacent segments.
+    steps = [np.array([0, n_steps])]
+    delta_t = [np.zeros(2, dtype=np.int64)]
+    delta_ccz = [np.zeros(2, dtype=np.int64)]
+    for start, profile in placements:
+        steps.append(start + profile._boundaries)
+        delta_t.append(np.diff(profile.n_t, prepend=0, append=0))
+        delta_ccz.append(np.diff(profile.n_ccz, prepend=0, append=0))
+    bounds, idx = np.unique(np.concatenate(steps), return_inverse=True)
+    n_t = np.zeros(len(bounds), dtype=np.int64)
+    n_ccz = np.zeros(len(bounds), dtype=np.int64)
+    np.add.at(n_t, idx, np.concatenate(delta_t))
+    np.add.at(n_ccz, idx, np.concatenate(delta_ccz))
+    n_t, n_ccz = np.cumsum(n_t)[:-1], np.cumsum(n_ccz)[:-1]
+
+    # Merge consecutive segments with the same demand.
+    first = np.flatnonzero(
+        np.concatenate([[True], (n_t[1:] != n_t[:-1]) | (n_ccz[1:] != n_ccz[:-1])])
+    )
+    return MagicDemandProfile(
+        n_t=n_t[first], n_ccz=n_ccz[first], durations=np.diff(np.append(bounds[first], n_steps))
+    )
+
+
+def _get_magic_demand_profile(
+    bloq: 'Bloq', cache: Dict['Bloq', MagicDemandProfile]
+) -> MagicDemandProfile:
+    from qualtran import CompositeBloq, DanglingT, DecomposeNotImplementedError, DecomposeTypeError
+
+    profile = cache.get(bloq)
+    if profile is not None:
+        return profile
+
+    leaf_counts = _leaf_magic_count(bloq)
+    if leaf_counts is not None:
+        # Synthesized rotations consume their T states one after the other.
+        profile = MagicDemandProfile.serial(*leaf_counts)
+        cache[bloq] = profile
+        return profile
+
+    try:
+        cbloq = bloq if isinstance(bloq, CompositeBloq) else bloq.decompose_bloq()
+    except (DecomposeNotImplementedError, DecomposeTypeError):
+        cbloq = None
+    if cbloq is None:
+        profile = MagicDemandProfile.serial(*_call_graph_magic_count(bloq))
+        cache[bloq] = profile
+        return profile
+
+    # Schedule each subbloq as soon as all of its inputs are available.
+    binst_graph = cbloq._binst_graph
+    placements: List[Tuple[int, MagicDemandProfile]] = []
+    end: Dict['BloqInstance', int] = {}
+    for binst in nx.topological_sort(binst_graph):
+        start = max((end[pred] for pred in binst_graph.predecessors(binst)), default=0)
+        if isinstance(binst, DanglingT):
+            end[binst] = start
+            continue
+        sub_profile = _get_magic_demand_profile(binst.bloq, cache)
+        end[binst] = start + sub_profile.n_steps
+        if sub_profile.n_steps:
+            placements.append((start, sub_profile))
+
+    profile = _overlay_profiles(placements, n_steps=max(end.values(), default=0))
+    cache[bloq] = profile
+    return profile
+
+
+def get_magic_demand_profile(bloq: 'Bloq') -> MagicDemandProfile:
+    """The number of magic states `bloq` consumes at each logical time step.
+
+    The bloq is recursively decomposed. Within each decomposition, subbloqs are scheduled as
+    soon as their inputs are available, and the profile of a subbloq is computed once and
+    re-used for every call to it. T gates and Toffolis (as CCZ states) take one time step.
+    Rotations take one time step per T state of their synthesis. Bloqs without a decomposition
+    consume the magic states from their call graph one per time step. All other leaf bloqs
+    are Clifford and take no time.
+
+    Use `MagicDemandProfile.min_factories` or `MultiFactory.from_demand_profile` to size
+    the magic state factories for the peak, rather than the average, demand.
+
+    Args:
+        bloq: The bloq to profile. Its decomposition must have concrete (non-symbolic) counts.
+    """
+    return _get_magic_demand_profile(bloq, cache={})
@@ -0,0 +1,144 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+from attrs import frozen
+
+from qualtran import Bloq, BloqBuilder, QUInt, Signature
+from qualtran.bloqs.arithmetic import Add
+from qualtran.bloqs.basic_gates import CNOT, TGate, Toffoli
+from qualtran.surface_code.ccz2t_cost_model import CCZ2TFactory
+from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.magic_demand import get_magic_demand_profile, MagicDemandProfile
+from qualtran.surface_code.multi_factory import MultiFactory
+
+
+def _parallel_then_serial_ts():
+    bb = BloqBuilder()
+    q0 = bb.add_register('q0', 1)
+    q1 = bb.add_register('q1', 1)
+    q0 = bb.add(TGate(), q=q0)
+    q1 = bb.add(TGate(), q=q1)
+    q0, q1 = bb.add(CNOT(), ctrl=q0, target=q1)
+    q0 = bb.add(TGate(), q=q0)
+    return bb.finalize(q0=q0, q1=q1)
+
+
+def test_leaf_profiles():
+    np.testing.assert_array_equal(get_magic_demand_profile(TGate()).n_t, [1])
+    np.testing.assert_array_equal(get_magic_demand_profile(TGate().adjoint()).n_t, [1])
+    profile = get_magic_demand_profile(Toffoli())
+    np.testing.assert_array_equal(profile.n_t, [0])
+    np.testing.assert_array_equal(profile.n_ccz, [1])
+    assert get_magic_demand_profile(CNOT()).n_steps == 0
+
+
+def test_schedules_independent_bloqs_in_parallel():
+    cbloq = _parallel_then_serial_ts()
+    profile = get_magic_demand_profile(cbloq)
+    np.testing.assert_array_equal(profile.n_t, [2, 1])
+    assert profile.total() == MagicCount(n_t=3)
+    assert profile.peak() == MagicCount(n_t=2)
+    assert profile.peak(window=5) == MagicCount(n_t=3)
+
+
+def test_matches_t_complexity():
+    bloq = Add(QUInt(8))
+    profile = get_magic_demand_profile(bloq)
+    assert profile.total() == MagicCount(n_t=bloq.t_complexity().t)
+    assert profile.peak().n_t > profile.total().n_t / profile.n_steps
+
+
+def test_profile_windows():
+    profile = MagicDemandProfile(n_t=[1, 3, 0, 0, 2], n_ccz=[0, 0, 1, 0, 0])
+    n_t, n_ccz = profile.windowed_counts(2)
+    np.testing.assert_array_equal(n_t, [4, 3, 0, 2])
+    np.testing.assert_array_equal(n_ccz, [0, 1, 1, 0])
+    # A CCZ state counts as two T states.
+    assert profile.peak(2) == MagicCount(n_t=3, n_ccz=1)
+
+    with pytest.raises(ValueError):
+        profile.windowed_counts(0)
+    with pytest.raises(ValueError):
+        MagicDemandProfile(n_t=[1, 2], n_ccz=[1])
+
+    with pytest.raises(ValueError):
+        MagicDemandProfile(n_t=[1, 2], n_ccz=[1, 0], durations=[1, -1])
+
+    serial = MagicDemandProfile.serial(n_t=2, n_ccz=1)
+    n_t, n_ccz = serial.per_step_counts()
+    np.testing.assert_array_equal(n_t, [1, 1, 0])
+    np.testing.assert_array_equal(n_ccz, [0, 0, 1])
+
+
+def test_segments_match_per_step_profile():
+    rs = np.random.RandomState(52)
+    segments = MagicDemandProfile(
+        n_t=rs.randint(0, 4, size=20),
+        n_ccz=rs.randint(0, 3, size=20),
+        durations=rs.randint(0, 5, size=20),
+    )
+    per_step = MagicDemandProfile(*segments.per_step_counts())
+    assert segments.n_steps == per_step.n_steps
+    assert segments.total() == per_step.total()
+    factory = CCZ2TFactory()
+    for window in [1, 2, 3, 7, 100]:
+        for got, want in zip(segments.windowed_counts(window), per_step.windowed_counts(window)):
+            np.testing.assert_array_equal(got, want)
+        assert segments.peak(window) == per_step.peak(window)
+        assert segments.min_factories(factory, 10, window) == per_step.min_factories(
+            factory, 10, window
+        )
+
+
+def test_long_serial_profile():
+    profile = MagicDemandProfile.serial(n_t=10**12, n_ccz=10**9)
+    assert len(profile.durations) == 2
+    assert profile.n_steps == 10**12 + 10**9
+    assert profile.total() == MagicCount(n_t=10**12, n_ccz=10**9)
+    assert profile.peak(window=10**6) == MagicCount(n_ccz=10**6)
+    assert profile.min_factories(CCZ2TFactory(), cycles_per_step=1, window=10**6) > 1
+
+
+@frozen
+class _FailingDecomposition(Bloq):
+    @property
+    def signature(self) -> Signature:
+        return Signature.build(q=1)
+
+    def build_composite_bloq(self, bb, q):
+        raise ValueError("Not a decomposition error.")
+
+
+def test_decomposition_value_errors_propagate():
+    with pytest.raises(ValueError, match="Not a decomposition error"):
+        get_magic_demand_profile(_FailingDecomposition())
+
+
+def test_size_factories_for_peak_demand():
+    factory = CCZ2TFactory()
+    bursty = MagicDemandProfile(n_t=[8, 0, 0, 0, 0, 0, 0, 0], n_ccz=[0] * 8)
+    steady = MagicDemandProfile(n_t=[1] * 8, n_ccz=[0] * 8)
+    assert bursty.total() == steady.total()
+
+    cycles_per_step = factory.n_cycles(MagicCount(n_t=1))
+    assert steady.min_factories(factory, cycles_per_step) == 1
+    assert bursty.min_factories(factory, cycles_per_step) > 1
+    # With enough buffering, the average demand is all that matters.
+    assert bursty.min_factories(factory, cycles_per_step, window=8) == 1
+
+    multi = MultiFactory.from_demand_profile(factory, bursty, cycles_per_step=cycles_per_step)
+    assert multi.n_factories == bursty.min_factories(factory, cycles_per_step)
+    assert multi.n_cycles(MagicCount(n_t=8)) <= cycles_per_step
@@ -12,12 +12,17 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from typing import TYPE_CHECKING
+
 import numpy as np
 from attrs import frozen
 
 from qualtran.surface_code.magic_count import MagicCount
 from qualtran.surface_code.magic_state_factory import MagicStateFactory
 
+if TYPE_CHECKING:
+    from qualtran.surface_code.magic_demand import MagicDemandProfile
+
 
 @frozen
 class MultiFactory(MagicStateFactory):
@@ -35,6 +40,24 @@ class MultiFactory(MagicStateFactory):
     base_factory: MagicStateFactory
     n_factories: int
 
+    @classmethod
+    def from_demand_profile(
+        cls,
+        base_factory: MagicStateFactory,
+        profile: 'MagicDemandProfile',
+        cycles_per_step: float,
+        window: int = 1,
+        phys_err: float = 1e-3,
+    ) -> 'MultiFactory':
+        """Enough copies of `base_factory` to keep up with the peak demand of `profile`.
+
+        See `MagicDemandProfile.min_factories` for the meaning of the arguments.
+        """
+        n_factories = profile.min_factories(
+            base_factory, cycles_per_step=cycles_per_step, window=window, phys_err=phys_err
+        )
+        return cls(base_factory=base_factory, n_factories=n_factories)
+
     def footprint(self) -> int:
         return self.base_factory.footprint() * self.n_factories
 
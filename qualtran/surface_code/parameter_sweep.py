@@ -0,0 +1,199 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import concurrent.futures
+import itertools
+import multiprocessing
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+from qualtran.surface_code.azure_cost_model import (
+    code_distance,
+    logical_qubits,
+    minimum_time_steps,
+    t_states,
+)
+from qualtran.surface_code.ccz2t_cost_model import CCZ2TFactory, get_ccz2t_costs_from_error_budget
+from qualtran.surface_code.quantum_error_correction_scheme_summary import (
+    FowlerSuperconductingQubits,
+    QuantumErrorCorrectionSchemeSummary,
+)
+from qualtran.surface_code.rotation_cost_model import BeverlandEtAlRotationCost, RotationCostModel
+
+SWEEP_DTYPE = np.dtype(
+    [
+        # Inputs. `algorithm` and `rotation_model` index into the sequences given to the sweep.
+        ('algorithm', np.int64),
+        ('rotation_model', np.int64),
+        ('phys_err', np.float64),
+        ('error_budget', np.float64),
+        ('cycle_time_us', np.float64),
+        # Magic states needed when a third of the error budget goes to rotation synthesis.
+        ('n_t', np.float64),
+        ('n_ccz', np.float64),
+        # `get_ccz2t_costs_from_error_budget`; NaN if distillation uses up the budget or
+        # `phys_err` is at or above the threshold of its error correction scheme.
+        ('ccz2t_failure_prob', np.float64),
+        ('ccz2t_footprint', np.float64),
+        ('ccz2t_duration_hr', np.float64),
+        # The Azure model of `azure_cost_model`. `code_distance` is NaN if `phys_err` is at or
+        # above the threshold of the error correction scheme.
+        ('logical_qubits', np.int64),
+        ('minimum_time_steps', np.int64),
+        ('code_distance', np.float64),
+        ('t_states', np.float64),
+    ]
+)
+"""The columns of the structured array returned by `sweep_physical_costs`."""
+
+
+# The default factory of `get_ccz2t_costs_from_error_budget`. Its data block uses the same
+# error correction scheme.
+_CCZ2T_FACTORY = CCZ2TFactory()
+
+
+def _sweep_one(
+    algorithm_idx: int,
+    algorithm: AlgorithmSummary,
+    rotation_model_idx: int,
+    rotation_model: RotationCostModel,
+    phys_errs: Sequence[float],
+    error_budgets: Sequence[float],
+    cycle_times_us: Sequence[float],
+    qec: QuantumErrorCorrectionSchemeSummary,
+) -> np.ndarray:
+    """All grid points of one (algorithm, rotation model) pair.
+
+    The loops are nested so that every intermediate quantity is computed once for all the
+    grid points it is shared by: magic state counts and time steps only depend on the error
+    budget, and code distances and CCZ2T costs don't depend on the cycle time, except for the
+    duration, which is proportional to it.
+    """
+    rows = np.zeros(len(phys_errs) * len(error_budgets) * len(cycle_times_us), dtype=SWEEP_DTYPE)
+    rows['algorithm'] = algorithm_idx
+    rows['rotation_model'] = rotation_model_idx
+    rows['logical_qubits'] = logical_qubits(algorithm)
+    cycle_times = np.asarray(cycle_times_us, dtype=float)
+
+    i = 0
+    for error_budget in error_budgets:
+        n_magic = algorithm.to_magic_count(rotation_model, error_budget / 3)
+        n_time_steps = minimum_time_steps(
+            error_budget=error_budget, alg=algorithm, rotation_model=rotation_model
+        )
+        n_t_states = t_states(
+            error_budget=error_budget, alg=algorithm, rotation_model=rotation_model
+        )
+        for phys_err in phys_errs:
+            # No code distance suppresses errors at or above the threshold.
+            distance: Union[float, np.ndarray] = np.nan
+            if phys_err < qec.error_rate_threshold:
+                distance = code_distance(
+                    error_budget=error_budget,
+                    time_steps=n_time_steps,
+                    alg=algorithm,
+                    qec=qec,
+                    physical_error_rate=phys_err,
+                )
+            ccz2t_cost = (np.nan, np.nan, np.nan)
+            if phys_err < _CCZ2T_FACTORY.qec_scheme.error_rate_threshold and (
+                _CCZ2T_FACTORY.distillation_error(n_magic=n_magic, phys_err=phys_err) < error_budget
+            ):
+                cost = get_ccz2t_costs_from_error_budget(
+                    n_magic=n_magic,
+                    n_algo_qubits=algorithm.algorithm_qubits,
+                    phys_err=phys_err,
+                    error_budget=error_budget,
+                    cycle_time_us=1.0,
+                    factory=_CCZ2T_FACTORY,
+                )
+                ccz2t_cost = (cost.failure_prob, cost.footprint, cost.duration_hr)
+
+            block = rows[i : i + len(cycle_times)]
+            block['phys_err'] = phys_err
+            block['error_budget'] = error_budget
+            block['cycle_time_us'] = cycle_times
+            block['n_t'] = n_magic.n_t
+            block['n_ccz'] = n_magic.n_ccz
+            block['minimum_time_steps'] = n_time_steps
+            block['code_distance'] = distance
+            block['t_states'] = n_t_states
+            block['ccz2t_failure_prob'] = ccz2t_cost[0]
+            block['ccz2t_footprint'] = ccz2t_cost[1]
+            block['ccz2t_duration_hr'] = ccz2t_cost[2] * cycle_times
+            i += len(cycle_times)
+    return rows
+
+
+def sweep_physical_costs(
+    algorithms: Sequence[AlgorithmSummary],
+    *,
+    phys_err: Iterable[float] = (1e-3,),
+    error_budget: Iterable[float] = (1e-2,),
+    cycle_time_us: Iterable[float] = (1.0,),
+    rotation_model: Sequence[RotationCostModel] = (BeverlandEtAlRotationCost,),
+    qec: QuantumErrorCorrectionSchemeSummary = FowlerSuperconductingQubits,
+    max_workers: Optional[int] = None,
+) -> np.ndarray:
+    """Evaluate the physical cost models over the product of parameter grids.
+
+    Every combination of algorithm, rotation model, physical error rate, error budget and
+    cycle time is costed with both `get_ccz2t_costs_from_error_budget` and the Azure model
+    (`logical_qubits`, `minimum_time_steps`, `code_distance`, `t_states`). Each
+    (algorithm, rotation model) pair is evaluated as one task on a process pool.
+
+    Args:
+        algorithms: The algorithms to cost.
+        phys_err: The physical error rates to sweep over.
+        error_budget: The error budgets to sweep over.
+        cycle_time_us: The surface code cycle times, in microseconds, to sweep over.
+        rotation_model: The rotation cost models to sweep over.
+        qec: The error correction scheme used by the Azure model.
+        max_workers: The number of worker processes. `None` uses one per CPU; 1 runs the
+            sweep in the current process.
+
+    Returns:
+        A structured array with dtype `SWEEP_DTYPE`, one row per grid point, ordered by
+        algorithm, rotation model, error budget, physical error rate and cycle time. It can be
+        passed directly to `pandas.DataFrame`.
+    """
+    phys_errs = tuple(phys_err)
+    error_budgets = tuple(error_budget)
+    cycle_times_us = tuple(cycle_time_us)
+    tasks: List[Tuple] = [
+        (i, algorithm, j, model, phys_errs, error_budgets, cycle_times_us, qec)
+        for (i, algorithm), (j, model) in itertools.product(
+            enumerate(algorithms), enumerate(rotation_model)
+        )
+    ]
+    if not tasks:
+        return np.zeros(0, dtype=SWEEP_DTYPE)
+
+    if max_workers == 1:
+        results = [_sweep_one(*task) for task in tasks]
+    else:
+        # Workers are started from a fresh server process rather than forked from this one,
+        # which may hold locks from threads started by other libraries (e.g. quimb). Platforms
+        # without a forkserver (e.g. Windows) spawn every worker instead.
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('forkserver')
+        else:
+            mp_context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp_context
+        ) as executor:
+            results = list(executor.map(_sweep_one, *zip(*tasks)))
+    return np.concatenate(results)
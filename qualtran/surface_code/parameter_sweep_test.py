@@ -0,0 +1,132 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from qualtran.surface_code import azure_cost_model
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+from qualtran.surface_code.ccz2t_cost_model import get_ccz2t_costs_from_error_budget
+from qualtran.surface_code.parameter_sweep import SWEEP_DTYPE, sweep_physical_costs
+from qualtran.surface_code.quantum_error_correction_scheme_summary import (
+    BeverlandSuperconductingQubits,
+)
+from qualtran.surface_code.rotation_cost_model import (
+    BeverlandEtAlRotationCost,
+    SevenDigitsOfPrecisionConstantCost,
+)
+
+_ALGORITHMS = [
+    AlgorithmSummary(algorithm_qubits=100, t_gates=10**8, toffoli_gates=10**8),
+    AlgorithmSummary(
+        algorithm_qubits=230,
+        measurements=1.37e9,
+        rotation_gates=2.06e6,
+        rotation_circuit_depth=1.76e5,
+        toffoli_gates=1.35e6,
+    ),
+]
+_ROTATION_MODELS = [BeverlandEtAlRotationCost, SevenDigitsOfPrecisionConstantCost]
+
+
+def test_sweep_matches_cost_models():
+    result = sweep_physical_costs(
+        _ALGORITHMS,
+        phys_err=[1e-3, 1e-4],
+        error_budget=[1e-2, 1e-3, 1e-15],
+        cycle_time_us=[1, 0.5],
+        rotation_model=_ROTATION_MODELS,
+        qec=BeverlandSuperconductingQubits,
+        max_workers=1,
+    )
+    assert result.dtype == SWEEP_DTYPE
+    assert len(result) == 2 * 2 * 2 * 3 * 2
+
+    for row in result:
+        alg = _ALGORITHMS[row['algorithm']]
+        rotation_model = _ROTATION_MODELS[row['rotation_model']]
+        error_budget = row['error_budget']
+        n_magic = alg.to_magic_count(rotation_model, error_budget / 3)
+        assert (row['n_t'], row['n_ccz']) == (n_magic.n_t, n_magic.n_ccz)
+
+        time_steps = azure_cost_model.minimum_time_steps(error_budget, alg, rotation_model)
+        assert row['minimum_time_steps'] == time_steps
+        assert row['logical_qubits'] == azure_cost_model.logical_qubits(alg)
+        assert row['t_states'] == azure_cost_model.t_states(error_budget, alg, rotation_model)
+        assert row['code_distance'] == azure_cost_model.code_distance(
+            error_budget, time_steps, alg, BeverlandSuperconductingQubits, row['phys_err']
+        )
+
+        try:
+            cost = get_ccz2t_costs_from_error_budget(
+                n_magic=n_magic,
+                n_algo_qubits=alg.algorithm_qubits,
+                phys_err=row['phys_err'],
+                error_budget=error_budget,
+                cycle_time_us=row['cycle_time_us'],
+            )
+        except ValueError:
+            assert np.isnan(row['ccz2t_footprint'])
+        else:
+            assert row['ccz2t_failure_prob'] == cost.failure_prob
+            assert row['ccz2t_footprint'] == cost.footprint
+            # The duration is rescaled from a unit cycle time, so it may differ in the last bit.
+            np.testing.assert_allclose(row['ccz2t_duration_hr'], cost.duration_hr, rtol=1e-14)
+
+
+def test_sweep_with_infeasible_phys_err():
+    threshold = BeverlandSuperconductingQubits.error_rate_threshold
+    result = sweep_physical_costs(
+        _ALGORITHMS,
+        phys_err=[1e-3, threshold],
+        error_budget=[1e-2],
+        cycle_time_us=[1, 0.5],
+        qec=BeverlandSuperconductingQubits,
+        max_workers=1,
+    )
+    assert len(result) == 2 * 2 * 2
+    feasible = result[result['phys_err'] == 1e-3]
+    infeasible = result[result['phys_err'] == threshold]
+    assert not np.any(np.isnan(feasible['code_distance']))
+    assert not np.any(np.isnan(feasible['ccz2t_footprint']))
+    assert np.all(np.isnan(infeasible['code_distance']))
+    assert np.all(np.isnan(infeasible['ccz2t_footprint']))
+    assert np.all(np.isnan(infeasible['ccz2t_duration_hr']))
+    np.testing.assert_array_equal(infeasible['t_states'], feasible['t_states'])
+
+
+def test_sweep_with_invalid_error_budget_raises():
+    with pytest.raises(ValueError):
+        sweep_physical_costs(_ALGORITHMS, error_budget=[-1e-2], max_workers=1)
+
+
+def test_sweep_with_process_pool():
+    kwargs = dict(phys_err=[1e-3, 1e-4], error_budget=[1e-2], rotation_model=_ROTATION_MODELS)
+    serial = sweep_physical_costs(_ALGORITHMS, **kwargs, max_workers=1)
+    parallel = sweep_physical_costs(_ALGORITHMS, **kwargs, max_workers=2)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_sweep_without_forkserver(monkeypatch):
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    kwargs = dict(phys_err=[1e-3], error_budget=[1e-2], rotation_model=_ROTATION_MODELS)
+    serial = sweep_physical_costs(_ALGORITHMS, **kwargs, max_workers=1)
+    parallel = sweep_physical_costs(_ALGORITHMS, **kwargs, max_workers=2)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_empty_sweep():
+    assert sweep_physical_costs([]).dtype == SWEEP_DTYPE
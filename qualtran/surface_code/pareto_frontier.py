@@ -0,0 +1,256 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import itertools
+import math
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from attrs import frozen
+
+import qualtran.surface_code.quantum_error_correction_scheme_summary as qec
+from qualtran.surface_code.ccz2t_cost_model import iter_ccz2t_factories
+from qualtran.surface_code.data_block import SimpleDataBlock
+from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.magic_state_factory import MagicStateFactory
+from qualtran.surface_code.multi_factory import MultiFactory
+from qualtran.surface_code.physical_cost import PhysicalCost
+
+
+@frozen
+class ParetoFrontierPoint:
+    """A non-dominated physical cost together with the configuration achieving it.
+
+    Args:
+        cost: The physical cost of the configuration.
+        factory: The (multi) factory used to distill magic states.
+        data_block: The data block storing the algorithm qubits.
+    """
+
+    cost: PhysicalCost
+    factory: MagicStateFactory
+    data_block: SimpleDataBlock
+
+
+def min_data_code_distance(
+    *,
+    phys_err: float,
+    budget: float,
+    n_data_cells: int,
+    qec_scheme: qec.QuantumErrorCorrectionSchemeSummary = qec.FowlerSuperconductingQubits,
+) -> Optional[int]:
+    """The smallest odd data code distance keeping `n_data_cells` unit cells within `budget`.
+
+    Below the threshold of `qec_scheme`, the logical error rate is monotonically decreasing in
+    the code distance, so the answer is found by inverting it with `code_distance_from_budget`
+    and then correcting for rounding by stepping to the neighbouring distances. Returns None if
+    the budget is not positive or `phys_err` is not below the threshold, in which case no code
+    distance suffices.
+    """
+    if budget <= 0 or phys_err >= qec_scheme.error_rate_threshold:
+        return None
+
+    def fits(d: int) -> bool:
+        return n_data_cells * qec_scheme.logical_error_rate(d, phys_err) <= budget
+
+    d = qec_scheme.code_distance_from_budget(
+        physical_error_rate=phys_err, budget=budget / n_data_cells
+    )
+    while not fits(d):
+        d += 2
+    while d > 3 and fits(d - 2):
+        d -= 2
+    return d
+
+
+def _pareto_mask(objectives: np.ndarray) -> np.ndarray:
+    """Boolean mask of the rows of `objectives` that no other row weakly dominates.
+
+    `objectives` has three columns. Of several rows with identical objectives, only the first is
+    kept. Rows are sorted lexicographically, so that every row weakly dominating another one
+    comes before it. For each distinct value of the second objective, a cumulative minimum of
+    the third objective over the rows that are no worse in the second one then finds the
+    dominated rows.
+    """
+    order = np.lexsort(objectives.T[::-1])
+    second, third = objectives[order, 1], objectives[order, 2]
+    dominated = np.zeros(len(objectives), dtype=bool)
+    for value in np.unique(second):
+        candidates = np.where(second <= value, third, np.inf)
+        # The best third objective among the preceding rows that are no worse in the second.
+        best_before = np.minimum.accumulate(np.concatenate([[np.inf], candidates[:-1]]))
+        dominated |= (second == value) & (best_before <= third)
+    keep = np.empty(len(objectives), dtype=bool)
+    keep[order] = ~dominated
+    return keep
+
+
+_DISTANCE_CHUNK_SIZE = 16
+
+
+def _data_code_distances(
+    *,
+    min_data_d: int,
+    phys_err: float,
+    n_data_cells: int,
+    distillation_error: float,
+    qec_scheme: qec.QuantumErrorCorrectionSchemeSummary,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The data code distances worth considering for one factory, and their data errors.
+
+    Distances are enumerated from `min_data_d` up to the first one whose data error no longer
+    changes the failure probability; every larger distance is dominated.
+    """
+    data_ds: List[np.ndarray] = []
+    data_errors: List[np.ndarray] = []
+    start = min_data_d
+    while True:
+        ds = start + 2 * np.arange(_DISTANCE_CHUNK_SIZE)
+        errors = n_data_cells * qec_scheme.logical_error_rate_vectorized(ds, phys_err)
+        done = (errors == 0) | (distillation_error + errors == distillation_error)
+        if done.any():
+            stop = int(np.argmax(done)) + 1
+            data_ds.append(ds[:stop])
+            data_errors.append(errors[:stop])
+            return np.concatenate(data_ds), np.concatenate(data_errors)
+        data_ds.append(ds)
+        data_errors.append(errors)
+        start += 2 * _DISTANCE_CHUNK_SIZE
+
+
+def get_physical_cost_pareto_frontier(
+    *,
+    n_magic: MagicCount,
+    n_algo_qubits: int,
+    phys_err: float = 1e-3,
+    error_budget: float = 1e-2,
+    cycle_time_us: float = 1.0,
+    factory_iter: Iterable[MagicStateFactory] = tuple(iter_ccz2t_factories()),
+    n_factories_iter: Iterable[int] = (1,),
+    routing_overhead: float = 0.5,
+    qec_scheme: qec.QuantumErrorCorrectionSchemeSummary = qec.FowlerSuperconductingQubits,
+) -> List[ParetoFrontierPoint]:
+    """The (footprint, duration, failure probability) Pareto frontier of physical costs.
+
+    Every factory from `factory_iter` is replicated `n` times for each `n` in
+    `n_factories_iter` and paired with a `SimpleDataBlock`. Instead of enumerating data block
+    code distances, the search exploits the monotonicity of the cost model:
+
+     - The distillation error and cycle count of a base factory are computed once and reused
+       for every replication count; factories whose distillation error alone exceeds the
+       budget are discarded before any data block is considered.
+     - A (replicated) factory whose footprint, cycle count and distillation error are all
+       matched or beaten by another one is discarded with all of its data blocks: at every code
+       distance, the other factory with the same data block dominates it.
+     - For a fixed factory, the duration does not depend on the data code distance while the
+       footprint grows and the failure probability shrinks with it. Data code distances are
+       enumerated from the smallest one satisfying the remaining error budget (see
+       `min_data_code_distance`) until the data error no longer changes the failure
+       probability; every larger distance is dominated.
+
+    Any factory model can be used, e.g. `CCZ2TFactory` or `FifteenToOne`.
+
+    Args:
+        n_magic: The number of magic states (T, Toffoli) required to execute the algorithm
+        n_algo_qubits: Number of algorithm logical qubits.
+        phys_err: The physical error rate of the device.
+        error_budget: The acceptable chance of an error occurring at any point.
+        cycle_time_us: The number of microseconds it takes to execute a surface code cycle.
+        factory_iter: The base factories to search over.
+        n_factories_iter: The numbers of parallel factories to search over.
+        routing_overhead: The routing overhead of the data block.
+        qec_scheme: The error correction scheme protecting the data block.
+
+    Returns:
+        The non-dominated points sorted by increasing footprint.
+    """
+    n_factories_options = tuple(n_factories_iter)
+    n_logical_qubits = math.ceil((1 + routing_overhead) * n_algo_qubits)
+
+    # One entry per (base factory, number of factories) pair.
+    factories: List[Tuple[MagicStateFactory, int, float, int]] = []
+    factory_objectives: List[Tuple[float, float, float]] = []
+    for base_factory in factory_iter:
+        distillation_error = base_factory.distillation_error(n_magic=n_magic, phys_err=phys_err)
+        if error_budget - distillation_error <= 0:
+            continue
+        base_cycles = base_factory.n_cycles(n_magic=n_magic, phys_err=phys_err)
+        base_footprint = base_factory.footprint()
+        for n_factories in n_factories_options:
+            n_cycles = math.ceil(base_cycles / n_factories)
+            factories.append((base_factory, n_factories, distillation_error, n_cycles))
+            factory_objectives.append((base_footprint * n_factories, n_cycles, distillation_error))
+    if not factories:
+        return []
+    keep_factories = _pareto_mask(np.array(factory_objectives, dtype=float))
+
+    # The objectives of every candidate point, and the factory and code distance achieving it.
+    objectives: List[np.ndarray] = []
+    candidates: List[Tuple[int, int]] = []
+    for i in np.flatnonzero(keep_factories):
+        base_factory, n_factories, distillation_error, n_cycles = factories[i]
+        n_data_cells = n_logical_qubits * n_cycles
+        min_data_d = min_data_code_distance(
+            phys_err=phys_err,
+            budget=error_budget - distillation_error,
+            n_data_cells=n_data_cells,
+            qec_scheme=qec_scheme,
+        )
+        if min_data_d is None:
+            continue
+        data_ds, data_errors = _data_code_distances(
+            min_data_d=min_data_d,
+            phys_err=phys_err,
+            n_data_cells=n_data_cells,
+            distillation_error=distillation_error,
+            qec_scheme=qec_scheme,
+        )
+        footprints = base_factory.footprint() * n_factories + n_logical_qubits * np.array(
+            [qec_scheme.physical_qubits(int(d)) for d in data_ds], dtype=float
+        )
+        duration_hr = (cycle_time_us * n_cycles) / (1_000_000 * 60 * 60)
+        objectives.append(
+            np.stack(
+                [footprints, np.full(len(data_ds), duration_hr), distillation_error + data_errors],
+                axis=1,
+            )
+        )
+        candidates.extend((int(i), int(d)) for d in data_ds)
+
+    if not candidates:
+        return []
+    keep = _pareto_mask(np.concatenate(objectives))
+
+    points: List[ParetoFrontierPoint] = []
+    for i, data_d in itertools.compress(candidates, keep):
+        base_factory, n_factories, distillation_error, n_cycles = factories[i]
+        factory = (
+            base_factory
+            if n_factories == 1
+            else MultiFactory(base_factory=base_factory, n_factories=n_factories)
+        )
+        data_block = SimpleDataBlock(
+            data_d=data_d, routing_overhead=routing_overhead, qec_scheme=qec_scheme
+        )
+        data_error = data_block.data_error(
+            n_algo_qubits=n_algo_qubits, n_cycles=n_cycles, phys_err=phys_err
+        )
+        cost = PhysicalCost(
+            failure_prob=distillation_error + data_error,
+            footprint=base_factory.footprint() * n_factories
+            + data_block.footprint(n_algo_qubits=n_algo_qubits),
+            duration_hr=(cycle_time_us * n_cycles) / (1_000_000 * 60 * 60),
+        )
+        points.append(ParetoFrontierPoint(cost=cost, factory=factory, data_block=data_block))
+    return sorted(points, key=lambda p: (p.cost.footprint, p.cost.duration_hr, p.cost.failure_prob))
@@ -0,0 +1,182 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+
+import qualtran.surface_code.quantum_error_correction_scheme_summary as qec
+from qualtran.surface_code.ccz2t_cost_model import (
+    CCZ2TFactory,
+    get_ccz2t_costs,
+    get_ccz2t_costs_from_grid_search,
+    iter_ccz2t_factories,
+)
+from qualtran.surface_code.data_block import SimpleDataBlock
+from qualtran.surface_code.fifteen_to_one import FifteenToOne733, FifteenToOne933
+from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.multi_factory import MultiFactory
+from qualtran.surface_code.pareto_frontier import (
+    _pareto_mask,
+    get_physical_cost_pareto_frontier,
+    min_data_code_distance,
+)
+
+
+@pytest.mark.parametrize('budget', [1e-2, 1e-5, 3.3e-9, 1e-14])
+@pytest.mark.parametrize('n_data_cells', [1, 150, 10**9])
+def test_min_data_code_distance(budget, n_data_cells):
+    scheme = qec.FowlerSuperconductingQubits
+    d = min_data_code_distance(phys_err=1e-3, budget=budget, n_data_cells=n_data_cells)
+    assert d % 2 == 1
+    assert n_data_cells * scheme.logical_error_rate(d, 1e-3) <= budget
+    if d > 3:
+        assert n_data_cells * scheme.logical_error_rate(d - 2, 1e-3) > budget
+
+
+def test_min_data_code_distance_no_budget():
+    assert min_data_code_distance(phys_err=1e-3, budget=0, n_data_cells=10) is None
+
+
+@pytest.mark.parametrize('phys_err', [0.01, 0.02])
+def test_min_data_code_distance_above_threshold(phys_err):
+    assert min_data_code_distance(phys_err=phys_err, budget=0.1, n_data_cells=100) is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pareto_mask_matches_brute_force(seed):
+    # Few distinct values, so that there are many ties.
+    objectives = np.random.default_rng(seed).integers(0, 6, size=(200, 3)).astype(float)
+    expected = np.ones(len(objectives), dtype=bool)
+    for i, row in enumerate(objectives):
+        for j, other in enumerate(objectives):
+            if j == i or np.any(other > row):
+                continue
+            if np.any(other < row) or j < i:
+                expected[i] = False
+    np.testing.assert_array_equal(_pareto_mask(objectives), expected)
+
+
+def _dominates(x, y):
+    return (
+        x.footprint <= y.footprint
+        and x.duration_hr <= y.duration_hr
+        and x.failure_prob <= y.failure_prob
+    )
+
+
+def test_pareto_frontier_dominates_grid():
+    n_magic = MagicCount(n_t=10**8, n_ccz=10**8)
+    factories = tuple(iter_ccz2t_factories())
+    frontier = get_physical_cost_pareto_frontier(
+        n_magic=n_magic,
+        n_algo_qubits=100,
+        error_budget=0.1,
+        factory_iter=factories,
+        n_factories_iter=(1, 2, 4),
+    )
+    assert frontier
+    costs = [p.cost for p in frontier]
+    assert costs == sorted(costs, key=lambda c: c.footprint)
+    for i, a in enumerate(costs):
+        assert a.failure_prob <= 0.1
+        assert not any(_dominates(b, a) for j, b in enumerate(costs) if i != j)
+
+    for point in frontier:
+        assert point.cost == get_ccz2t_costs(
+            n_magic=n_magic,
+            n_algo_qubits=100,
+            phys_err=1e-3,
+            cycle_time_us=1,
+            factory=point.factory,
+            data_block=point.data_block,
+        )
+
+    # Every feasible configuration of an exhaustive grid is matched or beaten in
+    # footprint, duration and failure probability.
+    for n_factories in (1, 2, 4):
+        for base_factory in factories[::7]:
+            factory = base_factory if n_factories == 1 else MultiFactory(base_factory, n_factories)
+            for data_d in range(3, 41, 2):
+                cost = get_ccz2t_costs(
+                    n_magic=n_magic,
+                    n_algo_qubits=100,
+                    phys_err=1e-3,
+                    cycle_time_us=1,
+                    factory=factory,
+                    data_block=SimpleDataBlock(data_d=data_d),
+                )
+                if cost.failure_prob > 0.1:
+                    continue
+                assert any(_dominates(c, cost) for c in costs)
+
+    best_cost, _, _ = get_ccz2t_costs_from_grid_search(
+        n_magic=n_magic, n_algo_qubits=100, error_budget=0.1
+    )
+    assert min(c.qubit_hours for c in costs) <= best_cost.qubit_hours
+
+
+def test_pareto_frontier_trades_footprint_for_failure_prob():
+    n_magic = MagicCount(n_t=10**8, n_ccz=10**8)
+    factory = CCZ2TFactory()
+    frontier = get_physical_cost_pareto_frontier(
+        n_magic=n_magic, n_algo_qubits=100, error_budget=0.1, factory_iter=[factory]
+    )
+    assert len(frontier) > 1
+    data_ds = [p.data_block.data_d for p in frontier]
+    assert data_ds == list(range(data_ds[0], data_ds[-1] + 1, 2))
+    failure_probs = [p.cost.failure_prob for p in frontier]
+    assert failure_probs == sorted(failure_probs, reverse=True)
+
+
+def test_pareto_frontier_fifteen_to_one():
+    n_magic = MagicCount(n_t=10**6)
+    frontier = get_physical_cost_pareto_frontier(
+        n_magic=n_magic,
+        n_algo_qubits=50,
+        phys_err=1e-4,
+        factory_iter=[FifteenToOne733, FifteenToOne933],
+        n_factories_iter=(1, 3),
+    )
+    assert frontier
+    for point in frontier:
+        base_factory = getattr(point.factory, 'base_factory', point.factory)
+        assert base_factory in (FifteenToOne733, FifteenToOne933)
+        assert point.cost.failure_prob <= 1e-2
+        assert point.cost == get_ccz2t_costs(
+            n_magic=n_magic,
+            n_algo_qubits=50,
+            phys_err=1e-4,
+            cycle_time_us=1,
+            factory=point.factory,
+            data_block=point.data_block,
+        )
+
+
+def test_pareto_frontier_infeasible():
+    assert (
+        get_physical_cost_pareto_frontier(
+            n_magic=MagicCount(n_t=10**8, n_ccz=10**8), n_algo_qubits=100, error_budget=1e-30
+        )
+        == []
+    )
+    assert (
+        get_physical_cost_pareto_frontier(
+            n_magic=MagicCount(n_t=10**8, n_ccz=10**8),
+            n_algo_qubits=100,
+            phys_err=0.02,
+            error_budget=0.1,
+            factory_iter=[FifteenToOne733],
+        )
+        == []
+    )
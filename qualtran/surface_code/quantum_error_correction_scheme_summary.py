@@ -13,9 +13,12 @@
 #  limitations under the License.
 import abc
 import math
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
 
+import numpy as np
 from attrs import field, frozen
+from numpy.typing import ArrayLike
 
 
 @frozen
@@ -81,6 +84,39 @@ class QuantumErrorCorrectionSchemeSummary(abc.ABC):
             return 3
         return d
 
+    def logical_error_rate_vectorized(
+        self, code_distance: ArrayLike, physical_error_rate: ArrayLike
+    ) -> np.ndarray:
+        """Elementwise `logical_error_rate` over broadcastable arrays."""
+        code_distance = np.asarray(code_distance)
+        physical_error_rate = np.asarray(physical_error_rate, dtype=float)
+        return self.error_rate_scaler * np.power(
+            physical_error_rate / self.error_rate_threshold, (code_distance + 1) / 2
+        )
+
+    def code_distance_from_budget_vectorized(
+        self, physical_error_rate: ArrayLike, budget: ArrayLike
+    ) -> np.ndarray:
+        """Elementwise `code_distance_from_budget` over broadcastable arrays."""
+        physical_error_rate = np.asarray(physical_error_rate, dtype=float)
+        budget = np.asarray(budget, dtype=float)
+        r = np.log(budget / self.error_rate_scaler) / np.log(
+            physical_error_rate / self.error_rate_threshold
+        )
+        d = 2 * np.ceil(r).astype(np.int64) - 1
+        return np.maximum(d, 3)
+
+    def code_distance_table(
+        self, physical_error_rate: float, max_code_distance: int = 101
+    ) -> 'CodeDistanceTable':
+        """A cached lookup table for `code_distance_from_budget` at one physical error rate.
+
+        Args:
+            physical_error_rate: The physical error rate of the device.
+            max_code_distance: The largest code distance to tabulate.
+        """
+        return _code_distance_table(self, float(physical_error_rate), max_code_distance)
+
     @abc.abstractmethod
     def physical_qubits(self, code_distance: int) -> int:
         """The number of physical qubits per logical qubit used by the error detection circuit."""
@@ -90,6 +126,67 @@ class QuantumErrorCorrectionSchemeSummary(abc.ABC):
         """The time of a quantum error detection cycle in microseconds."""
 
 
+@frozen(eq=False)
+class CodeDistanceTable:
+    """A precomputed, monotone map from logical error budgets to code distances.
+
+    The table holds the logical error rate of every odd code distance in
+    `[3, max_code_distance]` for a single physical error rate. Since the logical error rate
+    is decreasing in the code distance, a budget is converted to the smallest sufficient
+    code distance with a binary search instead of logarithms.
+
+    Budgets below the logical error rate of the largest tabulated distance fall back to
+    `QuantumErrorCorrectionSchemeSummary.code_distance_from_budget_vectorized`.
+
+    Attributes:
+        qec_scheme: The scheme the table was computed for.
+        physical_error_rate: The physical error rate the table was computed for.
+        code_distances: Tabulated code distances in decreasing order.
+        logical_error_rates: The logical error rates of `code_distances`, in increasing order.
+    """
+
+    qec_scheme: QuantumErrorCorrectionSchemeSummary
+    physical_error_rate: float
+    code_distances: np.ndarray
+    logical_error_rates: np.ndarray
+
+    def code_distance_from_budget(self, budget: ArrayLike) -> Union[int, np.ndarray]:
+        """Get the code distances that keep one below the logical error `budget`."""
+        budget = np.asarray(budget, dtype=float)
+        idx = np.searchsorted(self.logical_error_rates, budget, side='right') - 1
+        d = self.code_distances[np.maximum(idx, 0)]
+        out_of_range = idx < 0
+        if np.any(out_of_range):
+            d = np.where(
+                out_of_range,
+                self.qec_scheme.code_distance_from_budget_vectorized(
+                    self.physical_error_rate, budget
+                ),
+                d,
+            )
+        return int(d) if d.ndim == 0 else d
+
+
+@lru_cache(maxsize=256)
+def _code_distance_table(
+    qec_scheme: QuantumErrorCorrectionSchemeSummary,
+    physical_error_rate: float,
+    max_code_distance: int,
+) -> CodeDistanceTable:
+    code_distances = np.arange(max_code_distance - (1 - max_code_distance % 2), 2, -2)
+    logical_error_rates = np.array(
+        [qec_scheme.logical_error_rate(int(d), physical_error_rate) for d in code_distances]
+    )
+    code_distances.setflags(write=False)
+    logical_error_rates.setflags(write=False)
+    return CodeDistanceTable(
+        qec_scheme=qec_scheme,
+        physical_error_rate=physical_error_rate,
+        code_distances=code_distances,
+        logical_error_rates=logical_error_rates,
+    )
+
+
 @frozen
 class SimpliedSurfaceCode(QuantumErrorCorrectionSchemeSummary):
     """A Surface Code Quantum Error Correction Scheme.
@@ -54,3 +54,41 @@ def test_invert_error_at():
                 )
                 > budget
             )
+
+
+@pytest.mark.parametrize(
+    'qec', [qecs.FowlerSuperconductingQubits, qecs.BeverlandSuperconductingQubits]
+)
+def test_vectorized_matches_scalar(qec: qecs.QuantumErrorCorrectionSchemeSummary):
+    phys_errs = np.array([1e-3, 3e-4, 1e-4])[:, np.newaxis]
+    code_distances = np.arange(3, 41, 2)
+    rates = qec.logical_error_rate_vectorized(code_distances, phys_errs)
+    assert rates.shape == (3, len(code_distances))
+    for i, phys_err in enumerate(phys_errs[:, 0]):
+        for j, d in enumerate(code_distances):
+            assert rates[i, j] == pytest.approx(qec.logical_error_rate(int(d), phys_err))
+
+    budgets = np.logspace(-1, -18, 101)
+    distances = qec.code_distance_from_budget_vectorized(phys_errs, budgets)
+    assert distances.shape == (3, len(budgets))
+    for i, phys_err in enumerate(phys_errs[:, 0]):
+        for j, budget in enumerate(budgets):
+            assert distances[i, j] == qec.code_distance_from_budget(phys_err, budget)
+
+
+def test_code_distance_table():
+    qec = qecs.FowlerSuperconductingQubits
+    table = qec.code_distance_table(1e-3, max_code_distance=31)
+    assert table is qec.code_distance_table(1e-3, max_code_distance=31)
+    assert table.code_distances[0] == 31 and table.code_distances[-1] == 3
+    assert np.all(np.diff(table.logical_error_rates) > 0)
+
+    # Budgets both inside and beyond the tabulated distances, avoiding the exact logical
+    # error rates where the logarithm-based inversion is sensitive to rounding.
+    budgets = np.logspace(-1.05, -29.95, 203)
+    distances = table.code_distance_from_budget(budgets)
+    assert np.max(distances) > 31
+    for budget, d in zip(budgets, distances):
+        assert d == qec.code_distance_from_budget(1e-3, budget)
+        assert table.code_distance_from_budget(budget) == d
+    assert isinstance(table.code_distance_from_budget(1e-5), int)
@@ -14,11 +14,24 @@
 
 import abc
 import math
-from typing import Optional
+from typing import Callable, Optional
 
+import numpy as np
 from attrs import frozen
+from numpy.typing import ArrayLike
 
-from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.magic_count import MagicCount, MagicCountBatch
+
+
+def _map_unique(func: Callable[[float], MagicCount], values: ArrayLike) -> MagicCountBatch:
+    """Evaluate `func` once per distinct element of `values`."""
+    values = np.asarray(values, dtype=float)
+    unique, inverse = np.unique(values, return_inverse=True)
+    counts = [func(float(v)) for v in unique]
+    n_t = np.array([c.n_t for c in counts], dtype=float)
+    n_ccz = np.array([c.n_ccz for c in counts], dtype=float)
+    inverse = inverse.reshape(values.shape)
+    return MagicCountBatch(n_t=n_t[inverse], n_ccz=n_ccz[inverse])
 
 
 class RotationCostModel(abc.ABC):
@@ -32,6 +45,14 @@ class RotationCostModel(abc.ABC):
     def prepartion_overhead(self, error_budget) -> MagicCount:
         """Cost of preparation circuit."""
 
+    def rotation_cost_batch(self, error_budget: ArrayLike) -> MagicCountBatch:
+        """Elementwise `rotation_cost` over an array of error budgets."""
+        return _map_unique(self.rotation_cost, error_budget)
+
+    def prepartion_overhead_batch(self, error_budget: ArrayLike) -> MagicCountBatch:
+        """Elementwise `prepartion_overhead` over an array of error budgets."""
+        return _map_unique(self.prepartion_overhead, error_budget)
+
 
 @frozen
 class RotationLogarithmicModel(RotationCostModel):
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import numpy as np
 import pytest
 
 import qualtran.surface_code.rotation_cost_model as rcm
@@ -48,3 +49,16 @@ def test_rotation_cost(model: rcm.RotationCostModel, want: float):
 )
 def test_preparation_overhead(model: rcm.RotationCostModel, want: float):
     assert model.prepartion_overhead(2**-3) == want
+
+
+@pytest.mark.parametrize(
+    'model', [rcm.BeverlandEtAlRotationCost, rcm.SevenDigitsOfPrecisionConstantCost]
+)
+def test_batch_matches_scalar(model):
+    error_budgets = np.array([[1e-3, 1e-5], [1e-3, 0.5]])
+    rotation_cost = model.rotation_cost_batch(error_budgets)
+    overhead = model.prepartion_overhead_batch(error_budgets)
+    assert rotation_cost.shape == overhead.shape == (2, 2)
+    for idx, budget in np.ndenumerate(error_budgets):
+        assert rotation_cost[idx] == model.rotation_cost(budget)
+        assert overhead[idx] == model.prepartion_overhead(budget)
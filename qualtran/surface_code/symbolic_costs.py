@@ -0,0 +1,158 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import functools
+from typing import Callable, Dict, Mapping, Tuple, TYPE_CHECKING
+
+import numpy as np
+import sympy
+from attrs import frozen
+from numpy.typing import ArrayLike
+
+from qualtran.resource_counting.symbolic_counting_utils import SymbolicInt
+from qualtran.surface_code.ccz2t_cost_model import (
+    CCZ2TFactory,
+    get_ccz2t_costs_from_error_budget_vectorized,
+)
+from qualtran.surface_code.physical_cost import PhysicalCost
+
+if TYPE_CHECKING:
+    from qualtran import Bloq
+
+
+def _maximum(*args):
+    return functools.reduce(np.maximum, args)
+
+
+def _minimum(*args):
+    return functools.reduce(np.minimum, args)
+
+
+# The NumPy printer turns `Max` and `Min` into reductions over a tuple of arguments, which
+# fails when scalars and arrays are mixed. They are swapped for elementwise functions instead.
+_ELEMENTWISE_FUNCTIONS = {sympy.Max: _maximum, sympy.Min: _minimum}
+
+
+@functools.lru_cache(maxsize=1024)
+def _lambdify(expr: sympy.Expr, symbols: Tuple[sympy.Symbol, ...]) -> Callable[..., np.ndarray]:
+    modules: Dict[str, Callable] = {}
+    for func, impl in _ELEMENTWISE_FUNCTIONS.items():
+        placeholder = sympy.Function(impl.__name__)
+        expr = expr.replace(func, lambda *args, p=placeholder: p(*args))
+        modules[impl.__name__] = impl
+    return sympy.lambdify(symbols, expr, modules=[modules, 'numpy'])
+
+
+@frozen(eq=False)
+class CompiledCounts:
+    """Symbolic counts compiled once into NumPy functions of their free symbols.
+
+    Use `compile_counts` to construct this class. Calling it with an array of values for
+    every symbol evaluates all the counts with broadcasting, instead of calling `subs` on each
+    expression for each parameter point.
+
+    Attributes:
+        names: The names of the counts.
+        symbols: The free symbols of all counts, sorted by name. Values are passed by name.
+        functions: The compiled function of each count, taking `symbols` positionally.
+    """
+
+    names: Tuple[str, ...]
+    symbols: Tuple[sympy.Symbol, ...]
+    functions: Tuple[Callable[..., np.ndarray], ...]
+
+    def __call__(self, **values: ArrayLike) -> Dict[str, np.ndarray]:
+        missing = [s.name for s in self.symbols if s.name not in values]
+        if missing:
+            raise ValueError(f"Missing values for symbols {missing}.")
+        args = [np.asarray(values[s.name]) for s in self.symbols]
+        shape = np.broadcast_shapes(*(arg.shape for arg in args))
+        return {
+            name: np.broadcast_to(np.asarray(f(*args), dtype=float), shape)
+            for name, f in zip(self.names, self.functions)
+        }
+
+
+def compile_counts(counts: Mapping[str, SymbolicInt]) -> CompiledCounts:
+    """Lambdify symbolic counts into NumPy functions.
+
+    The compiled function of each expression is cached, so compiling the same counts again
+    (e.g. for another batch of parameter values) is cheap.
+
+    Args:
+        counts: A mapping from names to integers or sympy expressions.
+    """
+    exprs = {name: sympy.sympify(count) for name, count in counts.items()}
+    free_symbols = set().union(*(expr.free_symbols for expr in exprs.values()))
+    symbols = tuple(sorted(free_symbols, key=lambda s: s.name))
+    return CompiledCounts(
+        names=tuple(exprs.keys()),
+        symbols=symbols,
+        functions=tuple(_lambdify(expr, symbols) for expr in exprs.values()),
+    )
+
+
+def magic_counts_from_sigma(sigma: Mapping['Bloq', SymbolicInt]) -> Dict[str, SymbolicInt]:
+    """Symbolic magic state counts of a sigma dictionary of leaf bloqs.
+
+    `n_t` counts T gates and the T cost of synthesizing rotations, see `t_counts_from_sigma`.
+    `n_ccz` counts Toffoli gates. Every other bloq is assumed to be Clifford.
+    """
+    from qualtran.bloqs.basic_gates import Toffoli
+    from qualtran.resource_counting.t_counts_from_sigma import t_counts_from_sigma
+
+    return {'n_t': t_counts_from_sigma(dict(sigma)), 'n_ccz': sigma.get(Toffoli(), 0)}
+
+
+def get_ccz2t_costs_from_sigma(
+    sigma: Mapping['Bloq', SymbolicInt],
+    n_algo_qubits: SymbolicInt,
+    *,
+    params: Mapping[str, ArrayLike],
+    phys_err: ArrayLike = 1e-3,
+    error_budget: ArrayLike = 1e-2,
+    cycle_time_us: ArrayLike = 1.0,
+    routing_overhead: ArrayLike = 0.5,
+    factory: CCZ2TFactory = CCZ2TFactory(),
+) -> PhysicalCost:
+    """Physical costs of a symbolic sigma at many points of its parameters.
+
+    The magic state and qubit counts are lambdified once (see `compile_counts`), evaluated at
+    every point of `params`, and fed to `get_ccz2t_costs_from_error_budget_vectorized`.
+
+    Args:
+        sigma: A sigma dictionary, e.g. from `get_bloq_call_graph`, with symbolic counts.
+        n_algo_qubits: The number of algorithm qubits, possibly symbolic.
+        params: Values, possibly arrays, of each free symbol by name.
+        phys_err: The physical error rate(s) of the device.
+        error_budget: The acceptable chance(s) of an error occurring at any point.
+        cycle_time_us: The number(s) of microseconds it takes to execute a surface code cycle.
+        routing_overhead: Routing overhead(s) of the data block.
+        factory: The magic state factory.
+
+    Returns:
+        A `PhysicalCost` of arrays broadcast over `params` and the physical parameters.
+    """
+    compiled = compile_counts({**magic_counts_from_sigma(sigma), 'n_algo_qubits': n_algo_qubits})
+    counts = compiled(**params)
+    return get_ccz2t_costs_from_error_budget_vectorized(
+        n_t=counts['n_t'],
+        n_ccz=counts['n_ccz'],
+        n_algo_qubits=counts['n_algo_qubits'],
+        phys_err=phys_err,
+        error_budget=error_budget,
+        cycle_time_us=cycle_time_us,
+        routing_overhead=routing_overhead,
+        factory=factory,
+    )
@@ -0,0 +1,86 @@
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pytest
+import sympy
+
+from qualtran import QUInt
+from qualtran.bloqs.arithmetic import Add
+from qualtran.bloqs.basic_gates import Rz, TGate, Toffoli
+from qualtran.resource_counting import get_bloq_call_graph
+from qualtran.surface_code.ccz2t_cost_model import get_ccz2t_costs_from_error_budget
+from qualtran.surface_code.magic_count import MagicCount
+from qualtran.surface_code.symbolic_costs import (
+    compile_counts,
+    get_ccz2t_costs_from_sigma,
+    magic_counts_from_sigma,
+)
+
+
+def test_compile_counts():
+    n, eps = sympy.symbols('n eps')
+    compiled = compile_counts(
+        {'a': 4 * n + sympy.ceiling(sympy.log(1 / eps, 2)), 'b': sympy.Max(n, 10), 'c': 7}
+    )
+    assert [s.name for s in compiled.symbols] == ['eps', 'n']
+    assert (
+        compile_counts({'a': 4 * n + 1}).functions[0]
+        is compile_counts({'x': 4 * n + 1}).functions[0]
+    )
+
+    ns = np.arange(1, 20)
+    counts = compiled(n=ns[:, np.newaxis], eps=[1e-3, 1e-6])
+    for name in 'abc':
+        assert counts[name].shape == (len(ns), 2)
+    for i, n_val in enumerate(ns):
+        for j, eps_val in enumerate([1e-3, 1e-6]):
+            subs = {n: int(n_val), eps: eps_val}
+            assert counts['a'][i, j] == (4 * n + sympy.ceiling(sympy.log(1 / eps, 2))).subs(subs)
+            assert counts['b'][i, j] == max(n_val, 10)
+            assert counts['c'][i, j] == 7
+
+    with pytest.raises(ValueError, match='eps'):
+        compiled(n=ns)
+
+
+def test_magic_counts_from_sigma():
+    n = sympy.Symbol('n')
+    _, sigma = get_bloq_call_graph(Add(QUInt(n)))
+    assert magic_counts_from_sigma(sigma) == {'n_t': 4 * n - 4, 'n_ccz': 0}
+
+
+def test_get_ccz2t_costs_from_sigma():
+    n, eps = sympy.symbols('n eps')
+    sigma = {TGate(): 4 * n**3, Toffoli(): 10 * n**4, Rz(0.1, eps=eps): n**2}
+    ns = np.array([10, 100, 1000, 10000])
+    costs = get_ccz2t_costs_from_sigma(
+        sigma, 2 * n, params={'n': ns, 'eps': 1e-10}, phys_err=1e-3, error_budget=1e-2
+    )
+    n_t = magic_counts_from_sigma(sigma)['n_t']
+    for i, n_val in enumerate(ns):
+        n_magic = MagicCount(
+            n_t=int(n_t.subs({n: int(n_val), eps: 1e-10})), n_ccz=10 * int(n_val) ** 4
+        )
+        try:
+            expected = get_ccz2t_costs_from_error_budget(
+                n_magic=n_magic, n_algo_qubits=2 * int(n_val), phys_err=1e-3, error_budget=1e-2
+            )
+        except ValueError:
+            assert np.isnan(costs.failure_prob[i])
+            continue
+        np.testing.assert_allclose(costs.failure_prob[i], expected.failure_prob, rtol=1e-12)
+        assert costs.footprint[i] == expected.footprint
+        assert costs.duration_hr[i] == expected.duration_hr
+    assert np.isnan(costs.failure_prob[-1])
@@ -12,8 +12,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import copy
+import functools
+import threading
 from typing import Any, Dict, Sequence, Tuple
 
+import cachetools
 import numpy as np
 import pandas as pd
 import plotly.express as px
@@ -32,6 +36,7 @@ from qualtran.surface_code.ccz2t_cost_model import (
 )
 from qualtran.surface_code.magic_count import MagicCount
 from qualtran.surface_code.multi_factory import MultiFactory
+from qualtran.surface_code.physical_cost import PhysicalCost
 
 
 def get_objects(modules, object_type):
@@ -348,6 +353,68 @@ app.layout = html.Div(
 )
 
 
+# The callback below recomputes its outputs whenever any input changes. Each output is
+# produced by a function memoized on the subset of inputs it depends on, so e.g. changing the
+# QEC scheme only recomputes the runtime plot while every other output is served from cache.
+# All the cached arguments are hashable: floats, ints, strings and frozen attrs classes.
+_CACHE_SIZE = 64
+
+
+def _memoize(func):
+    """Memoize `func`, handing every caller its own deep copy of the cached result.
+
+    Some results are mutable, e.g. `go.Figure`s and style dicts, and must not be shared between
+    callers that may modify them.
+    """
+    cached = cachetools.cached(cachetools.LRUCache(_CACHE_SIZE), lock=threading.Lock())(func)
+
+    @functools.wraps(cached)
+    def wrapper(*args, **kwargs):
+        return copy.deepcopy(cached(*args, **kwargs))
+
+    return wrapper
+
+
+@_memoize
+def _needed_magic(
+    algorithm: AlgorithmSummary,
+    rotation_model: rotation_cost_model.RotationCostModel,
+    error_budget: float,
+) -> MagicCount:
+    return algorithm.to_magic_count(rotation_model, error_budget / 3)
+
+
+@_memoize
+def _minimum_time_steps(
+    error_budget: float,
+    algorithm: AlgorithmSummary,
+    rotation_model: rotation_cost_model.RotationCostModel,
+) -> int:
+    return minimum_time_steps(
+        error_budget=error_budget, alg=algorithm, rotation_model=rotation_model
+    )
+
+
+@_memoize
+def _ccz2t_grid_search(
+    needed_magic: MagicCount,
+    n_algo_qubits: float,
+    physical_error_rate: float,
+    error_budget: float,
+    magic_count: int,
+) -> Tuple[PhysicalCost, magic_state_factory.MagicStateFactory]:
+    """The grid search shared by the qubit pie chart and the duration output."""
+    res, factory, _ = get_ccz2t_costs_from_grid_search(
+        n_magic=needed_magic,
+        n_algo_qubits=n_algo_qubits,
+        phys_err=physical_error_rate,
+        error_budget=error_budget,
+        factory_iter=[MultiFactory(f, magic_count) for f in iter_ccz2t_factories()],
+    )
+    return res, factory
+
+
+@_memoize
 def create_qubit_pie_chart(
     physical_error_rate: float,
     error_budget: float,
@@ -359,12 +426,12 @@ def create_qubit_pie_chart(
 ) -> go.Figure:
     """Create a pie chart of the physical qubit utilization."""
     if estimation_model == _GIDNEY_FOWLER_MODEL:
-        res, factory, _ = get_ccz2t_costs_from_grid_search(
-            n_magic=needed_magic,
-            n_algo_qubits=algorithm.algorithm_qubits,
-            phys_err=physical_error_rate,
-            error_budget=error_budget,
-            factory_iter=[MultiFactory(f, int(magic_count)) for f in iter_ccz2t_factories()],
+        res, factory = _ccz2t_grid_search(
+            needed_magic,
+            algorithm.algorithm_qubits,
+            physical_error_rate,
+            error_budget,
+            int(magic_count),
         )
         memory_footprint = pd.DataFrame(columns=['source', 'qubits'])
         memory_footprint['source'] = [
@@ -416,6 +483,7 @@ def format_duration(duration: Sequence[float]) -> Tuple[str, Sequence[float]]:
     return unit, duration
 
 
+@_memoize
 def create_runtime_plot(
     physical_error_rate: float,
     error_budget: float,
@@ -434,9 +502,7 @@ def create_runtime_plot(
     if estimation_model == _GIDNEY_FOWLER_MODEL:
         return {'display': 'none'}, go.Figure()
     factory = MultiFactory(magic_factory, int(magic_count))
-    c_min = minimum_time_steps(
-        error_budget=error_budget, alg=algorithm, rotation_model=rotation_model
-    )
+    c_min = _minimum_time_steps(error_budget, algorithm, rotation_model)
     factory_cycles = factory.n_cycles(needed_magic, physical_error_rate)
     min_num_factories = int(np.ceil(factory_cycles / c_min))
     magic_counts = list(
@@ -504,7 +570,7 @@ def update(
     qec = _QEC_SCHEMES[qec_name]
     magic_factory = _MAGIC_FACTORIES[magic_name]
     rotation_model = _ROTATION_MODELS[rotaion_model_name]
-    needed_magic = algorithm.to_magic_count(rotation_model, error_budget / 3)
+    needed_magic = _needed_magic(algorithm, rotation_model, error_budget)
     magic_count = int(magic_count)
     return (
         create_qubit_pie_chart(
@@ -559,6 +625,7 @@ def total_magic(estimation_model: str, needed_magic: MagicCount) -> Tuple[Tuple[
         return ['Total Number of T gates'], f'{total_t:g}'
 
 
+@_memoize
 def min_num_factories(
     physical_error_rate,
     error_budget: float,
@@ -570,14 +637,13 @@ def min_num_factories(
 ) -> Tuple[Dict[str, Any], int]:
     if estimation_model == _GIDNEY_FOWLER_MODEL:
         return {'display': 'none'}, 1
-    c_min = minimum_time_steps(
-        error_budget=error_budget, alg=algorithm, rotation_model=rotation_model
-    )
+    c_min = _minimum_time_steps(error_budget, algorithm, rotation_model)
     return {'display': 'block'}, int(
         np.ceil(magic_factory.n_cycles(needed_magic, physical_error_rate) / c_min)
     )
 
 
+@_memoize
 def compute_duration(
     physical_error_rate: float,
     error_budget: float,
@@ -592,12 +658,8 @@ def compute_duration(
     Currently displays the result only for GidneyFowler (arxiv:1812.01238).
     """
     if estimation_model == _GIDNEY_FOWLER_MODEL:
-        res, _, _ = get_ccz2t_costs_from_grid_search(
-            n_magic=needed_magic,
-            n_algo_qubits=algorithm.algorithm_qubits,
-            phys_err=physical_error_rate,
-            error_budget=error_budget,
-            factory_iter=[MultiFactory(f, magic_count) for f in iter_ccz2t_factories()],
+        res, _ = _ccz2t_grid_search(
+            needed_magic, algorithm.algorithm_qubits, physical_error_rate, error_budget, magic_count
         )
         unit, duration = format_duration([res.duration_hr * 60 * 60 * 10**6])
         return {'display': 'block'}, f'{duration[0]:g} {unit}'
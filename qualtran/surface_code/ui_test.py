@@ -16,6 +16,9 @@ import pytest
 from dash.exceptions import PreventUpdate
 
 from qualtran.surface_code import ui
+from qualtran.surface_code.algorithm_summary import AlgorithmSummary
+from qualtran.surface_code.ccz2t_cost_model import CCZ2TFactory
+from qualtran.surface_code.magic_count import MagicCount
 
 
 @pytest.mark.parametrize('estimation_model', ui._SUPPORTED_ESTIMATION_MODELS)
@@ -106,3 +109,45 @@ def test_update_bad_input():
             magic_count=1,
             rotaion_model_name='BeverlandEtAlRotationCost',
         )
+
+
+def test_update_reuses_cached_results():
+    kwargs = dict(
+        physical_error_rate=2e-4,
+        error_budget=1e-3,
+        estimation_model=ui._GIDNEY_FOWLER_MODEL,
+        algorithm_data=(10**11,) * 6,
+        qec_name='FowlerSuperconductingQubits',
+        magic_name='FifteenToOne733',
+        magic_count=1,
+        rotaion_model_name='BeverlandEtAlRotationCost',
+    )
+    ui._ccz2t_grid_search.cache_clear()
+    first = ui.update(**kwargs)
+    assert len(ui._ccz2t_grid_search.cache) == 1
+
+    # The grid search doesn't depend on the QEC scheme, so it isn't recomputed.
+    kwargs['qec_name'] = 'BeverlandSuperconductingQubits'
+    second = ui.update(**kwargs)
+    assert len(ui._ccz2t_grid_search.cache) == 1
+    assert second[-1] == first[-1]
+
+    kwargs['error_budget'] = 1e-2
+    _ = ui.update(**kwargs)
+    assert len(ui._ccz2t_grid_search.cache) == 2
+
+
+def test_memoized_figures_are_not_shared():
+    kwargs = dict(
+        physical_error_rate=2e-4,
+        error_budget=1e-3,
+        estimation_model=ui._GIDNEY_FOWLER_MODEL,
+        algorithm=AlgorithmSummary(algorithm_qubits=100, toffoli_gates=10**8),
+        magic_factory=CCZ2TFactory(),
+        magic_count=1,
+        needed_magic=MagicCount(n_ccz=10**8),
+    )
+    fig = ui.create_qubit_pie_chart(**kwargs)
+    fig.update_layout(title='modified')
+    assert ui.create_qubit_pie_chart(**kwargs) is not fig
+    assert ui.create_qubit_pie_chart(**kwargs).layout.title.text != 'modified'